@@ -0,0 +1 @@
+"""Pre-aggregated analytics rollups."""
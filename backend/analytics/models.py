@@ -0,0 +1,52 @@
+"""SQLAlchemy models for daily analytics rollups."""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, String, func
+
+from backend.backend.db import Base
+
+
+class AnalyticsDailyRollup(Base):
+    """Task and alert counters for one user, project and day.
+
+    Tasks and alerts are bucketed by the day they were created, matching the
+    date filters of the report endpoints; status and priority counters move
+    between columns of that bucket when a task changes.  ``project_id`` is an
+    empty string for items without a project.
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+    __table_args__ = (Index("ix_analytics_daily_rollups_user_day", "user_id", "day"),)
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(String, primary_key=True)
+    project_id = Column(String, primary_key=True, default="")
+    tasks_total = Column(Integer, nullable=False, default=0)
+    tasks_completed = Column(Integer, nullable=False, default=0)
+    status_pending = Column(Integer, nullable=False, default=0)
+    status_in_progress = Column(Integer, nullable=False, default=0)
+    status_completed = Column(Integer, nullable=False, default=0)
+    status_other = Column(Integer, nullable=False, default=0)
+    priority_high = Column(Integer, nullable=False, default=0)
+    priority_medium = Column(Integer, nullable=False, default=0)
+    priority_low = Column(Integer, nullable=False, default=0)
+    alerts_total = Column(Integer, nullable=False, default=0)
+    alerts_critical = Column(Integer, nullable=False, default=0)
+    alerts_high = Column(Integer, nullable=False, default=0)
+    alerts_medium = Column(Integer, nullable=False, default=0)
+    alerts_low = Column(Integer, nullable=False, default=0)
+    # Last project progress reported that day; not derivable from raw rows,
+    # so backfills leave it alone.
+    progress = Column(Float, nullable=True)
+    progress_at = Column(DateTime, nullable=True)
+
+
+class AnalyticsRollupState(Base):
+    """Marks rollups as complete once a backfill has run."""
+
+    __tablename__ = "analytics_rollup_state"
+
+    name = Column(String, primary_key=True)
+    backfilled_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,531 @@
+"""Daily analytics rollups: incremental updates, backfill and consistency checks.
+
+Report and dashboard queries sum ``analytics_daily_rollups`` rows for their
+date range instead of filtering every task and alert.  Rows are kept current
+by folding task and alert events (see ``apply_event``) in the event projector.
+Writers sharing the database stage those events in the transaction of the
+row they change (``EventProjector.stage`` with ``task_event_payload`` or
+``alert_event_payload``), so counters never lag the raw tables;
+``backfill`` rebuilds the counters from the raw ``tasks`` and ``alerts`` tables
+and ``check_consistency`` reports where stored counters and a fresh
+recomputation disagree.
+
+Event payloads:
+
+* ``task.created`` / ``task.deleted``: ``user_id``, ``project_id``,
+  ``created_at``, ``status``, ``priority``, ``completed``.
+* ``task.updated``: the task after the change plus ``previous``, a mapping of
+  the fields that changed with their old values.
+* ``alert.created`` / ``alert.deleted``: ``user_id``, ``project_id``,
+  ``created_at``, ``severity``.
+* ``project.progress``: ``user_id``, ``project_id``, ``progress`` and an
+  optional ``at`` timestamp (defaults to the event time).
+
+Run: python -m backend.analytics.rollups backfill --since 2024-01-01
+     python -m backend.analytics.rollups check
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, DateTime, column, func, inspect, select, table
+from sqlalchemy.orm import Session
+
+from backend.analytics.models import AnalyticsDailyRollup, AnalyticsRollupState
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_STATE_NAME = "daily"
+STREAM_CHUNK_ROWS = 5000
+
+COUNTER_COLUMNS: Tuple[str, ...] = (
+    "tasks_total",
+    "tasks_completed",
+    "status_pending",
+    "status_in_progress",
+    "status_completed",
+    "status_other",
+    "priority_high",
+    "priority_medium",
+    "priority_low",
+    "alerts_total",
+    "alerts_critical",
+    "alerts_high",
+    "alerts_medium",
+    "alerts_low",
+)
+
+ROLLUP_EVENT_TYPES = frozenset(
+    {"task.created", "task.updated", "task.deleted", "alert.created", "alert.deleted", "project.progress"}
+)
+
+# (day, user_id, project_id)
+RollupKey = Tuple[date, str, str]
+Buckets = Dict[RollupKey, Dict[str, int]]
+
+# Raw task and alert tables written by the mobile backend, declared as
+# lightweight table clauses so this module does not import that app.
+TASKS = table(
+    "tasks",
+    column("user_id"),
+    column("project_id"),
+    column("title"),
+    column("priority"),
+    column("status"),
+    column("completed", Boolean),
+    column("due_date", DateTime),
+    column("created_at", DateTime),
+)
+ALERTS = table(
+    "alerts",
+    column("user_id"),
+    column("project_id"),
+    column("title"),
+    column("severity"),
+    column("created_at", DateTime),
+)
+
+_STATUSES = {"pending", "in_progress", "completed"}
+
+
+def _field(item: Any, name: str) -> Any:
+    if isinstance(item, Mapping):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _key(item: Any) -> RollupKey:
+    created_at = _to_datetime(_field(item, "created_at"))
+    if created_at is None:
+        raise ValueError("rollup items need a created_at timestamp")
+    return created_at.date(), str(_field(item, "user_id") or ""), str(_field(item, "project_id") or "")
+
+
+def task_counters(item: Any) -> Dict[str, int]:
+    """Counter increments for one task; priorities other than high/medium count as low."""
+
+    status = _field(item, "status") or ""
+    priority = _field(item, "priority")
+    return {
+        "tasks_total": 1,
+        "tasks_completed": 1 if _field(item, "completed") else 0,
+        f"status_{status if status in _STATUSES else 'other'}": 1,
+        f"priority_{priority if priority in ('high', 'medium') else 'low'}": 1,
+    }
+
+
+def alert_counters(item: Any) -> Dict[str, int]:
+    """Counter increments for one alert; unknown severities count as low."""
+
+    severity = _field(item, "severity")
+    return {"alerts_total": 1, f"alerts_{severity if severity in ('critical', 'high', 'medium') else 'low'}": 1}
+
+
+def _add(buckets: Buckets, key: RollupKey, counters: Mapping[str, int], sign: int = 1) -> None:
+    bucket = buckets.setdefault(key, {})
+    for name, value in counters.items():
+        if value:
+            bucket[name] = bucket.get(name, 0) + sign * value
+
+
+def compute_rollups(tasks: Iterable[Any], alerts: Iterable[Any]) -> Buckets:
+    """Aggregate raw task and alert rows (objects or mappings) into buckets."""
+
+    buckets: Buckets = {}
+    for task in tasks:
+        _add(buckets, _key(task), task_counters(task))
+    for alert in alerts:
+        _add(buckets, _key(alert), alert_counters(alert))
+    return buckets
+
+
+def event_deltas(event_type: str, payload: Mapping[str, Any]) -> Buckets:
+    """Counter changes implied by one task or alert event."""
+
+    deltas: Buckets = {}
+    if event_type == "task.created":
+        _add(deltas, _key(payload), task_counters(payload))
+    elif event_type == "task.deleted":
+        _add(deltas, _key(payload), task_counters(payload), sign=-1)
+    elif event_type == "task.updated":
+        before = {**payload, **(payload.get("previous") or {})}
+        _add(deltas, _key(before), task_counters(before), sign=-1)
+        _add(deltas, _key(payload), task_counters(payload))
+    elif event_type == "alert.created":
+        _add(deltas, _key(payload), alert_counters(payload))
+    elif event_type == "alert.deleted":
+        _add(deltas, _key(payload), alert_counters(payload), sign=-1)
+    return {key: counters for key, counters in deltas.items() if any(counters.values())}
+
+
+_TASK_EVENT_FIELDS = ("user_id", "project_id", "created_at", "status", "priority", "completed")
+_ALERT_EVENT_FIELDS = ("user_id", "project_id", "created_at", "severity")
+
+
+def _event_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def task_event_payload(task: Any, previous: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """``task.*`` payload for a task row; ``previous`` maps changed fields to their old values."""
+
+    payload = {name: _event_value(_field(task, name)) for name in _TASK_EVENT_FIELDS}
+    if previous:
+        payload["previous"] = {name: _event_value(value) for name, value in previous.items()}
+    return payload
+
+
+def alert_event_payload(alert: Any) -> Dict[str, Any]:
+    """``alert.*`` payload for an alert row."""
+
+    return {name: _event_value(_field(alert, name)) for name in _ALERT_EVENT_FIELDS}
+
+
+def _row(db: Session, key: RollupKey) -> AnalyticsDailyRollup:
+    row = db.get(AnalyticsDailyRollup, key)
+    if row is None:
+        day, user_id, project_id = key
+        row = AnalyticsDailyRollup(day=day, user_id=user_id, project_id=project_id)
+        for name in COUNTER_COLUMNS:
+            setattr(row, name, 0)
+        db.add(row)
+        db.flush([row])  # so a later get() in this transaction finds it
+    return row
+
+
+def apply_deltas(db: Session, deltas: Buckets) -> None:
+    """Add counter deltas to their rows, creating rows as needed (no commit)."""
+
+    for key, counters in deltas.items():
+        row = _row(db, key)
+        for name, value in counters.items():
+            setattr(row, name, (getattr(row, name) or 0) + value)
+
+
+def apply_event(
+    db: Session,
+    event_type: str,
+    payload: Mapping[str, Any],
+    ts: Optional[datetime] = None,
+) -> bool:
+    """Fold one event into the rollups; the caller commits.  Returns False if ignored."""
+
+    if event_type not in ROLLUP_EVENT_TYPES:
+        return False
+    if event_type == "project.progress":
+        at = _to_datetime(payload.get("at")) or ts or datetime.now(timezone.utc)
+        row = _row(db, (at.date(), str(payload.get("user_id") or ""), str(payload.get("project_id") or "")))
+        previous_at = row.progress_at
+        if previous_at is None or previous_at.replace(tzinfo=None) <= at.replace(tzinfo=None):
+            row.progress = float(payload["progress"])
+            row.progress_at = at.replace(tzinfo=None)
+        return True
+    apply_deltas(db, event_deltas(event_type, payload))
+    return True
+
+
+def _filters(
+    user_id: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    project_id: Optional[str],
+) -> List[Any]:
+    filters: List[Any] = []
+    if user_id is not None:
+        filters.append(AnalyticsDailyRollup.user_id == user_id)
+    if project_id is not None:
+        filters.append(AnalyticsDailyRollup.project_id == project_id)
+    if date_from is not None:
+        filters.append(AnalyticsDailyRollup.day >= date_from)
+    if date_to is not None:
+        filters.append(AnalyticsDailyRollup.day <= date_to)
+    return filters
+
+
+def sum_rollups(
+    db: Session,
+    user_id: Optional[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[str, int]:
+    """Counter totals over an inclusive day range, in one aggregate query.
+
+    ``None`` for ``user_id``, ``project_id`` or either day leaves it unfiltered.
+    """
+
+    totals = db.execute(
+        select(
+            *(func.coalesce(func.sum(getattr(AnalyticsDailyRollup, name)), 0) for name in COUNTER_COLUMNS)
+        ).where(*_filters(user_id, date_from, date_to, project_id))
+    ).one()
+    return {name: int(value) for name, value in zip(COUNTER_COLUMNS, totals)}
+
+
+def daily_rollups(
+    db: Session,
+    user_id: Optional[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[date, Dict[str, int]]:
+    """Counter totals per day; days without rows are absent."""
+
+    rows = db.execute(
+        select(
+            AnalyticsDailyRollup.day,
+            *(func.sum(getattr(AnalyticsDailyRollup, name)) for name in COUNTER_COLUMNS),
+        )
+        .where(*_filters(user_id, date_from, date_to, project_id))
+        .group_by(AnalyticsDailyRollup.day)
+    )
+    return {row[0]: {name: int(value or 0) for name, value in zip(COUNTER_COLUMNS, row[1:])} for row in rows}
+
+
+def progress_history(db: Session, user_id: str, project_id: str, limit: int = 90) -> List[Tuple[date, float]]:
+    """Most recent daily progress snapshots of a project, oldest first."""
+
+    rows = db.execute(
+        select(AnalyticsDailyRollup.day, AnalyticsDailyRollup.progress)
+        .where(*_filters(user_id, None, None, project_id), AnalyticsDailyRollup.progress.is_not(None))
+        .order_by(AnalyticsDailyRollup.day.desc())
+        .limit(limit)
+    ).all()
+    return [(day, progress) for day, progress in reversed(rows)]
+
+
+def _in_range(
+    key: RollupKey,
+    user_id: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    project_id: Optional[str],
+) -> bool:
+    day, key_user, key_project = key
+    return (
+        (user_id is None or key_user == user_id)
+        and (project_id is None or key_project == project_id)
+        and (date_from is None or day >= date_from)
+        and (date_to is None or day <= date_to)
+    )
+
+
+def sum_buckets(
+    buckets: Buckets,
+    user_id: Optional[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[str, int]:
+    """``sum_rollups`` over in-memory buckets from ``compute_rollups``."""
+
+    totals = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for key, counters in buckets.items():
+        if _in_range(key, user_id, date_from, date_to, project_id):
+            for name, value in counters.items():
+                totals[name] += value
+    return totals
+
+
+def daily_buckets(
+    buckets: Buckets,
+    user_id: Optional[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[date, Dict[str, int]]:
+    """``daily_rollups`` over in-memory buckets from ``compute_rollups``."""
+
+    days: Dict[date, Dict[str, int]] = {}
+    for key, counters in buckets.items():
+        if _in_range(key, user_id, date_from, date_to, project_id):
+            totals = days.setdefault(key[0], dict.fromkeys(COUNTER_COLUMNS, 0))
+            for name, value in counters.items():
+                totals[name] += value
+    return days
+
+
+def rollups_ready(db: Session) -> bool:
+    """True once a backfill has populated the rollup tables."""
+
+    try:
+        state = db.get(AnalyticsRollupState, ROLLUP_STATE_NAME)
+    except Exception as exc:
+        logger.debug("Analytics rollups unavailable: %s", exc)
+        db.rollback()
+        return False
+    return state is not None and state.backfilled_at is not None
+
+
+def _raw_rows(
+    db: Session,
+    source: Any,
+    columns: Sequence[str],
+    since: Optional[date],
+    until: Optional[date],
+) -> Iterable[Any]:
+    statement = select(*(source.c[name] for name in columns))
+    if since is not None:
+        statement = statement.where(source.c.created_at >= datetime.combine(since, datetime.min.time()))
+    if until is not None:
+        statement = statement.where(source.c.created_at < datetime.combine(until + timedelta(days=1), datetime.min.time()))
+    result = db.execute(statement.execution_options(stream_results=True, yield_per=STREAM_CHUNK_ROWS))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def raw_rollups(db: Session, since: Optional[date] = None, until: Optional[date] = None) -> Buckets:
+    """Recompute buckets from the raw ``tasks`` and ``alerts`` tables."""
+
+    inspector = inspect(db.get_bind())
+    tasks: Iterable[Any] = ()
+    alerts: Iterable[Any] = ()
+    if inspector.has_table("tasks"):
+        tasks = _raw_rows(db, TASKS, ("user_id", "project_id", "created_at", "status", "priority", "completed"), since, until)
+    if inspector.has_table("alerts"):
+        alerts = _raw_rows(db, ALERTS, ("user_id", "project_id", "created_at", "severity"), since, until)
+    return compute_rollups(tasks, alerts)
+
+
+@dataclass(frozen=True)
+class RollupMismatch:
+    """One counter whose stored value differs from the raw recomputation."""
+
+    day: date
+    user_id: str
+    project_id: str
+    column: str
+    stored: int
+    expected: int
+
+
+def _stored_rows(db: Session, since: Optional[date], until: Optional[date]) -> Dict[RollupKey, AnalyticsDailyRollup]:
+    rows = db.query(AnalyticsDailyRollup).filter(*_filters(None, since, until, None))
+    return {(row.day, row.user_id, row.project_id): row for row in rows}
+
+
+def _mismatches(stored: Dict[RollupKey, AnalyticsDailyRollup], expected: Buckets) -> List[RollupMismatch]:
+    mismatches: List[RollupMismatch] = []
+    for key in sorted(set(stored) | set(expected)):
+        row = stored.get(key)
+        counters = expected.get(key, {})
+        for name in COUNTER_COLUMNS:
+            have = (getattr(row, name) or 0) if row is not None else 0
+            want = counters.get(name, 0)
+            if have != want:
+                mismatches.append(RollupMismatch(*key, column=name, stored=have, expected=want))
+    return mismatches
+
+
+def check_consistency(
+    db: Session,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    expected: Optional[Buckets] = None,
+) -> List[RollupMismatch]:
+    """Compare stored counters with a recomputation from raw rows.
+
+    ``expected`` defaults to ``raw_rollups`` over the same day range.
+    """
+
+    if expected is None:
+        expected = raw_rollups(db, since, until)
+    return _mismatches(_stored_rows(db, since, until), expected)
+
+
+def backfill(
+    db: Session,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    expected: Optional[Buckets] = None,
+) -> int:
+    """Rewrite counters in the day range from raw rows and mark rollups ready.
+
+    Only rows that differ are touched, so re-running is cheap.  Progress
+    snapshots are kept; rows left with neither counters nor progress are
+    deleted.  Returns the number of rows inserted, updated or deleted.
+    """
+
+    if expected is None:
+        expected = raw_rollups(db, since, until)
+    stored = _stored_rows(db, since, until)
+    changed = 0
+    for key in set(stored) | set(expected):
+        row = stored.get(key)
+        counters = expected.get(key, {})
+        if row is not None and all((getattr(row, name) or 0) == counters.get(name, 0) for name in COUNTER_COLUMNS):
+            continue
+        changed += 1
+        if row is not None and not any(counters.values()) and row.progress is None:
+            db.delete(row)
+            continue
+        row = row or _row(db, key)
+        for name in COUNTER_COLUMNS:
+            setattr(row, name, counters.get(name, 0))
+    state = db.get(AnalyticsRollupState, ROLLUP_STATE_NAME)
+    if state is None:
+        state = AnalyticsRollupState(name=ROLLUP_STATE_NAME)
+        db.add(state)
+    state.backfilled_at = datetime.now(timezone.utc)
+    db.commit()
+    return changed
+
+
+def _parse_day(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill or verify the daily analytics rollups.")
+    parser.add_argument("command", choices=("backfill", "check"))
+    parser.add_argument("--since", type=_parse_day, default=None, help="first day (YYYY-MM-DD), default all")
+    parser.add_argument("--until", type=_parse_day, default=None, help="last day (YYYY-MM-DD), default all")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    from backend.backend.db import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            changed = backfill(db, args.since, args.until)
+            logger.info("Rollup backfill rewrote %d rows", changed)
+            return 0
+        mismatches = check_consistency(db, args.since, args.until)
+        for mismatch in mismatches[:50]:
+            logger.warning(
+                "%s %s/%s %s: stored %d, raw %d",
+                mismatch.day,
+                mismatch.user_id,
+                mismatch.project_id or "-",
+                mismatch.column,
+                mismatch.stored,
+                mismatch.expected,
+            )
+        logger.info("Rollup check found %d mismatched counters", len(mismatches))
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
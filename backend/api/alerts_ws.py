@@ -1,61 +1,51 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List
-import asyncio
+from typing import List, Optional
 
-router = APIRouter(prefix="/ws/alerts", tags=["alerts-ws"])
-
-active_connections: List[WebSocket] = []
-_broadcast_queue: asyncio.Queue | None = None
-_consumer_task: asyncio.Task | None = None
+from backend.redisx.fanout import BROADCAST_TOPIC, FanoutHub, topics_for, user_topic, workspace_topic
 
+# Not mounted by backend.main: the socket subscribes to whatever user_id and
+# workspace_id the client passes, so it must not be exposed until it
+# authenticates the connection and derives its topics from that identity.
+router = APIRouter(prefix="/ws/alerts", tags=["alerts-ws"])
 
-async def _ensure_consumer():
-    global _broadcast_queue, _consumer_task
-    if _broadcast_queue is None:
-        _broadcast_queue = asyncio.Queue()
-    if _consumer_task is None or _consumer_task.done():
-        _consumer_task = asyncio.create_task(_consumer())
+# Alerts raised on any replica reach sockets on every replica through Redis
+# pub/sub (see backend.redisx.fanout); each socket has its own send queue.
+hub = FanoutHub(namespace="alerts")
 
 
-async def _consumer():
-    while True:
-        message = await _broadcast_queue.get()
-        stale = []
-        for conn in active_connections:
-            try:
-                await conn.send_json(message)
-            except Exception:
-                stale.append(conn)
-        for stale_conn in stale:
-            if stale_conn in active_connections:
-                active_connections.remove(stale_conn)
+def alert_topics(message: dict) -> List[str]:
+    """Route to the alert's user and its workspace (project), else everyone."""
+    topics = []
+    if message.get("user_id"):
+        topics.append(user_topic(message["user_id"]))
+    workspace_id = message.get("workspace_id") or message.get("project_id")
+    if workspace_id:
+        topics.append(workspace_topic(workspace_id))
+    return topics or [BROADCAST_TOPIC]
 
 
 async def broadcast(message: dict):
-    await _ensure_consumer()
-    await _broadcast_queue.put(message)
+    await hub.publish(alert_topics(message), message)
 
 
 def enqueue_alert(message: dict):
     """Thread-safe enqueue from sync contexts (e.g., DB calls)."""
-    try:
-        loop = asyncio.get_running_loop()
-        loop.create_task(broadcast(message))
-    except RuntimeError:
-        try:
-            asyncio.run(broadcast(message))
-        except RuntimeError:
-            pass
+    hub.publish_threadsafe(alert_topics(message), message)
 
 
 @router.websocket("")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    workspace_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """Stream alerts for ``workspace_id``/``user_id`` plus broadcasts, or all alerts."""
     await websocket.accept()
-    active_connections.append(websocket)
-    await _ensure_consumer()
+    connection = await hub.connect(websocket, topics_for(user_id=user_id, workspace_id=workspace_id))
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        pass
+    finally:
+        hub.disconnect(connection)
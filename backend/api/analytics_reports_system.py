@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
 import os
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
 
+import asyncio
 import importlib
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import and_, func, inspect as sa_inspect, select
+
+from backend.analytics.rollups import (
+    ALERTS as _ALERTS,
+    TASKS as _TASKS,
+    compute_rollups,
+    daily_buckets,
+    daily_rollups,
+    progress_history,
+    rollups_ready,
+    sum_buckets,
+    sum_rollups,
+)
+from backend.ops.handlers.report_handler import (
+    REPORT_JOB_TYPE,
+    get_render_pool,
+    render_report,
+    report_dedupe_key,
+    store_report_artifact,
+)
+from backend.redisx.queue import PRIORITY_INTERACTIVE, RedisQueue
+from backend.services.streaming_pdf import PdfTextLayout, StreamingPdfWriter, encodable
 
 try:  # pragma: no cover - optional templating dependency
     from jinja2 import Environment, FileSystemLoader
@@ -91,6 +115,76 @@ else:  # pragma: no cover
     _openai_import_error = None
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# Bump when chart styling changes so cached images are redrawn.
+CHART_STYLE_VERSION = 1
+
+
+class ChartCache:
+    """PNG files keyed by a hash of the data each chart is drawn from.
+
+    Charts live on disk so every render process shares them; regenerating a
+    report over unchanged data then skips matplotlib entirely.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_files: Optional[int] = None) -> None:
+        self.directory = Path(directory or os.getenv("REPORT_CHART_CACHE_DIR", "./reports/.chart_cache"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_files = max_files if max_files is not None else _env_int("REPORT_CHART_CACHE_MAX_FILES", 2000)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+    @staticmethod
+    def key(name: str, data: Any) -> str:
+        blob = json.dumps([CHART_STYLE_VERSION, name, data], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            image = (self.directory / f"{key}.png").read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return base64.b64encode(image).decode("utf-8")
+
+    def put(self, key: str, encoded: str) -> None:
+        path = self.directory / f"{key}.png"
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temp_path.write_bytes(base64.b64decode(encoded))
+            os.replace(temp_path, path)
+        except OSError as exc:  # pragma: no cover - read-only or full disk
+            logger.debug("Failed to cache chart %s: %s", key, exc)
+            return
+        self._writes += 1
+        if self.max_files > 0 and self._writes % 64 == 0:
+            self.prune()
+
+    def get_or_render(self, name: str, data: Any, render: Callable[[], Optional[str]]) -> Optional[str]:
+        key = self.key(name, data)
+        encoded = self.get(key)
+        if encoded is None:
+            encoded = render()
+            if encoded is not None:
+                self.put(key, encoded)
+        return encoded
+
+    def prune(self) -> None:
+        """Delete the least recently written charts beyond ``max_files``."""
+
+        files = sorted(self.directory.glob("*.png"), key=lambda path: path.stat().st_mtime)
+        for path in files[: max(0, len(files) - self.max_files)]:
+            path.unlink(missing_ok=True)
+
+
 def _optional_db() -> Iterable[Any]:
     """Yield an optional database session when available."""
 
@@ -141,21 +235,65 @@ class ReportFormat(Enum):
     JSON = "json"
 
 
+class RowStream:
+    """Re-iterable rows produced on demand, e.g. from a server-side cursor.
+
+    Each iteration calls ``factory`` again, so every writer gets a fresh pass
+    over the data without the rows ever being held in memory together.
+    """
+
+    def __init__(self, factory: Callable[[], Iterator[Dict[str, Any]]]) -> None:
+        self._factory = factory
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._factory())
+
+
+# Rows fetched per round-trip when streaming report tables from the database.
+STREAM_CHUNK_ROWS = _env_int("REPORT_STREAM_CHUNK_ROWS", 1000)
+
+
+def stream_query_rows(
+    db: Any,
+    statement: Any,
+    mapper: Callable[[Any], Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+) -> RowStream:
+    """Rows of ``statement`` read through a server-side cursor in chunks."""
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        result = db.execute(
+            statement.execution_options(stream_results=True, yield_per=chunk_size or STREAM_CHUNK_ROWS)
+        )
+        try:
+            for row in result:
+                yield mapper(row)
+        finally:
+            result.close()
+
+    return RowStream(rows)
+
+
 @dataclass
 class TableData:
-    """Simple table abstraction that does not rely on pandas."""
+    """Simple table abstraction that does not rely on pandas.
+
+    ``rows`` may be a list or a ``RowStream``; writers only iterate it.
+    """
 
     headers: List[str]
-    rows: List[Dict[str, Any]]
+    rows: Iterable[Dict[str, Any]]
 
-    def to_html(self) -> str:
+    def iter_html(self) -> Iterator[str]:
         thead = "".join(f"<th>{header}</th>" for header in self.headers)
-        body_rows = []
+        yield f"<table class='data-table'><thead><tr>{thead}</tr></thead><tbody>"
         for row in self.rows:
             cells = "".join(f"<td>{row.get(header, '')}</td>" for header in self.headers)
-            body_rows.append(f"<tr>{cells}</tr>")
-        tbody = "".join(body_rows)
-        return f"<table class='data-table'><thead><tr>{thead}</tr></thead><tbody>{tbody}</tbody></table>"
+            yield f"<tr>{cells}</tr>"
+        yield "</tbody></table>"
+
+    def to_html(self) -> str:
+        return "".join(self.iter_html())
 
 
 @dataclass
@@ -327,6 +465,62 @@ _SAMPLE_ALERTS: List[AlertRecord] = [
 ]
 
 
+# The daily counters behind the dashboard and reports when no database is
+# configured; rebuilt from the sample rows once at import.
+_SAMPLE_ROLLUPS = compute_rollups(_SAMPLE_TASKS, _SAMPLE_ALERTS)
+
+
+def _task_row(task: Any) -> Dict[str, Any]:
+    return {
+        "Title": task.title,
+        "Priority": (task.priority or "").title(),
+        "Status": (task.status or "").replace("_", " ").title(),
+        "Due Date": task.due_date.strftime("%Y-%m-%d") if task.due_date else "N/A",
+    }
+
+
+def _alert_row(alert: Any) -> Dict[str, Any]:
+    return {
+        "Title": alert.title,
+        "Severity": (alert.severity or "").title(),
+        "Date": alert.created_at.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+@dataclass
+class _Activity:
+    """Task and alert figures for one report, from the database or samples.
+
+    ``counts`` uses the rollup counter names (``tasks_total``, ``alerts_high``...).
+    """
+
+    counts: Dict[str, int]
+    has_tasks: bool
+    task_rows: Iterable[Dict[str, Any]]
+    recent_alert_rows: List[Dict[str, Any]]
+
+
+# Above this many table rows PDFs skip WeasyPrint, which lays out the whole
+# HTML document in memory, and use the streaming text writer, unless the
+# report contains text (e.g. Arabic titles) that writer cannot encode.
+PDF_HTML_MAX_ROWS = _env_int("REPORT_PDF_HTML_MAX_ROWS", 2000)
+
+
+def _write_json_report(handle: TextIO, payload: Dict[str, Any], tables: Dict[str, TableData]) -> None:
+    """Write ``payload`` plus a ``tables`` object, streaming rows one at a time."""
+
+    head = json.dumps(payload, indent=2, default=str)
+    handle.write(head[:-2] + (",\n" if payload else "\n"))
+    handle.write('  "tables": {')
+    for table_index, (name, table) in enumerate(tables.items()):
+        handle.write("," if table_index else "")
+        handle.write(f"\n    {json.dumps(name)}: [")
+        for row_index, row in enumerate(table.rows):
+            handle.write(("," if row_index else "") + "\n      " + json.dumps(row, default=str))
+        handle.write("\n    ]")
+    handle.write("\n  }\n}" if tables else "}\n}")
+
+
 class AutomatedReportGenerator:
     """Composable report generator with Render-friendly fallbacks."""
 
@@ -335,8 +529,12 @@ class AutomatedReportGenerator:
         db: Any = None,
         openai_api_key: Optional[str] = None,
         template_dir: str = "./templates",
+        chart_cache: Optional[ChartCache] = None,
     ) -> None:
         self.db = db
+        self._activity_tables: Optional[bool] = None
+        self._rollups_ready: Optional[bool] = None
+        self.chart_cache = chart_cache or ChartCache()
         if openai_api_key and OpenAI is not None:
             self.openai_client = OpenAI(api_key=openai_api_key)
         else:
@@ -436,20 +634,14 @@ class AutomatedReportGenerator:
             for project in _SAMPLE_PROJECTS
             if project.user_id == user_id and (project_id is None or project.id == project_id)
         ]
-        tasks = [
-            task
-            for task in _SAMPLE_TASKS
-            if task.user_id == user_id
-            and date_from <= task.created_at <= date_to
-            and (project_id is None or task.project_id == project_id)
-        ]
-        alerts = [
-            alert
-            for alert in _SAMPLE_ALERTS
-            if alert.user_id == user_id
-            and date_from <= alert.created_at <= date_to
-            and (project_id is None or alert.project_id == project_id)
-        ]
+        # Reports cover whole days, the granularity of the analytics rollups.
+        day_from, day_to = date_from.date(), date_to.date()
+        counts = self._rollup_counts(user_id, project_id, day_from, day_to)
+        activity = (
+            self._activity_from_db(user_id, project_id, day_from, day_to, counts)
+            if self._activity_tables_available()
+            else self._activity_from_samples(user_id, project_id, day_from, day_to, counts)
+        )
 
         metrics: Dict[str, Any] = {}
         metrics["total_projects"] = len(projects)
@@ -458,8 +650,8 @@ class AutomatedReportGenerator:
             sum(project.progress for project in projects) / len(projects), 2
         ) if projects else 0.0
 
-        metrics["total_tasks"] = len(tasks)
-        metrics["completed_tasks"] = sum(1 for task in tasks if task.completed)
+        metrics["total_tasks"] = activity.counts["tasks_total"]
+        metrics["completed_tasks"] = activity.counts["tasks_completed"]
         metrics["pending_tasks"] = metrics["total_tasks"] - metrics["completed_tasks"]
         metrics["completion_rate"] = (
             round(metrics["completed_tasks"] / metrics["total_tasks"] * 100, 2)
@@ -467,10 +659,10 @@ class AutomatedReportGenerator:
             else 0.0
         )
 
-        metrics["total_alerts"] = len(alerts)
-        metrics["critical_alerts"] = sum(1 for alert in alerts if alert.severity == "critical")
-        metrics["high_alerts"] = sum(1 for alert in alerts if alert.severity == "high")
-        metrics["medium_alerts"] = sum(1 for alert in alerts if alert.severity == "medium")
+        metrics["total_alerts"] = activity.counts["alerts_total"]
+        metrics["critical_alerts"] = activity.counts["alerts_critical"]
+        metrics["high_alerts"] = activity.counts["alerts_high"]
+        metrics["medium_alerts"] = activity.counts["alerts_medium"]
 
         tables: Dict[str, TableData] = {}
         if projects:
@@ -486,31 +678,10 @@ class AutomatedReportGenerator:
                     for project in projects
                 ],
             )
-        if tasks:
-            tables["tasks"] = TableData(
-                headers=["Title", "Priority", "Status", "Due Date"],
-                rows=[
-                    {
-                        "Title": task.title,
-                        "Priority": task.priority.title(),
-                        "Status": task.status.replace("_", " ").title(),
-                        "Due Date": task.due_date.strftime("%Y-%m-%d") if task.due_date else "N/A",
-                    }
-                    for task in tasks
-                ],
-            )
-        if alerts:
-            tables["alerts"] = TableData(
-                headers=["Title", "Severity", "Date"],
-                rows=[
-                    {
-                        "Title": alert.title,
-                        "Severity": alert.severity.title(),
-                        "Date": alert.created_at.strftime("%Y-%m-%d %H:%M"),
-                    }
-                    for alert in sorted(alerts, key=lambda item: item.created_at, reverse=True)[:10]
-                ],
-            )
+        if activity.has_tasks:
+            tables["tasks"] = TableData(headers=["Title", "Priority", "Status", "Due Date"], rows=activity.task_rows)
+        if activity.recent_alert_rows:
+            tables["alerts"] = TableData(headers=["Title", "Severity", "Date"], rows=activity.recent_alert_rows)
 
         summary = self._generate_summary(metrics)
         period_str = f"{date_from.strftime('%Y-%m-%d')} to {date_to.strftime('%Y-%m-%d')}"
@@ -524,14 +695,181 @@ class AutomatedReportGenerator:
             tables=tables,
             summary=summary,
         )
+
+    def _activity_tables_available(self) -> bool:
+        if self.db is None:
+            return False
+        if self._activity_tables is None:
+            try:
+                inspector = sa_inspect(self.db.get_bind())
+                self._activity_tables = inspector.has_table("tasks") and inspector.has_table("alerts")
+            except Exception as exc:  # pragma: no cover - diagnostics only
+                logger.debug("Could not inspect report tables: %s", exc)
+                self._activity_tables = False
+        return self._activity_tables
+
+    def _rollup_counts(
+        self,
+        user_id: str,
+        project_id: Optional[str],
+        day_from: date,
+        day_to: date,
+    ) -> Optional[Dict[str, int]]:
+        """Counter totals from the daily rollups, or ``None`` until they are backfilled."""
+
+        if self.db is None:
+            return None
+        if self._rollups_ready is None:
+            self._rollups_ready = rollups_ready(self.db)
+        if not self._rollups_ready:
+            return None
+        return sum_rollups(self.db, user_id, day_from, day_to, project_id)
+
+    def _activity_from_db(
+        self,
+        user_id: str,
+        project_id: Optional[str],
+        day_from: date,
+        day_to: date,
+        counts: Optional[Dict[str, int]] = None,
+    ) -> _Activity:
+        """Stream the task table through a cursor; count with aggregates unless rolled up."""
+
+        start = datetime.combine(day_from, datetime.min.time())
+        end = datetime.combine(day_to + timedelta(days=1), datetime.min.time())
+        task_filter = and_(
+            _TASKS.c.user_id == user_id,
+            _TASKS.c.created_at >= start,
+            _TASKS.c.created_at < end,
+        )
+        alert_filter = and_(
+            _ALERTS.c.user_id == user_id,
+            _ALERTS.c.created_at >= start,
+            _ALERTS.c.created_at < end,
+        )
+        if project_id is not None:
+            task_filter = and_(task_filter, _TASKS.c.project_id == project_id)
+            alert_filter = and_(alert_filter, _ALERTS.c.project_id == project_id)
+
+        if counts is None:
+            task_totals = self.db.execute(
+                select(func.count(), func.count().filter(_TASKS.c.completed.is_(True))).where(task_filter)
+            ).one()
+            severities = ("critical", "high", "medium")
+            alert_totals = self.db.execute(
+                select(
+                    func.count(),
+                    *(func.count().filter(_ALERTS.c.severity == severity) for severity in severities),
+                ).where(alert_filter)
+            ).one()
+            counts = dict(zip(("tasks_total", "tasks_completed"), task_totals))
+            counts.update(zip(("alerts_total",) + tuple(f"alerts_{severity}" for severity in severities), alert_totals))
+            has_tasks = counts["tasks_total"] > 0
+        else:
+            # The task table follows the rows themselves, not the rolled-up counters.
+            has_tasks = self.db.execute(select(_TASKS.c.title).where(task_filter).limit(1)).first() is not None
+        task_rows = stream_query_rows(
+            self.db,
+            select(_TASKS.c.title, _TASKS.c.priority, _TASKS.c.status, _TASKS.c.due_date)
+            .where(task_filter)
+            .order_by(_TASKS.c.created_at),
+            _task_row,
+        )
+        recent_alerts = self.db.execute(
+            select(_ALERTS.c.title, _ALERTS.c.severity, _ALERTS.c.created_at)
+            .where(alert_filter)
+            .order_by(_ALERTS.c.created_at.desc())
+            .limit(10)
+        )
+        return _Activity(
+            counts=counts,
+            has_tasks=has_tasks,
+            task_rows=task_rows,
+            recent_alert_rows=[_alert_row(alert) for alert in recent_alerts],
+        )
+
+    def _activity_from_samples(
+        self,
+        user_id: str,
+        project_id: Optional[str],
+        day_from: date,
+        day_to: date,
+        counts: Optional[Dict[str, int]] = None,
+    ) -> _Activity:
+        tasks = [
+            task
+            for task in _SAMPLE_TASKS
+            if task.user_id == user_id
+            and day_from <= task.created_at.date() <= day_to
+            and (project_id is None or task.project_id == project_id)
+        ]
+        alerts = [
+            alert
+            for alert in _SAMPLE_ALERTS
+            if alert.user_id == user_id
+            and day_from <= alert.created_at.date() <= day_to
+            and (project_id is None or alert.project_id == project_id)
+        ]
+        return _Activity(
+            counts=counts or sum_buckets(_SAMPLE_ROLLUPS, user_id, day_from, day_to, project_id),
+            has_tasks=bool(tasks),
+            task_rows=[_task_row(task) for task in tasks],
+            recent_alert_rows=[
+                _alert_row(alert) for alert in sorted(alerts, key=lambda item: item.created_at, reverse=True)[:10]
+            ],
+        )
+
     async def _generate_charts(self, report_data: ReportData) -> Dict[str, str]:
         charts: Dict[str, str] = {}
         plt_local = _load_matplotlib()
         if plt_local is None:
             return charts
 
+        def add(name: str, data: Any, render: Callable[[], Optional[str]]) -> None:
+            try:
+                encoded = self.chart_cache.get_or_render(name, data, render)
+            except Exception as exc:  # pragma: no cover - diagnostics only
+                logger.debug("Failed to build %s chart: %s", name, exc)
+                return
+            if encoded is not None:
+                charts[name] = encoded
+
+        metrics = report_data.metrics
+        overview_values = [
+            metrics.get("total_projects", 0),
+            metrics.get("active_projects", 0),
+            metrics.get("total_tasks", 0),
+            metrics.get("completed_tasks", 0),
+            metrics.get("pending_tasks", 0),
+        ]
+        add("overview", overview_values, lambda: self._draw_overview(plt_local, overview_values))
+
+        if go is not None:
+            completion_rate = metrics.get("completion_rate", 0.0)
+            add("completion_gauge", completion_rate, lambda: self._draw_completion_gauge(completion_rate))
+
+        if "projects" in report_data.tables:
+            table = report_data.tables["projects"]
+            names = [row["Name"] for row in table.rows]
+            progress = [float(row["Progress"].rstrip("%")) for row in table.rows]
+            add("project_progress", [names, progress], lambda: self._draw_project_progress(plt_local, names, progress))
+
+        if metrics.get("total_alerts", 0) > 0:
+            severities = ["Critical", "High", "Medium"]
+            counts = [
+                metrics.get("critical_alerts", 0),
+                metrics.get("high_alerts", 0),
+                metrics.get("medium_alerts", 0),
+            ]
+            data = [(label, count) for label, count in zip(severities, counts) if count > 0]
+            if data:
+                add("alerts_pie", data, lambda: self._draw_alerts_pie(plt_local, data))
+
+        return charts
+
+    def _draw_overview(self, plt_local: Any, values: List[int]) -> str:
+        fig, ax = plt_local.subplots(figsize=(8, 5))
         try:
-            fig, ax = plt_local.subplots(figsize=(8, 5))
             labels = [
                 "Total\nProjects",
                 "Active\nProjects",
@@ -539,13 +877,6 @@ class AutomatedReportGenerator:
                 "Completed\nTasks",
                 "Pending\nTasks",
             ]
-            values = [
-                report_data.metrics.get("total_projects", 0),
-                report_data.metrics.get("active_projects", 0),
-                report_data.metrics.get("total_tasks", 0),
-                report_data.metrics.get("completed_tasks", 0),
-                report_data.metrics.get("pending_tasks", 0),
-            ]
             bars = ax.bar(labels, values, color=["#3B82F6", "#10B981", "#F59E0B", "#8B5CF6", "#EF4444"])
             for bar in bars:
                 height = bar.get_height()
@@ -562,75 +893,55 @@ class AutomatedReportGenerator:
             ax.spines["top"].set_visible(False)
             ax.spines["right"].set_visible(False)
             fig.tight_layout()
-            charts["overview"] = self._fig_to_base64(fig)
+            return self._fig_to_base64(fig)
+        finally:
             plt_local.close(fig)
-        except Exception as exc:  # pragma: no cover - diagnostics only
-            logger.debug("Failed to build overview chart: %s", exc)
 
-        if go is not None:
-            try:
-                completion_rate = report_data.metrics.get("completion_rate", 0.0)
-                fig = go.Figure(
-                    go.Indicator(
-                        mode="gauge+number",
-                        value=completion_rate,
-                        title={"text": "Task Completion"},
-                        gauge={
-                            "axis": {"range": [0, 100]},
-                            "bar": {"color": "#10B981"},
-                            "steps": [
-                                {"range": [0, 50], "color": "#fee2e2"},
-                                {"range": [50, 80], "color": "#fef3c7"},
-                                {"range": [80, 100], "color": "#d1fae5"},
-                            ],
-                        },
-                    )
-                )
-                charts["completion_gauge"] = self._plotly_to_base64(fig)
-            except Exception as exc:  # pragma: no cover - diagnostics only
-                logger.debug("Failed to build gauge chart: %s", exc)
-
-        if plt_local is not None and "projects" in report_data.tables:
-            try:
-                table = report_data.tables["projects"]
-                fig, ax = plt_local.subplots(figsize=(8, 5))
-                names = [row["Name"] for row in table.rows]
-                progress = [float(row["Progress"].rstrip("%")) for row in table.rows]
-                bars = ax.barh(names, progress, color="#3B82F6")
-                for bar, value in zip(bars, progress):
-                    ax.text(value + 2, bar.get_y() + bar.get_height() / 2, f"{value:.1f}%", va="center")
-                ax.set_xlabel("Progress (%)")
-                ax.set_title("Project Progress")
-                ax.set_xlim(0, 110)
-                ax.spines["top"].set_visible(False)
-                ax.spines["right"].set_visible(False)
-                fig.tight_layout()
-                charts["project_progress"] = self._fig_to_base64(fig)
-                plt_local.close(fig)
-            except Exception as exc:  # pragma: no cover - diagnostics only
-                logger.debug("Failed to build project progress chart: %s", exc)
+    def _draw_completion_gauge(self, completion_rate: float) -> str:
+        fig = go.Figure(
+            go.Indicator(
+                mode="gauge+number",
+                value=completion_rate,
+                title={"text": "Task Completion"},
+                gauge={
+                    "axis": {"range": [0, 100]},
+                    "bar": {"color": "#10B981"},
+                    "steps": [
+                        {"range": [0, 50], "color": "#fee2e2"},
+                        {"range": [50, 80], "color": "#fef3c7"},
+                        {"range": [80, 100], "color": "#d1fae5"},
+                    ],
+                },
+            )
+        )
+        return self._plotly_to_base64(fig)
 
-        if plt_local is not None and report_data.metrics.get("total_alerts", 0) > 0:
-            try:
-                fig, ax = plt_local.subplots(figsize=(6, 6))
-                severities = ["Critical", "High", "Medium"]
-                counts = [
-                    report_data.metrics.get("critical_alerts", 0),
-                    report_data.metrics.get("high_alerts", 0),
-                    report_data.metrics.get("medium_alerts", 0),
-                ]
-                data = [(label, count) for label, count in zip(severities, counts) if count > 0]
-                if data:
-                    labels, values = zip(*data)
-                    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90)
-                    ax.set_title("Alert Severity Distribution")
-                    fig.tight_layout()
-                    charts["alerts_pie"] = self._fig_to_base64(fig)
-                plt_local.close(fig)
-            except Exception as exc:  # pragma: no cover - diagnostics only
-                logger.debug("Failed to build alerts pie chart: %s", exc)
+    def _draw_project_progress(self, plt_local: Any, names: List[str], progress: List[float]) -> str:
+        fig, ax = plt_local.subplots(figsize=(8, 5))
+        try:
+            bars = ax.barh(names, progress, color="#3B82F6")
+            for bar, value in zip(bars, progress):
+                ax.text(value + 2, bar.get_y() + bar.get_height() / 2, f"{value:.1f}%", va="center")
+            ax.set_xlabel("Progress (%)")
+            ax.set_title("Project Progress")
+            ax.set_xlim(0, 110)
+            ax.spines["top"].set_visible(False)
+            ax.spines["right"].set_visible(False)
+            fig.tight_layout()
+            return self._fig_to_base64(fig)
+        finally:
+            plt_local.close(fig)
 
-        return charts
+    def _draw_alerts_pie(self, plt_local: Any, data: List[Any]) -> str:
+        fig, ax = plt_local.subplots(figsize=(6, 6))
+        try:
+            labels, values = zip(*data)
+            ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90)
+            ax.set_title("Alert Severity Distribution")
+            fig.tight_layout()
+            return self._fig_to_base64(fig)
+        finally:
+            plt_local.close(fig)
 
     async def _generate_ai_insights(self, report_data: ReportData) -> List[str]:
         if self.openai_client is None:
@@ -680,40 +991,102 @@ class AutomatedReportGenerator:
             ]
 
     async def _generate_pdf_report(self, report_data: ReportData, report_type: ReportType) -> str:
-        html_path = await self._generate_html_report(report_data, report_type)
-        if HTML is None:
-            return html_path
         pdf_filename = f"report_{report_type.value}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         pdf_path = self.output_dir / pdf_filename
-        try:
-            HTML(html_path).write_pdf(pdf_path)
-            return str(pdf_path)
-        except Exception as exc:  # pragma: no cover - diagnostics only
-            logger.warning("Failed to write PDF, returning HTML instead: %s", exc)
-            return html_path
+        if HTML is not None and (
+            self._table_row_estimate(report_data) <= PDF_HTML_MAX_ROWS or not self._text_pdf_encodable(report_data)
+        ):
+            html_path = await self._generate_html_report(report_data, report_type)
+            try:
+                HTML(html_path).write_pdf(pdf_path)
+                return str(pdf_path)
+            except Exception as exc:  # pragma: no cover - diagnostics only
+                logger.warning("WeasyPrint failed, writing a plain PDF instead: %s", exc)
+        with pdf_path.open("wb") as handle:
+            self._write_streaming_pdf(report_data, handle)
+        return str(pdf_path)
+
+    @staticmethod
+    def _table_row_estimate(report_data: ReportData) -> int:
+        metrics = report_data.metrics
+        return metrics.get("total_projects", 0) + metrics.get("total_tasks", 0) + min(metrics.get("total_alerts", 0), 10)
+
+    @staticmethod
+    def _text_pdf_encodable(report_data: ReportData) -> bool:
+        """True if the streaming text writer can render every string in the report.
+
+        Table rows are read in one extra pass, which keeps memory flat for a
+        ``RowStream``; the scan stops at the first string it cannot encode.
+        """
+
+        texts = [report_data.title, report_data.period, report_data.summary or ""]
+        texts.extend(report_data.insights)
+        texts.extend(report_data.recommendations)
+        texts.extend(f"{key}: {value}" for key, value in report_data.metrics.items())
+        if not all(encodable(text) for text in texts):
+            return False
+        for table in report_data.tables.values():
+            if not encodable("".join(table.headers)):
+                return False
+            for row in table.rows:
+                if not encodable("".join(str(row.get(header, "")) for header in table.headers)):
+                    return False
+        return True
+
+    def _write_streaming_pdf(self, report_data: ReportData, handle: Any) -> None:
+        """Lay the report out as text pages, streaming table rows page by page."""
+
+        layout = PdfTextLayout(StreamingPdfWriter(handle))
+        layout.heading(report_data.title, size=18)
+        layout.paragraph(f"Period: {report_data.period}")
+        layout.paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}")
+        layout.heading("Summary")
+        layout.paragraph(report_data.summary or "No summary available.")
+        layout.heading("Metrics")
+        for key, value in report_data.metrics.items():
+            layout.paragraph(f"{key.replace('_', ' ').title()}: {value}")
+        for title, items in (("Key Insights", report_data.insights), ("Recommendations", report_data.recommendations)):
+            if items:
+                layout.heading(title)
+                for item in items:
+                    layout.paragraph(f"- {item}")
+        for table_name, table in report_data.tables.items():
+            layout.heading(f"{table_name.title()} Details")
+            widths = layout.begin_table(table.headers)
+            for row in table.rows:
+                layout.row([str(row.get(header, "")) for header in table.headers], widths)
+            layout.end_table()
+        layout.close()
 
     async def _generate_html_report(self, report_data: ReportData, report_type: ReportType) -> str:
         template_name = f"{report_type.value}_template.html"
-        if self.jinja_env is None:
-            html_content = self._render_basic_html(report_data)
-        else:
-            try:
-                template = self.jinja_env.get_template(template_name)
-            except Exception:
-                template = self.jinja_env.get_template("default_template.html")
-            html_content = template.render(
-                report=report_data,
-                generated_date=datetime.now().strftime("%B %d, %Y at %H:%M"),
-                **report_data.metrics,
-            )
         html_filename = f"report_{report_type.value}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
         html_path = self.output_dir / html_filename
-        html_path.write_text(html_content, encoding="utf-8")
+        with html_path.open("w", encoding="utf-8") as handle:
+            if self.jinja_env is None:
+                handle.writelines(self._iter_basic_html(report_data))
+            else:
+                try:
+                    template = self.jinja_env.get_template(template_name)
+                except Exception:
+                    template = self.jinja_env.get_template("default_template.html")
+                stream = template.stream(
+                    report=report_data,
+                    generated_date=datetime.now().strftime("%B %d, %Y at %H:%M"),
+                    **report_data.metrics,
+                )
+                stream.enable_buffering(64)
+                stream.dump(handle)
         return str(html_path)
 
     def _render_basic_html(self, report_data: ReportData) -> str:
         """Render a lightweight HTML report when Jinja2 is unavailable."""
 
+        return "".join(self._iter_basic_html(report_data))
+
+    def _iter_basic_html(self, report_data: ReportData) -> Iterator[str]:
+        """Yield the lightweight HTML report in chunks, one table row at a time."""
+
         metrics_html = "".join(
             f"<li><strong>{key.replace('_', ' ').title()}:</strong> {value}</li>"
             for key, value in report_data.metrics.items()
@@ -723,20 +1096,7 @@ class AutomatedReportGenerator:
             f"<li>{recommendation}</li>" for recommendation in report_data.recommendations
         ) or "<li>No recommendations available.</li>"
 
-        tables_sections: List[str] = []
-        for table_name, table in report_data.tables.items():
-            header_html = "".join(f"<th>{column}</th>" for column in table.headers)
-            rows_html = "".join(
-                "<tr>" + "".join(f"<td>{row.get(column, '')}</td>" for column in table.headers) + "</tr>"
-                for row in table.rows
-            )
-            tables_sections.append(
-                f"<section><h3>{table_name.title()} Details</h3><table><thead><tr>{header_html}</tr></thead><tbody>{rows_html}</tbody></table></section>"
-            )
-
-        tables_html = "".join(tables_sections) or "<p>No tabular data available.</p>"
-
-        return f"""
+        yield f"""
 <!DOCTYPE html>
 <html lang=\"en\">
   <head>
@@ -768,7 +1128,16 @@ class AutomatedReportGenerator:
       <h2>Recommendations</h2>
       <ul>{recommendations_html}</ul>
     </section>
-    {tables_html}
+    """
+        if not report_data.tables:
+            yield "<p>No tabular data available.</p>"
+        for table_name, table in report_data.tables.items():
+            header_html = "".join(f"<th>{column}</th>" for column in table.headers)
+            yield f"<section><h3>{table_name.title()} Details</h3><table><thead><tr>{header_html}</tr></thead><tbody>"
+            for row in table.rows:
+                yield "<tr>" + "".join(f"<td>{row.get(column, '')}</td>" for column in table.headers) + "</tr>"
+            yield "</tbody></table></section>"
+        yield """
   </body>
 </html>
 """
@@ -777,9 +1146,10 @@ class AutomatedReportGenerator:
         if Workbook is None:
             logger.warning("openpyxl unavailable, returning JSON instead of Excel")
             return await self._generate_json_report(report_data, report_type)
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Summary"
+        # Write-only sheets serialise each appended row immediately, so memory
+        # does not grow with the table size.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Summary")
         sheet.append(["Metric", "Value"])
         for key, value in report_data.metrics.items():
             sheet.append([key, value])
@@ -815,12 +1185,9 @@ class AutomatedReportGenerator:
             "insights": report_data.insights,
             "recommendations": report_data.recommendations,
             "summary": report_data.summary,
-            "tables": {
-                name: table.rows
-                for name, table in report_data.tables.items()
-            },
         }
-        json_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        with json_path.open("w", encoding="utf-8") as handle:
+            _write_json_report(handle, payload, report_data.tables)
         return str(json_path)
 
     def _create_default_templates(self) -> None:
@@ -905,7 +1272,7 @@ class AutomatedReportGenerator:
         {% for table_name, table_data in report.tables.items() %}
         <div class=\"section\">
             <h2>{{ table_name|title }} Details</h2>
-            {{ table_data.to_html() | safe }}
+            {% for chunk in table_data.iter_html() %}{{ chunk | safe }}{% endfor %}
         </div>
         {% endfor %}
         <div class=\"footer\">
@@ -972,9 +1339,36 @@ class AutomatedReportGenerator:
 
 analytics_router = APIRouter(prefix="/analytics", tags=["Analytics"])
 reports_router = APIRouter(prefix="/reports", tags=["Reports"])
-router = APIRouter()
-router.include_router(analytics_router)
-router.include_router(reports_router)
+
+
+def _rollup_source(db: Any) -> Any:
+    """The session to sum rollups from, or ``None`` to use the sample rollups."""
+
+    return db if db is not None and rollups_ready(db) else None
+
+
+def _rollup_totals(
+    source: Any,
+    user_id: Optional[str],
+    day_from: Optional[date] = None,
+    day_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[str, int]:
+    if source is not None:
+        return sum_rollups(source, user_id, day_from, day_to, project_id)
+    return sum_buckets(_SAMPLE_ROLLUPS, user_id, day_from, day_to, project_id)
+
+
+def _rollup_days(
+    source: Any,
+    user_id: Optional[str],
+    day_from: Optional[date] = None,
+    day_to: Optional[date] = None,
+    project_id: Optional[str] = None,
+) -> Dict[date, Dict[str, int]]:
+    if source is not None:
+        return daily_rollups(source, user_id, day_from, day_to, project_id)
+    return daily_buckets(_SAMPLE_ROLLUPS, user_id, day_from, day_to, project_id)
 
 
 @analytics_router.get("/dashboard")
@@ -983,49 +1377,40 @@ async def get_dashboard_analytics(
     current_user: UserContext = Depends(get_current_user),
     db: Any = Depends(_optional_db),
 ) -> Dict[str, Any]:
-    del db  # database not required for stub implementation
     date_from = datetime.utcnow() - timedelta(days=days)
+    today = datetime.utcnow().date()
     projects = [
         project
         for project in _SAMPLE_PROJECTS
         if project.user_id == current_user.id
     ]
-    tasks = [
-        task
-        for task in _SAMPLE_TASKS
-        if task.user_id == current_user.id and task.created_at >= date_from
-    ]
-    alerts = [
-        alert
-        for alert in _SAMPLE_ALERTS
-        if alert.user_id == current_user.id and alert.created_at >= date_from
-    ]
+    source = _rollup_source(db)
+    totals = _rollup_totals(source, current_user.id, date_from.date(), today)
+    trend_from = max(date_from.date(), today - timedelta(days=6))
+    daily = _rollup_days(source, current_user.id, trend_from, today)
     total_projects = len(projects)
     active_projects = sum(1 for project in projects if project.status == "active")
     avg_progress = round(
         sum(project.progress for project in projects) / total_projects, 2
     ) if projects else 0.0
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task.completed)
+    total_tasks = totals["tasks_total"]
+    completed_tasks = totals["tasks_completed"]
     completion_rate = round(
         (completed_tasks / total_tasks) * 100, 2
     ) if total_tasks else 0.0
     completion_trend: List[Dict[str, Any]] = []
     for offset in range(7):
-        day = datetime.utcnow() - timedelta(days=6 - offset)
-        day_tasks = [task for task in tasks if task.created_at.date() == day.date()]
+        day = today - timedelta(days=6 - offset)
+        counters = daily.get(day, {})
         completion_trend.append(
             {
                 "date": day.strftime("%Y-%m-%d"),
-                "completed": sum(1 for task in day_tasks if task.completed),
-                "total": len(day_tasks),
+                "completed": counters.get("tasks_completed", 0),
+                "total": counters.get("tasks_total", 0),
             }
         )
     alert_breakdown = {
-        "critical": sum(1 for alert in alerts if alert.severity == "critical"),
-        "high": sum(1 for alert in alerts if alert.severity == "high"),
-        "medium": sum(1 for alert in alerts if alert.severity == "medium"),
-        "low": sum(1 for alert in alerts if alert.severity not in {"critical", "high", "medium"}),
+        severity: totals[f"alerts_{severity}"] for severity in ("critical", "high", "medium", "low")
     }
     status_breakdown: Dict[str, int] = {}
     for project in projects:
@@ -1039,7 +1424,7 @@ async def get_dashboard_analytics(
             "completed_tasks": completed_tasks,
             "pending_tasks": total_tasks - completed_tasks,
             "completion_rate": completion_rate,
-            "total_alerts": len(alerts),
+            "total_alerts": totals["alerts_total"],
         },
         "trends": {"completion_trend": completion_trend},
         "breakdowns": {
@@ -1060,7 +1445,6 @@ async def get_project_analytics(
     current_user: UserContext = Depends(get_current_user),
     db: Any = Depends(_optional_db),
 ) -> Dict[str, Any]:
-    del db
     project = next(
         (
             project
@@ -1073,13 +1457,16 @@ async def get_project_analytics(
         raise HTTPException(status_code=404, detail="Project not found")
     tasks = [task for task in _SAMPLE_TASKS if task.project_id == project_id]
     alerts = [alert for alert in _SAMPLE_ALERTS if alert.project_id == project_id]
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task.completed)
-    priority_breakdown = {
-        "high": sum(1 for task in tasks if task.priority == "high"),
-        "medium": sum(1 for task in tasks if task.priority == "medium"),
-        "low": sum(1 for task in tasks if task.priority not in {"high", "medium"}),
-    }
+    source = _rollup_source(db)
+    totals = _rollup_totals(source, None, project_id=project_id)
+    total_tasks = totals["tasks_total"]
+    completed_tasks = totals["tasks_completed"]
+    priority_breakdown = {priority: totals[f"priority_{priority}"] for priority in ("high", "medium", "low")}
+    status_breakdown = {status: totals[f"status_{status}"] for status in ("pending", "in_progress", "completed")}
+    if source is not None:
+        progress_points = progress_history(source, project.user_id, project_id)
+    else:
+        progress_points = [(datetime.utcnow().date(), project.progress)]
     recent_tasks = sorted(tasks, key=lambda item: item.created_at, reverse=True)[:5]
     recent_alerts = sorted(alerts, key=lambda item: item.created_at, reverse=True)[:5]
     return {
@@ -1095,9 +1482,12 @@ async def get_project_analytics(
             "completed_tasks": completed_tasks,
             "pending_tasks": total_tasks - completed_tasks,
             "completion_rate": round((completed_tasks / total_tasks) * 100, 2) if total_tasks else 0.0,
-            "total_alerts": len(alerts),
+            "total_alerts": totals["alerts_total"],
+        },
+        "breakdowns": {"task_priority": priority_breakdown, "task_status": status_breakdown},
+        "trends": {
+            "progress": [{"date": day.isoformat(), "progress": progress} for day, progress in progress_points],
         },
-        "breakdowns": {"task_priority": priority_breakdown},
         "recent_activity": {
             "tasks": [
                 {
@@ -1174,6 +1564,15 @@ async def get_performance_metrics(
     }
 
 
+async def _render_off_loop(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Render in the report pool so the event loop keeps serving requests."""
+
+    pool = get_render_pool()
+    if pool is None:
+        return await asyncio.to_thread(render_report, payload)
+    return await asyncio.get_running_loop().run_in_executor(pool, render_report, payload)
+
+
 @reports_router.post("/generate")
 async def generate_report(
     report_type: ReportType,
@@ -1186,25 +1585,130 @@ async def generate_report(
     db: Any = Depends(_optional_db),
 ) -> Dict[str, Any]:
     del background_tasks
-    generator = AutomatedReportGenerator(db=db, openai_api_key=os.getenv("OPENAI_API_KEY"))
-    report_path = await generator.generate_report(
-        report_type=report_type,
-        report_format=report_format,
-        user_id=current_user.id,
-        project_id=project_id,
-        date_from=date_from,
-        date_to=date_to,
-    )
-    filename = Path(report_path).name
+    if db is None:
+        raise HTTPException(status_code=503, detail="Report store unavailable")
+    payload = {
+        "user_id": current_user.id,
+        "report_type": report_type.value,
+        "report_format": report_format.value,
+        "project_id": project_id,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+    }
+    try:
+        job_id = RedisQueue().enqueue(
+            REPORT_JOB_TYPE,
+            payload,
+            {"user_id": current_user.id},
+            db=db,
+            priority=PRIORITY_INTERACTIVE,
+            dedupe_key=report_dedupe_key(payload),
+        )
+    except RuntimeError as exc:
+        # No queue (local debugging): render here, still off the event loop.
+        logger.info("Report queue unavailable, rendering in-process: %s", exc)
+        result = store_report_artifact(db, payload, await _render_off_loop(payload))
+        db.commit()
+        return {"message": "Report generated successfully", "job_id": None, "status": "success", **result}
     return {
-        "message": "Report generated successfully",
-        "report_id": filename,
-        "download_url": f"/api/reports/download/{filename}",
+        "message": "Report queued for rendering",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/reports/jobs/{job_id}",
+        "download_url": f"/api/reports/jobs/{job_id}/download",
         "format": report_format.value,
         "type": report_type.value,
     }
 
 
+def _report_job(db: Any, job_id: str, user_id: str) -> Any:
+    if db is None:
+        raise HTTPException(status_code=503, detail="Job store unavailable")
+    from backend.ops.models import BackgroundJob, BackgroundJobEvent
+
+    job = (
+        db.query(BackgroundJob)
+        .filter(BackgroundJob.job_id == job_id, BackgroundJob.job_type == REPORT_JOB_TYPE)
+        .one_or_none()
+    )
+    # The job's payload, and so its owner, is recorded with its "queued" event.
+    queued = (
+        db.query(BackgroundJobEvent)
+        .filter(BackgroundJobEvent.job_id == job_id, BackgroundJobEvent.event_type == "queued")
+        .order_by(BackgroundJobEvent.id)
+        .first()
+    )
+    owner = ((queued.data_json or {}).get("payload") or {}).get("user_id") if queued is not None else None
+    if job is None or owner is None or str(owner) != str(user_id):
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+def _artifact_response(db: Any, report_id: str, user_id: str) -> Response:
+    if db is None:
+        raise HTTPException(status_code=503, detail="Report store unavailable")
+    from backend.ops.models import ReportArtifact
+
+    artifact = db.query(ReportArtifact).filter(ReportArtifact.report_id == report_id).one_or_none()
+    if artifact is None or artifact.user_id != str(user_id):
+        raise HTTPException(status_code=404, detail="Report not found")
+    return Response(
+        content=artifact.content,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{artifact.filename}"'},
+    )
+
+
+@reports_router.get("/jobs/{job_id}")
+async def get_report_job(
+    job_id: str,
+    current_user: UserContext = Depends(get_current_user),
+    db: Any = Depends(_optional_db),
+) -> Dict[str, Any]:
+    job = _report_job(db, job_id, current_user.id)
+    result = job.result_json or {}
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "last_error": job.last_error,
+        "report_id": result.get("report_id"),
+        "download_url": f"/api/reports/jobs/{job_id}/download" if job.status == "success" else None,
+    }
+
+
+@reports_router.get("/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: str,
+    current_user: UserContext = Depends(get_current_user),
+    db: Any = Depends(_optional_db),
+) -> Response:
+    job = _report_job(db, job_id, current_user.id)
+    if job.status != "success":
+        raise HTTPException(status_code=409, detail=f"Report is not ready (status: {job.status})")
+    report_id = (job.result_json or {}).get("report_id")
+    if not report_id:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _artifact_response(db, report_id, current_user.id)
+
+
+@reports_router.get("/artifacts/{report_id}")
+async def download_report_artifact(
+    report_id: str,
+    current_user: UserContext = Depends(get_current_user),
+    db: Any = Depends(_optional_db),
+) -> Response:
+    return _artifact_response(db, report_id, current_user.id)
+
+
+# Included here, before the file routes below: include_router copies only the
+# routes registered so far.  Those routes serve ./reports by filename without
+# checking who owns a report, so they stay unmounted.
+router = APIRouter()
+router.include_router(analytics_router)
+router.include_router(reports_router)
+
+
 @reports_router.get("/download/{filename}")
 async def download_report(filename: str, current_user: UserContext = Depends(get_current_user)) -> FileResponse:
     del current_user
@@ -1243,3 +1747,4 @@ async def delete_report(filename: str, current_user: UserContext = Depends(get_c
         raise HTTPException(status_code=404, detail="Report not found")
     file_path.unlink()
     return {"message": "Report deleted successfully"}
+
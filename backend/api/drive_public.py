@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from backend.backend.db import get_db
 from backend.hydration.connectors.google_drive_public import GoogleDrivePublicConnector
 from backend.hydration.models import SourceType, WorkspaceSource
+from backend.ops.handlers.hydration_handler import hydration_dedupe_key, hydration_priority
 from backend.redisx.queue import RedisQueue
 
 router = APIRouter(prefix="/drive/public")
@@ -152,7 +153,14 @@ def ingest_drive_public_files(
             "dry_run": payload.dry_run,
         }
         headers = {"correlation_id": correlation_id, "workspace_id": payload.workspace_id}
-        job_id = queue.enqueue("hydration", job_payload, headers, db=db)
+        job_id = queue.enqueue(
+            "hydration",
+            job_payload,
+            headers,
+            db=db,
+            priority=hydration_priority(job_payload),
+            dedupe_key=hydration_dedupe_key(job_payload),
+        )
     except HTTPException:
         raise
     except Exception as exc:
@@ -2,14 +2,46 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+import json
+from typing import AsyncIterator, Optional
 
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query as SAQuery, Session
+
+from backend.api.pagination import (
+    NDJSON_MEDIA_TYPE,
+    NEXT_CURSOR_HEADER,
+    iter_keyset,
+    keyset_page,
+    ndjson_lines,
+)
 from backend.backend.db import get_db
 from backend.events.models import EventLog
+from backend.events.tail import EventTailHub, SubscriberDropped, get_tail_hub
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+TAIL_KEEPALIVE_SECONDS = 15.0
+
+# Events are paged on their own emission timestamp: ``ts`` is always set by
+# the emitter in one ISO-8601 UTC format, so it sorts correctly as text on
+# every backend, whereas ``created_at`` comes from a second-resolution server
+# default on SQLite and cannot be compared exactly.
+_KEY_COLUMNS = (EventLog.ts, EventLog.event_id)
+
 
 def _serialize_event(event: EventLog) -> dict:
     return {
@@ -25,26 +57,194 @@ def _serialize_event(event: EventLog) -> dict:
     }
 
 
+def _event_key(event: EventLog) -> tuple:
+    return event.ts, event.event_id
+
+
+def _ts_bound(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _filtered_events(
+    db: Session,
+    workspace_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    correlation_id: Optional[str] = None,
+    actor_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> SAQuery:
+    query = db.query(EventLog)
+    if workspace_id is not None:
+        query = query.filter(EventLog.workspace_id == workspace_id)
+    if event_type:
+        query = query.filter(EventLog.event_type == event_type)
+    if correlation_id:
+        query = query.filter(EventLog.correlation_id == correlation_id)
+    if actor_id is not None:
+        query = query.filter(EventLog.actor_id == actor_id)
+    if since is not None:
+        query = query.filter(EventLog.ts >= _ts_bound(since))
+    if until is not None:
+        query = query.filter(EventLog.ts < _ts_bound(until))
+    return query
+
+
+def _page_response(query: SAQuery, cursor: Optional[str], limit: int, response: Response) -> list[dict]:
+    events, next_cursor = keyset_page(query, _KEY_COLUMNS, _event_key, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [_serialize_event(event) for event in events]
+
+
 @router.get("/global")
 def list_global_events(
+    response: Response,
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    event_type: Optional[str] = Query(None),
+    correlation_id: Optional[str] = Query(None),
+    actor_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
     db: Session = Depends(get_db),
 ) -> list[dict]:
-    events = db.query(EventLog).order_by(EventLog.created_at.desc()).limit(limit).all()
-    return [_serialize_event(event) for event in events]
+    query = _filtered_events(
+        db,
+        event_type=event_type,
+        correlation_id=correlation_id,
+        actor_id=actor_id,
+        since=since,
+        until=until,
+    )
+    return _page_response(query, cursor, limit, response)
 
 
 @router.get("/workspace/{workspace_id}")
 def list_workspace_events(
     workspace_id: int,
+    response: Response,
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    event_type: Optional[str] = Query(None),
+    correlation_id: Optional[str] = Query(None),
+    actor_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
     db: Session = Depends(get_db),
 ) -> list[dict]:
-    events = (
-        db.query(EventLog)
-        .filter(EventLog.workspace_id == workspace_id)
-        .order_by(EventLog.created_at.desc())
-        .limit(limit)
-        .all()
+    query = _filtered_events(
+        db,
+        workspace_id=workspace_id,
+        event_type=event_type,
+        correlation_id=correlation_id,
+        actor_id=actor_id,
+        since=since,
+        until=until,
     )
-    return [_serialize_event(event) for event in events]
+    return _page_response(query, cursor, limit, response)
+
+
+@router.get("/export")
+def export_events(
+    workspace_id: Optional[int] = Query(None),
+    event_type: Optional[str] = Query(None),
+    correlation_id: Optional[str] = Query(None),
+    actor_id: Optional[int] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Stream every matching event, oldest first, as newline-delimited JSON."""
+
+    query = _filtered_events(
+        db,
+        workspace_id=workspace_id,
+        event_type=event_type,
+        correlation_id=correlation_id,
+        actor_id=actor_id,
+        since=since,
+        until=until,
+    )
+    pages = iter_keyset(query, _KEY_COLUMNS, _event_key)
+    return StreamingResponse(ndjson_lines(pages, _serialize_event), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _tail_message(entry_id: str, fields: dict) -> dict:
+    return {"id": entry_id, **fields}
+
+
+async def _sse_frames(request: Request, hub: EventTailHub, workspace_id: int, last_id: Optional[str]) -> AsyncIterator[str]:
+    subscription = await hub.subscribe(workspace_id, last_id)
+    try:
+        async for entry in subscription.entries(idle_timeout=TAIL_KEEPALIVE_SECONDS):
+            if await request.is_disconnected():
+                return
+            if entry is None:
+                yield ": keepalive\n\n"
+                continue
+            entry_id, fields = entry
+            data = json.dumps(_tail_message(entry_id, fields), ensure_ascii=False)
+            yield f"id: {entry_id}\nevent: {fields.get('event_type', 'message')}\ndata: {data}\n\n"
+    except SubscriberDropped:
+        # The client reconnects with Last-Event-ID and resumes from the gap.
+        yield "event: dropped\ndata: {}\n\n"
+    finally:
+        await subscription.close()
+
+
+@router.get("/workspace/{workspace_id}/stream")
+async def stream_workspace_events(
+    workspace_id: int,
+    request: Request,
+    last_id: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    hub: EventTailHub = Depends(get_tail_hub),
+) -> StreamingResponse:
+    """Server-sent events tail of the workspace stream, resumable by stream id."""
+
+    try:
+        hub.redis
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    return StreamingResponse(
+        _sse_frames(request, hub, workspace_id, last_event_id or last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/workspace/{workspace_id}/ws")
+async def tail_workspace_events(
+    websocket: WebSocket,
+    workspace_id: int,
+    last_id: Optional[str] = Query(None),
+    hub: EventTailHub = Depends(get_tail_hub),
+) -> None:
+    """WebSocket tail of the workspace stream; each message carries its stream id.
+
+    Idle connections receive ``{"type": "keepalive"}`` frames, which also
+    surfaces disconnected clients so their subscription is released.
+    """
+
+    await websocket.accept()
+    try:
+        subscription = await hub.subscribe(workspace_id, last_id)
+    except RuntimeError as exc:
+        await websocket.close(code=1011, reason=str(exc))
+        return
+    try:
+        async for entry in subscription.entries(idle_timeout=TAIL_KEEPALIVE_SECONDS):
+            if entry is None:
+                await websocket.send_json({"type": "keepalive"})
+                continue
+            entry_id, fields = entry
+            await websocket.send_json(_tail_message(entry_id, fields))
+    except SubscriberDropped:
+        await websocket.close(code=1013, reason="subscriber too slow; reconnect with last_id")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await subscription.close()
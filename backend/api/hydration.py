@@ -39,6 +39,7 @@ from backend.hydration.schemas import (
     WorkspaceSourceOut,
     WorkspaceSourceUpdate,
 )
+from backend.ops.handlers.hydration_handler import hydration_dedupe_key, hydration_priority
 from backend.redisx.queue import RedisQueue
 
 logger = logging.getLogger(__name__)
@@ -203,7 +204,14 @@ def run_now(
             "user_id": user_id,
         }
         try:
-            job_id = queue.enqueue("hydration", payload, headers, db=db)
+            job_id = queue.enqueue(
+                "hydration",
+                payload,
+                headers,
+                db=db,
+                priority=hydration_priority(payload),
+                dedupe_key=hydration_dedupe_key(payload),
+            )
         except RuntimeError as exc:
             logger.error(
                 "Redis queue unavailable for hydration run: %s",
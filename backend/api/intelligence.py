@@ -92,6 +92,26 @@ async def process_intelligent_alert(event: Dict[str, Any]) -> Dict[str, Any]:
     return {"alert_generated": True, "alert": alert.to_dict()}
 
 
+@router.post("/process-intelligent-alerts")
+async def process_intelligent_alerts(request: Dict[str, Any]) -> Dict[str, Any]:
+    _, _, alert_system, _ = _get_intelligence_stack()
+    events = request.get("events")
+    if not isinstance(events, list):
+        raise HTTPException(status_code=400, detail="'events' must be a list")
+    outcomes = await alert_system.process_events(events, return_exceptions=True)
+    alerts = [None if isinstance(outcome, Exception) else outcome for outcome in outcomes]
+    return {
+        "processed": len(events),
+        "alerts_generated": sum(1 for alert in alerts if alert is not None),
+        "alerts": [alert.to_dict() if alert is not None else None for alert in alerts],
+        "errors": [
+            {"index": index, "error": str(outcome)}
+            for index, outcome in enumerate(outcomes)
+            if isinstance(outcome, Exception)
+        ],
+    }
+
+
 @router.post("/simulate-intervention")
 async def simulate_intervention(payload: Dict[str, Any]) -> Dict[str, Any]:
     intervention = payload.get("intervention")
@@ -1,7 +1,139 @@
-from fastapi import APIRouter
+"""Live meeting minutes built from transcript segments as they are transcribed.
+
+Segments are posted per meeting (or attached by ``/speech/{project_id}`` with
+a ``meeting_id``) and folded into a ``StreamingSummarizer``.  Whenever a
+segment yields new decisions, actions or issues, the partial summary is
+published on the alerts WebSocket channel, routed to the meeting's user or
+project like any other alert.
+
+Sessions live in this process (an LRU of ``MEETING_SUMMARY_MAX_SESSIONS``), so
+the endpoints assume a single replica: behind several replicas one meeting's
+segments would be split across summarizers.  A live meeting pushed out of the
+LRU loses its summary; evictions are logged.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from backend.api import alerts_ws
+from backend.services.meeting_summarizer import StreamingSummarizer
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MEETING_SUMMARY_EVENT = "meeting.summary"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+MAX_SESSIONS = _env_int("MEETING_SUMMARY_MAX_SESSIONS", 256)
+
+
+@dataclass
+class MeetingSession:
+    meeting_id: str
+    project_id: Optional[str] = None
+    user_id: Optional[str] = None
+    summarizer: StreamingSummarizer = field(default_factory=StreamingSummarizer)
+    published_version: int = 0
+
+    def message(self, final: bool = False) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "type": MEETING_SUMMARY_EVENT,
+            "meeting_id": self.meeting_id,
+            "final": final,
+            "version": self.summarizer.version,
+            "sentences": self.summarizer.sentence_count,
+            **self.summarizer.snapshot(),
+        }
+        if self.project_id:
+            payload["project_id"] = self.project_id
+        if self.user_id:
+            payload["user_id"] = self.user_id
+        return payload
+
+
+_sessions: "OrderedDict[str, MeetingSession]" = OrderedDict()
+
+
+class SegmentIn(BaseModel):
+    text: str
+    project_id: Optional[str] = None
+    user_id: Optional[str] = None
+
+
+def _session(meeting_id: str, project_id: Optional[str] = None, user_id: Optional[str] = None) -> MeetingSession:
+    session = _sessions.get(meeting_id)
+    if session is None:
+        session = MeetingSession(meeting_id=meeting_id, project_id=project_id, user_id=user_id)
+        _sessions[meeting_id] = session
+        while len(_sessions) > max(1, MAX_SESSIONS):
+            evicted_id, evicted = _sessions.popitem(last=False)
+            logger.warning(
+                "Evicted meeting %s after %d sentences; MEETING_SUMMARY_MAX_SESSIONS=%d reached",
+                evicted_id,
+                evicted.summarizer.sentence_count,
+                MAX_SESSIONS,
+            )
+    else:
+        _sessions.move_to_end(meeting_id)
+        session.project_id = session.project_id or project_id
+        session.user_id = session.user_id or user_id
+    return session
+
+
+async def add_segment(
+    meeting_id: str, text: str, project_id: Optional[str] = None, user_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Feed one transcript segment; publishes a partial summary if it changed."""
+
+    session = _session(meeting_id, project_id, user_id)
+    session.summarizer.feed(text)
+    message = session.message()
+    if session.summarizer.version != session.published_version:
+        session.published_version = session.summarizer.version
+        await alerts_ws.broadcast(message)
+    return message
+
+
 @router.get("/meeting_summarizer-ping")
 async def ping():
     return {"service": "meeting_summarizer", "status": "ok"}
+
+
+@router.post("/meetings/{meeting_id}/segments")
+async def post_segment(meeting_id: str, segment: SegmentIn) -> Dict[str, Any]:
+    return await add_segment(meeting_id, segment.text, segment.project_id, segment.user_id)
+
+
+@router.get("/meetings/{meeting_id}/summary")
+async def get_summary(meeting_id: str) -> Dict[str, Any]:
+    session = _sessions.get(meeting_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return session.message()
+
+
+@router.post("/meetings/{meeting_id}/finish")
+async def finish_meeting(meeting_id: str) -> Dict[str, Any]:
+    session = _sessions.pop(meeting_id, None)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    session.summarizer.finish()
+    message = session.message(final=True)
+    await alerts_ws.broadcast(message)
+    return message
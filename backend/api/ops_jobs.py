@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query as SAQuery, Session
+
+from backend.api.pagination import (
+    NDJSON_MEDIA_TYPE,
+    NEXT_CURSOR_HEADER,
+    iter_keyset,
+    keyset_page,
+    ndjson_lines,
+)
 from backend.backend.db import get_db
 from backend.ops.models import BackgroundJob, BackgroundJobEvent
 
@@ -18,6 +27,12 @@ def _isoformat(value) -> Optional[str]:
 
 router = APIRouter(prefix="/ops/jobs", tags=["Ops Jobs"])
 
+# Jobs are paged on the autoincrement id, which follows creation order.
+# created_at cannot be the key: rows mirrored by the queue store microsecond
+# timestamps while ensure_job() rows take a second-resolution server default
+# on SQLite, so equal instants do not compare equal.
+_KEY_COLUMNS = (BackgroundJob.id,)
+
 
 def _serialize_job(job: BackgroundJob) -> dict:
     return {
@@ -47,6 +62,48 @@ def _serialize_event(event: BackgroundJobEvent) -> dict:
     }
 
 
+def _job_key(job: BackgroundJob) -> tuple:
+    return (job.id,)
+
+
+def _filtered_jobs(
+    db: Session,
+    status: Optional[str] = None,
+    workspace_id: Optional[int] = None,
+    job_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> SAQuery:
+    query = db.query(BackgroundJob)
+    if status:
+        query = query.filter(BackgroundJob.status == status)
+    if workspace_id is not None:
+        query = query.filter(BackgroundJob.workspace_id == workspace_id)
+    if job_type:
+        query = query.filter(BackgroundJob.job_type == job_type)
+    if since is not None:
+        query = query.filter(BackgroundJob.created_at >= since)
+    if until is not None:
+        query = query.filter(BackgroundJob.created_at < until)
+    return query
+
+
+@router.get("/export")
+def export_jobs(
+    status: Optional[str] = Query(default=None),
+    workspace_id: Optional[int] = Query(default=None),
+    job_type: Optional[str] = Query(default=None),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Stream every matching job, oldest first, as newline-delimited JSON."""
+
+    query = _filtered_jobs(db, status, workspace_id, job_type, since, until)
+    pages = iter_keyset(query, _KEY_COLUMNS, _job_key)
+    return StreamingResponse(ndjson_lines(pages, _serialize_job), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/{job_id}")
 def get_job(job_id: str, db: Session = Depends(get_db)) -> dict:
     job = db.query(BackgroundJob).filter(BackgroundJob.job_id == job_id).one_or_none()
@@ -57,17 +114,20 @@ def get_job(job_id: str, db: Session = Depends(get_db)) -> dict:
 
 @router.get("")
 def list_jobs(
+    response: Response,
     status: Optional[str] = Query(default=None),
     workspace_id: Optional[int] = Query(default=None),
+    job_type: Optional[str] = Query(default=None),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db),
 ) -> List[dict]:
-    query = db.query(BackgroundJob)
-    if status:
-        query = query.filter(BackgroundJob.status == status)
-    if workspace_id is not None:
-        query = query.filter(BackgroundJob.workspace_id == workspace_id)
-    jobs = query.order_by(BackgroundJob.created_at.desc()).limit(limit).all()
+    query = _filtered_jobs(db, status, workspace_id, job_type, since, until)
+    jobs, next_cursor = keyset_page(query, _KEY_COLUMNS, _job_key, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [_serialize_job(job) for job in jobs]
 
 
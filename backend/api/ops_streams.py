@@ -0,0 +1,44 @@
+"""API endpoints for Redis stream health and retention."""
+
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from backend.redisx.retention import StreamRetention
+
+router = APIRouter(prefix="/ops/streams", tags=["Ops Streams"])
+
+
+def get_stream_retention() -> StreamRetention:
+    return StreamRetention()
+
+
+def _connected(retention: StreamRetention) -> StreamRetention:
+    try:
+        retention.connect()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    return retention
+
+
+@router.get("")
+def list_stream_metrics(retention: StreamRetention = Depends(get_stream_retention)) -> List[dict]:
+    return _connected(retention).metrics()
+
+
+@router.get("/{stream:path}")
+def get_stream_metrics(
+    stream: str,
+    retention: StreamRetention = Depends(get_stream_retention),
+) -> dict:
+    metrics = _connected(retention).stream_metrics(stream)
+    if not metrics.get("exists"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stream not found")
+    return metrics
+
+
+@router.post("/trim")
+def trim_streams(retention: StreamRetention = Depends(get_stream_retention)) -> List[dict]:
+    return [result.to_dict() for result in _connected(retention).sweep()]
@@ -0,0 +1,92 @@
+"""Keyset pagination helpers shared by the listing APIs.
+
+Cursors are opaque to clients: the sort key of the last row on a page is
+JSON-encoded and base64url-wrapped.  The next page is the rows strictly
+after that key in sort order, which an index on the key columns serves
+without any OFFSET scan.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], arity: int) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != arity:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """Row-value comparison ``(c1, c2, ...) </> (v1, v2, ...)`` spelled portably."""
+
+    clauses = []
+    for index, column in enumerate(columns):
+        equal_prefix = [columns[i] == values[i] for i in range(index)]
+        compare = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, compare) if equal_prefix else compare)
+    return or_(*clauses)
+
+
+def keyset_page(
+    query: Query,
+    columns: Sequence[Any],
+    key: Callable[[Any], Sequence[Any]],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> tuple[list, Optional[str]]:
+    """Return one page of ``query`` ordered by ``columns`` plus the next cursor."""
+
+    after = decode_cursor(cursor, len(columns))
+    if after is not None:
+        query = query.filter(keyset_filter(columns, after, descending))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def iter_keyset(
+    query: Query,
+    columns: Sequence[Any],
+    key: Callable[[Any], Sequence[Any]],
+    page_size: int = 1000,
+    descending: bool = False,
+) -> Iterator[list]:
+    cursor: Optional[str] = None
+    while True:
+        rows, cursor = keyset_page(query, columns, key, cursor, page_size, descending)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+
+def ndjson_lines(pages: Iterable[list], serialize: Callable[[Any], dict]) -> Iterator[bytes]:
+    for rows in pages:
+        yield "".join(json.dumps(serialize(row), ensure_ascii=False) + "\n" for row in rows).encode()
@@ -249,46 +249,17 @@ async def get_link_evidence(link_id: str):
 
 @router.get("/reasoning/graph/{project_id}")
 async def get_project_graph(project_id: int, db: Session = Depends(get_db)):
-    """Get knowledge graph data for visualization."""
+    """Get knowledge graph data for visualization.
+
+    Only links touching documents processed for ``project_id`` are returned;
+    nodes and edges come straight from the engine's link store.
+    """
     engine = get_engine()
 
-    # Get all links for the project
     stats = engine.get_statistics()
-
-    # Build nodes and edges for visualization
-    nodes = []
-    edges = []
-    seen_entities = set()
-
-    for link in engine._links.values():
-        # Add source node
-        if link.source.id not in seen_entities:
-            nodes.append({
-                "id": link.source.id,
-                "label": link.source.text[:50],
-                "type": link.source.type.value,
-                "document_id": link.source.document_id,
-            })
-            seen_entities.add(link.source.id)
-
-        # Add target node
-        if link.target.id not in seen_entities:
-            nodes.append({
-                "id": link.target.id,
-                "label": link.target.text[:50],
-                "type": link.target.type.value,
-                "document_id": link.target.document_id,
-            })
-            seen_entities.add(link.target.id)
-
-        # Add edge
-        edges.append({
-            "id": str(link.id),
-            "source": link.source.id,
-            "target": link.target.id,
-            "link_type": link.link_type.value,
-            "confidence": link.confidence,
-        })
+    graph = engine.get_graph(project_id=str(project_id))
+    nodes = graph["nodes"]
+    edges = graph["edges"]
 
     return {
         "project_id": project_id,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -23,7 +24,7 @@ from backend.runtime.schemas import (
     GenerateResponse,
 )
 from backend.runtime.sandbox import SandboxExecutor
-from backend.runtime.function_registry import list_functions, APPROVED_FUNCTIONS
+from backend.runtime.function_registry import list_functions, evaluate_batch, APPROVED_FUNCTIONS
 from backend.runtime.schemas import ExecutionLog
 
 router = APIRouter()
@@ -263,7 +264,8 @@ async def execute_approved_function(
 
     try:
         func = APPROVED_FUNCTIONS[function_name]["function"]
-        result = func(**params)
+        # Registry functions are CPU bound (Monte Carlo runs up to max_runtime).
+        result = await asyncio.to_thread(func, **params)
         return {"status": "ok", "result": result}
     except TypeError as e:
         raise HTTPException(
@@ -275,3 +277,93 @@ async def execute_approved_function(
             status_code=500,
             detail=f"Execution error: {str(e)}",
         )
+
+
+class FunctionBatchRequest(BaseModel):
+    """Request body for batched function execution: one params dict per project."""
+    projects: List[dict]
+
+
+@router.post("/runtime/function/{function_name}/batch")
+def execute_approved_function_batch(
+    function_name: str,
+    request: FunctionBatchRequest,
+):
+    """Execute an approved function for many projects in one call.
+
+    Declared synchronously so the CPU-bound batch runs in the threadpool
+    instead of blocking the event loop.
+
+    Args:
+        function_name: Name of the approved function.
+        request: Parameters for each project.
+
+    Returns:
+        One result per project, in request order.
+    """
+    if function_name not in APPROVED_FUNCTIONS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Function '{function_name}' not found in registry",
+        )
+
+    try:
+        results = evaluate_batch(function_name, request.projects)
+        return {"status": "ok", "count": len(results), "results": results}
+    except (TypeError, KeyError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid parameters: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Execution error: {str(e)}",
+        )
+
+
+class ScheduleSimulationRequest(BaseModel):
+    """Request body for a schedule risk simulation."""
+    tasks: List[dict]
+    iterations: int = 1000
+    distribution: str = "triangular"
+    seed: Optional[int] = None
+    project_start: Optional[str] = None
+    percentiles: List[int] = [50, 80, 90]
+    weekmask: str = "1111111"
+
+
+@router.post("/runtime/schedule/simulate")
+def simulate_schedule_risk(request: ScheduleSimulationRequest):
+    """Run a Monte Carlo schedule risk analysis on the task dependency graph.
+
+    Declared synchronously so the CPU-bound simulation runs in the
+    threadpool instead of blocking the event loop.
+
+    Args:
+        request: Tasks with three-point estimates and simulation settings.
+
+    Returns:
+        Finish percentiles and per-task criticality indexes.
+    """
+    from backend.services.cpm_engine import WorkCalendar
+    from backend.services.schedule_risk import simulate_schedule
+
+    if not request.tasks:
+        raise HTTPException(status_code=400, detail="No tasks provided")
+    try:
+        result = simulate_schedule(
+            request.tasks,
+            iterations=request.iterations,
+            distribution=request.distribution,
+            percentiles=request.percentiles,
+            seed=request.seed,
+            project_start=request.project_start,
+            calendar=WorkCalendar(weekmask=request.weekmask),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid schedule: {str(e)}",
+        )
+    return {"status": "ok", "result": result.to_dict()}
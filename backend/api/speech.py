@@ -8,6 +8,8 @@ from typing import Any, Callable, Optional
 
 from fastapi import APIRouter, Body, File, HTTPException, UploadFile
 
+from backend.api.meeting_summarizer import add_segment as add_meeting_segment
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -155,9 +157,15 @@ def _generate_answer(project_id: str, transcript: str) -> str:
 
 @router.post("/speech/{project_id}")
 async def speech_to_text(
-    project_id: str, file: UploadFile | None = _upload_param(...)
+    project_id: str,
+    file: UploadFile | None = _upload_param(...),
+    meeting_id: Optional[str] = None,
 ) -> dict[str, str]:
-    """Transcribe uploaded audio and provide a stubbed answer for the project."""
+    """Transcribe uploaded audio and provide a stubbed answer for the project.
+
+    With ``meeting_id`` the transcript is also appended to that meeting's live
+    summary (see ``backend.api.meeting_summarizer``).
+    """
 
     if multipart is None or file is None:
         raise HTTPException(
@@ -167,4 +175,7 @@ async def speech_to_text(
 
     transcript = await _transcribe(file)
     answer = _generate_answer(project_id, transcript)
+    if meeting_id:
+        await add_meeting_segment(meeting_id, transcript, project_id=project_id)
+        return {"transcript": transcript, "answer": answer, "meeting_id": meeting_id}
     return {"transcript": transcript, "answer": answer}
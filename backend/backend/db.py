@@ -2,7 +2,7 @@ import logging
 import os
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 logger = logging.getLogger(__name__)
@@ -76,6 +76,7 @@ logger.info(
 def _import_models() -> None:
     """Import all SQLAlchemy models so metadata is populated."""
 
+    from backend.analytics import models as _analytics_models  # noqa: F401
     from backend.backend import models as _core_models  # noqa: F401
     from backend.backend.pdp import models as _pdp_models  # noqa: F401
     from backend.events import models as _event_models  # noqa: F401
@@ -111,6 +112,20 @@ def _apply_postgres_schema_hotfixes(connection) -> None:
         if "does not exist" not in str(exc).lower():
             logger.debug("init_db: pdp_audit_logs hotfix skipped: %s", exc)
 
+    # Add the generation cache columns to code_executions (see backend.runtime.generation_cache)
+    try:
+        connection.execute(text("ALTER TABLE code_executions ADD COLUMN IF NOT EXISTS cache_key VARCHAR(64)"))
+        connection.execute(
+            text("ALTER TABLE code_executions ADD COLUMN IF NOT EXISTS context_fingerprint VARCHAR(64)")
+        )
+        connection.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_code_executions_cache_key ON code_executions (cache_key)")
+        )
+        logger.info("init_db: Applied hotfix - code_executions has generation cache columns")
+    except Exception as exc:
+        if "does not exist" not in str(exc).lower():
+            logger.debug("init_db: code_executions hotfix skipped: %s", exc)
+
     # Add google_drive_public to hydration SourceType enum (Render/Postgres hotfix)
     try:
         connection.execute(
@@ -137,6 +152,43 @@ def _apply_postgres_schema_hotfixes(connection) -> None:
         logger.debug("init_db: sourcetype hotfix skipped: %s", exc)
 
 
+def _ensure_columns(bind, metadata=None) -> None:
+    """Add nullable columns declared on models that predate their table."""
+
+    # Like indexes, columns added to a model later are skipped by create_all()
+    # on existing tables.  Only nullable columns without server defaults are
+    # added, which is safe on every backend.
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    for table in (metadata or Base.metadata).sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable or column.server_default is not None:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            try:
+                with bind.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info("init_db: added column %s.%s", table.name, column.name)
+            except Exception as exc:
+                logger.warning("init_db: could not add column %s.%s: %s", table.name, column.name, exc)
+
+
+def _ensure_indexes(bind) -> None:
+    """Create indexes declared on models that predate their table."""
+
+    # create_all() skips existing tables entirely, so indexes added to a model
+    # later (e.g. the keyset pagination indexes) would never reach old databases.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except Exception as exc:
+                logger.warning("init_db: could not create index %s: %s", index.name, exc)
+
+
 def init_db() -> None:
     """Ensure all tables exist for the current metadata."""
 
@@ -145,6 +197,8 @@ def init_db() -> None:
     logger.info("init_db: %d tables registered in metadata: %s", len(table_names), table_names)
     Base.metadata.create_all(bind=engine)
     logger.info("init_db: create_all completed")
+    _ensure_columns(engine)
+    _ensure_indexes(engine)
 
     # Apply schema hotfixes for existing Postgres databases
     if DATABASE_URL.startswith("postgresql"):
@@ -4,15 +4,27 @@ Schedule file parser for Diriyah AI.
 This module provides a simple parser for Primavera P6 XER files and
 Microsoft Project XML/MPP files. It detects the file type based on
 extension, extracts a list of tasks and their dependencies, and then
-computes schedule metrics using the critical path algorithm defined
-in :mod:`schedule_metrics`. Unsupported formats return basic
+computes schedule metrics with the CPM engine in
+:mod:`backend.services.cpm_engine`. Unsupported formats return basic
 metadata with an informative message.
+
+XER files are read table by table with :mod:`backend.services.xer_reader`,
+and their TASKPRED relationships feed the CPM engine directly. MS Project
+XML is streamed with :mod:`backend.services.msp_xml_reader` in the same way.
 """
 
+import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+import xml.etree.ElementTree as ET
+
+from backend.services.cpm_engine import compute_cpm
+from backend.services.msp_xml_reader import MspFormatError, read_msp_xml
+from backend.services.msp_xml_reader import build_network as build_msp_network
+from backend.services.msp_xml_reader import schedule_tasks as schedule_msp_tasks
+from backend.services.xer_reader import XerFormatError, build_network, read_xer, schedule_tasks
 
-from .schedule_metrics import compute_critical_path
+logger = logging.getLogger(__name__)
 
 
 def parse_schedule_file(file_path: Path) -> Dict[str, Any]:
@@ -37,8 +49,7 @@ def parse_schedule_file(file_path: Path) -> Dict[str, Any]:
     }
 
     if suffix == 'xer':
-        tasks = _parse_xer(file_path)
-        metrics = compute_critical_path(tasks) if tasks else None
+        tasks, metrics = _parse_xer(file_path)
         result.update({
             "format": "XER",
             "tasks": tasks,
@@ -46,8 +57,7 @@ def parse_schedule_file(file_path: Path) -> Dict[str, Any]:
             "analysis": metrics,
         })
     elif suffix in {'xml', 'mpp'}:
-        tasks = _parse_mpp_xml(file_path)
-        metrics = compute_critical_path(tasks) if tasks else None
+        tasks, metrics = _parse_mpp_xml(file_path)
         result.update({
             "format": "XML",
             "tasks": tasks,
@@ -72,82 +82,52 @@ def parse_schedule_file(file_path: Path) -> Dict[str, Any]:
     return result
 
 
-def _parse_xer(file_path: Path) -> List[Dict[str, Any]]:
-    """Extract tasks from a Primavera P6 XER file.
+def _parse_xer(file_path: Path) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Extract tasks and CPM metrics from a Primavera P6 XER file.
 
-    This simplified parser treats any line with at least five tab‑separated
-    columns as a task record and maps the first five columns to ID,
-    WBS code, name, start and finish dates. Real XER files contain
-    multiple tables and require more sophisticated parsing.
+    Only the schedule tables (TASK, TASKPRED, CALENDAR, PROJWBS, PROJECT)
+    are materialised; resource and other tables are skipped while
+    streaming. Durations and lags are converted from hours to working days
+    with each activity's calendar.
 
     Args:
         file_path: Path to the XER file.
 
     Returns:
-        A list of task dictionaries.
+        A list of task dictionaries and the CPM analysis (``None`` when the
+        file has no tasks).
     """
-    tasks: List[Dict[str, Any]] = []
     try:
-        with file_path.open('r', errors='ignore') as f:
-            for line in f:
-                if not line.strip() or line.startswith('%'):
-                    continue
-                cols = line.rstrip('\n').split('\t')
-                if len(cols) >= 5:
-                    tasks.append({
-                        "id": cols[0].strip(),
-                        "wbs": cols[1].strip(),
-                        "name": cols[2].strip(),
-                        "start": cols[3].strip(),
-                        "finish": cols[4].strip(),
-                    })
-    except Exception:
-        pass
-    return tasks
-
-
-def _parse_mpp_xml(file_path: Path) -> List[Dict[str, Any]]:
-    """Extract tasks from an MS Project XML (or exported MPP) file.
-
-    Finds ``Task`` elements and reads UID, Name, Start, Finish and
-    PredecessorUID values. Returns a list of task dictionaries with
-    optional ``dependencies`` lists.
+        tables = read_xer(file_path)
+    except (OSError, XerFormatError, ValueError) as exc:
+        logger.warning("Could not parse XER file %s: %s", file_path.name, exc)
+        return [], None
+    if "TASK" not in tables or not len(tables["TASK"]):
+        return [], None
+    network = build_network(tables)
+    return schedule_tasks(tables, network), compute_cpm(network).to_dict()
+
+
+def _parse_mpp_xml(file_path: Path) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Extract tasks and CPM metrics from an MS Project XML (or exported MPP) file.
+
+    The document is streamed with ``iterparse`` (namespaced or not), so
+    large exports are never held in memory as a DOM. Predecessor link types
+    and lags are kept; summary tasks are left out of the network.
 
     Args:
         file_path: Path to the XML/MPP file.
 
     Returns:
-        A list of task dictionaries.
+        A list of task dictionaries and the CPM analysis (``None`` when the
+        file has no tasks).
     """
-    tasks: List[Dict[str, Any]] = []
     try:
-        import xml.etree.ElementTree as ET
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        for task_elem in root.iterfind('.//Task'):
-            try:
-                uid_elem = task_elem.find('UID')
-                name_elem = task_elem.find('Name')
-                start_elem = task_elem.find('Start')
-                finish_elem = task_elem.find('Finish')
-                uid = uid_elem.text.strip() if uid_elem is not None and uid_elem.text else ''
-                name = name_elem.text.strip() if name_elem is not None and name_elem.text else ''
-                start = start_elem.text.strip() if start_elem is not None and start_elem.text else ''
-                finish = finish_elem.text.strip() if finish_elem is not None and finish_elem.text else ''
-                dependencies: List[str] = []
-                for pred_link in task_elem.findall('PredecessorLink'):
-                    pred_uid_elem = pred_link.find('PredecessorUID')
-                    if pred_uid_elem is not None and pred_uid_elem.text:
-                        dependencies.append(pred_uid_elem.text.strip())
-                tasks.append({
-                    "id": uid,
-                    "name": name,
-                    "start": start,
-                    "finish": finish,
-                    "dependencies": dependencies,
-                })
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return tasks
\ No newline at end of file
+        project = read_msp_xml(file_path, sections=("Tasks",))
+    except (OSError, ET.ParseError, MspFormatError, ValueError) as exc:
+        logger.warning("Could not parse MS Project file %s: %s", file_path.name, exc)
+        return [], None
+    network = build_msp_network(project)
+    if not network.size:
+        return [], None
+    return schedule_msp_tasks(project, network), compute_cpm(network).to_dict()
@@ -43,6 +43,21 @@ class EventEnvelope:
             payload_json=json.dumps(payload or {}, ensure_ascii=False),
         )
 
+    @classmethod
+    def from_fields(cls, fields: Dict[str, Any]) -> "EventEnvelope":
+        """Rebuild an envelope from Redis stream fields (see ``to_fields``)."""
+
+        return cls(
+            event_id=str(fields.get("event_id", "")),
+            event_type=str(fields.get("event_type", "")),
+            ts=str(fields.get("ts", "")),
+            workspace_id=_optional_int(fields.get("workspace_id")),
+            actor_id=_optional_int(fields.get("actor_id")),
+            correlation_id=fields.get("correlation_id") or None,
+            source=str(fields.get("source") or "unknown"),
+            payload_json=str(fields.get("payload_json") or "{}"),
+        )
+
     def to_fields(self) -> Dict[str, str]:
         return {
             "event_id": self.event_id,
@@ -54,3 +69,12 @@ class EventEnvelope:
             "source": self.source,
             "payload_json": self.payload_json,
         }
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func
 
 from backend.backend.db import Base
 
 
 class EventLog(Base):
     __tablename__ = "event_log"
+    __table_args__ = (
+        # Keyset pagination and replay walk the log in (ts, event_id) order;
+        # the filtered listings need the same key behind each filter column.
+        Index("ix_event_log_ts_event_id", "ts", "event_id"),
+        Index("ix_event_log_workspace_ts", "workspace_id", "ts", "event_id"),
+        Index("ix_event_log_type_ts", "event_type", "ts", "event_id"),
+        Index("ix_event_log_correlation_ts", "correlation_id", "ts", "event_id"),
+        Index("ix_event_log_actor_ts", "actor_id", "ts", "event_id"),
+    )
 
     event_id = Column(String, primary_key=True)
     event_type = Column(String, nullable=False, index=True)
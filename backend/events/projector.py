@@ -4,13 +4,20 @@ from __future__ import annotations
 
 from datetime import datetime
 import json
-from typing import Optional
+import logging
+from typing import Any, Dict, Optional
 
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from backend.analytics.models import AnalyticsDailyRollup
+from backend.analytics.rollups import ROLLUP_EVENT_TYPES, apply_event as apply_rollup_event
 from backend.events.envelope import EventEnvelope
 from backend.events.models import EventLog, WorkspaceStateProjection
 
+logger = logging.getLogger(__name__)
+
 
 def _parse_ts(value: str) -> Optional[datetime]:
     if not value:
@@ -21,11 +28,48 @@ def _parse_ts(value: str) -> Optional[datetime]:
         return None
 
 
+def _payload(event: EventEnvelope) -> Dict[str, Any]:
+    if not event.payload_json:
+        return {}
+    try:
+        payload = json.loads(event.payload_json)
+    except json.JSONDecodeError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def apply_workspace_state(projection, event: EventEnvelope) -> None:
+    """Fold ``event`` into a workspace state row (ORM instance or plain record)."""
+
+    timestamp = _parse_ts(event.ts)
+    if event.event_type == "hydration.completed":
+        payload = _payload(event)
+        projection.last_hydration_at = timestamp or projection.last_hydration_at
+        projection.last_hydration_job_id = payload.get("job_id") or projection.last_hydration_job_id
+    elif event.event_type == "learning.dataset.exported":
+        projection.last_learning_export_at = timestamp or projection.last_learning_export_at
+    elif event.event_type == "regression.promoted":
+        projection.last_promotion_at = timestamp or projection.last_promotion_at
+
+
 class EventProjector:
     """Applies events to the database with idempotency."""
 
     @staticmethod
     def apply(event: EventEnvelope, db: Session) -> bool:
+        if not EventProjector.stage(event, db):
+            return False
+        db.commit()
+        return True
+
+    @staticmethod
+    def stage(event: EventEnvelope, db: Session) -> bool:
+        """Add ``event`` to the session without committing; False if already logged.
+
+        Writers that share the database call this before committing their
+        own change, so the row and its event land in one transaction.
+        """
+
         exists = db.query(EventLog).filter(EventLog.event_id == event.event_id).one_or_none()
         if exists is not None:
             return False
@@ -43,13 +87,6 @@ class EventProjector:
             )
         )
 
-        payload = {}
-        if event.payload_json:
-            try:
-                payload = json.loads(event.payload_json)
-            except json.JSONDecodeError:
-                payload = {}
-
         if event.workspace_id is not None:
             projection = (
                 db.query(WorkspaceStateProjection)
@@ -60,14 +97,31 @@ class EventProjector:
                 projection = WorkspaceStateProjection(workspace_id=event.workspace_id)
                 db.add(projection)
 
-            timestamp = _parse_ts(event.ts)
-            if event.event_type == "hydration.completed":
-                projection.last_hydration_at = timestamp or projection.last_hydration_at
-                projection.last_hydration_job_id = payload.get("job_id") or projection.last_hydration_job_id
-            elif event.event_type == "learning.dataset.exported":
-                projection.last_learning_export_at = timestamp or projection.last_learning_export_at
-            elif event.event_type == "regression.promoted":
-                projection.last_promotion_at = timestamp or projection.last_promotion_at
+            apply_workspace_state(projection, event)
 
-        db.commit()
+        if event.event_type in ROLLUP_EVENT_TYPES:
+            # Same transaction as the event_log row, so a replayed event
+            # cannot be counted twice.
+            try:
+                apply_rollup_event(db, event.event_type, _payload(event), ts=_parse_ts(event.ts))
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("Skipping malformed rollup event %s: %s", event.event_id, exc)
         return True
+
+
+def projection_tables_available(bind: Any) -> bool:
+    """True if ``bind``'s database has the event log and rollup tables ``stage`` writes.
+
+    Check before a unit of work starts, not inside it: inspecting the schema on
+    a connection with an open transaction can roll that transaction back.
+    """
+
+    try:
+        inspector = sa_inspect(bind)
+        return all(
+            inspector.has_table(name)
+            for name in (EventLog.__tablename__, WorkspaceStateProjection.__tablename__, AnalyticsDailyRollup.__tablename__)
+        )
+    except SQLAlchemyError as exc:
+        logger.debug("Event projection tables unavailable: %s", exc)
+        return False
@@ -0,0 +1,397 @@
+"""Replay stored events to rebuild projections from scratch.
+
+Events are read in order from ``event_log`` (keyset pages on the ``(ts,
+event_id)`` index, so no OFFSET scans) or from the stream archive written by
+the retention sweep, folded into in-memory projection rows, and flushed to
+the target table at checkpoints together with the replay offset.  Rebuilding
+into a shadow table and swapping it in keeps the live projection readable
+for the whole run.
+
+Run: python -m backend.events.replay --projection workspace_state --swap
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, MetaData, Table, and_, delete, insert, or_, select
+from sqlalchemy.engine import Engine
+
+from backend.backend.db import engine as default_engine
+from backend.events.emitter import GLOBAL_STREAM
+from backend.events.envelope import EventEnvelope
+from backend.events.models import EventLog, EventOffset, WorkspaceStateProjection
+from backend.events.projector import apply_workspace_state
+from backend.redisx.retention import StreamArchive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CHECKPOINT_EVERY = 50_000
+SHADOW_SUFFIX = "_shadow"
+_CURSOR_SEPARATOR = "|"
+
+
+@dataclass(frozen=True)
+class ProjectionSpec:
+    """How to rebuild one projection table from events."""
+
+    name: str
+    table: Table
+    key_column: str
+    key_for: Callable[[EventEnvelope], Any]
+    apply: Callable[[Any, EventEnvelope], None]
+
+    @property
+    def value_columns(self) -> List[str]:
+        return [
+            column.name
+            for column in self.table.columns
+            if column.name not in {self.key_column, "updated_at"}
+        ]
+
+
+PROJECTIONS: Dict[str, ProjectionSpec] = {
+    "workspace_state": ProjectionSpec(
+        name="workspace_state",
+        table=WorkspaceStateProjection.__table__,
+        key_column="workspace_id",
+        key_for=lambda event: event.workspace_id,
+        apply=apply_workspace_state,
+    ),
+}
+
+
+@dataclass
+class ReplayResult:
+    projection: str
+    source: str
+    target_table: str
+    events: int
+    applied: int
+    seconds: float
+    cursor: Optional[str]
+    resumed_from: Optional[str]
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds > 0 else float(self.events)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "projection": self.projection,
+            "source": self.source,
+            "target_table": self.target_table,
+            "events": self.events,
+            "applied": self.applied,
+            "seconds": round(self.seconds, 3),
+            "events_per_second": round(self.events_per_second, 1),
+            "cursor": self.cursor,
+            "resumed_from": self.resumed_from,
+        }
+
+
+class EventLogSource:
+    """Streams ``event_log`` rows in ``(ts, event_id)`` order."""
+
+    name = "event_log"
+
+    _columns = (
+        EventLog.event_id,
+        EventLog.event_type,
+        EventLog.ts,
+        EventLog.workspace_id,
+        EventLog.actor_id,
+        EventLog.correlation_id,
+        EventLog.source,
+        EventLog.payload_json,
+    )
+
+    def __init__(self, bind: Engine, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.bind = bind
+        self.batch_size = batch_size
+
+    def iter_batches(self, after: Optional[str]) -> Iterator[List[Tuple[str, EventEnvelope]]]:
+        # One short keyset query per page instead of a single long-lived
+        # cursor: SQLite would otherwise hold a read lock that blocks the
+        # checkpoint commits, and every page resumes cleanly from its cursor.
+        cursor = after
+        while True:
+            stmt = select(*self._columns).order_by(EventLog.ts, EventLog.event_id).limit(self.batch_size)
+            if cursor:
+                after_ts, _, after_id = cursor.partition(_CURSOR_SEPARATOR)
+                stmt = stmt.where(
+                    or_(
+                        EventLog.ts > after_ts,
+                        and_(EventLog.ts == after_ts, EventLog.event_id > after_id),
+                    )
+                )
+            with self.bind.connect() as connection:
+                rows = connection.execute(stmt).all()
+            if not rows:
+                return
+            yield [
+                (
+                    f"{row[2]}{_CURSOR_SEPARATOR}{row[0]}",
+                    EventEnvelope(
+                        event_id=row[0],
+                        event_type=row[1],
+                        ts=row[2],
+                        workspace_id=row[3],
+                        actor_id=row[4],
+                        correlation_id=row[5],
+                        source=row[6],
+                        payload_json=row[7],
+                    ),
+                )
+                for row in rows
+            ]
+            if len(rows) < self.batch_size:
+                return
+            last = rows[-1]
+            cursor = f"{last[2]}{_CURSOR_SEPARATOR}{last[0]}"
+
+
+class ArchiveSource:
+    """Streams events from the trimmed-stream archive in stream id order."""
+
+    name = "archive"
+
+    def __init__(
+        self,
+        archive: Optional[StreamArchive] = None,
+        stream: str = GLOBAL_STREAM,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.archive = archive or StreamArchive()
+        self.stream = stream
+        self.batch_size = batch_size
+
+    def iter_batches(self, after: Optional[str]) -> Iterator[List[Tuple[str, EventEnvelope]]]:
+        batch: List[Tuple[str, EventEnvelope]] = []
+        for entry_id, fields in self.archive.iter_entries(self.stream, after_id=after):
+            batch.append((entry_id, EventEnvelope.from_fields(fields)))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _shadow_table(spec: ProjectionSpec) -> Table:
+    # Copy columns only: index/constraint names must stay unique per schema.
+    return Table(
+        f"{spec.table.name}{SHADOW_SUFFIX}",
+        MetaData(),
+        *[
+            Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+            for column in spec.table.columns
+        ],
+    )
+
+
+class ProjectionReplayer:
+    """Rebuilds a projection table by folding a source of events in order."""
+
+    def __init__(
+        self,
+        projection: str = "workspace_state",
+        source: Optional[Any] = None,
+        bind: Optional[Engine] = None,
+        shadow: bool = True,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        if projection not in PROJECTIONS:
+            raise ValueError(f"Unknown projection {projection!r}; known: {sorted(PROJECTIONS)}")
+        self.spec = PROJECTIONS[projection]
+        self.bind = bind or default_engine
+        self.source = source or EventLogSource(self.bind)
+        self.shadow = shadow
+        self.checkpoint_every = checkpoint_every
+        self.target = _shadow_table(self.spec) if shadow else self.spec.table
+
+    @property
+    def _offset_key(self) -> Tuple[str, str]:
+        return f"replay:{self.source.name}", f"{self.spec.name}:{self.target.name}"
+
+    def _load_checkpoint(self, connection) -> Optional[str]:
+        stream_name, group = self._offset_key
+        return connection.execute(
+            select(EventOffset.last_id).where(
+                EventOffset.stream_name == stream_name,
+                EventOffset.consumer_group == group,
+            )
+        ).scalar_one_or_none()
+
+    def _save_checkpoint(self, connection, cursor: str) -> None:
+        stream_name, group = self._offset_key
+        offsets = EventOffset.__table__
+        updated = connection.execute(
+            offsets.update()
+            .where(offsets.c.stream_name == stream_name, offsets.c.consumer_group == group)
+            .values(last_id=cursor, updated_at=datetime.now(timezone.utc))
+        )
+        if updated.rowcount == 0:
+            connection.execute(
+                insert(offsets).values(
+                    stream_name=stream_name,
+                    consumer_group=group,
+                    last_id=cursor,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+
+    def _clear_checkpoint(self, connection) -> None:
+        stream_name, group = self._offset_key
+        offsets = EventOffset.__table__
+        connection.execute(
+            delete(offsets).where(offsets.c.stream_name == stream_name, offsets.c.consumer_group == group)
+        )
+
+    def _prepare_target(self, resume: bool) -> Tuple[Optional[str], Dict[Any, SimpleNamespace]]:
+        EventOffset.__table__.create(self.bind, checkfirst=True)
+        with self.bind.begin() as connection:
+            checkpoint = self._load_checkpoint(connection) if resume else None
+            if checkpoint is None:
+                self._clear_checkpoint(connection)
+                if self.shadow:
+                    self.target.drop(connection, checkfirst=True)
+                    self.target.create(connection)
+                else:
+                    connection.execute(delete(self.target))
+                return None, {}
+
+            key_column = self.spec.key_column
+            rows: Dict[Any, SimpleNamespace] = {}
+            for row in connection.execute(select(self.target)).mappings():
+                record = SimpleNamespace(**{name: row[name] for name in self.spec.value_columns})
+                rows[row[key_column]] = record
+            return checkpoint, rows
+
+    def _flush(
+        self,
+        rows: Dict[Any, SimpleNamespace],
+        dirty: set,
+        cursor: Optional[str],
+    ) -> None:
+        key_column = self.spec.key_column
+        now = datetime.now(timezone.utc)
+        keys = list(dirty)
+        with self.bind.begin() as connection:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                connection.execute(delete(self.target).where(self.target.c[key_column].in_(chunk)))
+                connection.execute(
+                    insert(self.target),
+                    [{key_column: key, "updated_at": now, **vars(rows[key])} for key in chunk],
+                )
+            if cursor is not None:
+                self._save_checkpoint(connection, cursor)
+        dirty.clear()
+
+    def run(self, resume: bool = True) -> ReplayResult:
+        started = time.perf_counter()
+        resumed_from, rows = self._prepare_target(resume)
+        spec = self.spec
+        value_columns = spec.value_columns
+        key_for = spec.key_for
+        apply = spec.apply
+
+        dirty: set = set()
+        cursor = resumed_from
+        events = applied = since_checkpoint = 0
+        for batch in self.source.iter_batches(resumed_from):
+            for cursor, event in batch:
+                key = key_for(event)
+                if key is None:
+                    continue
+                record = rows.get(key)
+                if record is None:
+                    record = SimpleNamespace(**dict.fromkeys(value_columns))
+                    rows[key] = record
+                apply(record, event)
+                dirty.add(key)
+                applied += 1
+            events += len(batch)
+            since_checkpoint += len(batch)
+            if since_checkpoint >= self.checkpoint_every:
+                self._flush(rows, dirty, cursor)
+                since_checkpoint = 0
+        self._flush(rows, dirty, cursor)
+
+        result = ReplayResult(
+            projection=spec.name,
+            source=self.source.name,
+            target_table=self.target.name,
+            events=events,
+            applied=applied,
+            seconds=time.perf_counter() - started,
+            cursor=cursor,
+            resumed_from=resumed_from,
+        )
+        logger.info("Projection replay finished: %s", result.to_dict())
+        return result
+
+    def swap(self) -> int:
+        """Replace the live projection with the rebuilt shadow table atomically."""
+
+        if not self.shadow:
+            raise RuntimeError("swap() is only valid for shadow rebuilds")
+        live = self.spec.table
+        columns = [column.name for column in live.columns]
+        with self.bind.begin() as connection:
+            connection.execute(delete(live))
+            copied = connection.execute(
+                insert(live).from_select(columns, select(*[self.target.c[name] for name in columns]))
+            ).rowcount
+            self._clear_checkpoint(connection)
+            self.target.drop(connection)
+        return copied
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild event projections by replaying history.")
+    parser.add_argument("--projection", default="workspace_state", choices=sorted(PROJECTIONS))
+    parser.add_argument("--source", default="event_log", choices=["event_log", "archive"])
+    parser.add_argument("--stream", default=GLOBAL_STREAM, help="Archived stream to replay (archive source).")
+    parser.add_argument("--in-place", action="store_true", help="Rebuild the live table instead of a shadow copy.")
+    parser.add_argument("--swap", action="store_true", help="Swap the shadow table in after the replay.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore any saved checkpoint.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    if args.source == "archive":
+        source = ArchiveSource(stream=args.stream, batch_size=args.batch_size)
+    else:
+        source = EventLogSource(default_engine, batch_size=args.batch_size)
+
+    replayer = ProjectionReplayer(
+        projection=args.projection,
+        source=source,
+        shadow=not args.in_place,
+        checkpoint_every=args.checkpoint_every,
+    )
+    result = replayer.run(resume=not args.fresh)
+    logger.info(
+        "Replayed %d events into %s at %.0f events/sec",
+        result.events,
+        result.target_table,
+        result.events_per_second,
+    )
+    if args.swap and not args.in_place:
+        copied = replayer.swap()
+        logger.info("Swapped %d rows into %s", copied, replayer.spec.table.name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Live fan-out of workspace event streams to WebSocket/SSE clients.
+
+Each process runs at most one ``XREAD BLOCK`` loop per workspace, no matter
+how many dashboards are watching it; entries are copied into a bounded queue
+per subscriber.  A subscriber that resumes from a ``last_id`` is first
+replayed the gap with ``XRANGE`` and then joins the live feed, with ids at or
+below what it has already been sent filtered out so the hand-over neither
+skips nor repeats entries.  Subscribers that fall a full queue behind are
+dropped and are expected to reconnect with their last id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from backend.events.emitter import WORKSPACE_STREAM_TEMPLATE
+from backend.redisx.retention import next_stream_id, parse_stream_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_MS = 5000
+DEFAULT_READ_COUNT = 100
+DEFAULT_QUEUE_SIZE = 1000
+CATCH_UP_PAGE_SIZE = 500
+
+StreamEntry = Tuple[str, Dict[str, Any]]
+
+
+class SubscriberDropped(Exception):
+    """Raised to a subscriber that fell too far behind the live stream."""
+
+
+class TailSubscription:
+    """One client's view of a workspace stream."""
+
+    def __init__(self, hub: "EventTailHub", workspace_id: int, last_id: Optional[str], maxsize: int) -> None:
+        self.hub = hub
+        self.workspace_id = workspace_id
+        self.last_id = last_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, entry: StreamEntry) -> None:
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped = True
+            logger.info("Dropping slow event tail subscriber for workspace %s", self.workspace_id)
+
+    def _is_new(self, entry_id: str) -> bool:
+        return self.last_id is None or parse_stream_id(entry_id) > parse_stream_id(self.last_id)
+
+    async def entries(self, idle_timeout: Optional[float] = None) -> AsyncIterator[Optional[StreamEntry]]:
+        """Yield entries in id order; yields ``None`` after ``idle_timeout`` seconds idle."""
+
+        if self.last_id is not None:
+            async for entry in self.hub.catch_up(self.workspace_id, self.last_id):
+                self.last_id = entry[0]
+                yield entry
+        while True:
+            if self.dropped and self.queue.empty():
+                raise SubscriberDropped(self.last_id or "")
+            try:
+                entry = await asyncio.wait_for(self.queue.get(), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if self._is_new(entry[0]):
+                self.last_id = entry[0]
+                yield entry
+
+    async def close(self) -> None:
+        await self.hub.unsubscribe(self)
+
+
+def _default_redis_factory() -> Optional[object]:
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    try:
+        import redis.asyncio as redis_async  # type: ignore
+
+        return redis_async.Redis.from_url(redis_url, decode_responses=True)
+    except Exception as exc:
+        logger.warning("Redis unavailable for event tail: %s", exc)
+        return None
+
+
+class EventTailHub:
+    """Per-process registry of workspace readers and their subscribers."""
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Optional[object]] = _default_redis_factory,
+        block_ms: int = DEFAULT_BLOCK_MS,
+        read_count: int = DEFAULT_READ_COUNT,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self._redis: Optional[object] = None
+        self.block_ms = block_ms
+        self.read_count = read_count
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[TailSubscription]] = {}
+        self._readers: Dict[int, asyncio.Task] = {}
+
+    @property
+    def redis(self) -> object:
+        if self._redis is None:
+            self._redis = self._redis_factory()
+        if self._redis is None:
+            raise RuntimeError("REDIS_URL is not configured for the event tail.")
+        return self._redis
+
+    def reader_count(self) -> int:
+        return sum(1 for task in self._readers.values() if not task.done())
+
+    def subscriber_count(self, workspace_id: int) -> int:
+        return len(self._subscribers.get(workspace_id, ()))
+
+    async def subscribe(self, workspace_id: int, last_id: Optional[str] = None) -> TailSubscription:
+        redis_client = self.redis
+        subscription = TailSubscription(self, workspace_id, last_id, self.queue_size)
+        self._subscribers.setdefault(workspace_id, set()).add(subscription)
+        reader = self._readers.get(workspace_id)
+        if reader is None or reader.done():
+            # Pin the reader's start before returning so nothing emitted after
+            # subscribe() can be missed by a subscriber without a last_id.
+            start_id = await self._stream_head(redis_client, workspace_id)
+            self._readers[workspace_id] = asyncio.create_task(self._read_loop(workspace_id, start_id))
+        return subscription
+
+    async def unsubscribe(self, subscription: TailSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.workspace_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.workspace_id, None)
+                reader = self._readers.pop(subscription.workspace_id, None)
+                if reader is not None and not reader.done():
+                    reader.cancel()
+
+    async def close(self) -> None:
+        for reader in list(self._readers.values()):
+            reader.cancel()
+        self._readers.clear()
+        self._subscribers.clear()
+
+    async def _stream_head(self, redis_client: object, workspace_id: int) -> str:
+        stream = WORKSPACE_STREAM_TEMPLATE.format(workspace_id=workspace_id)
+        latest = await redis_client.xrevrange(stream, max="+", min="-", count=1)
+        return latest[0][0] if latest else "0-0"
+
+    async def catch_up(self, workspace_id: int, last_id: str) -> AsyncIterator[StreamEntry]:
+        stream = WORKSPACE_STREAM_TEMPLATE.format(workspace_id=workspace_id)
+        start = next_stream_id(last_id)
+        while True:
+            page = await self.redis.xrange(stream, min=start, max="+", count=CATCH_UP_PAGE_SIZE)
+            for entry_id, fields in page:
+                yield entry_id, dict(fields)
+            if len(page) < CATCH_UP_PAGE_SIZE:
+                return
+            start = next_stream_id(page[-1][0])
+
+    def _fan_out(self, workspace_id: int, entries: List[StreamEntry]) -> None:
+        subscribers = self._subscribers.get(workspace_id)
+        if not subscribers:
+            return
+        for entry in entries:
+            for subscription in list(subscribers):
+                subscription.offer(entry)
+
+    async def _read_loop(self, workspace_id: int, start_id: str) -> None:
+        stream = WORKSPACE_STREAM_TEMPLATE.format(workspace_id=workspace_id)
+        last_id = start_id
+        while self._subscribers.get(workspace_id):
+            try:
+                response = await self.redis.xread(
+                    {stream: last_id},
+                    count=self.read_count,
+                    block=self.block_ms,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Event tail read failed for %s: %s", stream, exc)
+                await asyncio.sleep(1)
+                continue
+            for _stream, messages in response or []:
+                if not messages:
+                    continue
+                entries = [(entry_id, dict(fields)) for entry_id, fields in messages]
+                last_id = entries[-1][0]
+                self._fan_out(workspace_id, entries)
+
+
+_hub: Optional[EventTailHub] = None
+
+
+def get_tail_hub() -> EventTailHub:
+    global _hub
+    if _hub is None:
+        _hub = EventTailHub()
+    return _hub
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from backend.backend.db import SessionLocal, init_db
 from backend.events.envelope import EventEnvelope
 from backend.events.projector import EventProjector
+from backend.runtime.context_cache import invalidate_for_event
 
 logger = logging.getLogger(__name__)
 
@@ -25,26 +26,8 @@ def _consumer_name() -> str:
     return os.getenv("HOSTNAME") or f"event-projector-{socket.gethostname()}-{os.getpid()}"
 
 
-def _safe_int(value: Any) -> Optional[int]:
-    if value in (None, ""):
-        return None
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
-
-
 def _parse_event(fields: Dict[str, Any]) -> EventEnvelope:
-    return EventEnvelope(
-        event_id=str(fields.get("event_id", "")),
-        event_type=str(fields.get("event_type", "")),
-        ts=str(fields.get("ts", "")),
-        workspace_id=_safe_int(fields.get("workspace_id")),
-        actor_id=_safe_int(fields.get("actor_id")),
-        correlation_id=fields.get("correlation_id") or None,
-        source=str(fields.get("source") or "unknown"),
-        payload_json=str(fields.get("payload_json") or "{}"),
-    )
+    return EventEnvelope.from_fields(fields)
 
 
 def _decode_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
@@ -134,6 +117,7 @@ def _read_new(redis_client: object, consumer: str) -> List[Tuple[str, Dict[str,
 def _process_entry(entry_id: str, fields: Dict[str, Any], db: Session, redis_client: object) -> None:
     event = _parse_event(fields)
     EventProjector.apply(event, db)
+    invalidate_for_event(event)
     redis_client.xack(STREAM_NAME, CONSUMER_GROUP, entry_id)
 
 
@@ -16,14 +16,44 @@ from backend.backend.db import SessionLocal, init_db
 from backend.events.emitter import emit_global
 from backend.events.envelope import EventEnvelope
 from backend.ops.handlers.hydration_handler import handle_hydration_job
+from backend.ops.handlers.report_handler import REPORT_JOB_TYPE, handle_report_job
 from backend.ops.models import BackgroundJob, BackgroundJobEvent
-from backend.redisx.queue import CONSUMER_GROUP, STREAM_NAME, RedisQueue, QueueEntry
+from backend.redisx.queue import (
+    CONSUMER_GROUP,
+    QueueEntry,
+    RedisQueue,
+    WeightedLaneSelector,
+    lane_stream,
+)
+from backend.runtime.context_cache import invalidate_hydrated_context
 
 logger = logging.getLogger(__name__)
 
 MAX_ATTEMPTS = 5
 BACKOFF_SECONDS = [5, 15, 60, 180, 600]
 
+JobHandler = Callable[[BackgroundJob, Dict[str, Any], Dict[str, Any], Session], Dict[str, Any]]
+
+# Handlers for job types other than hydration, whose handler is injected
+# separately so existing callers and tests keep working.
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    REPORT_JOB_TYPE: handle_report_job,
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# Upper bound on jobs one workspace may have running across all workers;
+# 0 disables the cap.
+WORKSPACE_MAX_INFLIGHT = _env_int("WORKSPACE_MAX_INFLIGHT", 2)
+# How long a worker idles after a read where every entry was deferred.
+DEFERRED_SLEEP_SECONDS = 0.5
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -71,25 +101,42 @@ def _record_event(
     )
 
 
-def _emit_hydration_event(
-    event_type: str,
+def _emit_job_event(
+    job_type: str,
+    phase: str,
     workspace_id: Optional[int],
     job_id: str,
     payload: Dict[str, Any],
     headers: Dict[str, Any],
 ) -> None:
+    """Emit ``<job_type>.<phase>``, e.g. ``hydration.completed``."""
+
+    event_type = f"{job_type}.{phase}"
     event = EventEnvelope.build(
         event_type=event_type,
         payload={"job_id": job_id, **payload},
         workspace_id=workspace_id,
         actor_id=None,
         correlation_id=headers.get("correlation_id"),
-        source="hydration",
+        source=job_type,
     )
     try:
         emit_global(event)
     except Exception as exc:
-        logger.warning("Failed to emit hydration event %s: %s", event_type, exc)
+        logger.warning("Failed to emit %s event %s: %s", job_type, event_type, exc)
+
+
+def _resolve_handler(
+    job_type: str,
+    hydration_handler: JobHandler,
+    handlers: Optional[Dict[str, JobHandler]],
+) -> JobHandler:
+    if job_type == "hydration":
+        return hydration_handler
+    handler = (handlers if handlers is not None else JOB_HANDLERS).get(job_type)
+    if handler is None:
+        raise ValueError(f"Unsupported job type {job_type}")
+    return handler
 
 
 def _get_job(db: Session, job_id: str) -> Optional[BackgroundJob]:
@@ -127,19 +174,61 @@ def _handle_entry(
     entry: QueueEntry,
     queue: RedisQueue,
     db: Session,
-    hydration_handler: Callable[[BackgroundJob, Dict[str, Any], Dict[str, Any], Session], Dict[str, Any]],
+    hydration_handler: JobHandler,
     sleep_fn: Callable[[float], None],
-) -> None:
+    max_inflight: Optional[int] = None,
+    handlers: Optional[Dict[str, JobHandler]] = None,
+) -> bool:
+    """Process one entry; returns False when it was deferred for fairness."""
+
     fields = dict(entry.fields)
     job_id = fields.get("job_id")
     job_type = fields.get("job_type")
     payload = _decode_json(fields.get("payload_json"))
     headers = _decode_json(fields.get("headers_json"))
+    stream = entry.stream
 
     if not job_id or not job_type:
         logger.warning("Invalid queue entry %s missing job_id/job_type", entry.entry_id)
-        queue.ack(STREAM_NAME, CONSUMER_GROUP, entry.entry_id)
-        return
+        queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
+        return True
+
+    workspace_id = _safe_int(fields.get("workspace_id")) or _safe_int(payload.get("workspace_id"))
+    limit = WORKSPACE_MAX_INFLIGHT if max_inflight is None else max_inflight
+    if not queue.acquire_workspace_slot(workspace_id, limit):
+        # Send it to the back of its own lane so other workspaces get a turn.
+        queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
+        queue.requeue(fields, stream=stream)
+        return False
+    try:
+        retry_in = _process_entry(
+            entry, fields, job_id, job_type, payload, headers, queue, db, hydration_handler, handlers
+        )
+    finally:
+        queue.release_workspace_slot(workspace_id, limit)
+    if retry_in is not None:
+        # Back off after releasing the slot so the workspace's other jobs
+        # are not held up by this one's retry.
+        sleep_fn(retry_in)
+        queue.requeue(fields, stream=stream)
+    return True
+
+
+def _process_entry(
+    entry: QueueEntry,
+    fields: Dict[str, Any],
+    job_id: str,
+    job_type: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, Any],
+    queue: RedisQueue,
+    db: Session,
+    hydration_handler: JobHandler,
+    handlers: Optional[Dict[str, JobHandler]] = None,
+) -> Optional[float]:
+    """Run one job; returns the backoff in seconds when it must be retried."""
+
+    stream = entry.stream
 
     job = _get_job(db, job_id)
     if job is None:
@@ -149,7 +238,7 @@ def _handle_entry(
             workspace_id=_safe_int(payload.get("workspace_id")),
             status="queued",
             attempts=0,
-            redis_stream=STREAM_NAME,
+            redis_stream=stream,
             created_at=_utc_now(),
             updated_at=_utc_now(),
         )
@@ -161,14 +250,19 @@ def _handle_entry(
 
     if job.status in {"success", "dlq"}:
         db.commit()
-        queue.ack(STREAM_NAME, CONSUMER_GROUP, entry.entry_id)
-        return
+        queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
+        return None
+
+    # A duplicate request arriving from now on describes work this run will
+    # not see, so it must queue a fresh job.
+    queue.release_dedupe_key(fields.pop("dedupe_key", None), job_id)
 
     _mark_running(job)
     job.redis_entry_id = entry.entry_id
     _record_event(db, job_id, "started", "Job processing started")
-    _emit_hydration_event(
-        "hydration.started",
+    _emit_job_event(
+        job_type,
+        "started",
         job.workspace_id,
         job_id,
         {"job_type": job_type, "attempt": job.attempts + 1},
@@ -177,28 +271,31 @@ def _handle_entry(
     db.commit()
 
     try:
-        if job_type != "hydration":
-            raise ValueError(f"Unsupported job type {job_type}")
-
-        result = hydration_handler(job, payload, headers, db)
+        handler = _resolve_handler(job_type, hydration_handler, handlers)
+        result = handler(job, payload, headers, db)
         _mark_success(job, result)
         _record_event(db, job_id, "completed", "Job completed", data=result)
-        _emit_hydration_event(
-            "hydration.completed",
+        _emit_job_event(
+            job_type,
+            "completed",
             job.workspace_id,
             job_id,
             result,
             headers,
         )
         db.commit()
-        queue.ack(STREAM_NAME, CONSUMER_GROUP, entry.entry_id)
+        if job_type == "hydration":
+            # Runtime context fetched before this hydration is now stale.
+            invalidate_hydrated_context(payload)
+        queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
     except Exception as exc:
         error_message = str(exc)
         job.attempts += 1
         _mark_failed(job, error_message)
         _record_event(db, job_id, "failed_attempt", error_message, data={"attempt": job.attempts})
-        _emit_hydration_event(
-            "hydration.failed",
+        _emit_job_event(
+            job_type,
+            "failed",
             job.workspace_id,
             job_id,
             {"error": error_message, "attempt": job.attempts},
@@ -207,19 +304,20 @@ def _handle_entry(
         db.commit()
 
         if job.attempts >= MAX_ATTEMPTS:
-            queue.ack(STREAM_NAME, CONSUMER_GROUP, entry.entry_id)
+            queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
             queue.add_to_dlq(fields, error_message)
             _mark_dlq(job, error_message)
             _record_event(db, job_id, "dlq", "Job moved to DLQ")
-            _emit_hydration_event(
-                "hydration.dlq",
+            _emit_job_event(
+                job_type,
+                "dlq",
                 job.workspace_id,
                 job_id,
                 {"error": error_message, "attempt": job.attempts},
                 headers,
             )
             db.commit()
-            return
+            return None
 
         backoff = BACKOFF_SECONDS[min(job.attempts - 1, len(BACKOFF_SECONDS) - 1)]
         fields["attempt"] = str(job.attempts)
@@ -227,54 +325,73 @@ def _handle_entry(
         job.updated_at = _utc_now()
         _record_event(db, job_id, "retrying", f"Retrying in {backoff}s", data={"attempt": job.attempts})
         db.commit()
-        queue.ack(STREAM_NAME, CONSUMER_GROUP, entry.entry_id)
-        sleep_fn(backoff)
-        queue.requeue(fields)
+        queue.ack(stream, CONSUMER_GROUP, entry.entry_id)
+        return backoff
+    return None
 
 
-def process_once(
-    queue: RedisQueue,
-    db_factory=SessionLocal,
-    hydration_handler: Callable[[BackgroundJob, Dict[str, Any], Dict[str, Any], Session], Dict[str, Any]] = handle_hydration_job,
-    sleep_fn: Callable[[float], None] = time.sleep,
-) -> int:
-    consumer = _consumer_name()
-    queue.ensure_group(STREAM_NAME, CONSUMER_GROUP)
+def _claim_all(queue: RedisQueue, selector: WeightedLaneSelector, consumer: str) -> List[QueueEntry]:
+    claimed: List[QueueEntry] = []
+    for lane in selector.weights:
+        claimed.extend(queue.claim(lane_stream(lane), CONSUMER_GROUP, consumer=consumer, min_idle_ms=60000))
+    return claimed
 
-    claimed = queue.claim(STREAM_NAME, CONSUMER_GROUP, consumer=consumer, min_idle_ms=60000)
-    entries = claimed + queue.read(STREAM_NAME, CONSUMER_GROUP, consumer=consumer, count=10, block_ms=100)
 
+def _run_entries(
+    entries: List[QueueEntry],
+    queue: RedisQueue,
+    db_factory,
+    hydration_handler: JobHandler,
+    sleep_fn: Callable[[float], None],
+    handlers: Optional[Dict[str, JobHandler]] = None,
+) -> int:
     processed = 0
     for entry in entries:
         db = db_factory()
         try:
-            _handle_entry(entry, queue, db, hydration_handler, sleep_fn)
-            processed += 1
+            if _handle_entry(entry, queue, db, hydration_handler, sleep_fn, handlers=handlers):
+                processed += 1
         finally:
             db.close()
     return processed
 
 
+def process_once(
+    queue: RedisQueue,
+    db_factory=SessionLocal,
+    hydration_handler: JobHandler = handle_hydration_job,
+    sleep_fn: Callable[[float], None] = time.sleep,
+    selector: Optional[WeightedLaneSelector] = None,
+    count: int = 10,
+    handlers: Optional[Dict[str, JobHandler]] = None,
+) -> int:
+    consumer = _consumer_name()
+    selector = selector or WeightedLaneSelector()
+
+    claimed = _claim_all(queue, selector, consumer)
+    entries = claimed + queue.read_weighted(selector, CONSUMER_GROUP, consumer=consumer, count=count, block_ms=100)
+    return _run_entries(entries, queue, db_factory, hydration_handler, sleep_fn, handlers)
+
+
 def run_forever() -> None:
     init_db()
     queue = RedisQueue()
     consumer = _consumer_name()
-    queue.ensure_group(STREAM_NAME, CONSUMER_GROUP)
+    selector = WeightedLaneSelector()
+    for lane in selector.weights:
+        queue.ensure_group(lane_stream(lane), CONSUMER_GROUP)
 
-    logger.info("Queue worker starting", extra={"consumer": consumer})
+    logger.info("Queue worker starting", extra={"consumer": consumer, "lanes": selector.weights})
 
     while True:
         try:
-            claimed = queue.claim(STREAM_NAME, CONSUMER_GROUP, consumer=consumer, min_idle_ms=60000)
-            entries = claimed + queue.read(STREAM_NAME, CONSUMER_GROUP, consumer=consumer, count=10, block_ms=2000)
+            claimed = _claim_all(queue, selector, consumer)
+            entries = claimed + queue.read_weighted(selector, CONSUMER_GROUP, consumer=consumer, count=10, block_ms=2000)
             if not entries:
                 continue
-            for entry in entries:
-                db = SessionLocal()
-                try:
-                    _handle_entry(entry, queue, db, handle_hydration_job, time.sleep)
-                finally:
-                    db.close()
+            processed = _run_entries(entries, queue, SessionLocal, handle_hydration_job, time.sleep)
+            if not processed:
+                time.sleep(DEFERRED_SLEEP_SECONDS)
         except Exception as exc:
             logger.exception("Queue worker loop error: %s", exc)
             time.sleep(1)
@@ -0,0 +1,44 @@
+"""Worker that periodically trims and archives the Redis event/job streams."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+from backend.redisx.retention import StreamRetention
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL_SECONDS = int(os.getenv("STREAM_RETENTION_INTERVAL_SECONDS", "300"))
+
+
+def run_once(retention: StreamRetention) -> int:
+    trimmed = 0
+    for result in retention.sweep():
+        trimmed += result.trimmed
+        if result.trimmed or result.archived:
+            logger.info(
+                "Stream retention trimmed %s: trimmed=%s archived=%s ack_floor=%s",
+                result.stream,
+                result.trimmed,
+                result.archived,
+                result.ack_floor,
+            )
+    return trimmed
+
+
+def run_forever() -> None:
+    retention = StreamRetention()
+    logger.info("Stream retention worker starting", extra={"interval": SWEEP_INTERVAL_SECONDS})
+
+    while True:
+        try:
+            run_once(retention)
+        except Exception as exc:
+            logger.warning("Stream retention loop error: %s", exc)
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    run_forever()
@@ -222,6 +222,7 @@ def _iter_router_specs() -> Iterable[Tuple[str, str]]:
         ("backend.api.qto", "QTO"),
         ("backend.api.vision", "Vision"),
         ("backend.api.speech", "Speech"),
+        ("backend.api.meeting_summarizer", "Meetings"),
         ("backend.api.projects", "Projects"),
         ("backend.api.preferences", "Preferences"),
         ("backend.api.users", "Users"),
@@ -232,6 +233,7 @@ def _iter_router_specs() -> Iterable[Tuple[str, str]]:
         ("backend.api.runtime", "Runtime"),
         ("backend.api.hydration", "Hydration"),
         ("backend.api.ops_jobs", "Ops Jobs"),
+        ("backend.api.ops_streams", "Ops Streams"),
         ("backend.api.regression", "Regression"),
         ("backend.api.learning", "Learning"),
         ("backend.api.events", "Events"),
@@ -30,12 +30,16 @@ dependencies, the only adjustments are:
 
 from __future__ import annotations
 
+import copy
 import logging
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 import aiofiles
 from fastapi import (
@@ -60,13 +64,21 @@ from sqlalchemy import (
     Column,
     DateTime,
     Float,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    func,
+    select,
 )
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from backend.analytics.rollups import task_event_payload
+from backend.events.envelope import EventEnvelope
+from backend.events.projector import EventProjector, projection_tables_available
+from backend.redisx.fanout import BROADCAST_TOPIC, FanoutConnection, FanoutHub, user_topic
+
 try:  # Optional dependencies that might not be present during local debugging
     import boto3
 except Exception:  # pragma: no cover - only happens when boto3 is missing
@@ -139,6 +151,9 @@ class User(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_user_updated", "user_id", "updated_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String)
@@ -148,11 +163,15 @@ class Project(Base):
     user_id = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
 
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_user_created", "user_id", "created_at"),
+        Index("ix_alerts_project", "project_id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String)
@@ -162,11 +181,15 @@ class Alert(Base):
     severity = Column(String, default="medium")
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_created", "user_id", "created_at"),
+        Index("ix_tasks_project", "project_id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String)
@@ -183,17 +206,24 @@ class Task(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_user_created", "user_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String)
     role = Column(String)
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
 
 
 class UploadedFile(Base):
     __tablename__ = "uploaded_files"
+    __table_args__ = (
+        Index("ix_uploaded_files_user_created", "user_id", "created_at"),
+        Index("ix_uploaded_files_project", "project_id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String)
@@ -207,12 +237,30 @@ class UploadedFile(Base):
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
 
 
 Base.metadata.create_all(bind=engine)
 
 
+def _ensure_indexes() -> None:
+    """Add indexes declared after the tables were first created.
+
+    ``create_all`` skips existing tables entirely, so deployments that predate
+    the analytics indexes would otherwise keep scanning a user's full history.
+    """
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as exc:  # pragma: no cover - depends on database permissions
+                logger.warning("Could not create index %s: %s", index.name, exc)
+
+
+_ensure_indexes()
+
+
 # ---------------------------------------------------------------------------
 # Pydantic models
 # ---------------------------------------------------------------------------
@@ -305,43 +353,145 @@ s3_client = (
 
 
 class ConnectionManager:
-    def __init__(self) -> None:
-        self.active_connections: Dict[str, WebSocket] = {}
+    """Per-user sockets fanned out across replicas through ``FanoutHub``.
+
+    Messages for a user are published to ``user:<id>`` so they reach the
+    socket whichever replica holds it; each socket drains its own bounded
+    queue, so a slow phone never delays anyone else.
+    """
+
+    def __init__(self, hub: Optional[FanoutHub] = None) -> None:
+        self.hub = hub or FanoutHub(namespace="mobile")
+        self.active_connections: Dict[str, FanoutConnection] = {}
 
     async def connect(self, user_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        previous = self.active_connections.pop(user_id, None)
+        if previous is not None:
+            self.hub.disconnect(previous)
+        self.active_connections[user_id] = await self.hub.connect(
+            websocket, [user_topic(user_id), BROADCAST_TOPIC]
+        )
         logger.info("User %s connected via WebSocket", user_id)
 
-    def disconnect(self, user_id: str) -> None:
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-            logger.info("User %s disconnected", user_id)
+    def disconnect(self, user_id: str, websocket: Optional[WebSocket] = None) -> None:
+        connection = self.active_connections.get(user_id)
+        if connection is None or (websocket is not None and connection.websocket is not websocket):
+            return  # already replaced by a newer socket for this user
+        del self.active_connections[user_id]
+        self.hub.disconnect(connection)
+        logger.info("User %s disconnected", user_id)
 
     async def send_personal_message(self, user_id: str, message: dict) -> None:
-        websocket = self.active_connections.get(user_id)
-        if websocket is None:
-            return
-        try:
-            await websocket.send_json(message)
-        except Exception as exc:  # pragma: no cover - network exceptions
-            logger.error("Error sending message to %s: %s", user_id, exc)
-            self.disconnect(user_id)
+        await self.hub.publish(user_topic(user_id), message)
 
     async def broadcast(self, message: dict) -> None:
-        disconnected: List[str] = []
-        for user_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_json(message)
-            except Exception:  # pragma: no cover - network exceptions
-                disconnected.append(user_id)
-        for user_id in disconnected:
-            self.disconnect(user_id)
+        await self.hub.publish(BROADCAST_TOPIC, message)
 
 
 manager = ConnectionManager()
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class AnalyticsCache:
+    """Short-lived LRU of analytics payloads keyed by ``(user_id, view, *args)``.
+
+    Entries expire after ``ttl_seconds`` and write endpoints drop a user's
+    entries eagerly, so the TTL only bounds staleness from writes that bypass
+    this API (for example alerts inserted by other services).
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize if maxsize is not None else _env_int("MOBILE_ANALYTICS_CACHE_SIZE", 1024)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int("MOBILE_ANALYTICS_CACHE_TTL_SECONDS", 30)
+        self._time = time_fn
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if self._time() - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(payload)
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, key: Tuple[Hashable, ...], payload: Dict[str, Any]) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._time(), copy.deepcopy(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None, project_id: Optional[str] = None) -> None:
+        """Drop entries owned by ``user_id`` and project views of ``project_id``."""
+
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if (user_id is not None and key[0] == user_id)
+                or (project_id is not None and key[1:3] == ("project", project_id))
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+analytics_cache = AnalyticsCache()
+
+# The daily analytics rollups live next to the event log in the main app's
+# database.  When this API shares it, task and project writes stage their
+# events in the same transaction, keeping the rollup counters in step with
+# the ``tasks`` table; otherwise nothing is staged.  Whether the tables exist
+# is checked at startup on a connection of its own: inspecting the schema in
+# the middle of a request's unit of work can end its transaction.
+_projection_tables_ready = False
+
+
+def refresh_projection_tables() -> bool:
+    """Re-check whether the database has the event log and rollup tables.
+
+    Runs at startup; call it again after migrating the database so writes
+    start (or stop) staging events without a restart.
+    """
+
+    global _projection_tables_ready
+    _projection_tables_ready = projection_tables_available(engine)
+    return _projection_tables_ready
+
+
+def _stage_event(db, event_type: str, payload: Dict[str, Any]) -> None:
+    if _projection_tables_ready:
+        EventProjector.stage(EventEnvelope.build(event_type, payload, source="mobile_backend"), db)
+
+
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
@@ -595,10 +745,10 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str, db=Depends(get_
                     },
                 )
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
+        manager.disconnect(user_id, websocket)
     except Exception as exc:  # pragma: no cover - network exceptions
         logger.error("WebSocket error for user %s: %s", user_id, exc)
-        manager.disconnect(user_id)
+        manager.disconnect(user_id, websocket)
 
 
 # ---------------------------------------------------------------------------
@@ -619,7 +769,7 @@ async def get_projects(current_user: User = Depends(get_current_user), db=Depend
                 "progress": project.progress,
                 "created_at": project.created_at.isoformat(),
                 "updated_at": project.updated_at.isoformat(),
-                "metadata": project.metadata or {},
+                "metadata": project.metadata_ or {},
             }
             for project in projects
         ]
@@ -636,11 +786,18 @@ async def create_project(
         name=project_data.name,
         description=project_data.description,
         user_id=current_user.id,
-        metadata=project_data.metadata,
+        metadata_=project_data.metadata,
     )
     db.add(project)
+    db.flush()
+    _stage_event(
+        db,
+        "project.progress",
+        {"user_id": project.user_id, "project_id": project.id, "progress": project.progress},
+    )
     db.commit()
     db.refresh(project)
+    analytics_cache.invalidate(user_id=current_user.id)
     return {
         "id": project.id,
         "name": project.name,
@@ -671,7 +828,7 @@ async def get_project(
         "progress": project.progress,
         "created_at": project.created_at.isoformat(),
         "updated_at": project.updated_at.isoformat(),
-        "metadata": project.metadata or {},
+        "metadata": project.metadata_ or {},
     }
 
 
@@ -698,7 +855,7 @@ async def get_alerts(current_user: User = Depends(get_current_user), db=Depends(
                 "read": alert.read,
                 "timestamp": alert.created_at.isoformat(),
                 "project_id": alert.project_id,
-                "metadata": alert.metadata or {},
+                "metadata": alert.metadata_ or {},
             }
             for alert in alerts
         ]
@@ -720,6 +877,7 @@ async def mark_alert_read(
         raise HTTPException(status_code=404, detail="Alert not found")
     alert.read = True
     db.commit()
+    analytics_cache.invalidate(user_id=current_user.id)
     return {"message": "Alert marked as read"}
 
 
@@ -764,8 +922,11 @@ async def create_task(
         due_date=task_data.due_date,
     )
     db.add(task)
+    db.flush()
+    _stage_event(db, "task.created", task_event_payload(task))
     db.commit()
     db.refresh(task)
+    analytics_cache.invalidate(user_id=current_user.id, project_id=task.project_id)
     return {
         "id": task.id,
         "title": task.title,
@@ -788,9 +949,13 @@ async def complete_task(
     )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    previous = {"completed": task.completed, "status": task.status}
     task.completed = True
     task.status = "completed"
+    if previous != {"completed": True, "status": "completed"}:
+        _stage_event(db, "task.updated", task_event_payload(task, previous))
     db.commit()
+    analytics_cache.invalidate(user_id=current_user.id, project_id=task.project_id)
     return {"message": "Task completed"}
 
 
@@ -838,6 +1003,7 @@ async def send_chat_message(
     ai_msg = ChatMessage(user_id=current_user.id, role="assistant", content=ai_response)
     db.add(ai_msg)
     db.commit()
+    analytics_cache.invalidate(user_id=current_user.id)
     return {
         "user_message": {
             "id": user_msg.id,
@@ -890,7 +1056,7 @@ async def upload_photo(
             description=description,
             latitude=latitude,
             longitude=longitude,
-            metadata={
+            metadata_={
                 "original_filename": photo.filename,
                 "content_type": photo.content_type,
             },
@@ -898,6 +1064,7 @@ async def upload_photo(
         db.add(uploaded_file)
         db.commit()
         db.refresh(uploaded_file)
+        analytics_cache.invalidate(user_id=current_user.id, project_id=project_id)
         logger.info("Photo uploaded: %s by user %s", unique_filename, current_user.id)
         return {
             "id": uploaded_file.id,
@@ -947,7 +1114,7 @@ async def upload_file(
             s3_url=s3_url,
             local_path=local_path,
             description=description,
-            metadata={
+            metadata_={
                 "original_filename": file.filename,
                 "content_type": file.content_type,
             },
@@ -955,6 +1122,7 @@ async def upload_file(
         db.add(uploaded_file)
         db.commit()
         db.refresh(uploaded_file)
+        analytics_cache.invalidate(user_id=current_user.id, project_id=project_id)
         return {
             "id": uploaded_file.id,
             "filename": unique_filename,
@@ -1005,7 +1173,7 @@ async def upload_voice_message(
             user_id=current_user.id,
             role="user",
             content=transcription,
-            metadata={"type": "voice", "original_filename": audio.filename},
+            metadata_={"type": "voice", "original_filename": audio.filename},
         )
         db.add(chat_msg)
         db.commit()
@@ -1013,6 +1181,7 @@ async def upload_voice_message(
         ai_msg = ChatMessage(user_id=current_user.id, role="assistant", content=ai_response)
         db.add(ai_msg)
         db.commit()
+        analytics_cache.invalidate(user_id=current_user.id)
         return {
             "transcription": transcription,
             "ai_response": ai_response,
@@ -1046,23 +1215,37 @@ async def sync_offline_actions(
     db=Depends(get_db),
 ):
     results = {"processed": 0, "failed": 0, "errors": []}
+    touched_projects = set()
     for action in actions:
         try:
             action_type = action.get("type")
             if action_type == "create_task":
                 task = Task(user_id=current_user.id, **action.get("data", {}))
                 db.add(task)
+                db.flush()
+                _stage_event(db, "task.created", task_event_payload(task))
+                touched_projects.add(task.project_id)
             elif action_type == "update_task":
                 task_id = action.get("task_id")
                 task = db.query(Task).filter(Task.id == task_id).first()
                 if task:
+                    touched_projects.add(task.project_id)
+                    previous = {}
                     for key, value in action.get("data", {}).items():
+                        if getattr(task, key, None) != value:
+                            previous[key] = getattr(task, key, None)
                         setattr(task, key, value)
+                    touched_projects.add(task.project_id)
+                    if previous:
+                        _stage_event(db, "task.updated", task_event_payload(task, previous))
             results["processed"] += 1
         except Exception as exc:  # pragma: no cover - depends on payload
             results["failed"] += 1
             results["errors"].append(str(exc))
     db.commit()
+    analytics_cache.invalidate(user_id=current_user.id)
+    for project_id in touched_projects - {None}:
+        analytics_cache.invalidate(project_id=project_id)
     return results
 
 
@@ -1071,27 +1254,112 @@ async def sync_offline_actions(
 # ---------------------------------------------------------------------------
 
 
-@app.get("/api/analytics/dashboard")
-async def get_dashboard_analytics(current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    total_projects = db.query(Project).filter(Project.user_id == current_user.id).count()
-    active_projects = (
-        db.query(Project)
-        .filter(Project.user_id == current_user.id, Project.status == "active")
-        .count()
+def _count_where(column, *conditions):
+    if not conditions:
+        return func.count(column)
+    return func.count(column).filter(*conditions)
+
+
+def _dashboard_summary(db, user_id: str) -> Dict[str, Any]:
+    """Return the dashboard counters with a single round-trip.
+
+    Each counter is a ``COUNT(*) FILTER (WHERE ...)`` scalar subquery over the
+    user's ``(user_id, ...)`` index, all selected in one statement.
+    """
+
+    def counter(column, owner, name, *conditions):
+        return select(_count_where(column, *conditions)).where(owner == user_id).scalar_subquery().label(name)
+
+    row = db.execute(
+        select(
+            counter(Project.id, Project.user_id, "total_projects"),
+            counter(Project.id, Project.user_id, "active_projects", Project.status == "active"),
+            counter(Task.id, Task.user_id, "total_tasks"),
+            counter(Task.id, Task.user_id, "completed_tasks", Task.completed.is_(True)),
+            counter(Alert.id, Alert.user_id, "total_alerts"),
+            counter(Alert.id, Alert.user_id, "unread_alerts", Alert.read.is_(False)),
+            counter(UploadedFile.id, UploadedFile.user_id, "total_files"),
+        )
+    ).one()._mapping
+    total_tasks = row["total_tasks"]
+    completion_rate = (row["completed_tasks"] / total_tasks * 100) if total_tasks > 0 else 0
+    return {
+        "total_projects": row["total_projects"],
+        "active_projects": row["active_projects"],
+        "total_tasks": total_tasks,
+        "completed_tasks": row["completed_tasks"],
+        "completion_rate": round(completion_rate, 1),
+        "total_alerts": row["total_alerts"],
+        "unread_alerts": row["unread_alerts"],
+        "total_files": row["total_files"],
+    }
+
+
+def _project_breakdown(db, project_id: str) -> Dict[str, Any]:
+    task_row = (
+        db.query(
+            _count_where(Task.id).label("total"),
+            _count_where(Task.id, Task.completed.is_(True)).label("completed"),
+            *(
+                _count_where(Task.id, Task.priority == priority).label(f"priority_{priority}")
+                for priority in ("high", "medium", "low")
+            ),
+            *(
+                _count_where(Task.id, Task.status == status).label(f"status_{status}")
+                for status in ("pending", "in_progress", "completed")
+            ),
+        )
+        .filter(Task.project_id == project_id)
+        .one()
+        ._mapping
     )
-    total_tasks = db.query(Task).filter(Task.user_id == current_user.id).count()
-    completed_tasks = (
-        db.query(Task)
-        .filter(Task.user_id == current_user.id, Task.completed.is_(True))
-        .count()
+    alert_total, critical_alerts = (
+        db.query(_count_where(Alert.id), _count_where(Alert.id, Alert.severity == "critical"))
+        .filter(Alert.project_id == project_id)
+        .one()
     )
-    total_alerts = db.query(Alert).filter(Alert.user_id == current_user.id).count()
-    unread_alerts = (
-        db.query(Alert)
-        .filter(Alert.user_id == current_user.id, Alert.read.is_(False))
-        .count()
+    file_total, total_file_size = (
+        db.query(_count_where(UploadedFile.id), func.coalesce(func.sum(UploadedFile.file_size), 0))
+        .filter(UploadedFile.project_id == project_id)
+        .one()
     )
-    total_files = db.query(UploadedFile).filter(UploadedFile.user_id == current_user.id).count()
+    total_tasks = task_row["total"]
+    completed_tasks = task_row["completed"]
+    return {
+        "tasks": {
+            "total": total_tasks,
+            "completed": completed_tasks,
+            "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks else 0, 1),
+            "by_priority": {priority: task_row[f"priority_{priority}"] for priority in ("high", "medium", "low")},
+            "by_status": {status: task_row[f"status_{status}"] for status in ("pending", "in_progress", "completed")},
+        },
+        "alerts": {"total": alert_total, "critical": critical_alerts},
+        "files": {
+            "total": file_total,
+            "total_size_mb": round(total_file_size / (1024 * 1024), 2),
+        },
+    }
+
+
+def _daily_counts(db, model, user_id: str, start_date: datetime, *conditions) -> Tuple[int, Dict[str, int]]:
+    day = func.date(model.created_at)
+    rows = (
+        db.query(day, func.count(model.id))
+        .filter(model.user_id == user_id, model.created_at >= start_date, *conditions)
+        .group_by(day)
+        .all()
+    )
+    # SQLite returns ``date()`` as text, PostgreSQL as a ``date`` object.
+    by_day = {value if isinstance(value, str) else value.isoformat(): count for value, count in rows}
+    return sum(by_day.values()), by_day
+
+
+@app.get("/api/analytics/dashboard")
+async def get_dashboard_analytics(current_user: User = Depends(get_current_user), db=Depends(get_db)):
+    cache_key = (current_user.id, "dashboard")
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
     recent_projects = (
         db.query(Project)
         .filter(Project.user_id == current_user.id)
@@ -1106,18 +1374,8 @@ async def get_dashboard_analytics(current_user: User = Depends(get_current_user)
         .limit(5)
         .all()
     )
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    return {
-        "summary": {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "completion_rate": round(completion_rate, 1),
-            "total_alerts": total_alerts,
-            "unread_alerts": unread_alerts,
-            "total_files": total_files,
-        },
+    payload = {
+        "summary": _dashboard_summary(db, current_user.id),
         "recent_projects": [
             {
                 "id": project.id,
@@ -1139,6 +1397,8 @@ async def get_dashboard_analytics(current_user: User = Depends(get_current_user)
             for task in recent_tasks
         ],
     }
+    analytics_cache.put(cache_key, payload)
+    return payload
 
 
 @app.get("/api/analytics/projects/{project_id}")
@@ -1147,6 +1407,10 @@ async def get_project_analytics(
     current_user: User = Depends(get_current_user),
     db=Depends(get_db),
 ):
+    cache_key = (current_user.id, "project", project_id)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
     project = (
         db.query(Project)
         .filter(Project.id == project_id, Project.user_id == current_user.id)
@@ -1154,24 +1418,7 @@ async def get_project_analytics(
     )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    tasks = db.query(Task).filter(Task.project_id == project_id).all()
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task.completed)
-    alerts = db.query(Alert).filter(Alert.project_id == project_id).all()
-    critical_alerts = sum(1 for alert in alerts if alert.severity == "critical")
-    files = db.query(UploadedFile).filter(UploadedFile.project_id == project_id).all()
-    total_file_size = sum(file.file_size for file in files)
-    priority_breakdown = {
-        "high": sum(1 for task in tasks if task.priority == "high"),
-        "medium": sum(1 for task in tasks if task.priority == "medium"),
-        "low": sum(1 for task in tasks if task.priority == "low"),
-    }
-    status_breakdown = {
-        "pending": sum(1 for task in tasks if task.status == "pending"),
-        "in_progress": sum(1 for task in tasks if task.status == "in_progress"),
-        "completed": sum(1 for task in tasks if task.status == "completed"),
-    }
-    return {
+    payload = {
         "project": {
             "id": project.id,
             "name": project.name,
@@ -1179,19 +1426,10 @@ async def get_project_analytics(
             "progress": project.progress,
             "created_at": project.created_at.isoformat(),
         },
-        "tasks": {
-            "total": total_tasks,
-            "completed": completed_tasks,
-            "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks else 0, 1),
-            "by_priority": priority_breakdown,
-            "by_status": status_breakdown,
-        },
-        "alerts": {"total": len(alerts), "critical": critical_alerts},
-        "files": {
-            "total": len(files),
-            "total_size_mb": round(total_file_size / (1024 * 1024), 2),
-        },
+        **_project_breakdown(db, project_id),
     }
+    analytics_cache.put(cache_key, payload)
+    return payload
 
 
 @app.get("/api/analytics/activity")
@@ -1200,68 +1438,71 @@ async def get_activity_analytics(
     db=Depends(get_db),
     days: int = 30,
 ):
+    cache_key = (current_user.id, "activity", days)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
     start_date = datetime.utcnow() - timedelta(days=days)
-    tasks = (
-        db.query(Task)
-        .filter(Task.user_id == current_user.id, Task.created_at >= start_date)
-        .all()
-    )
-    files = (
-        db.query(UploadedFile)
-        .filter(UploadedFile.user_id == current_user.id, UploadedFile.created_at >= start_date)
-        .all()
-    )
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.user_id == current_user.id, ChatMessage.created_at >= start_date)
-        .all()
+    task_total, tasks_by_day = _daily_counts(db, Task, current_user.id, start_date)
+    file_total, files_by_day = _daily_counts(db, UploadedFile, current_user.id, start_date)
+    message_total, messages_by_day = _daily_counts(
+        db, ChatMessage, current_user.id, start_date, ChatMessage.role == "user"
     )
     activity_by_day: Dict[str, Dict[str, int]] = {}
     for i in range(days):
         date = (datetime.utcnow() - timedelta(days=i)).date().isoformat()
-        activity_by_day[date] = {"tasks": 0, "files": 0, "messages": 0}
-    for task in tasks:
-        date = task.created_at.date().isoformat()
-        if date in activity_by_day:
-            activity_by_day[date]["tasks"] += 1
-    for file in files:
-        date = file.created_at.date().isoformat()
-        if date in activity_by_day:
-            activity_by_day[date]["files"] += 1
-    for message in messages:
-        if message.role == "user":
-            date = message.created_at.date().isoformat()
-            if date in activity_by_day:
-                activity_by_day[date]["messages"] += 1
-    return {
+        activity_by_day[date] = {
+            "tasks": tasks_by_day.get(date, 0),
+            "files": files_by_day.get(date, 0),
+            "messages": messages_by_day.get(date, 0),
+        }
+    payload = {
         "period": f"Last {days} days",
         "activity": activity_by_day,
         "totals": {
-            "tasks": len(tasks),
-            "files": len(files),
-            "messages": len([msg for msg in messages if msg.role == "user"]),
+            "tasks": task_total,
+            "files": file_total,
+            "messages": message_total,
         },
     }
+    analytics_cache.put(cache_key, payload)
+    return payload
 
 
 @app.get("/api/analytics/files")
 async def get_file_analytics(current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    files = db.query(UploadedFile).filter(UploadedFile.user_id == current_user.id).all()
-    type_breakdown: Dict[str, int] = {}
-    total_size = 0
-    for file in files:
-        file_type = file.file_type
-        type_breakdown[file_type] = type_breakdown.get(file_type, 0) + 1
-        total_size += file.file_size
-    project_breakdown: Dict[str, int] = {}
-    for file in files:
-        if file.project_id:
-            project_breakdown[file.project_id] = project_breakdown.get(file.project_id, 0) + 1
-    return {
-        "total_files": len(files),
-        "total_size_mb": round(total_size / (1024 * 1024), 2),
-        "by_type": type_breakdown,
-        "by_project": project_breakdown,
+    cache_key = (current_user.id, "files")
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    type_rows = (
+        db.query(
+            UploadedFile.file_type,
+            func.count(UploadedFile.id),
+            func.coalesce(func.sum(UploadedFile.file_size), 0),
+        )
+        .filter(UploadedFile.user_id == current_user.id)
+        .group_by(UploadedFile.file_type)
+        .all()
+    )
+    project_rows = (
+        db.query(UploadedFile.project_id, func.count(UploadedFile.id))
+        .filter(UploadedFile.user_id == current_user.id, UploadedFile.project_id.isnot(None))
+        .group_by(UploadedFile.project_id)
+        .all()
+    )
+    recent_uploads = (
+        db.query(UploadedFile)
+        .filter(UploadedFile.user_id == current_user.id)
+        .order_by(UploadedFile.created_at.desc())
+        .limit(10)
+        .all()
+    )
+    payload = {
+        "total_files": sum(count for _, count, _ in type_rows),
+        "total_size_mb": round(sum(size for _, _, size in type_rows) / (1024 * 1024), 2),
+        "by_type": {file_type: count for file_type, count, _ in type_rows},
+        "by_project": {project_id: count for project_id, count in project_rows if project_id},
         "recent_uploads": [
             {
                 "id": file.id,
@@ -1269,9 +1510,11 @@ async def get_file_analytics(current_user: User = Depends(get_current_user), db=
                 "file_type": file.file_type,
                 "created_at": file.created_at.isoformat(),
             }
-            for file in sorted(files, key=lambda item: item.created_at, reverse=True)[:10]
+            for file in recent_uploads
         ],
     }
+    analytics_cache.put(cache_key, payload)
+    return payload
 
 
 # ---------------------------------------------------------------------------
@@ -1500,6 +1743,7 @@ async def startup_event():
     logger.info("OpenAI: %s", "✓" if openai_client else "✗")
     logger.info("S3: %s", "✓" if s3_client else "✗")
     logger.info("Uploads directory: %s", UPLOAD_DIR)
+    logger.info("Analytics rollup events: %s", "✓" if refresh_projection_tables() else "✗")
 
 
 if __name__ == "__main__":  # pragma: no cover - manual execution helper
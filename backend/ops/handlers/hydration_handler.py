@@ -9,6 +9,24 @@ from sqlalchemy.orm import Session
 
 from backend.hydration.pipeline import HydrationOptions, HydrationPipeline, HydrationTrigger
 from backend.redisx.locks import DistributedLock
+from backend.redisx.queue import PRIORITY_BULK, PRIORITY_INTERACTIVE
+
+
+def hydration_priority(payload: Dict[str, Any]) -> str:
+    """Full rescans go to the bulk lane; targeted runs are interactive."""
+
+    return PRIORITY_BULK if payload.get("force_full_scan") else PRIORITY_INTERACTIVE
+
+
+def hydration_dedupe_key(payload: Dict[str, Any]) -> str:
+    """Identical hydration requests that are still queued collapse into one job."""
+
+    source_ids = ",".join(str(source_id) for source_id in sorted(payload.get("source_ids") or []))
+    return (
+        f"hydration:{payload.get('workspace_id')}:{source_ids or '*'}:"
+        f"{int(bool(payload.get('force_full_scan')))}:{int(bool(payload.get('dry_run')))}:"
+        f"{payload.get('max_files') or '*'}"
+    )
 
 
 def handle_hydration_job(job: Any, payload: Dict[str, Any], headers: Dict[str, Any], db: Session) -> Dict[str, Any]:
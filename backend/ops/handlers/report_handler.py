@@ -0,0 +1,184 @@
+"""Report rendering job handler.
+
+Reports are CPU bound (matplotlib, PDF and Excel writers), so the queue worker
+hands them to a small process pool whose workers import the headless Agg
+backend once at start-up instead of on every report.  The rendered file is
+moved into ``report_artifacts``: the worker and the web service share only the
+database, not a disk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from backend.ops.models import ReportArtifact
+
+logger = logging.getLogger(__name__)
+
+REPORT_JOB_TYPE = "report_render"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# Seconds a queue worker waits for one report before failing the attempt.
+REPORT_RENDER_TIMEOUT_SECONDS = _env_int("REPORT_RENDER_TIMEOUT_SECONDS", 600)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def report_dedupe_key(payload: Dict[str, Any]) -> str:
+    """Identical report requests that are still queued collapse into one job.
+
+    ``custom_params`` take part through a hash of their canonical JSON, so the
+    same parameters in any key order share a key and different ones never do.
+    """
+
+    parts = [
+        str(payload.get(key) or "*")
+        for key in ("user_id", "report_type", "report_format", "project_id", "date_from", "date_to")
+    ]
+    custom_params = payload.get("custom_params")
+    if custom_params:
+        canonical = json.dumps(custom_params, sort_keys=True, separators=(",", ":"), default=str)
+        parts.append(hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16])
+    else:
+        parts.append("*")
+    return "report:" + ":".join(parts)
+
+
+def _init_render_worker() -> None:
+    """Preload matplotlib with the Agg backend in each pool process."""
+
+    from backend.api.analytics_reports_system import _load_matplotlib, _load_seaborn
+
+    _load_matplotlib()
+    _load_seaborn()
+
+
+def _mp_context():
+    # A forked worker would inherit the parent's SQLAlchemy pool and talk over
+    # its sockets; forkserver and spawn children open their own connections.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def get_render_pool() -> Optional[Executor]:
+    """Return the shared render pool, or ``None`` when ``REPORT_RENDER_WORKERS=0``."""
+
+    global _pool
+    workers = _env_int("REPORT_RENDER_WORKERS", min(4, os.cpu_count() or 1))
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=_mp_context(), initializer=_init_render_worker
+            )
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def render_report(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one report described by a JSON payload and return its local path.
+
+    Runs in a pool process, so everything it needs travels in ``payload``.
+    """
+
+    from backend.api.analytics_reports_system import AutomatedReportGenerator, ReportFormat, ReportType
+    from backend.backend.db import SessionLocal
+
+    report_type = ReportType(payload["report_type"])
+    report_format = ReportFormat(payload["report_format"])
+    # Table rows are streamed from this session while the writers run, so it
+    # stays open until the file is complete.
+    db = SessionLocal()
+    try:
+        generator = AutomatedReportGenerator(db=db, openai_api_key=os.getenv("OPENAI_API_KEY"))
+        report_path = asyncio.run(
+            generator.generate_report(
+                report_type=report_type,
+                report_format=report_format,
+                user_id=payload["user_id"],
+                project_id=payload.get("project_id"),
+                date_from=_parse_datetime(payload.get("date_from")),
+                date_to=_parse_datetime(payload.get("date_to")),
+                custom_params=payload.get("custom_params"),
+            )
+        )
+    finally:
+        db.close()
+    return {"path": str(report_path), "format": report_format.value, "type": report_type.value}
+
+
+def store_report_artifact(db: Session, payload: Dict[str, Any], rendered: Dict[str, Any]) -> Dict[str, Any]:
+    """Move a rendered report into ``report_artifacts`` (flushed, not committed)."""
+
+    path = Path(rendered["path"])
+    content = path.read_bytes()
+    report_id = uuid4().hex
+    db.add(
+        ReportArtifact(
+            report_id=report_id,
+            user_id=str(payload["user_id"]),
+            filename=path.name,
+            report_format=rendered["format"],
+            size=len(content),
+            content=content,
+        )
+    )
+    db.flush()
+    path.unlink(missing_ok=True)
+    return {
+        "report_id": report_id,
+        "filename": path.name,
+        "download_url": f"/api/reports/artifacts/{report_id}",
+        "format": rendered["format"],
+        "type": rendered["type"],
+    }
+
+
+def handle_report_job(job: Any, payload: Dict[str, Any], headers: Dict[str, Any], db: Session) -> Dict[str, Any]:
+    del job
+    pool = get_render_pool()
+    if pool is None:
+        rendered = render_report(payload)
+    else:
+        rendered = pool.submit(render_report, payload).result(timeout=REPORT_RENDER_TIMEOUT_SECONDS)
+    result = store_report_artifact(db, payload, rendered)
+    result["correlation_id"] = headers.get("correlation_id")
+    return result
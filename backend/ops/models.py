@@ -1,12 +1,14 @@
-"""SQLAlchemy models for background jobs and job events."""
+"""SQLAlchemy models for background jobs, job events and job artifacts."""
 
 from __future__ import annotations
 
 from sqlalchemy import (
     Column,
     DateTime,
+    Index,
     Integer,
     JSON,
+    LargeBinary,
     String,
     Text,
     func,
@@ -17,6 +19,11 @@ from backend.backend.db import Base
 
 class BackgroundJob(Base):
     __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index("ix_background_jobs_workspace_id_id", "workspace_id", "id"),
+        Index("ix_background_jobs_status_id", "status", "id"),
+        Index("ix_background_jobs_type_id", "job_type", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     job_id = Column(String, unique=True, nullable=False, index=True)
@@ -43,3 +50,22 @@ class BackgroundJobEvent(Base):
     message = Column(Text, nullable=True)
     data_json = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ReportArtifact(Base):
+    """A rendered report file.
+
+    Reports render on the queue worker, which shares only the database with
+    the web service, so the file itself is kept here for download.
+    """
+
+    __tablename__ = "report_artifacts"
+
+    id = Column(Integer, primary_key=True)
+    report_id = Column(String, unique=True, nullable=False, index=True)
+    user_id = Column(String, nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    report_format = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    content = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,395 @@
+"""Compact in-memory storage for ULE entities and links.
+
+Entity ids are interned to integer indexes and each entity is a ``__slots__``
+record.  Links are stored column-wise: parallel ``array`` columns hold the
+endpoint indexes, link type, confidence, pack, creation time and validation
+flag, so a link costs a few dozen bytes instead of a Pydantic ``Link`` with
+its own evidence objects.  Evidence and link metadata live out of line, keyed
+by row, only for links that have them.
+
+Adjacency indexes map every entity to the rows of its links; documents map to
+their entities, and projects to their documents, so per-document and
+per-project queries touch only their own links.  ``Entity``/``Link`` models
+are built only when a caller asks for them (the API boundary).
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from backend.reasoning.schemas import Entity, EntityType, Evidence, EvidenceType, Link, LinkType
+
+_ENTITY_TYPES = list(EntityType)
+_ENTITY_TYPE_CODES = {entity_type: code for code, entity_type in enumerate(_ENTITY_TYPES)}
+_LINK_TYPES = list(LinkType)
+_LINK_TYPE_CODES = {link_type: code for code, link_type in enumerate(_LINK_TYPES)}
+_EVIDENCE_TYPES = list(EvidenceType)
+_EVIDENCE_TYPE_CODES = {evidence_type: code for code, evidence_type in enumerate(_EVIDENCE_TYPES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# (type code, value, weight, source_text, target_text, metadata or None)
+EvidenceRow = Tuple[int, Any, float, Optional[str], Optional[str], Optional[Dict[str, Any]]]
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class EntityRecord:
+    """Stored form of an ``Entity``; ``registered`` is False for link-only stubs."""
+
+    __slots__ = ("id", "type", "text", "document", "document_name", "page_number", "section", "metadata", "registered")
+
+    def __init__(self, entity: Entity, document: int, registered: bool) -> None:
+        self.id = entity.id
+        self.type = _ENTITY_TYPE_CODES[entity.type]
+        self.text = entity.text
+        self.document = document
+        self.document_name = entity.document_name
+        self.page_number = entity.page_number
+        self.section = entity.section
+        self.metadata = dict(entity.metadata) if entity.metadata else None
+        self.registered = registered
+
+    def to_entity(self, document_id: Optional[str]) -> Entity:
+        return Entity.model_construct(
+            id=self.id,
+            type=_ENTITY_TYPES[self.type],
+            text=self.text,
+            document_id=document_id,
+            document_name=self.document_name,
+            page_number=self.page_number,
+            section=self.section,
+            metadata=dict(self.metadata) if self.metadata else {},
+            embedding=None,
+        )
+
+
+class LinkStore:
+    """Interned entities plus struct-of-arrays links with adjacency indexes."""
+
+    def __init__(self) -> None:
+        self._entity_index: Dict[str, int] = {}
+        self._entities: List[EntityRecord] = []
+        self._registered = 0
+        self._document_index: Dict[str, int] = {}
+        self._document_ids: List[str] = []
+        self._document_entities: Dict[int, List[int]] = {}
+        self._document_project: Dict[int, str] = {}
+        self._project_documents: Dict[str, Set[int]] = {}
+        self._pack_index: Dict[str, int] = {}
+        self._pack_names: List[str] = []
+
+        self._uuids = bytearray()
+        self._row_by_uuid: Dict[int, int] = {}
+        self._source = array("i")
+        self._target = array("i")
+        self._link_type = array("B")
+        self._confidence = array("d")
+        self._pack = array("H")
+        self._created = array("q")
+        self._validated = bytearray()
+        self._evidence: Dict[int, Tuple[EvidenceRow, ...]] = {}
+        self._link_metadata: Dict[int, Dict[str, Any]] = {}
+        self._entity_links: Dict[int, array] = {}
+
+    # -- entities -------------------------------------------------------------
+
+    def _document(self, document_id: Optional[str]) -> int:
+        if document_id is None:
+            return -1
+        index = self._document_index.get(document_id)
+        if index is None:
+            index = len(self._document_ids)
+            self._document_index[document_id] = index
+            self._document_ids.append(document_id)
+        return index
+
+    def _document_id(self, index: int) -> Optional[str]:
+        return self._document_ids[index] if index >= 0 else None
+
+    def put_entity(self, entity: Entity, registered: bool = True) -> int:
+        """Store (or replace) ``entity``; stubs never overwrite registered entities."""
+
+        index = self._entity_index.get(entity.id)
+        if index is None:
+            index = len(self._entities)
+            self._entity_index[entity.id] = index
+            self._entities.append(EntityRecord(entity, self._document(entity.document_id), registered))
+            self._registered += registered
+            return index
+        current = self._entities[index]
+        if current.registered and not registered:
+            return index
+        self._registered += registered and not current.registered
+        self._entities[index] = EntityRecord(entity, self._document(entity.document_id), registered)
+        return index
+
+    def has_entity(self, entity_id: str) -> bool:
+        index = self._entity_index.get(entity_id)
+        return index is not None and self._entities[index].registered
+
+    def entity(self, entity_id: str) -> Optional[Entity]:
+        index = self._entity_index.get(entity_id)
+        if index is None or not self._entities[index].registered:
+            return None
+        return self._materialize_entity(index)
+
+    def _materialize_entity(self, index: int) -> Entity:
+        record = self._entities[index]
+        return record.to_entity(self._document_id(record.document))
+
+    def entity_ids(self) -> Iterator[str]:
+        return (record.id for record in self._entities if record.registered)
+
+    def iter_entities(self) -> Iterator[Entity]:
+        for index, record in enumerate(self._entities):
+            if record.registered:
+                yield self._materialize_entity(index)
+
+    @property
+    def entity_count(self) -> int:
+        return self._registered
+
+    def entity_type_counts(self) -> Dict[str, int]:
+        counts = Counter(record.type for record in self._entities if record.registered)
+        return {_ENTITY_TYPES[code].value: count for code, count in counts.items()}
+
+    # -- documents and projects -------------------------------------------------
+
+    def set_document(self, document_id: str, entity_ids: Iterable[str], project_id: Optional[str] = None) -> None:
+        """Record which (already stored) entities a document produced."""
+
+        document = self._document(document_id)
+        self._document_entities[document] = [self._entity_index[entity_id] for entity_id in entity_ids]
+        previous = self._document_project.pop(document, None)
+        if previous is not None:
+            self._project_documents[previous].discard(document)
+        if project_id is not None:
+            self._document_project[document] = project_id
+            self._project_documents.setdefault(project_id, set()).add(document)
+
+    def document_entity_ids(self, document_id: str) -> List[str]:
+        document = self._document_index.get(document_id)
+        if document is None:
+            return []
+        return [self._entities[index].id for index in self._document_entities.get(document, ())]
+
+    @property
+    def document_count(self) -> int:
+        return len(self._document_entities)
+
+    # -- links ------------------------------------------------------------------
+
+    def _pack_code(self, pack_name: str) -> int:
+        code = self._pack_index.get(pack_name)
+        if code is None:
+            code = len(self._pack_names)
+            self._pack_index[pack_name] = code
+            self._pack_names.append(pack_name)
+        return code
+
+    def add_link(self, link: Link) -> int:
+        """Store ``link`` (replacing one with the same id); returns its row."""
+
+        source = self.put_entity(link.source, registered=False)
+        target = self.put_entity(link.target, registered=False)
+        key = link.id.int
+        row = self._row_by_uuid.get(key)
+        if row is None:
+            row = len(self._source)
+            self._row_by_uuid[key] = row
+            self._uuids += link.id.bytes
+            self._source.append(source)
+            self._target.append(target)
+            self._link_type.append(_LINK_TYPE_CODES[link.link_type])
+            self._confidence.append(link.confidence)
+            self._pack.append(self._pack_code(link.pack_name))
+            self._created.append(_to_micros(link.created_at))
+            self._validated.append(1 if link.validated else 0)
+        else:
+            for endpoint in {self._source[row], self._target[row]}:
+                self._entity_links[endpoint].remove(row)
+            self._source[row] = source
+            self._target[row] = target
+            self._link_type[row] = _LINK_TYPE_CODES[link.link_type]
+            self._confidence[row] = link.confidence
+            self._pack[row] = self._pack_code(link.pack_name)
+            self._created[row] = _to_micros(link.created_at)
+            self._validated[row] = 1 if link.validated else 0
+        for endpoint in {source, target}:
+            self._entity_links.setdefault(endpoint, array("i")).append(row)
+
+        self._evidence.pop(row, None)
+        if link.evidence:
+            self._evidence[row] = tuple(
+                (
+                    _EVIDENCE_TYPE_CODES[evidence.type],
+                    evidence.value,
+                    evidence.weight,
+                    evidence.source_text,
+                    evidence.target_text,
+                    dict(evidence.metadata) if evidence.metadata else None,
+                )
+                for evidence in link.evidence
+            )
+        self._link_metadata.pop(row, None)
+        if link.metadata:
+            self._link_metadata[row] = dict(link.metadata)
+        return row
+
+    @property
+    def link_count(self) -> int:
+        return len(self._source)
+
+    def has_link(self, link_id: UUID) -> bool:
+        return link_id.int in self._row_by_uuid
+
+    def link_id(self, row: int) -> UUID:
+        return UUID(bytes=bytes(self._uuids[row * 16 : row * 16 + 16]))
+
+    def _link_id_str(self, row: int) -> str:
+        # Same text as str(self.link_id(row)) without building a UUID.
+        value = self._uuids[row * 16 : row * 16 + 16].hex()
+        return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+    def link_ids(self) -> Iterator[UUID]:
+        return (self.link_id(row) for row in range(len(self._source)))
+
+    def link(self, link_id: UUID) -> Optional[Link]:
+        row = self._row_by_uuid.get(link_id.int)
+        return None if row is None else self.materialize_link(row)
+
+    def materialize_link(self, row: int) -> Link:
+        evidence = [
+            Evidence.model_construct(
+                type=_EVIDENCE_TYPES[code],
+                value=value,
+                weight=weight,
+                source_text=source_text,
+                target_text=target_text,
+                metadata=dict(metadata) if metadata else {},
+            )
+            for code, value, weight, source_text, target_text, metadata in self._evidence.get(row, ())
+        ]
+        return Link.model_construct(
+            id=self.link_id(row),
+            source=self._materialize_entity(self._source[row]),
+            target=self._materialize_entity(self._target[row]),
+            link_type=_LINK_TYPES[self._link_type[row]],
+            confidence=self._confidence[row],
+            evidence=evidence,
+            pack_name=self._pack_names[self._pack[row]],
+            created_at=_EPOCH + timedelta(microseconds=self._created[row]),
+            validated=bool(self._validated[row]),
+            metadata=dict(self._link_metadata.get(row, {})),
+        )
+
+    def iter_links(self) -> Iterator[Link]:
+        return (self.materialize_link(row) for row in range(len(self._source)))
+
+    def link_type_counts(self) -> Dict[str, int]:
+        counts = Counter(self._link_type)
+        return {_LINK_TYPES[code].value: count for code, count in counts.items()}
+
+    def rows_for_entities(self, entities: Iterable[int]) -> List[int]:
+        """Rows of links touching any of ``entities``, in insertion order."""
+
+        rows: Set[int] = set()
+        for entity in entities:
+            rows.update(self._entity_links.get(entity, ()))
+        return sorted(rows)
+
+    def rows_for_document(self, document_id: str) -> List[int]:
+        document = self._document_index.get(document_id)
+        if document is None:
+            return []
+        return self.rows_for_entities(self._document_entities.get(document, ()))
+
+    def rows_for_project(self, project_id: str) -> List[int]:
+        entities: List[int] = []
+        for document in self._project_documents.get(project_id, ()):
+            entities.extend(self._document_entities.get(document, ()))
+        return self.rows_for_entities(entities)
+
+    def links_for_document(self, document_id: str) -> List[Link]:
+        return [self.materialize_link(row) for row in self.rows_for_document(document_id)]
+
+    def graph(self, rows: Optional[Iterable[int]] = None, label_length: int = 50) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Visualisation nodes and edges for ``rows`` (all links by default), read straight from the columns."""
+
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+        seen: Set[int] = set()
+        entities = self._entities
+        sources, targets, link_types, confidences = self._source, self._target, self._link_type, self._confidence
+        link_type_values = [link_type.value for link_type in _LINK_TYPES]
+        for row in range(len(sources)) if rows is None else rows:
+            source = sources[row]
+            target = targets[row]
+            for endpoint in (source, target):
+                if endpoint in seen:
+                    continue
+                seen.add(endpoint)
+                record = entities[endpoint]
+                nodes.append(
+                    {
+                        "id": record.id,
+                        "label": record.text[:label_length],
+                        "type": _ENTITY_TYPES[record.type].value,
+                        "document_id": self._document_id(record.document),
+                    }
+                )
+            edges.append(
+                {
+                    "id": self._link_id_str(row),
+                    "source": entities[source].id,
+                    "target": entities[target].id,
+                    "link_type": link_type_values[link_types[row]],
+                    "confidence": confidences[row],
+                }
+            )
+        return nodes, edges
+
+    def export_rows(self) -> List[Dict[str, Any]]:
+        """All links as plain dictionaries for database storage."""
+
+        exported = []
+        for row in range(len(self._source)):
+            source = self._entities[self._source[row]]
+            target = self._entities[self._target[row]]
+            exported.append(
+                {
+                    "id": self._link_id_str(row),
+                    "source_entity_id": source.id,
+                    "source_entity_type": _ENTITY_TYPES[source.type].value,
+                    "target_entity_id": target.id,
+                    "target_entity_type": _ENTITY_TYPES[target.type].value,
+                    "link_type": _LINK_TYPES[self._link_type[row]].value,
+                    "confidence": self._confidence[row],
+                    "evidence": [
+                        {
+                            "type": _EVIDENCE_TYPES[code],
+                            "value": value,
+                            "weight": weight,
+                            "source_text": source_text,
+                            "target_text": target_text,
+                            "metadata": dict(metadata) if metadata else {},
+                        }
+                        for code, value, weight, source_text, target_text, metadata in self._evidence.get(row, ())
+                    ],
+                    "pack_name": self._pack_names[self._pack[row]],
+                    "created_at": (_EPOCH + timedelta(microseconds=self._created[row])).isoformat(),
+                    "validated": bool(self._validated[row]),
+                    "metadata": dict(self._link_metadata.get(row, {})),
+                }
+            )
+        return exported
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Type
 from uuid import UUID
 
 import numpy as np
@@ -22,6 +22,7 @@ from backend.reasoning.schemas import (
     LinkType,
     PackConfig,
 )
+from backend.reasoning.link_store import LinkStore
 from backend.reasoning.packs.base_pack import BasePack
 
 logger = logging.getLogger(__name__)
@@ -54,6 +55,56 @@ except Exception:
     _openai_client = None
 
 
+class _EntityView(Mapping[str, Entity]):
+    """Read-only ``entity_id -> Entity`` view; models are built on access."""
+
+    def __init__(self, store: LinkStore) -> None:
+        self._store = store
+
+    def __getitem__(self, entity_id: str) -> Entity:
+        entity = self._store.entity(entity_id)
+        if entity is None:
+            raise KeyError(entity_id)
+        return entity
+
+    def __contains__(self, entity_id: object) -> bool:
+        return isinstance(entity_id, str) and self._store.has_entity(entity_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._store.entity_ids()
+
+    def __len__(self) -> int:
+        return self._store.entity_count
+
+    def values(self):  # type: ignore[override]
+        return self._store.iter_entities()
+
+
+class _LinkView(Mapping[UUID, Link]):
+    """Read-only ``link_id -> Link`` view; models are built on access."""
+
+    def __init__(self, store: LinkStore) -> None:
+        self._store = store
+
+    def __getitem__(self, link_id: UUID) -> Link:
+        link = self._store.link(link_id) if isinstance(link_id, UUID) else None
+        if link is None:
+            raise KeyError(link_id)
+        return link
+
+    def __contains__(self, link_id: object) -> bool:
+        return isinstance(link_id, UUID) and self._store.has_link(link_id)
+
+    def __iter__(self) -> Iterator[UUID]:
+        return self._store.link_ids()
+
+    def __len__(self) -> int:
+        return self._store.link_count
+
+    def values(self):  # type: ignore[override]
+        return self._store.iter_links()
+
+
 class ULEEngine:
     """
     Universal Linking Engine for automatic construction document linking.
@@ -88,9 +139,11 @@ class ULEEngine:
             use_openai_embeddings: Use OpenAI embeddings instead of local model.
         """
         self._packs: Dict[str, BasePack] = {}
-        self._entities: Dict[str, Entity] = {}
-        self._links: Dict[UUID, Link] = {}
-        self._document_entities: Dict[str, List[str]] = {}  # doc_id -> entity_ids
+        # Entities and links live in a compact column store; Pydantic models
+        # are only built when a caller reads them.
+        self._store = LinkStore()
+        self._entities: Mapping[str, Entity] = _EntityView(self._store)
+        self._links: Mapping[UUID, Link] = _LinkView(self._store)
         self._embeddings: Dict[str, np.ndarray] = {}
         self._default_threshold = default_confidence_threshold
 
@@ -236,12 +289,13 @@ class ULEEngine:
                 logger.exception("Pack %s failed to extract entities: %s", pack.name, e)
 
         # Store entities
-        entity_ids = []
         for entity in all_entities:
-            self._entities[entity.id] = entity
-            entity_ids.append(entity.id)
-
-        self._document_entities[document.document_id] = entity_ids
+            self._store.put_entity(entity)
+        self._store.set_document(
+            document.document_id,
+            [entity.id for entity in all_entities],
+            project_id=document.project_id,
+        )
 
         # Compute embeddings for new entities
         await self._compute_embeddings(all_entities)
@@ -251,7 +305,7 @@ class ULEEngine:
 
         # Store links
         for link in links:
-            self._links[link.id] = link
+            self._store.add_link(link)
 
         processing_time = (time.time() - start_time) * 1000
 
@@ -300,8 +354,8 @@ class ULEEngine:
         source_entities: List[Entity] = []
 
         if document_id:
-            entity_ids = self._document_entities.get(document_id, [])
-            source_entities = [self._entities[eid] for eid in entity_ids if eid in self._entities]
+            entity_ids = self._store.document_entity_ids(document_id)
+            source_entities = [entity for entity in map(self._store.entity, entity_ids) if entity is not None]
 
         if query_text:
             # Find entities matching the query via semantic search
@@ -326,7 +380,7 @@ class ULEEngine:
 
         # Get all target entities (excluding sources to avoid self-links)
         source_ids = {e.id for e in source_entities}
-        target_entities = [e for e in self._entities.values() if e.id not in source_ids]
+        target_entities = [e for e in self._store.iter_entities() if e.id not in source_ids]
 
         # Filter targets by entity types if specified
         if entity_types:
@@ -374,7 +428,7 @@ class ULEEngine:
         Returns:
             EvidenceResponse with full evidence details and explanation.
         """
-        link = self._links.get(link_id)
+        link = self._store.link(link_id)
         if not link:
             return None
 
@@ -392,23 +446,28 @@ class ULEEngine:
         )
 
     def get_links_for_document(self, document_id: str) -> List[Link]:
-        """Get all links involving a document."""
-        entity_ids = set(self._document_entities.get(document_id, []))
-        if not entity_ids:
-            return []
-
-        return [
-            link for link in self._links.values()
-            if link.source.id in entity_ids or link.target.id in entity_ids
-        ]
+        """Get all links involving a document (via the entity adjacency index)."""
+        return self._store.links_for_document(document_id)
 
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         """Get an entity by ID."""
-        return self._entities.get(entity_id)
+        return self._store.entity(entity_id)
 
     def get_link(self, link_id: UUID) -> Optional[Link]:
         """Get a link by ID."""
-        return self._links.get(link_id)
+        return self._store.link(link_id)
+
+    def get_graph(self, project_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Nodes and edges for visualisation, without building Pydantic models.
+
+        Args:
+            project_id: Only links touching documents of this project
+                (None = every link).
+        """
+        rows = None if project_id is None else self._store.rows_for_project(project_id)
+        nodes, edges = self._store.graph(rows)
+        return {"nodes": nodes, "edges": edges}
 
     # -------------------------------------------------------------------------
     # Internal methods
@@ -700,30 +759,14 @@ class ULEEngine:
 
     def export_links(self) -> List[Dict[str, Any]]:
         """Export all links as dictionaries for database storage."""
-        return [
-            {
-                "id": str(link.id),
-                "source_entity_id": link.source.id,
-                "source_entity_type": link.source.type.value,
-                "target_entity_id": link.target.id,
-                "target_entity_type": link.target.type.value,
-                "link_type": link.link_type.value,
-                "confidence": link.confidence,
-                "evidence": [e.model_dump() for e in link.evidence],
-                "pack_name": link.pack_name,
-                "created_at": link.created_at.isoformat(),
-                "validated": link.validated,
-                "metadata": link.metadata,
-            }
-            for link in self._links.values()
-        ]
+        return self._store.export_rows()
 
     def import_link(self, data: Dict[str, Any]) -> None:
         """Import a link from database storage."""
         from uuid import UUID as UUIDType
         from datetime import datetime
 
-        # Reconstruct entities (minimal)
+        # Reconstruct entities (minimal; known entities keep their details)
         source = Entity(
             id=data["source_entity_id"],
             type=EntityType(data["source_entity_type"]),
@@ -751,29 +794,18 @@ class ULEEngine:
             metadata=data.get("metadata", {}),
         )
 
-        self._links[link.id] = link
+        self._store.add_link(link)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get engine statistics."""
-        link_types_count: Dict[str, int] = {}
-        entity_types_count: Dict[str, int] = {}
-
-        for link in self._links.values():
-            lt = link.link_type.value
-            link_types_count[lt] = link_types_count.get(lt, 0) + 1
-
-        for entity in self._entities.values():
-            et = entity.type.value
-            entity_types_count[et] = entity_types_count.get(et, 0) + 1
-
         return {
             "total_packs": len(self._packs),
-            "total_entities": len(self._entities),
-            "total_links": len(self._links),
-            "total_documents": len(self._document_entities),
+            "total_entities": self._store.entity_count,
+            "total_links": self._store.link_count,
+            "total_documents": self._store.document_count,
             "total_embeddings": len(self._embeddings),
-            "entity_types": entity_types_count,
-            "link_types": link_types_count,
+            "entity_types": self._store.entity_type_counts(),
+            "link_types": self._store.link_type_counts(),
             "packs": [p.name for p in self._packs.values()],
             "embeddings_enabled": self._embedding_model is not None or self._use_openai,
             "faiss_enabled": self._faiss_index is not None,
@@ -0,0 +1,392 @@
+"""Cross-replica WebSocket fan-out over sharded Redis pub/sub.
+
+Messages carry a topic such as ``user:<id>`` or ``workspace:<id>`` and are
+published to one of ``WS_FANOUT_SHARDS`` channels picked by a stable hash of
+the topic, so every API replica sees every message for the topics its own
+sockets follow while subscribing to a bounded number of channels.  Each
+replica only subscribes to the shards its local sockets need.
+
+A message may carry several topics (an alert for a user in a workspace).  It
+is published once per shard those topics hash to, and every socket receives
+it once: a replica delivers the copy from the lowest shard among the topics
+that socket follows.
+
+Delivery never awaits a socket: each connection has a bounded send queue
+drained by its own sender task, so a slow client cannot delay the others.
+A connection whose queue overflows, or whose send exceeds
+``WS_SEND_TIMEOUT_SECONDS``, is closed with code 1013 and dropped.
+
+Without ``REDIS_URL`` the hub delivers in-process, which suffices for a
+single replica.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+import os
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_TEMPLATE = "ws:{namespace}:{shard}"
+ALL_TOPICS = "*"
+BROADCAST_TOPIC = "broadcast"
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def user_topic(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def workspace_topic(workspace_id: Any) -> str:
+    return f"workspace:{workspace_id}"
+
+
+# One topic, or several for a message that concerns more than one audience.
+Topics = Union[str, Sequence[str]]
+
+
+def _topic_list(topics: Topics) -> List[str]:
+    if isinstance(topics, str):
+        return [topics]
+    return list(dict.fromkeys(topics))
+
+
+def shard_for(topic: str, shards: int) -> int:
+    """Stable across processes, unlike ``hash()``."""
+
+    return zlib.crc32(topic.encode("utf-8")) % shards
+
+
+@dataclass
+class FanoutStats:
+    published: int = 0
+    delivered: int = 0
+    sent: int = 0
+    dropped: int = 0
+
+
+class FanoutConnection:
+    """One socket with a bounded send queue and its own sender task."""
+
+    def __init__(
+        self,
+        websocket: Any,
+        topics: Iterable[str],
+        queue_size: int,
+        send_timeout: float,
+        on_drop: Callable[["FanoutConnection", str], None],
+        stats: FanoutStats,
+    ) -> None:
+        self.websocket = websocket
+        self.topics: Set[str] = set(topics)
+        self.send_timeout = send_timeout
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+        self._on_drop = on_drop
+        self._stats = stats
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def offer(self, message: Any) -> bool:
+        """Queue ``message`` without waiting; a full queue drops the connection."""
+
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.drop("send queue full")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_json(message), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.drop("send timed out")
+                return
+            except Exception as exc:
+                self.drop(f"send failed: {exc}")
+                return
+            self._stats.sent += 1
+
+    def drop(self, reason: str) -> None:
+        """Stop sending and close the socket (1013); idempotent."""
+
+        if self.closed:
+            return
+        self.closed = True
+        self._stats.dropped += 1
+        logger.info("Dropping WebSocket connection: %s", reason)
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        asyncio.get_running_loop().create_task(self._close_socket(reason))
+        self._on_drop(self, reason)
+
+    async def _close_socket(self, reason: str) -> None:
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason=reason[:120]),
+                timeout=self.send_timeout,
+            )
+        except Exception:  # pragma: no cover - the peer is already gone
+            pass
+
+    def close(self) -> None:
+        """Stop the sender after a normal disconnect; the socket is already closed."""
+
+        self.closed = True
+        self._task.cancel()
+
+
+class FanoutHub:
+    """Topic subscriptions of local sockets plus the Redis shard listener."""
+
+    def __init__(
+        self,
+        namespace: str,
+        redis_client: Any = None,
+        redis_url: Optional[str] = None,
+        shards: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        self.namespace = namespace
+        self.shards = max(1, shards or _env_int("WS_FANOUT_SHARDS", 16))
+        self.queue_size = max(1, queue_size or _env_int("WS_SEND_QUEUE_SIZE", 256))
+        self.send_timeout = send_timeout or _env_int("WS_SEND_TIMEOUT_SECONDS", 10)
+        self.stats = FanoutStats()
+        self._redis = redis_client
+        self._owns_redis = False
+        self._redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
+        self._sync_redis: Any = None
+        self._topics: Dict[str, Set[FanoutConnection]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pubsub: Any = None
+        self._subscribed: Set[int] = set()
+        self._listener: Optional["asyncio.Task[None]"] = None
+        self._subscription_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def distributed(self) -> bool:
+        return self._redis is not None or bool(self._redis_url)
+
+    def channel(self, shard: int) -> str:
+        return CHANNEL_TEMPLATE.format(namespace=self.namespace, shard=shard)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # A new event loop (tests, reloads) cannot reuse tasks or pub/sub
+        # connections from the old one.
+        self._loop = loop
+        self._topics = {}
+        self._pubsub = None
+        self._subscribed = set()
+        self._listener = None
+        self._subscription_lock = asyncio.Lock()
+        if self._redis_url and (self._redis is None or self._owns_redis):
+            import redis.asyncio as redis_asyncio  # type: ignore
+
+            self._redis = redis_asyncio.Redis.from_url(self._redis_url, decode_responses=True)
+            self._owns_redis = True
+
+    @property
+    def connection_count(self) -> int:
+        return len({conn for conns in self._topics.values() for conn in conns})
+
+    async def connect(self, websocket: Any, topics: Iterable[str]) -> FanoutConnection:
+        """Register an accepted socket for ``topics`` (``ALL_TOPICS`` for everything)."""
+
+        self._bind_loop()
+        connection = FanoutConnection(
+            websocket, topics, self.queue_size, self.send_timeout, self._dropped, self.stats
+        )
+        for topic in connection.topics:
+            self._topics.setdefault(topic, set()).add(connection)
+        await self._sync_subscriptions()
+        return connection
+
+    def disconnect(self, connection: FanoutConnection) -> None:
+        connection.close()
+        self._forget(connection)
+
+    def _dropped(self, connection: FanoutConnection, reason: str) -> None:
+        del reason
+        self._forget(connection)
+
+    def _forget(self, connection: FanoutConnection) -> None:
+        for topic in connection.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self._topics[topic]
+        if self.distributed and self._loop is not None and not self._loop.is_closed():
+            self._loop.create_task(self._sync_subscriptions())
+
+    def deliver(self, topics: Topics, message: Any, shard: Optional[int] = None) -> int:
+        """Queue ``message`` once for each local subscriber of ``topics``; returns how many.
+
+        ``shard`` is the channel a distributed copy arrived on; a subscriber
+        only takes the copy from the lowest shard among its matching topics.
+        """
+
+        topics = _topic_list(topics)
+        recipients: Set[FanoutConnection] = set(self._topics.get(ALL_TOPICS, ()))
+        for topic in topics:
+            recipients.update(self._topics.get(topic, ()))
+        if shard is not None:
+            recipients = {
+                connection
+                for connection in recipients
+                if shard == min(
+                    shard_for(topic, self.shards)
+                    for topic in topics
+                    if topic in connection.topics or ALL_TOPICS in connection.topics
+                )
+            }
+        delivered = sum(1 for connection in recipients if connection.offer(message))
+        self.stats.delivered += delivered
+        return delivered
+
+    def _envelopes(self, topics: List[str], message: Any) -> Dict[int, str]:
+        return {
+            shard: json.dumps({"topics": topics, "shard": shard, "message": message}, default=str)
+            for shard in {shard_for(topic, self.shards) for topic in topics}
+        }
+
+    async def publish(self, topics: Topics, message: Any) -> None:
+        """Send ``message`` to subscribers of ``topics`` on every replica."""
+
+        self._bind_loop()
+        self.stats.published += 1
+        topics = _topic_list(topics)
+        if not self.distributed:
+            self.deliver(topics, message)
+            return
+        for shard, payload in self._envelopes(topics, message).items():
+            await self._redis.publish(self.channel(shard), payload)
+
+    def publish_threadsafe(self, topics: Topics, message: Any) -> None:
+        """Publish from synchronous code, on or off the event loop thread."""
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None:
+            running.create_task(self.publish(topics, message))
+            return
+        loop = self._loop
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self.publish(topics, message), loop)
+            return
+        if self._redis_url:
+            # No loop in this process (e.g. a worker): publish synchronously so
+            # API replicas still deliver it.
+            try:
+                if self._sync_redis is None:
+                    import redis  # type: ignore
+
+                    self._sync_redis = redis.Redis.from_url(self._redis_url, decode_responses=True)
+                for shard, payload in self._envelopes(_topic_list(topics), message).items():
+                    self._sync_redis.publish(self.channel(shard), payload)
+            except Exception as exc:
+                logger.warning("Could not publish WebSocket message: %s", exc)
+
+    def _wanted_shards(self) -> Set[int]:
+        if ALL_TOPICS in self._topics:
+            return set(range(self.shards))
+        return {shard_for(topic, self.shards) for topic in self._topics}
+
+    async def _sync_subscriptions(self) -> None:
+        if not self.distributed or self._subscription_lock is None:
+            return
+        async with self._subscription_lock:
+            wanted = self._wanted_shards()
+            added = wanted - self._subscribed
+            removed = self._subscribed - wanted
+            if not added and not removed:
+                return
+            if self._pubsub is None:
+                self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            if added:
+                await self._pubsub.subscribe(*(self.channel(shard) for shard in sorted(added)))
+            if removed:
+                await self._pubsub.unsubscribe(*(self.channel(shard) for shard in sorted(removed)))
+            self._subscribed = wanted
+            if added and (self._listener is None or self._listener.done()):
+                self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            if not self._subscribed:
+                await asyncio.sleep(0.05)
+                continue
+            try:
+                raw = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("WebSocket fan-out listener error: %s", exc)
+                await asyncio.sleep(1.0)
+                continue
+            if raw is None or raw.get("type") != "message":
+                continue
+            try:
+                envelope = json.loads(raw["data"])
+                self.deliver(envelope["topics"], envelope["message"], shard=envelope["shard"])
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("Ignoring malformed fan-out message: %s", exc)
+
+    async def close(self) -> None:
+        """Drop all connections and stop listening (for shutdown and tests)."""
+
+        for connection in {conn for conns in self._topics.values() for conn in conns}:
+            connection.close()
+        self._topics = {}
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            close = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+            try:
+                await close()
+            except Exception:  # pragma: no cover - connection already gone
+                pass
+            self._pubsub = None
+        self._subscribed = set()
+
+
+def topics_for(user_id: Optional[Any] = None, workspace_id: Optional[Any] = None) -> List[str]:
+    """Topics a socket follows: its user and workspace plus broadcasts, or everything."""
+
+    topics = []
+    if user_id not in (None, ""):
+        topics.append(user_topic(user_id))
+    if workspace_id not in (None, ""):
+        topics.append(workspace_topic(workspace_id))
+    if not topics:
+        return [ALL_TOPICS]
+    return topics + [BROADCAST_TOPIC]
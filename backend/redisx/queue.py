@@ -26,11 +26,81 @@ STREAM_NAME = "jobs:main"
 DLQ_STREAM_NAME = "jobs:dlq"
 CONSUMER_GROUP = "workers"
 
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_SCHEDULED = "scheduled"
+PRIORITY_BULK = "bulk"
+
+# "scheduled" keeps the original stream so entries queued before lanes
+# existed are still drained by upgraded workers.
+LANE_STREAMS: Dict[str, str] = {
+    PRIORITY_INTERACTIVE: "jobs:interactive",
+    PRIORITY_SCHEDULED: STREAM_NAME,
+    PRIORITY_BULK: "jobs:bulk",
+}
+DEFAULT_LANE_WEIGHTS: Dict[str, int] = {
+    PRIORITY_INTERACTIVE: 6,
+    PRIORITY_SCHEDULED: 3,
+    PRIORITY_BULK: 1,
+}
+DEDUPE_KEY_TEMPLATE = "jobs:dedupe:{key}"
+INFLIGHT_KEY_TEMPLATE = "jobs:inflight:{workspace_id}"
+
 
 @dataclass(frozen=True)
 class QueueEntry:
     entry_id: str
     fields: Dict[str, Any]
+    stream: str = STREAM_NAME
+
+
+def lane_stream(priority: str) -> str:
+    try:
+        return LANE_STREAMS[priority]
+    except KeyError:
+        raise ValueError(f"Unknown job priority {priority!r}; expected one of {sorted(LANE_STREAMS)}") from None
+
+
+def _lane_weights_from_env() -> Dict[str, int]:
+    """Parse ``JOB_LANE_WEIGHTS`` such as ``interactive=6,scheduled=3,bulk=1``."""
+
+    weights = dict(DEFAULT_LANE_WEIGHTS)
+    raw = os.getenv("JOB_LANE_WEIGHTS")
+    if not raw:
+        return weights
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name in weights:
+            try:
+                weights[name] = max(int(value), 0)
+            except ValueError:
+                logger.warning("Ignoring invalid JOB_LANE_WEIGHTS entry %r", part)
+    return weights
+
+
+class WeightedLaneSelector:
+    """Smooth weighted round-robin over priority lanes.
+
+    Every call to ``order`` returns all lanes, led by the lane whose turn it
+    is; over ``sum(weights)`` calls each lane leads exactly ``weight`` times,
+    interleaved rather than in bursts.  Lanes after the leader are tried when
+    the leader has nothing queued, so idle capacity is never wasted.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, int]] = None) -> None:
+        self.weights = {lane: weight for lane, weight in (weights or _lane_weights_from_env()).items() if weight > 0}
+        if not self.weights:
+            raise ValueError("At least one job lane needs a positive weight")
+        self._current = {lane: 0 for lane in self.weights}
+        self._total = sum(self.weights.values())
+
+    def order(self) -> List[str]:
+        for lane, weight in self.weights.items():
+            self._current[lane] += weight
+        leader = max(self._current, key=self._current.get)
+        self._current[leader] -= self._total
+        rest = sorted((lane for lane in self.weights if lane != leader), key=lambda lane: -self.weights[lane])
+        return [leader, *rest]
 
 
 def _utc_now() -> datetime:
@@ -85,30 +155,55 @@ class RedisQueue:
         payload: Dict[str, Any],
         headers: Dict[str, Any],
         db: Optional[Session] = None,
+        priority: str = PRIORITY_SCHEDULED,
+        dedupe_key: Optional[str] = None,
+        dedupe_ttl_seconds: int = 3600,
     ) -> str:
+        """Queue a job on the lane for ``priority`` and return its job id.
+
+        When ``dedupe_key`` is given and an earlier job with the same key is
+        still waiting to start, that job's id is returned and nothing new is
+        queued.  The key is released as soon as a worker picks the job up.
+        """
+
+        stream = lane_stream(priority)
         job_id = str(headers.get("job_id") or uuid.uuid4())
-        created_at = _utc_now().isoformat()
-        payload_json = json.dumps(payload)
-        headers_json = json.dumps(headers)
-        workspace_id = _safe_int(payload.get("workspace_id"))
-        fields = {
-            "job_id": job_id,
-            "job_type": job_type,
-            "workspace_id": str(workspace_id) if workspace_id is not None else "",
-            "payload_json": payload_json,
-            "headers_json": headers_json,
-            "attempt": "0",
-            "created_at": created_at,
-        }
-
-        # Try to mirror job to DB (resilient to missing tables)
-        db_mirror_success = self._try_mirror_to_db(
-            job_id, job_type, workspace_id, headers, payload, db
-        )
+        if dedupe_key:
+            existing = self._claim_dedupe_key(dedupe_key, job_id, dedupe_ttl_seconds)
+            if existing is not None:
+                logger.info("Collapsed duplicate %s job onto %s (dedupe key %s)", job_type, existing, dedupe_key)
+                return existing
+
+        try:
+            created_at = _utc_now().isoformat()
+            payload_json = json.dumps(payload)
+            headers_json = json.dumps(headers)
+            workspace_id = _safe_int(payload.get("workspace_id"))
+            fields = {
+                "job_id": job_id,
+                "job_type": job_type,
+                "workspace_id": str(workspace_id) if workspace_id is not None else "",
+                "payload_json": payload_json,
+                "headers_json": headers_json,
+                "attempt": "0",
+                "created_at": created_at,
+                "priority": priority,
+            }
+            if dedupe_key:
+                fields["dedupe_key"] = dedupe_key
 
-        # Enqueue to Redis (this is the critical path)
-        self.ensure_group()
-        entry_id = self.redis.xadd(STREAM_NAME, fields)
+            # Try to mirror job to DB (resilient to missing tables)
+            db_mirror_success = self._try_mirror_to_db(
+                job_id, job_type, workspace_id, headers, payload, db, stream=stream
+            )
+
+            # Enqueue to Redis (this is the critical path)
+            self.ensure_group(stream)
+            entry_id = self.redis.xadd(stream, fields)
+        except Exception:
+            # Nothing was queued; a retry must not collapse onto this job id.
+            self.release_dedupe_key(dedupe_key, job_id)
+            raise
 
         # Update DB entry with Redis entry ID if mirroring succeeded
         if db_mirror_success:
@@ -116,6 +211,72 @@ class RedisQueue:
 
         return job_id
 
+    def _claim_dedupe_key(self, dedupe_key: str, job_id: str, ttl_seconds: int) -> Optional[str]:
+        """Reserve ``dedupe_key`` for ``job_id``; return the holder's id if taken."""
+
+        redis_client = self.redis
+        if not hasattr(redis_client, "set"):
+            return None
+        key = DEDUPE_KEY_TEMPLATE.format(key=dedupe_key)
+        if redis_client.set(key, job_id, nx=True, ex=ttl_seconds):
+            return None
+        existing = redis_client.get(key)
+        if isinstance(existing, bytes):
+            existing = existing.decode()
+        if not existing:
+            # Expired between SET and GET; take it over.
+            redis_client.set(key, job_id, ex=ttl_seconds)
+            return None
+        return existing
+
+    def release_dedupe_key(self, dedupe_key: Optional[str], job_id: str) -> None:
+        if not dedupe_key:
+            return
+        redis_client = self.redis
+        if not hasattr(redis_client, "get"):
+            return
+        key = DEDUPE_KEY_TEMPLATE.format(key=dedupe_key)
+        holder = redis_client.get(key)
+        if isinstance(holder, bytes):
+            holder = holder.decode()
+        # Only release our own reservation; the key may have expired and been
+        # taken by a newer job in the meantime.
+        if holder == job_id:
+            redis_client.delete(key)
+
+    def acquire_workspace_slot(self, workspace_id: Optional[int], limit: int, ttl_seconds: int = 3 * 3600) -> bool:
+        """Take one of ``limit`` in-flight slots for the workspace.
+
+        INCR is atomic, so concurrent workers can never both see a free slot;
+        a worker that overshoots gives its increment straight back.  The
+        counter expires after ``ttl_seconds`` so slots leaked by a crashed
+        worker heal on their own.  ``limit <= 0`` and clients without INCR
+        (test doubles) disable the cap.
+        """
+
+        if workspace_id is None or limit <= 0:
+            return True
+        redis_client = self.redis
+        if not hasattr(redis_client, "incr"):
+            return True
+        key = INFLIGHT_KEY_TEMPLATE.format(workspace_id=workspace_id)
+        current = int(redis_client.incr(key))
+        redis_client.expire(key, ttl_seconds)
+        if current > limit:
+            redis_client.decr(key)
+            return False
+        return True
+
+    def release_workspace_slot(self, workspace_id: Optional[int], limit: int) -> None:
+        if workspace_id is None or limit <= 0:
+            return
+        redis_client = self.redis
+        if not hasattr(redis_client, "decr"):
+            return
+        # Left at zero rather than deleted so a racing INCR is never lost;
+        # the TTL removes idle counters.
+        redis_client.decr(INFLIGHT_KEY_TEMPLATE.format(workspace_id=workspace_id))
+
     def _try_mirror_to_db(
         self,
         job_id: str,
@@ -124,6 +285,7 @@ class RedisQueue:
         headers: Dict[str, Any],
         payload: Dict[str, Any],
         db: Optional[Session] = None,
+        stream: str = STREAM_NAME,
     ) -> bool:
         """Try to mirror job to DB. Returns True on success, False if tables missing."""
         global _db_mirror_warning_logged
@@ -136,7 +298,7 @@ class RedisQueue:
                 workspace_id=workspace_id,
                 status="queued",
                 attempts=0,
-                redis_stream=STREAM_NAME,
+                redis_stream=stream,
                 created_at=_utc_now(),
                 updated_at=_utc_now(),
             )
@@ -207,19 +369,63 @@ class RedisQueue:
         group: str = CONSUMER_GROUP,
         consumer: Optional[str] = None,
         count: int = 1,
-        block_ms: int = 2000,
+        block_ms: Optional[int] = 2000,
     ) -> List[QueueEntry]:
-        self.ensure_group(stream, group)
+        return self.read_streams([stream], group, consumer, count, block_ms)
+
+    def read_streams(
+        self,
+        streams: List[str],
+        group: str = CONSUMER_GROUP,
+        consumer: Optional[str] = None,
+        count: int = 1,
+        block_ms: Optional[int] = 2000,
+    ) -> List[QueueEntry]:
+        """XREADGROUP over several streams; ``block_ms=None`` never blocks."""
+
+        for stream in streams:
+            self.ensure_group(stream, group)
         consumer_name = consumer or os.getenv("HOSTNAME") or socket.gethostname()
         response = self.redis.xreadgroup(
             group,
             consumer_name,
-            streams={stream: ">"},
+            streams={stream: ">" for stream in streams},
             count=count,
             block=block_ms,
         )
         return _parse_stream_response(response)
 
+    def read_weighted(
+        self,
+        selector: WeightedLaneSelector,
+        group: str = CONSUMER_GROUP,
+        consumer: Optional[str] = None,
+        count: int = 1,
+        block_ms: Optional[int] = 2000,
+    ) -> List[QueueEntry]:
+        """Read up to ``count`` entries one at a time in weighted lane order.
+
+        Each pick asks the selector which lane leads and takes a single entry
+        from the first non-empty lane in that order, so a deep bulk backlog
+        only ever gets its weighted share.  If every lane is empty the call
+        blocks on all lanes at once for at most ``block_ms``.
+        """
+
+        lanes = list(selector.weights)
+        entries: List[QueueEntry] = []
+        for _ in range(count):
+            picked: List[QueueEntry] = []
+            for lane in selector.order():
+                picked = self.read(lane_stream(lane), group, consumer, count=1, block_ms=None)
+                if picked:
+                    break
+            if not picked:
+                break
+            entries.extend(picked)
+        if entries or not block_ms:
+            return entries
+        return self.read_streams([lane_stream(lane) for lane in lanes], group, consumer, count=1, block_ms=block_ms)
+
     def claim(
         self,
         stream: str = STREAM_NAME,
@@ -233,7 +439,8 @@ class RedisQueue:
         redis_client = self.redis
 
         if hasattr(redis_client, "xautoclaim"):
-            _, messages, _ = redis_client.xautoclaim(
+            # Redis 7 appends a list of deleted ids to the (cursor, messages) reply.
+            response = redis_client.xautoclaim(
                 stream,
                 group,
                 consumer_name,
@@ -241,7 +448,12 @@ class RedisQueue:
                 start_id="0-0",
                 count=len(entry_ids) if entry_ids else 10,
             )
-            return [QueueEntry(entry_id, _decode_fields(fields)) for entry_id, fields in messages]
+            messages = response[1]
+            return [
+                QueueEntry(entry_id, _decode_fields(fields), stream)
+                for entry_id, fields in messages
+                if fields is not None
+            ]
 
         if entry_ids is None:
             pending = redis_client.xpending_range(
@@ -263,7 +475,7 @@ class RedisQueue:
                 entry_ids,
             )
             for entry_id, fields in claimed:
-                entries.append(QueueEntry(entry_id, _decode_fields(fields)))
+                entries.append(QueueEntry(entry_id, _decode_fields(fields), stream))
         return entries
 
     def ack(self, stream: str, group: str, entry_id: str) -> None:
@@ -279,16 +491,18 @@ class RedisQueue:
         )
         return self.redis.xadd(DLQ_STREAM_NAME, payload)
 
-    def requeue(self, fields: Dict[str, Any]) -> str:
-        self.ensure_group()
-        return self.redis.xadd(STREAM_NAME, fields)
+    def requeue(self, fields: Dict[str, Any], stream: str = STREAM_NAME) -> str:
+        self.ensure_group(stream)
+        return self.redis.xadd(stream, fields)
 
 
 def _parse_stream_response(response: Iterable) -> List[QueueEntry]:
     entries: List[QueueEntry] = []
-    for _stream_name, stream_entries in response or []:
+    for stream_name, stream_entries in response or []:
+        if isinstance(stream_name, bytes):
+            stream_name = stream_name.decode()
         for entry_id, fields in stream_entries:
-            entries.append(QueueEntry(entry_id, _decode_fields(fields)))
+            entries.append(QueueEntry(entry_id, _decode_fields(fields), stream_name))
     return entries
 
 
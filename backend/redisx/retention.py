@@ -0,0 +1,501 @@
+"""Retention, archival and metrics for the Redis event and job streams.
+
+Streams are trimmed by a periodic sweep rather than with ``XADD MAXLEN``:
+trimming at write time cannot see consumer groups, so it would happily drop
+entries that a worker has not acknowledged yet.  The sweep computes an
+"ack floor" per stream (the oldest entry still pending or not yet delivered
+to some group), archives everything older than the policy cutoff and below
+that floor, and only then issues an approximate ``XTRIM MINID``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import fnmatch
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_JSONL = "jsonl"
+ARCHIVE_FORMAT_PARQUET = "parquet"
+WORKSPACE_STREAM_PATTERN = "events:workspace:*"
+SCAN_BATCH_SIZE = 1000
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("Invalid integer for %s=%r; using %s", name, raw, default)
+        return default
+    return value if value > 0 else None
+
+
+@dataclass(frozen=True)
+class StreamRetentionPolicy:
+    """Retention rule for a family of streams matched by a glob pattern."""
+
+    pattern: str
+    maxlen: Optional[int] = None
+    max_age_seconds: Optional[int] = None
+    archive: bool = True
+    approximate: bool = True
+
+    def matches(self, stream: str) -> bool:
+        return fnmatch.fnmatchcase(stream, self.pattern)
+
+
+def default_policies() -> List[StreamRetentionPolicy]:
+    """Policies for the known stream families, overridable through env vars."""
+
+    return [
+        StreamRetentionPolicy(
+            pattern="events:global",
+            maxlen=_env_int("EVENTS_GLOBAL_STREAM_MAXLEN", 200_000),
+            max_age_seconds=_env_int("EVENTS_GLOBAL_STREAM_MAX_AGE_SECONDS", 7 * 24 * 3600),
+        ),
+        StreamRetentionPolicy(
+            pattern=WORKSPACE_STREAM_PATTERN,
+            maxlen=_env_int("EVENTS_WORKSPACE_STREAM_MAXLEN", 20_000),
+            max_age_seconds=_env_int("EVENTS_WORKSPACE_STREAM_MAX_AGE_SECONDS", 7 * 24 * 3600),
+        ),
+        *(
+            StreamRetentionPolicy(
+                pattern=lane,
+                maxlen=_env_int("JOBS_STREAM_MAXLEN", 50_000),
+                max_age_seconds=_env_int("JOBS_STREAM_MAX_AGE_SECONDS", 3 * 24 * 3600),
+            )
+            for lane in ("jobs:interactive", "jobs:main", "jobs:bulk")
+        ),
+        StreamRetentionPolicy(
+            pattern="jobs:dlq",
+            maxlen=_env_int("JOBS_DLQ_STREAM_MAXLEN", 10_000),
+            max_age_seconds=_env_int("JOBS_DLQ_STREAM_MAX_AGE_SECONDS", 30 * 24 * 3600),
+        ),
+    ]
+
+
+def parse_stream_id(entry_id: Any) -> Tuple[int, int]:
+    """Return ``(ms, seq)`` for a Redis stream id so ids compare numerically."""
+
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    text = str(entry_id)
+    ms, _, seq = text.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def format_stream_id(parsed: Tuple[int, int]) -> str:
+    return f"{parsed[0]}-{parsed[1]}"
+
+
+def next_stream_id(entry_id: Any) -> str:
+    ms, seq = parse_stream_id(entry_id)
+    return format_stream_id((ms, seq + 1))
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+def _decode_fields(fields: Dict[Any, Any]) -> Dict[str, Any]:
+    return {str(_decode(key)): _decode(value) for key, value in (fields or {}).items()}
+
+
+def _safe_stream_dirname(stream: str) -> str:
+    return stream.replace(":", "_").replace("/", "_")
+
+
+@dataclass
+class TrimResult:
+    stream: str
+    length_before: int
+    trimmed: int = 0
+    archived: int = 0
+    ack_floor: Optional[str] = None
+    min_id: Optional[str] = None
+    archive_files: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stream": self.stream,
+            "length_before": self.length_before,
+            "trimmed": self.trimmed,
+            "archived": self.archived,
+            "ack_floor": self.ack_floor,
+            "min_id": self.min_id,
+            "archive_files": list(self.archive_files),
+        }
+
+
+class StreamArchive:
+    """Append-only archive of trimmed stream ranges on local disk.
+
+    Each trimmed range is written to its own file named after the first and
+    last entry id it contains, so the newest archived id can be recovered from
+    the directory listing alone and replays can read files in id order.
+    """
+
+    def __init__(self, root: Optional[str | Path] = None, fmt: Optional[str] = None) -> None:
+        self.root = Path(root or os.getenv("STREAM_ARCHIVE_DIR", "backend/data/stream_archive"))
+        requested = (fmt or os.getenv("STREAM_ARCHIVE_FORMAT", ARCHIVE_FORMAT_JSONL)).lower()
+        if requested == ARCHIVE_FORMAT_PARQUET and not _parquet_available():
+            logger.warning("pyarrow not installed; archiving streams as compressed JSONL instead of Parquet")
+            requested = ARCHIVE_FORMAT_JSONL
+        if requested not in {ARCHIVE_FORMAT_JSONL, ARCHIVE_FORMAT_PARQUET}:
+            logger.warning("Unknown STREAM_ARCHIVE_FORMAT %r; using jsonl", requested)
+            requested = ARCHIVE_FORMAT_JSONL
+        self.format = requested
+
+    def stream_dir(self, stream: str) -> Path:
+        return self.root / _safe_stream_dirname(stream)
+
+    def _archive_files(self, stream: str) -> List[Tuple[Tuple[int, int], Tuple[int, int], Path]]:
+        directory = self.stream_dir(stream)
+        if not directory.exists():
+            return []
+        files = []
+        for path in directory.iterdir():
+            name = path.name
+            if name.endswith(".jsonl.gz"):
+                stem = name[: -len(".jsonl.gz")]
+            elif name.endswith(".parquet"):
+                stem = name[: -len(".parquet")]
+            else:
+                continue
+            first, sep, last = stem.partition("__")
+            if not sep:
+                continue
+            try:
+                files.append((parse_stream_id(first), parse_stream_id(last), path))
+            except ValueError:
+                continue
+        files.sort(key=lambda item: item[0])
+        return files
+
+    def last_archived_id(self, stream: str) -> Optional[str]:
+        files = self._archive_files(stream)
+        if not files:
+            return None
+        return format_stream_id(max(last for _, last, _ in files))
+
+    def write(self, stream: str, entries: Sequence[Tuple[str, Dict[str, Any]]]) -> Optional[Path]:
+        if not entries:
+            return None
+        directory = self.stream_dir(stream)
+        directory.mkdir(parents=True, exist_ok=True)
+        first_id, last_id = entries[0][0], entries[-1][0]
+        suffix = ".parquet" if self.format == ARCHIVE_FORMAT_PARQUET else ".jsonl.gz"
+        target = directory / f"{first_id}__{last_id}{suffix}"
+        tmp_path = target.with_name(target.name + ".tmp")
+        if self.format == ARCHIVE_FORMAT_PARQUET:
+            _write_parquet(tmp_path, stream, entries)
+        else:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                for entry_id, fields in entries:
+                    handle.write(json.dumps({"stream": stream, "id": entry_id, "fields": fields}, ensure_ascii=False))
+                    handle.write("\n")
+        os.replace(tmp_path, target)
+        return target
+
+    def iter_entries(
+        self,
+        stream: str,
+        after_id: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield archived ``(entry_id, fields)`` pairs in id order."""
+
+        floor = parse_stream_id(after_id) if after_id else None
+        for _, last, path in self._archive_files(stream):
+            if floor is not None and last <= floor:
+                continue
+            if path.name.endswith(".parquet"):
+                rows = _read_parquet(path)
+            else:
+                rows = _read_jsonl(path)
+            for entry_id, fields in rows:
+                if floor is not None and parse_stream_id(entry_id) <= floor:
+                    continue
+                yield entry_id, fields
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # type: ignore  # noqa: F401
+        import pyarrow.parquet  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _write_parquet(path: Path, stream: str, entries: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    table = pa.table(
+        {
+            "stream": [stream] * len(entries),
+            "id": [entry_id for entry_id, _ in entries],
+            "fields_json": [json.dumps(fields, ensure_ascii=False) for _, fields in entries],
+        }
+    )
+    pq.write_table(table, path, compression="zstd")
+
+
+def _read_parquet(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    import pyarrow.parquet as pq  # type: ignore
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(columns=["id", "fields_json"]):
+        ids = batch.column(0).to_pylist()
+        payloads = batch.column(1).to_pylist()
+        for entry_id, payload in zip(ids, payloads):
+            yield entry_id, json.loads(payload)
+
+
+def _read_jsonl(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            yield record["id"], record.get("fields") or {}
+
+
+class StreamRetention:
+    """Applies retention policies to Redis streams without losing unacked work."""
+
+    def __init__(
+        self,
+        redis_client: Optional[object] = None,
+        redis_url: Optional[str] = None,
+        policies: Optional[Sequence[StreamRetentionPolicy]] = None,
+        archive: Optional[StreamArchive] = None,
+        batch_size: int = SCAN_BATCH_SIZE,
+        time_fn=time.time,
+    ) -> None:
+        self._redis = redis_client
+        self._redis_url = redis_url or os.getenv("REDIS_URL")
+        self.policies = list(policies) if policies is not None else default_policies()
+        self.archive = archive if archive is not None else StreamArchive()
+        self.batch_size = batch_size
+        self._time_fn = time_fn
+
+    def connect(self) -> object:
+        if self._redis is not None:
+            return self._redis
+        if not self._redis_url:
+            raise RuntimeError("REDIS_URL is not configured for stream retention.")
+        try:
+            import redis  # type: ignore
+
+            client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+            if hasattr(client, "ping"):
+                client.ping()
+            self._redis = client
+            return client
+        except Exception as exc:
+            raise RuntimeError(f"Redis unavailable for stream retention: {exc}") from exc
+
+    @property
+    def redis(self) -> object:
+        return self.connect()
+
+    def policy_for(self, stream: str) -> Optional[StreamRetentionPolicy]:
+        for policy in self.policies:
+            if policy.matches(stream):
+                return policy
+        return None
+
+    def discover_streams(self) -> List[str]:
+        """Return every existing stream that one of the policies applies to."""
+
+        streams: List[str] = []
+        for policy in self.policies:
+            if any(char in policy.pattern for char in "*?["):
+                for key in self.redis.scan_iter(match=policy.pattern, count=SCAN_BATCH_SIZE):
+                    key = _decode(key)
+                    if key not in streams:
+                        streams.append(key)
+            elif self.redis.exists(policy.pattern) and policy.pattern not in streams:
+                streams.append(policy.pattern)
+        return streams
+
+    def ack_floor(self, stream: str) -> Optional[str]:
+        """Oldest entry id some consumer group still needs, or ``None``.
+
+        For each group this is the smallest pending id, or the id right after
+        ``last-delivered-id`` when nothing is pending.  Entries strictly below
+        the minimum across groups have been acknowledged by every group.
+        """
+
+        try:
+            groups = self.redis.xinfo_groups(stream)
+        except Exception as exc:
+            if "no such key" in str(exc).lower():
+                return None
+            raise
+        floor: Optional[Tuple[int, int]] = None
+        for group in groups or []:
+            info = _decode_fields(group)
+            name = info.get("name")
+            candidate: Optional[Tuple[int, int]] = None
+            if int(info.get("pending") or 0) > 0:
+                summary = self.redis.xpending(stream, name)
+                min_pending = _decode((summary or {}).get("min"))
+                if min_pending:
+                    candidate = parse_stream_id(min_pending)
+            if candidate is None:
+                last_delivered = info.get("last-delivered-id") or "0-0"
+                candidate = parse_stream_id(next_stream_id(last_delivered))
+            if floor is None or candidate < floor:
+                floor = candidate
+        return format_stream_id(floor) if floor is not None else None
+
+    def trim_stream(self, stream: str, policy: Optional[StreamRetentionPolicy] = None) -> TrimResult:
+        policy = policy or self.policy_for(stream)
+        redis_client = self.redis
+        length = int(redis_client.xlen(stream) or 0)
+        result = TrimResult(stream=stream, length_before=length)
+        if policy is None or length == 0:
+            return result
+
+        excess = max(length - policy.maxlen, 0) if policy.maxlen else 0
+        age_cutoff: Optional[Tuple[int, int]] = None
+        if policy.max_age_seconds:
+            age_cutoff = (int((self._time_fn() - policy.max_age_seconds) * 1000), 0)
+        if excess == 0 and age_cutoff is None:
+            return result
+
+        floor_id = self.ack_floor(stream)
+        result.ack_floor = floor_id
+        floor = parse_stream_id(floor_id) if floor_id else None
+        archived_upto = None
+        if policy.archive:
+            last_archived = self.archive.last_archived_id(stream)
+            archived_upto = parse_stream_id(last_archived) if last_archived else None
+
+        boundary: Optional[str] = None
+        removable = 0
+        start = "-"
+        done = False
+        while not done:
+            batch = redis_client.xrange(stream, min=start, max="+", count=self.batch_size)
+            if not batch:
+                break
+            to_archive: List[Tuple[str, Dict[str, Any]]] = []
+            for entry_id, fields in batch:
+                entry_id = _decode(entry_id)
+                parsed = parse_stream_id(entry_id)
+                expired = removable < excess or (age_cutoff is not None and parsed < age_cutoff)
+                if not expired or (floor is not None and parsed >= floor):
+                    boundary = entry_id
+                    done = True
+                    break
+                removable += 1
+                if policy.archive and (archived_upto is None or parsed > archived_upto):
+                    to_archive.append((entry_id, _decode_fields(fields)))
+            if to_archive:
+                path = self.archive.write(stream, to_archive)
+                result.archived += len(to_archive)
+                if path is not None:
+                    result.archive_files.append(str(path))
+            if not done:
+                last_id = _decode(batch[-1][0])
+                start = next_stream_id(last_id)
+                boundary = start
+                if len(batch) < self.batch_size:
+                    break
+
+        if removable == 0 or boundary is None:
+            return result
+
+        result.min_id = boundary
+        result.trimmed = int(redis_client.xtrim(stream, minid=boundary, approximate=policy.approximate) or 0)
+        return result
+
+    def sweep(self) -> List[TrimResult]:
+        results: List[TrimResult] = []
+        for stream in self.discover_streams():
+            try:
+                results.append(self.trim_stream(stream))
+            except Exception as exc:
+                logger.warning("Stream retention failed for %s: %s", stream, exc)
+        return results
+
+    def stream_metrics(self, stream: str) -> Dict[str, Any]:
+        """Length, PEL size and lag per consumer group for ``stream``."""
+
+        redis_client = self.redis
+        try:
+            info = _decode_fields(redis_client.xinfo_stream(stream))
+        except Exception as exc:
+            if "no such key" in str(exc).lower():
+                return {"stream": stream, "exists": False, "length": 0, "groups": []}
+            raise
+
+        first_entry = info.get("first-entry")
+        last_entry = info.get("last-entry")
+        groups = []
+        for group in redis_client.xinfo_groups(stream) or []:
+            group_info = _decode_fields(group)
+            lag = group_info.get("lag")
+            if lag is None:
+                lag = self._count_after(stream, group_info.get("last-delivered-id") or "0-0")
+            groups.append(
+                {
+                    "name": group_info.get("name"),
+                    "consumers": int(group_info.get("consumers") or 0),
+                    "pending": int(group_info.get("pending") or 0),
+                    "last_delivered_id": group_info.get("last-delivered-id"),
+                    "lag": int(lag) if lag is not None else None,
+                }
+            )
+        policy = self.policy_for(stream)
+        return {
+            "stream": stream,
+            "exists": True,
+            "length": int(info.get("length") or 0),
+            "first_entry_id": _decode(first_entry[0]) if first_entry else None,
+            "last_entry_id": _decode(last_entry[0]) if last_entry else None,
+            "pending_total": sum(group["pending"] for group in groups),
+            "groups": groups,
+            "policy": (
+                {
+                    "pattern": policy.pattern,
+                    "maxlen": policy.maxlen,
+                    "max_age_seconds": policy.max_age_seconds,
+                }
+                if policy
+                else None
+            ),
+            "last_archived_id": self.archive.last_archived_id(stream),
+        }
+
+    def _count_after(self, stream: str, last_delivered_id: str) -> Optional[int]:
+        # Redis < 7 has no "lag" field; count undelivered entries in pages.
+        total = 0
+        start = next_stream_id(last_delivered_id)
+        while True:
+            batch = self.redis.xrange(stream, min=start, max="+", count=self.batch_size)
+            if not batch:
+                return total
+            total += len(batch)
+            if len(batch) < self.batch_size:
+                return total
+            start = next_stream_id(_decode(batch[-1][0]))
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [self.stream_metrics(stream) for stream in self.discover_streams()]
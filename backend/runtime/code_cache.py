@@ -0,0 +1,213 @@
+"""AST validation and compiled-code cache for runtime executions.
+
+Generated code is validated with a single walk over its syntax tree instead
+of repeated substring scans, and the verdict is cached together with the
+compiled code object, keyed by a hash of the source.  Template code and
+repeated dashboard queries therefore skip parsing, validation and
+compilation after the first run.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import os
+import threading
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.runtime.sandbox import APPROVED_MODULES, FORBIDDEN_PATTERNS
+
+# The sandbox's reference list names call patterns ("eval(", "globals()") and
+# module prefixes ("os."); the walk below matches the bare names.  Dunder
+# entries are covered by the general dunder check.
+FORBIDDEN_NAMES = frozenset(
+    {pattern.rstrip("()") for pattern in FORBIDDEN_PATTERNS if pattern.endswith("(") or pattern.endswith("()")}
+    | {"__import__", "vars", "breakpoint"}
+)
+
+# Modules that must not be referenced even if smuggled in through context.
+FORBIDDEN_MODULE_NAMES = frozenset(pattern[:-1] for pattern in FORBIDDEN_PATTERNS if pattern.endswith("."))
+
+# Attributes used to walk from an object to frames, globals or classes.
+DANGEROUS_ATTRIBUTES = frozenset(
+    {"mro", "f_globals", "f_locals", "f_builtins", "f_back", "gi_frame", "gi_code", "cr_frame", "tb_frame"}
+)
+
+# Dunders with no path to interpreter internals.
+SAFE_DUNDERS = frozenset({"__name__"})
+
+CODE_FILENAME = "<sandbox>"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _is_dunder(name: str) -> bool:
+    return len(name) > 4 and name.startswith("__") and name.endswith("__") and name not in SAFE_DUNDERS
+
+
+@dataclass(frozen=True)
+class CodeAnalysis:
+    """Validation verdict for one piece of source, plus its code object."""
+
+    is_safe: bool
+    violations: Tuple[str, ...]
+    approved_imports: Tuple[str, ...]
+    forbidden_imports: Tuple[str, ...]
+    code_object: Optional[CodeType] = field(default=None, compare=False, repr=False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "is_safe": self.is_safe,
+            "violations": list(self.violations),
+            "approved_imports": list(self.approved_imports),
+            "forbidden_imports": list(self.forbidden_imports),
+        }
+
+
+class _SafetyVisitor(ast.NodeVisitor):
+    def __init__(self) -> None:
+        self.violations: List[str] = []
+        self.approved: List[str] = []
+        self.forbidden: List[str] = []
+
+    def _violation(self, message: str) -> None:
+        if message not in self.violations:
+            self.violations.append(message)
+
+    def _check_module(self, name: str) -> None:
+        module = name.split(".")[0]
+        if module in APPROVED_MODULES:
+            if module not in self.approved:
+                self.approved.append(module)
+        else:
+            if module not in self.forbidden:
+                self.forbidden.append(module)
+            self._violation(f"Forbidden import: {module}")
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._check_module(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.level:
+            self._violation("Forbidden import: relative import")
+        elif node.module:
+            self._check_module(node.module)
+        for alias in node.names:
+            if _is_dunder(alias.name):
+                self._violation(f"Dangerous pattern: {alias.name}")
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id in FORBIDDEN_NAMES:
+            self._violation(f"Forbidden pattern: {node.id}")
+        elif node.id in FORBIDDEN_MODULE_NAMES:
+            self._violation(f"Forbidden module: {node.id}")
+        elif _is_dunder(node.id):
+            self._violation(f"Dangerous pattern: {node.id}")
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        # Approved libraries re-export modules and builtins as attributes
+        # (``pd.io.common.os``), so attribute names are checked like names.
+        if node.attr in FORBIDDEN_NAMES:
+            self._violation(f"Forbidden pattern: {node.attr}")
+        elif node.attr in FORBIDDEN_MODULE_NAMES:
+            self._violation(f"Forbidden module: {node.attr}")
+        elif _is_dunder(node.attr) or node.attr in DANGEROUS_ATTRIBUTES:
+            self._violation(f"Dangerous pattern: {node.attr}")
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # Dunders in literals reach attributes through format strings
+        # ("{0.__class__}".format(x)) or string lookups (df.agg("__class__")).
+        value = node.value
+        if (isinstance(value, str) and "__" in value) or (isinstance(value, bytes) and b"__" in value):
+            self._violation("Dangerous pattern: '__' in string literal")
+
+
+def analyze_code(code: str) -> CodeAnalysis:
+    """Parse, validate and (when safe) compile ``code`` in one pass."""
+
+    try:
+        tree = ast.parse(code, filename=CODE_FILENAME)
+    except SyntaxError as exc:
+        return CodeAnalysis(False, (f"Syntax error: {exc}",), (), ())
+    visitor = _SafetyVisitor()
+    visitor.visit(tree)
+    is_safe = not visitor.violations
+    code_object = compile(tree, CODE_FILENAME, "exec") if is_safe else None
+    return CodeAnalysis(
+        is_safe=is_safe,
+        violations=tuple(visitor.violations),
+        approved_imports=tuple(visitor.approved),
+        forbidden_imports=tuple(visitor.forbidden),
+        code_object=code_object,
+    )
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class CodeCache:
+    """Thread-safe LRU of :class:`CodeAnalysis` keyed by source hash."""
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self.maxsize = maxsize if maxsize is not None else _env_int("RUNTIME_CODE_CACHE_SIZE", 512)
+        self._entries: "OrderedDict[str, CodeAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, code: str) -> CodeAnalysis:
+        key = code_hash(code)
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+        # Parse and compile outside the lock; a racing duplicate is harmless.
+        analysis = analyze_code(code)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = analysis
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return analysis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[CodeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_code_cache() -> CodeCache:
+    """Per-process cache; sandbox workers each hold their own."""
+
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CodeCache()
+    return _cache
@@ -71,9 +71,9 @@ Example:
 import pandas as pd
 
 try:
-    # Calculate steel cost variance
-    steel_items = [item for item in boq_items if 'steel' in item.get('description', '').lower()]
-    total = sum(item.get('quantity', 0) * item.get('unit_cost', 0) for item in steel_items)
+    # Calculate steel cost variance; boq_items is a DataFrame (one row per item)
+    steel_items = boq_items[boq_items['description'].fillna('').str.lower().str.contains('steel')]
+    total = float((steel_items['quantity'] * steel_items['unit_cost']).sum())
     variance = total * 0.15
     result = {{'original': total, 'increased': total * 1.15, 'variance': variance, 'items_count': len(steel_items)}}
 except Exception as e:
@@ -166,7 +166,10 @@ class CodeGenerator:
         """Build a description of available context."""
         descriptions = []
         for key, value in context.items():
-            if isinstance(value, list):
+            if hasattr(value, "columns") and hasattr(value, "dtypes"):
+                descriptions.append(f"- {key}: pandas DataFrame with {len(value)} rows")
+                descriptions.append(f"  Columns: {list(value.columns)}")
+            elif isinstance(value, list):
                 descriptions.append(f"- {key}: List of {len(value)} items")
                 if value and isinstance(value[0], dict):
                     descriptions.append(f"  Keys: {list(value[0].keys())}")
@@ -205,14 +208,19 @@ class CodeGenerator:
     def _template_boq_sum(self, context: Dict[str, Any]) -> str:
         """Template for BOQ sum calculations."""
         return """import json
+import pandas as pd
 
 try:
     boq_items = context.get('boq_items', [])
-    total_quantity = sum(item.get('quantity', 0) for item in boq_items)
-    total_cost = sum(
-        item.get('quantity', 0) * item.get('unit_cost', 0)
-        for item in boq_items
-    )
+    if isinstance(boq_items, pd.DataFrame):
+        total_quantity = float(boq_items['quantity'].sum())
+        total_cost = float((boq_items['quantity'] * boq_items['unit_cost']).sum())
+    else:
+        total_quantity = sum(item.get('quantity', 0) for item in boq_items)
+        total_cost = sum(
+            item.get('quantity', 0) * item.get('unit_cost', 0)
+            for item in boq_items
+        )
     result = {
         'total_items': len(boq_items),
         'total_quantity': total_quantity,
@@ -238,12 +246,17 @@ except Exception as e:
         pct_match = re.search(r"(\d+(?:\.\d+)?)\s*%", query)
         percentage = float(pct_match.group(1)) / 100 if pct_match else 0.15
 
-        return f"""try:
+        return f"""import pandas as pd
+
+try:
     boq_items = context.get('boq_items', [])
-    total_cost = sum(
-        item.get('quantity', 0) * item.get('unit_cost', 0)
-        for item in boq_items
-    )
+    if isinstance(boq_items, pd.DataFrame):
+        total_cost = float((boq_items['quantity'] * boq_items['unit_cost']).sum())
+    else:
+        total_cost = sum(
+            item.get('quantity', 0) * item.get('unit_cost', 0)
+            for item in boq_items
+        )
     percentage = {percentage}
     variance = total_cost * percentage
     result = {{
@@ -259,11 +272,14 @@ except Exception as e:
     def _template_monte_carlo(self, context: Dict[str, Any]) -> str:
         """Template for Monte Carlo simulation."""
         return """import numpy as np
+import pandas as pd
 import statistics
 
 try:
     values = context.get('values', context.get('boq_items', []))
-    if isinstance(values, list) and values and isinstance(values[0], dict):
+    if isinstance(values, pd.DataFrame):
+        values = (values['quantity'] * values['unit_cost']).tolist()
+    elif isinstance(values, list) and values and isinstance(values[0], dict):
         values = [item.get('quantity', 0) * item.get('unit_cost', 0) for item in values]
 
     iterations = min(context.get('iterations', 1000), 10000)
@@ -289,13 +305,17 @@ except Exception as e:
 
     def _template_average(self, context: Dict[str, Any]) -> str:
         """Template for average calculations."""
-        return """import statistics
+        return """import pandas as pd
+import statistics
 
 try:
     values = context.get('values', [])
     if not values:
         boq_items = context.get('boq_items', [])
-        values = [item.get('quantity', 0) for item in boq_items]
+        if isinstance(boq_items, pd.DataFrame):
+            values = boq_items['quantity'].tolist()
+        else:
+            values = [item.get('quantity', 0) for item in boq_items]
 
     if values:
         result = {
@@ -311,10 +331,14 @@ except Exception as e:
 
     def _template_context_summary(self, context: Dict[str, Any]) -> str:
         """Template that summarizes available context."""
-        return """try:
+        return """import pandas as pd
+
+try:
     summary = {}
     for key, value in context.items():
-        if isinstance(value, list):
+        if isinstance(value, pd.DataFrame):
+            summary[key] = {'type': 'frame', 'count': len(value), 'columns': list(value.columns)}
+        elif isinstance(value, list):
             summary[key] = {'type': 'list', 'count': len(value)}
         elif isinstance(value, dict):
             summary[key] = {'type': 'dict', 'keys': list(value.keys())}
@@ -334,44 +358,9 @@ except Exception as e:
         Returns:
             Dictionary with validation results.
         """
-        violations = []
-        approved_imports = []
-        forbidden_imports = []
-
-        # Check for forbidden patterns
-        for pattern in FORBIDDEN_PATTERNS:
-            if pattern in code:
-                violations.append(f"Forbidden pattern: {pattern}")
+        from backend.runtime.code_cache import get_code_cache
 
-        # Parse and check imports
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        module = alias.name.split(".")[0]
-                        if module in APPROVED_MODULES:
-                            approved_imports.append(module)
-                        else:
-                            forbidden_imports.append(module)
-                            violations.append(f"Forbidden import: {module}")
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        module = node.module.split(".")[0]
-                        if module in APPROVED_MODULES:
-                            approved_imports.append(module)
-                        else:
-                            forbidden_imports.append(module)
-                            violations.append(f"Forbidden import: {module}")
-        except SyntaxError as e:
-            violations.append(f"Syntax error: {e}")
-
-        return {
-            "is_safe": len(violations) == 0,
-            "violations": violations,
-            "approved_imports": list(set(approved_imports)),
-            "forbidden_imports": list(set(forbidden_imports)),
-        }
+        return get_code_cache().analyze(code).as_dict()
 
     def extract_imports(self, code: str) -> List[str]:
         """Extract import statements from code.
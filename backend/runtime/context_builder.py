@@ -1,10 +1,21 @@
-"""Context builder for assembling project data for code execution."""
+"""Context builder for assembling project data for code execution.
+
+Project datasets are fetched concurrently, each on its own connection, and
+returned as pandas DataFrames built straight from the result rows, so large
+BOQs reach sandboxed code without per-row dict building or float conversion.
+Fetched datasets are cached per project (see ``context_cache``) until a
+hydration or ``project.updated`` signal invalidates them.
+"""
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from backend.runtime.context_cache import ProjectContextCache, get_context_cache
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +28,64 @@ DATA_KEYWORDS: Dict[str, Set[str]] = {
     "variation": {"variation", "change", "vo", "change order"},
 }
 
+# Context key each data type is exposed under.
+CONTEXT_KEYS: Dict[str, str] = {
+    "boq": "boq_items",
+    "schedule": "tasks",
+    "cost": "cost_data",
+    "payment": "payments",
+    "variation": "variations",
+}
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or len(value) == 0
+
+
+def _frame(result, numeric: tuple = ()):
+    """DataFrame of a result set; ``numeric`` columns become floats with NULL -> 0."""
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
+    for column in numeric:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0).astype(float)
+    return frame
+
 
 class ContextBuilder:
     """Builds execution context by fetching relevant project data."""
 
-    def __init__(self, db_session=None):
+    def __init__(
+        self,
+        db_session=None,
+        cache: Optional[ProjectContextCache] = None,
+        columnar: Optional[bool] = None,
+        max_workers: int = 5,
+    ):
         """Initialize the context builder.
 
         Args:
             db_session: Optional database session for fetching data.
+            cache: Per-project context cache (defaults to the process-wide one).
+            columnar: Return DataFrames instead of lists of dicts
+                (``RUNTIME_CONTEXT_COLUMNAR``, default on).
+            max_workers: Upper bound on concurrent fetches.
         """
         self._db = db_session
+        self._cache = cache
+        self._columnar = columnar if columnar is not None else _env_flag("RUNTIME_CONTEXT_COLUMNAR", True)
+        self._max_workers = max(1, max_workers)
+
+    @property
+    def cache(self) -> ProjectContextCache:
+        return self._cache if self._cache is not None else get_context_cache()
 
     def build_context(
         self,
@@ -54,36 +112,76 @@ class ContextBuilder:
 
         # Fetch project data if project_id provided
         if project_id and db:
-            if "boq" in required_data:
-                context["boq_items"] = self._fetch_boq_data(project_id, db)
-
-            if "schedule" in required_data:
-                context["tasks"] = self._fetch_schedule_data(project_id, db)
-
-            if "cost" in required_data:
-                context["cost_data"] = self._fetch_cost_data(project_id, db)
-
-            if "payment" in required_data:
-                context["payments"] = self._fetch_payment_data(project_id, db)
-
-            if "variation" in required_data:
-                context["variations"] = self._fetch_variation_data(project_id, db)
+            context.update(self._fetch_project_data(project_id, required_data, db))
 
         # Add utility context
         context["project_id"] = project_id
 
         # Add sample/mock data if no real data available
-        if not context.get("boq_items") and "boq" in required_data:
+        if _is_empty(context.get("boq_items")) and "boq" in required_data:
             context["boq_items"] = self._get_sample_boq_data()
 
-        if not context.get("tasks") and "schedule" in required_data:
+        if _is_empty(context.get("tasks")) and "schedule" in required_data:
             context["tasks"] = self._get_sample_schedule_data()
 
-        if not context.get("cost_data") and "cost" in required_data:
+        if _is_empty(context.get("cost_data")) and "cost" in required_data:
             context["cost_data"] = self._get_sample_cost_data()
 
         return context
 
+    def _fetchers(self) -> Dict[str, Callable[[int, Any], Any]]:
+        return {
+            "boq": self._fetch_boq_data,
+            "schedule": self._fetch_schedule_data,
+            "cost": self._fetch_cost_data,
+            "payment": self._fetch_payment_data,
+            "variation": self._fetch_variation_data,
+        }
+
+    def _fetch_project_data(self, project_id: int, required_data: List[str], db) -> Dict[str, Any]:
+        """Cached datasets for ``required_data``, fetching the misses concurrently."""
+
+        cache = self.cache
+        version = cache.version(project_id)
+        fetchers = self._fetchers()
+        data: Dict[str, Any] = {}
+        missing: List[str] = []
+        for data_type in required_data:
+            cached = cache.get(project_id, data_type, version)
+            if cached is None:
+                missing.append(data_type)
+            else:
+                data[data_type] = cached
+
+        bind = db.get_bind() if hasattr(db, "get_bind") else None
+        # SQLite serialises access anyway, and its in-memory databases live on
+        # a single shared connection, so fetch through the session in turn.
+        parallel = len(missing) > 1 and bind is not None and bind.dialect.name != "sqlite"
+        if parallel:
+            def fetch(data_type: str) -> Any:
+                with bind.connect() as connection:
+                    return fetchers[data_type](project_id, connection)
+
+            with ThreadPoolExecutor(max_workers=min(len(missing), self._max_workers)) as pool:
+                fetched = dict(zip(missing, pool.map(fetch, missing)))
+        else:
+            fetched = {data_type: fetchers[data_type](project_id, db) for data_type in missing}
+
+        for data_type, value in fetched.items():
+            if value is None:
+                # Failed fetches are not cached; the caller falls back to samples.
+                data[data_type] = []
+            else:
+                cache.put(project_id, data_type, version, value)
+                data[data_type] = value
+
+        return {CONTEXT_KEYS[data_type]: self._present(data[data_type]) for data_type in required_data}
+
+    def _present(self, value: Any) -> Any:
+        if not self._columnar and hasattr(value, "to_dict") and hasattr(value, "columns"):
+            return value.to_dict("records")
+        return value
+
     def _detect_required_data(self, query: str) -> List[str]:
         """Detect what data types are needed based on query.
 
@@ -106,15 +204,15 @@ class ContextBuilder:
 
         return required
 
-    def _fetch_boq_data(self, project_id: int, db) -> List[Dict[str, Any]]:
+    def _fetch_boq_data(self, project_id: int, db):
         """Fetch BOQ items for project.
 
         Args:
             project_id: Project ID.
-            db: Database session.
+            db: Database session or connection.
 
         Returns:
-            List of BOQ item dictionaries.
+            DataFrame of BOQ items, or ``None`` if they could not be fetched.
         """
         try:
             # Try to query from database
@@ -128,30 +226,20 @@ class ContextBuilder:
                 """),
                 {"project_id": project_id},
             )
-            rows = result.fetchall()
-            return [
-                {
-                    "id": row[0],
-                    "description": row[1],
-                    "quantity": float(row[2]) if row[2] else 0,
-                    "unit": row[3],
-                    "unit_cost": float(row[4]) if row[4] else 0,
-                }
-                for row in rows
-            ]
+            return _frame(result, numeric=("quantity", "unit_cost"))
         except Exception as e:
             logger.warning("Could not fetch BOQ data: %s", e)
-            return self._get_sample_boq_data()
+            return None
 
-    def _fetch_schedule_data(self, project_id: int, db) -> List[Dict[str, Any]]:
+    def _fetch_schedule_data(self, project_id: int, db):
         """Fetch schedule tasks for project.
 
         Args:
             project_id: Project ID.
-            db: Database session.
+            db: Database session or connection.
 
         Returns:
-            List of task dictionaries.
+            DataFrame of tasks, or ``None`` if they could not be fetched.
         """
         try:
             from sqlalchemy import text
@@ -165,34 +253,23 @@ class ContextBuilder:
                 """),
                 {"project_id": project_id},
             )
-            rows = result.fetchall()
-            return [
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "planned_start": row[2],
-                    "planned_end": row[3],
-                    "actual_start": row[4],
-                    "actual_end": row[5],
-                    "progress": float(row[6]) if row[6] else 0,
-                    "planned_value": 100,  # Default
-                    "earned_value": float(row[6]) if row[6] else 0,
-                }
-                for row in rows
-            ]
+            frame = _frame(result, numeric=("progress",))
+            frame["planned_value"] = 100  # Default
+            frame["earned_value"] = frame["progress"]
+            return frame
         except Exception as e:
             logger.warning("Could not fetch schedule data: %s", e)
-            return self._get_sample_schedule_data()
+            return None
 
-    def _fetch_cost_data(self, project_id: int, db) -> Dict[str, Any]:
+    def _fetch_cost_data(self, project_id: int, db) -> Optional[Dict[str, Any]]:
         """Fetch cost data for project.
 
         Args:
             project_id: Project ID.
-            db: Database session.
+            db: Database session or connection.
 
         Returns:
-            Cost data dictionary.
+            Cost data dictionary, or ``None`` if no costs are recorded.
         """
         try:
             from sqlalchemy import text
@@ -215,9 +292,9 @@ class ContextBuilder:
         except Exception as e:
             logger.warning("Could not fetch cost data: %s", e)
 
-        return self._get_sample_cost_data()
+        return None
 
-    def _fetch_payment_data(self, project_id: int, db) -> List[Dict[str, Any]]:
+    def _fetch_payment_data(self, project_id: int, db):
         """Fetch payment data for project."""
         try:
             from sqlalchemy import text
@@ -230,22 +307,12 @@ class ContextBuilder:
                 """),
                 {"project_id": project_id},
             )
-            rows = result.fetchall()
-            return [
-                {
-                    "id": row[0],
-                    "certificate_no": row[1],
-                    "amount": float(row[2]) if row[2] else 0,
-                    "date": row[3],
-                    "status": row[4],
-                }
-                for row in rows
-            ]
+            return _frame(result, numeric=("amount",))
         except Exception as e:
             logger.warning("Could not fetch payment data: %s", e)
-            return []
+            return None
 
-    def _fetch_variation_data(self, project_id: int, db) -> List[Dict[str, Any]]:
+    def _fetch_variation_data(self, project_id: int, db):
         """Fetch variation orders for project."""
         try:
             from sqlalchemy import text
@@ -258,20 +325,10 @@ class ContextBuilder:
                 """),
                 {"project_id": project_id},
             )
-            rows = result.fetchall()
-            return [
-                {
-                    "id": row[0],
-                    "vo_number": row[1],
-                    "description": row[2],
-                    "amount": float(row[3]) if row[3] else 0,
-                    "status": row[4],
-                }
-                for row in rows
-            ]
+            return _frame(result, numeric=("amount",))
         except Exception as e:
             logger.warning("Could not fetch variation data: %s", e)
-            return []
+            return None
 
     def _get_sample_boq_data(self) -> List[Dict[str, Any]]:
         """Get sample BOQ data for testing/demo."""
@@ -0,0 +1,221 @@
+"""Per-project cache of runtime context data.
+
+``ContextBuilder`` caches each fetched dataset (BOQ, schedule, costs, ...)
+per project.  Entries are stamped with the project's *context version*; any
+signal that the project's data changed bumps the version, which retires
+every entry fetched before it.  When Redis is configured the version lives in
+``runtime:context:version:{project_id}`` so an invalidation in one process
+(a hydration worker, the event projector) reaches API processes as well;
+otherwise versions are process-local.  A change that cannot be narrowed to
+projects (a workspace hydration) bumps the shared ``all`` version instead,
+retiring every project's entries.  A TTL bounds staleness for writes
+that bypass both signals.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_TEMPLATE = "runtime:context:version:{project_id}"
+ALL_PROJECTS_VERSION_KEY = "runtime:context:version:all"
+
+# Events after which a project's cached context must be refetched.
+CONTEXT_INVALIDATING_EVENTS = frozenset({"hydration.completed", "project.updated"})
+
+_MISSING = object()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _default_redis() -> Optional[object]:
+    if not os.getenv("REDIS_URL"):
+        return None
+    from backend.events.emitter import _get_redis_client
+
+    return _get_redis_client()
+
+
+def _copy(value: Any) -> Any:
+    # Sandboxed code may mutate what it is given; never hand out the cached object.
+    if hasattr(value, "copy") and hasattr(value, "columns"):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class ProjectContextCache:
+    """LRU of ``(project_id, data_type) -> value`` validated by project version."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        maxsize: Optional[int] = None,
+        redis_client: Any = _MISSING,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int("RUNTIME_CONTEXT_CACHE_TTL_SECONDS", 300)
+        self.maxsize = maxsize if maxsize is not None else _env_int("RUNTIME_CONTEXT_CACHE_SIZE", 256)
+        self._redis = redis_client
+        self._time = time_fn
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[str, float, Any]]" = OrderedDict()
+        self._local_versions: Dict[Hashable, int] = {}
+        self._local_all_version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_client(self) -> Optional[object]:
+        if self._redis is _MISSING:
+            self._redis = _default_redis()
+        return self._redis
+
+    def version(self, project_id: Hashable) -> Optional[str]:
+        """Current context version, or ``None`` if it cannot be determined."""
+
+        local = f"{self._local_all_version}.{self._local_versions.get(project_id, 0)}"
+        redis_client = self._redis_client()
+        if redis_client is None:
+            return local
+        try:
+            shared = redis_client.mget([ALL_PROJECTS_VERSION_KEY, VERSION_KEY_TEMPLATE.format(project_id=project_id)])
+        except Exception as exc:
+            logger.warning("Context version lookup failed for project %s: %s", project_id, exc)
+            return None
+        shared_all, shared_project = (value.decode() if isinstance(value, bytes) else value or 0 for value in shared)
+        return f"{shared_all}.{shared_project}.{local}"
+
+    def get(self, project_id: Hashable, data_type: str, version: Optional[str]) -> Any:
+        """Cached value, or ``None`` on a miss, stale version or expiry."""
+
+        if version is None:
+            self.misses += 1
+            return None
+        key = (project_id, data_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, created_at, value = entry
+                if entry_version == version and not (
+                    self.ttl_seconds > 0 and self._time() - created_at > self.ttl_seconds
+                ):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(value)
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, project_id: Hashable, data_type: str, version: Optional[str], value: Any) -> None:
+        if version is None or self.maxsize <= 0:
+            return
+        key = (project_id, data_type)
+        with self._lock:
+            self._entries[key] = (version, self._time(), _copy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: Optional[Hashable] = None) -> None:
+        """Retire cached context for ``project_id`` (every project if ``None``)."""
+
+        with self._lock:
+            if project_id is None:
+                self._local_all_version += 1
+                self._entries.clear()
+            else:
+                self._local_versions[project_id] = self._local_versions.get(project_id, 0) + 1
+                for key in [key for key in self._entries if key[0] == project_id]:
+                    del self._entries[key]
+        redis_client = self._redis_client()
+        if redis_client is not None:
+            key = ALL_PROJECTS_VERSION_KEY if project_id is None else VERSION_KEY_TEMPLATE.format(project_id=project_id)
+            try:
+                redis_client.incr(key)
+            except Exception as exc:
+                logger.warning("Failed to publish context invalidation for project %s: %s", project_id, exc)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[ProjectContextCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_context_cache() -> ProjectContextCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProjectContextCache()
+    return _cache
+
+
+def invalidate_project_context(project_id: Optional[Hashable]) -> None:
+    if project_id is None:
+        return
+    get_context_cache().invalidate(project_id)
+
+
+def invalidate_all_project_context() -> None:
+    get_context_cache().invalidate(None)
+
+
+def invalidate_hydrated_context(payload: Dict[str, Any]) -> None:
+    """Retire context made stale by a hydration job.
+
+    Hydration works on a workspace, and workspace ids are not project ids.
+    The projects named in the job payload (``project_id``/``project_ids``)
+    are invalidated; without any, every project is.
+    """
+
+    project_ids = list(payload.get("project_ids") or [])
+    if payload.get("project_id") is not None:
+        project_ids.append(payload["project_id"])
+    if not project_ids:
+        invalidate_all_project_context()
+    for project_id in project_ids:
+        invalidate_project_context(_project_key(project_id))
+
+
+def _project_key(project_id: Any) -> Any:
+    try:
+        return int(project_id)
+    except (TypeError, ValueError):
+        return project_id
+
+
+def invalidate_for_event(event: Any) -> bool:
+    """Invalidate the project an event refers to; returns whether it did."""
+
+    if event.event_type not in CONTEXT_INVALIDATING_EVENTS:
+        return False
+    try:
+        payload = json.loads(event.payload_json or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    if event.event_type == "hydration.completed":
+        invalidate_hydrated_context(payload)
+        return True
+    project_id = payload.get("project_id")
+    if project_id is None:
+        # The event's workspace id is not a project id.
+        invalidate_all_project_context()
+        return True
+    invalidate_project_context(_project_key(project_id))
+    return True
@@ -1,17 +1,84 @@
-"""Registry of approved analytical functions for the runtime system."""
+"""Registry of approved analytical functions for the runtime system.
+
+Row-oriented inputs (lists of dicts) are still accepted everywhere, but the
+analytics run on NumPy arrays: functions also take columnar inputs, either a
+mapping of column name to array, a pandas DataFrame or a pyarrow Table, which
+skips per-row dictionary access entirely.  ``evaluate_batch`` runs one
+function over many projects in a single call.
+"""
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 
+# Hard ceiling for correlated_monte_carlo; samples are drawn in chunks so
+# memory stays bounded by MONTE_CARLO_CHUNK_SIZE regardless of iterations.
+MONTE_CARLO_MAX_ITERATIONS = 1_000_000
+MONTE_CARLO_CHUNK_SIZE = 100_000
+# Resolution of the streaming percentile histogram, spanning +/-8 sigma.
+_PERCENTILE_BINS = 20_000
+_PERCENTILE_SPAN_SIGMAS = 8.0
+
+
+def _is_rows(data: Any) -> bool:
+    return isinstance(data, (list, tuple))
+
+
+def _row_count(data: Any) -> int:
+    if _is_rows(data):
+        return len(data)
+    if hasattr(data, "num_rows"):  # pyarrow.Table
+        return int(data.num_rows)
+    if isinstance(data, Mapping):
+        if not data:
+            return 0
+        first = next(iter(data.values()))
+        # A mapping of scalars (e.g. category -> value) is one row per key.
+        return len(first) if hasattr(first, "__len__") and not isinstance(first, str) else len(data)
+    return len(data)
+
+
+def _has_column(data: Any, name: str) -> bool:
+    if hasattr(data, "column_names"):
+        return name in data.column_names
+    if isinstance(data, Mapping):
+        return name in data
+    return name in getattr(data, "columns", ())
+
+
+def _column(data: Any, name: str, default: Any = 0) -> np.ndarray:
+    """Column ``name`` from row dicts, a mapping of arrays, a DataFrame or an Arrow table."""
+
+    if _is_rows(data):
+        return np.asarray([row.get(name, default) for row in data])
+    if not _has_column(data, name):
+        return np.full(_row_count(data), default)
+    if hasattr(data, "column_names"):
+        return data.column(name).to_numpy()
+    return np.asarray(data[name])
+
+
+def _item_ids(data: Any) -> np.ndarray:
+    if _is_rows(data):
+        return np.asarray([row.get("id", row.get("description", "unknown")) for row in data], dtype=object)
+    if _has_column(data, "id"):
+        return _column(data, "id").astype(object)
+    return _column(data, "description", "unknown").astype(object)
+
+
+def _scalar(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
 
 def monte_carlo_sim(
     values: List[float],
     iterations: int = 1000,
     confidence_level: float = 0.9,
+    seed: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Run Monte Carlo simulation on values.
 
@@ -19,87 +86,227 @@ def monte_carlo_sim(
         values: List of numeric values to simulate.
         iterations: Number of simulation iterations (max 10000).
         confidence_level: Confidence level for percentile calculation.
+        seed: Optional seed for reproducible draws.
 
     Returns:
         Dictionary with simulation results.
+
+    For correlated variables or more iterations use ``correlated_monte_carlo``.
     """
     # Limit iterations for safety
     iterations = min(iterations, 10000)
 
-    if not values:
+    if values is None or len(values) == 0:
         return {"error": "No values provided for simulation"}
 
-    mean_val = np.mean(values)
-    std_val = np.std(values) if len(values) > 1 else 0
+    values = np.asarray(values, dtype=float)
+    mean_val = values.mean()
+    std_val = values.std() if values.size > 1 else 0
 
     # Run simulation
-    simulations = np.random.normal(mean_val, std_val, iterations)
+    simulations = np.random.default_rng(seed).normal(mean_val, std_val, iterations)
 
     lower_pct = (1 - confidence_level) / 2 * 100
     upper_pct = (1 + confidence_level) / 2 * 100
+    p10, p90, lower, upper = np.percentile(simulations, [10, 90, lower_pct, upper_pct])
 
     return {
-        "mean": float(np.mean(simulations)),
-        "std": float(np.std(simulations)),
-        "min": float(np.min(simulations)),
-        "max": float(np.max(simulations)),
-        "percentile_10": float(np.percentile(simulations, 10)),
-        "percentile_90": float(np.percentile(simulations, 90)),
-        "lower_bound": float(np.percentile(simulations, lower_pct)),
-        "upper_bound": float(np.percentile(simulations, upper_pct)),
+        "mean": float(simulations.mean()),
+        "std": float(simulations.std()),
+        "min": float(simulations.min()),
+        "max": float(simulations.max()),
+        "percentile_10": float(p10),
+        "percentile_90": float(p90),
+        "lower_bound": float(lower),
+        "upper_bound": float(upper),
         "iterations": iterations,
         "confidence_level": confidence_level,
     }
 
 
+class _StreamingPercentiles:
+    """Fixed-bin histogram over a known range, merged chunk by chunk.
+
+    Percentiles are read from the cumulative counts with linear interpolation
+    inside a bin, so the error is at most one bin width (16 sigma / 20,000).
+    Samples outside the range are counted in the end bins and the exact
+    minimum and maximum are tracked separately.
+    """
+
+    def __init__(self, low: float, high: float, bins: int = _PERCENTILE_BINS) -> None:
+        if not high > low:
+            high = low + 1.0
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.total = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, samples: np.ndarray) -> None:
+        clipped = np.clip(samples, self.edges[0], self.edges[-1])
+        self.counts += np.histogram(clipped, bins=self.edges)[0]
+        self.total += samples.size
+        self.minimum = min(self.minimum, float(samples.min()))
+        self.maximum = max(self.maximum, float(samples.max()))
+        self._sum += float(samples.sum())
+        self._sum_sq += float(np.dot(samples, samples))
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(max(self._sum_sq / self.total - self.mean**2, 0.0)))
+
+    def percentiles(self, qs: Sequence[float]) -> np.ndarray:
+        cumulative = np.concatenate(([0], np.cumsum(self.counts)))
+        targets = np.asarray(qs, dtype=float) / 100 * self.total
+        values = np.interp(targets, cumulative, self.edges)
+        return np.clip(values, self.minimum, self.maximum)
+
+
+def correlated_monte_carlo(
+    means: Sequence[float],
+    stds: Sequence[float],
+    correlation: Optional[Sequence[Sequence[float]]] = None,
+    weights: Optional[Sequence[float]] = None,
+    iterations: int = 10_000,
+    confidence_level: float = 0.9,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Simulate the weighted total of correlated normal cost drivers.
+
+    Args:
+        means: Mean of each variable.
+        stds: Standard deviation of each variable.
+        correlation: Correlation matrix (identity if omitted).
+        weights: Weight of each variable in the total (all ones if omitted).
+        iterations: Number of draws (max 1,000,000).
+        confidence_level: Confidence level for the bounds.
+        seed: Seed for ``np.random.Generator``; identical seeds give identical results.
+
+    Returns:
+        Dictionary with summary statistics of the simulated total.
+    """
+    means_arr = np.asarray(means, dtype=float)
+    stds_arr = np.asarray(stds, dtype=float)
+    if means_arr.size == 0:
+        return {"error": "No variables provided for simulation"}
+    if stds_arr.shape != means_arr.shape:
+        return {"error": "means and stds must have the same length"}
+    count = means_arr.size
+    corr = np.eye(count) if correlation is None else np.asarray(correlation, dtype=float)
+    if corr.shape != (count, count):
+        return {"error": "correlation must be a square matrix matching means"}
+    weights_arr = np.ones(count) if weights is None else np.asarray(weights, dtype=float)
+
+    covariance = corr * np.outer(stds_arr, stds_arr)
+    try:
+        factor = np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        # Positive semi-definite (e.g. perfectly correlated or zero-variance
+        # drivers): fall back to an eigen-decomposition square root.
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+    iterations = int(max(1, min(iterations, MONTE_CARLO_MAX_ITERATIONS)))
+    rng = np.random.default_rng(seed)
+    # The total is a linear function of the normals, so each chunk only needs
+    # the projection of the factor onto the weights.
+    projection = factor.T @ weights_arr
+    total_mean = float(means_arr @ weights_arr)
+    total_std = float(np.sqrt(weights_arr @ covariance @ weights_arr))
+
+    lower_pct = (1 - confidence_level) / 2 * 100
+    upper_pct = (1 + confidence_level) / 2 * 100
+    qs = [10, 50, 90, lower_pct, upper_pct]
+
+    if iterations <= MONTE_CARLO_CHUNK_SIZE:
+        totals = total_mean + rng.standard_normal((iterations, count)) @ projection
+        mean, std = float(totals.mean()), float(totals.std())
+        minimum, maximum = float(totals.min()), float(totals.max())
+        p10, p50, p90, lower, upper = np.percentile(totals, qs)
+    else:
+        span = _PERCENTILE_SPAN_SIGMAS * total_std
+        stream = _StreamingPercentiles(total_mean - span, total_mean + span)
+        remaining = iterations
+        while remaining:
+            size = min(remaining, MONTE_CARLO_CHUNK_SIZE)
+            stream.add(total_mean + rng.standard_normal((size, count)) @ projection)
+            remaining -= size
+        mean, std = stream.mean, stream.std
+        minimum, maximum = stream.minimum, stream.maximum
+        p10, p50, p90, lower, upper = stream.percentiles(qs)
+
+    return {
+        "mean": mean,
+        "std": std,
+        "min": minimum,
+        "max": maximum,
+        "percentile_10": float(p10),
+        "percentile_50": float(p50),
+        "percentile_90": float(p90),
+        "lower_bound": float(lower),
+        "upper_bound": float(upper),
+        "expected_mean": total_mean,
+        "expected_std": total_std,
+        "variables": count,
+        "iterations": iterations,
+        "confidence_level": confidence_level,
+        "seed": seed,
+    }
+
+
 def boq_quantity_check(
-    boq_items: List[Dict[str, Any]],
+    boq_items: Any,
     specs: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Verify BOQ quantities against specifications.
 
     Args:
-        boq_items: List of BOQ items with quantity and unit_cost.
-        specs: Optional specification requirements.
+        boq_items: BOQ items with quantity and unit_cost, as row dicts or columns.
+        specs: Optional specification requirements keyed by item id.
 
     Returns:
         Dictionary with quantity analysis.
     """
-    if not boq_items:
+    if boq_items is None or _row_count(boq_items) == 0:
         return {"error": "No BOQ items provided"}
 
     specs = specs or {}
-    total_items = len(boq_items)
-    total_quantity = sum(item.get("quantity", 0) for item in boq_items)
-    total_cost = sum(
-        item.get("quantity", 0) * item.get("unit_cost", 0) for item in boq_items
-    )
+    quantities = _column(boq_items, "quantity")
+    unit_costs = _column(boq_items, "unit_cost")
+    total_items = quantities.size
+    total_quantity = _scalar(quantities.sum())
+    total_cost = _scalar(np.dot(quantities, unit_costs))
 
     # Check against specs if provided
     items_over = 0
     items_under = 0
     variance_details = []
 
-    for item in boq_items:
-        item_id = item.get("id", item.get("description", "unknown"))
-        quantity = item.get("quantity", 0)
-        spec_qty = specs.get(str(item_id), {}).get("quantity")
-
-        if spec_qty is not None:
-            variance = quantity - spec_qty
-            variance_pct = (variance / spec_qty * 100) if spec_qty > 0 else 0
-
-            if variance > 0:
-                items_over += 1
-            elif variance < 0:
-                items_under += 1
-
+    if specs:
+        ids = _item_ids(boq_items)
+        spec_values = [specs.get(str(item_id), {}).get("quantity") for item_id in ids]
+        spec_qty = np.array([np.nan if value is None else value for value in spec_values], dtype=float)
+        with np.errstate(invalid="ignore"):
+            variance = quantities - spec_qty
+        items_over = int(np.count_nonzero(variance > 0))
+        items_under = int(np.count_nonzero(variance < 0))
+
+        for index in np.flatnonzero(~np.isnan(spec_qty))[:10]:  # Limit details
+            quantity = _scalar(quantities[index])
+            spec_value = spec_values[index]
+            item_variance = quantity - spec_value
             variance_details.append({
-                "item_id": item_id,
+                "item_id": _scalar(ids[index]),
                 "quantity": quantity,
-                "spec_quantity": spec_qty,
-                "variance": variance,
-                "variance_pct": variance_pct,
+                "spec_quantity": spec_value,
+                "variance": item_variance,
+                "variance_pct": (item_variance / spec_value * 100) if spec_value > 0 else 0,
             })
 
     return {
@@ -109,7 +316,7 @@ def boq_quantity_check(
         "items_over_spec": items_over,
         "items_under_spec": items_under,
         "items_on_spec": total_items - items_over - items_under,
-        "variance_details": variance_details[:10],  # Limit details
+        "variance_details": variance_details,
     }
 
 
@@ -212,40 +419,93 @@ def schedule_slip_forecast(
     }
 
 
+def schedule_risk_simulation(
+    tasks: List[Dict[str, Any]],
+    iterations: int = 1000,
+    distribution: str = "triangular",
+    seed: Optional[int] = None,
+    project_start: Optional[str] = None,
+    percentiles: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """Monte Carlo of project duration over the CPM dependency graph.
+
+    Args:
+        tasks: Tasks with id, duration (or start/finish), dependencies and
+            optional optimistic/most_likely/pessimistic estimates.
+        iterations: Number of simulated schedules (max 100,000).
+        distribution: "triangular" or "pert" for tasks without their own.
+        seed: Seed for ``np.random.Generator``; identical seeds give identical results.
+        project_start: Project start date; adds P50/P80/P90 finish dates.
+        percentiles: Duration percentiles to report (50, 80, 90 by default).
+
+    Returns:
+        Dictionary with finish percentiles and per-task criticality indexes.
+    """
+    from backend.services.schedule_risk import DEFAULT_PERCENTILES, simulate_schedule
+
+    if not tasks:
+        return {"error": "No tasks provided"}
+    try:
+        result = simulate_schedule(
+            tasks,
+            iterations=iterations,
+            distribution=distribution,
+            percentiles=percentiles or DEFAULT_PERCENTILES,
+            seed=seed,
+            project_start=project_start,
+        )
+    except ValueError as exc:
+        return {"error": str(exc)}
+    return result.to_dict()
+
+
 def pnl_attribution(
-    cost_data: Dict[str, float],
+    cost_data: Any,
     categories: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """Calculate P&L attribution by category.
 
     Args:
-        cost_data: Dictionary mapping category to cost value.
+        cost_data: Mapping of category to cost value, or columns ``category`` and ``value``.
         categories: Optional list of categories to include.
 
     Returns:
         Dictionary with P&L attribution analysis.
     """
-    if not cost_data:
+    if cost_data is None or _row_count(cost_data) == 0:
         return {"error": "No cost data provided"}
 
+    if isinstance(cost_data, Mapping) and not _has_column(cost_data, "value"):
+        names = list(cost_data.keys())
+        raw_values = list(cost_data.values())
+    else:
+        names = list(_column(cost_data, "category", ""))
+        raw_values = [_scalar(value) for value in _column(cost_data, "value")]
+
     # Filter categories if specified
     if categories:
-        filtered_data = {k: v for k, v in cost_data.items() if k in categories}
-    else:
-        filtered_data = cost_data
-
-    total = sum(filtered_data.values())
-
-    # Calculate attribution
-    category_impacts = []
-    for category, value in sorted(filtered_data.items(), key=lambda x: abs(x[1]), reverse=True):
-        pct = (value / total * 100) if total != 0 else 0
-        category_impacts.append({
-            "category": category,
-            "value": value,
-            "percentage": round(pct, 2),
-            "impact": "positive" if value > 0 else "negative",
-        })
+        wanted = set(categories)
+        keep = [index for index, name in enumerate(names) if name in wanted]
+        names = [names[index] for index in keep]
+        raw_values = [raw_values[index] for index in keep]
+
+    values = np.asarray(raw_values)
+    total = _scalar(values.sum()) if values.size else 0
+
+    # Largest absolute contribution first; ties keep their input order.
+    order = np.argsort(-np.abs(values), kind="stable")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = values / total * 100 if total != 0 else np.zeros(values.size)
+
+    category_impacts = [
+        {
+            "category": names[index],
+            "value": raw_values[index],
+            "percentage": round(float(percentages[index]), 2),
+            "impact": "positive" if raw_values[index] > 0 else "negative",
+        }
+        for index in order
+    ]
 
     # Get top contributors
     top_positive = [c for c in category_impacts if c["value"] > 0][:3]
@@ -260,6 +520,14 @@ def pnl_attribution(
     }
 
 
+def _sensitivity_changes(base_values: np.ndarray, weights: np.ndarray, percentages: np.ndarray) -> np.ndarray:
+    """Absolute changes shaped ``(projects, variables, percentages)``."""
+
+    # Same operation order as base * (pct / 100) * weight so results match
+    # the scalar formula exactly.
+    return (base_values[:, None, None] * (percentages / 100)[None, None, :]) * weights[None, :, None]
+
+
 def sensitivity_analysis(
     base_value: float,
     variables: Dict[str, float],
@@ -278,20 +546,23 @@ def sensitivity_analysis(
     if impact_percentages is None:
         impact_percentages = [-20, -10, 0, 10, 20]
 
+    names = list(variables.keys())
+    weights = np.asarray([variables[name] for name in names], dtype=float)
+    changes = _sensitivity_changes(np.asarray([base_value], dtype=float), weights, np.asarray(impact_percentages, dtype=float))[0]
+    new_values = base_value + changes
+
     results = {}
-    for var_name, weight in variables.items():
-        impacts = []
-        for pct in impact_percentages:
-            change = base_value * (pct / 100) * weight
-            new_value = base_value + change
-            impacts.append({
-                "percentage_change": pct,
-                "new_value": round(new_value, 2),
-                "absolute_change": round(change, 2),
-            })
+    for row, var_name in enumerate(names):
         results[var_name] = {
-            "weight": weight,
-            "impacts": impacts,
+            "weight": variables[var_name],
+            "impacts": [
+                {
+                    "percentage_change": pct,
+                    "new_value": round(float(new_values[row, col]), 2),
+                    "absolute_change": round(float(changes[row, col]), 2),
+                }
+                for col, pct in enumerate(impact_percentages)
+            ],
         }
 
     return {
@@ -302,6 +573,131 @@ def sensitivity_analysis(
     }
 
 
+def sensitivity_analysis_batch(
+    base_values: Sequence[float],
+    variables: Dict[str, float],
+    impact_percentages: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Sensitivity of many base values to the same variables, as dense arrays.
+
+    ``new_values[p][v][k]`` is project ``p`` with variable ``v`` moved by
+    ``impact_percentages[k]``.
+    """
+    if impact_percentages is None:
+        impact_percentages = [-20, -10, 0, 10, 20]
+    bases = np.asarray(base_values, dtype=float)
+    names = list(variables.keys())
+    weights = np.asarray([variables[name] for name in names], dtype=float)
+    changes = _sensitivity_changes(bases, weights, np.asarray(impact_percentages, dtype=float))
+    return {
+        "variables": names,
+        "impact_percentages": impact_percentages,
+        "base_values": bases.tolist(),
+        "new_values": np.round(bases[:, None, None] + changes, 2).tolist(),
+        "absolute_changes": np.round(changes, 2).tolist(),
+    }
+
+
+def _boq_quantity_check_batch(params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Totals for many projects from one concatenated array pass."""
+
+    if any(params.get("specs") for params in params_list):
+        return [boq_quantity_check(**params) for params in params_list]
+    # Explicit None checks: a DataFrame has no truth value.
+    counts = np.array([0 if p.get("boq_items") is None else _row_count(p["boq_items"]) for p in params_list])
+    non_empty = [p["boq_items"] for p in params_list if p.get("boq_items") is not None and _row_count(p["boq_items"])]
+    if not non_empty:
+        return [boq_quantity_check(**params) for params in params_list]
+    quantities = np.concatenate([_column(items, "quantity") for items in non_empty])
+    unit_costs = np.concatenate([_column(items, "unit_cost") for items in non_empty])
+    group = np.repeat(np.arange(len(non_empty)), counts[counts > 0])
+    quantity_totals = np.bincount(group, weights=quantities, minlength=len(non_empty))
+    cost_totals = np.bincount(group, weights=quantities * unit_costs, minlength=len(non_empty))
+    # bincount always sums in float64; keep integer totals integral like the scalar path.
+    quantity_type = int if np.issubdtype(quantities.dtype, np.integer) else float
+    cost_type = int if quantity_type is int and np.issubdtype(unit_costs.dtype, np.integer) else float
+
+    results: List[Dict[str, Any]] = []
+    position = 0
+    for count in counts:
+        if not count:
+            results.append({"error": "No BOQ items provided"})
+            continue
+        results.append({
+            "total_items": int(count),
+            "total_quantity": quantity_type(quantity_totals[position]),
+            "total_cost": cost_type(cost_totals[position]),
+            "items_over_spec": 0,
+            "items_under_spec": 0,
+            "items_on_spec": int(count),
+            "variance_details": [],
+        })
+        position += 1
+    return results
+
+
+def _sensitivity_analysis_batch(params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    first = params_list[0]
+    shared = all(
+        params.get("variables") == first.get("variables")
+        and params.get("impact_percentages") == first.get("impact_percentages")
+        for params in params_list
+    )
+    if not shared:
+        return [sensitivity_analysis(**params) for params in params_list]
+    batch = sensitivity_analysis_batch(
+        [params["base_value"] for params in params_list],
+        first["variables"],
+        first.get("impact_percentages"),
+    )
+    results = []
+    for project, params in enumerate(params_list):
+        results.append({
+            "base_value": params["base_value"],
+            "variables_analyzed": len(batch["variables"]),
+            "impact_percentages": batch["impact_percentages"],
+            "results": {
+                name: {
+                    "weight": first["variables"][name],
+                    "impacts": [
+                        {
+                            "percentage_change": pct,
+                            "new_value": batch["new_values"][project][row][col],
+                            "absolute_change": batch["absolute_changes"][project][row][col],
+                        }
+                        for col, pct in enumerate(batch["impact_percentages"])
+                    ],
+                }
+                for row, name in enumerate(batch["variables"])
+            },
+        })
+    return results
+
+
+_BATCH_IMPLEMENTATIONS = {
+    "boq_quantity_check": _boq_quantity_check_batch,
+    "sensitivity_analysis": _sensitivity_analysis_batch,
+}
+
+
+def evaluate_batch(name: str, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Evaluate an approved function for many projects in one call.
+
+    Functions with a vectorised batch form share one array pass across all
+    projects; the rest are applied per project.
+
+    Raises:
+        KeyError: If ``name`` is not an approved function.
+    """
+    entry = APPROVED_FUNCTIONS[name]
+    if not params_list:
+        return []
+    batch = _BATCH_IMPLEMENTATIONS.get(name)
+    if batch is not None:
+        return batch(params_list)
+    return [entry["function"](**params) for params in params_list]
+
+
 # Registry of all approved functions with metadata
 APPROVED_FUNCTIONS: Dict[str, Dict[str, Any]] = {
     "monte_carlo_sim": {
@@ -311,6 +707,13 @@ APPROVED_FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "risk_level": "low",
         "max_runtime": 5.0,
     },
+    "correlated_monte_carlo": {
+        "function": correlated_monte_carlo,
+        "signature": "correlated_monte_carlo(means: List[float], stds: List[float], correlation: List[List[float]] = None, weights: List[float] = None, iterations: int = 10000, confidence_level: float = 0.9, seed: int = None) -> Dict",
+        "description": "Monte Carlo of a weighted total of correlated cost drivers, up to 1,000,000 seeded iterations.",
+        "risk_level": "low",
+        "max_runtime": 10.0,
+    },
     "boq_quantity_check": {
         "function": boq_quantity_check,
         "signature": "boq_quantity_check(boq_items: List[Dict], specs: Dict = None) -> Dict",
@@ -332,6 +735,13 @@ APPROVED_FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "risk_level": "low",
         "max_runtime": 3.0,
     },
+    "schedule_risk_simulation": {
+        "function": schedule_risk_simulation,
+        "signature": "schedule_risk_simulation(tasks: List[Dict], iterations: int = 1000, distribution: str = 'triangular', seed: int = None, project_start: str = None, percentiles: List[int] = None) -> Dict",
+        "description": "Monte Carlo schedule risk on the dependency graph. Returns P50/P80/P90 finish and criticality indexes.",
+        "risk_level": "low",
+        "max_runtime": 30.0,
+    },
     "pnl_attribution": {
         "function": pnl_attribution,
         "signature": "pnl_attribution(cost_data: Dict[str, float], categories: List[str] = None) -> Dict",
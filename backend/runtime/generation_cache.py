@@ -0,0 +1,322 @@
+"""Cache of LLM-generated runtime code.
+
+Generated code depends on the question and on the *shape* of the context it
+will run against, not on the context's values, so entries are keyed by the
+normalised query plus a fingerprint of the context's keys and types.  The
+fingerprint also folds in the approved-function registry, so changing
+``APPROVED_FUNCTIONS`` naturally retires every entry generated against the
+old registry.
+
+Lookups go to an in-process LRU first, then to the ``code_executions``
+history table (successful runs carry their ``cache_key``), and finally, when
+an embedding model is available, to a near-duplicate match among cached
+queries with the same fingerprint, so "sum of BOQ" can reuse the code written
+for "total BOQ cost".  Generated code bakes in the numbers of its question, so
+a near duplicate must also contain exactly the same numbers.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Bounds how deep the context shape is described; deeper structure rarely
+# changes the code that gets generated.
+_FINGERPRINT_DEPTH = 3
+
+EmbedFn = Callable[[Sequence[str]], np.ndarray]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace; numbers are kept."""
+
+    text = re.sub(r"[^\w%.\s]", " ", query.lower())
+    text = re.sub(r"(?<!\d)\.|\.(?!\d)", " ", text)
+    return " ".join(text.split())
+
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def query_numbers(normalized_query: str) -> Tuple[str, ...]:
+    """Numbers in a normalised query, in order ("by 10%" and "by 20%" differ)."""
+
+    return tuple(_NUMBER_RE.findall(normalized_query))
+
+
+def _shape(value: Any, depth: int) -> Any:
+    if depth <= 0:
+        return type(value).__name__
+    if isinstance(value, dict):
+        return {str(key): _shape(item, depth - 1) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        # Lists are described by their first element; values and length are ignored.
+        return [type(value).__name__, _shape(value[0], depth - 1) if value else None]
+    if isinstance(value, np.ndarray):
+        return ["ndarray", str(value.dtype), value.ndim]
+    columns = getattr(value, "dtypes", None)
+    if columns is not None and hasattr(columns, "items"):
+        return ["frame", [(str(name), str(dtype)) for name, dtype in columns.items()]]
+    return type(value).__name__
+
+
+def registry_version() -> str:
+    """Hash of the approved-function names and signatures."""
+
+    from backend.runtime.function_registry import APPROVED_FUNCTIONS
+
+    parts = sorted(f"{name}:{info.get('signature', '')}" for name, info in APPROVED_FUNCTIONS.items())
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def context_fingerprint(context: Dict[str, Any]) -> str:
+    """Fingerprint of the context's keys and types plus the function registry."""
+
+    shape = repr(_shape(context, _FINGERPRINT_DEPTH))
+    return hashlib.sha256(f"{registry_version()}|{shape}".encode()).hexdigest()
+
+
+def cache_key(query: str, fingerprint: str) -> str:
+    return hashlib.sha256(f"{normalize_query(query)}|{fingerprint}".encode()).hexdigest()
+
+
+def _default_embedder() -> Optional[EmbedFn]:
+    if importlib.util.find_spec("sentence_transformers") is None:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    except Exception as exc:
+        logger.warning("Embedding model unavailable for generation cache: %s", exc)
+        return None
+
+    def embed(texts: Sequence[str]) -> np.ndarray:
+        return model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False, normalize_embeddings=True)
+
+    return embed
+
+
+@dataclass
+class CachedGeneration:
+    key: str
+    fingerprint: str
+    normalized_query: str
+    code: str
+    created_at: float
+    embedding: Optional[np.ndarray] = None
+
+
+class GenerationCache:
+    """LRU + history-table cache of generated code with optional fuzzy matching."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        maxsize: Optional[int] = None,
+        embed_fn: Optional[EmbedFn] = None,
+        similarity_threshold: Optional[float] = None,
+        load_embedder: bool = True,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int("RUNTIME_CODEGEN_CACHE_TTL_SECONDS", 24 * 3600)
+        self.maxsize = maxsize if maxsize is not None else _env_int("RUNTIME_CODEGEN_CACHE_SIZE", 1024)
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else _env_float("RUNTIME_CODEGEN_SIMILARITY", 0.9)
+        )
+        self._embed_fn = embed_fn
+        self._load_embedder = load_embedder and embed_fn is None
+        self._time = time_fn
+        self._entries: "OrderedDict[str, CachedGeneration]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._embedder_lock = threading.Lock()
+        self._registry_version = registry_version()
+        self.hits = {"memory": 0, "history": 0, "similar": 0}
+        self.misses = 0
+
+    # -- embedding -----------------------------------------------------------
+
+    def ensure_embedder(self) -> bool:
+        """Load the default embedding model once; returns whether one is available.
+
+        Loading takes seconds and blocks, so async callers run this (and
+        ``lookup``/``store``, which call it) in a worker thread.
+        """
+
+        with self._embedder_lock:
+            if self._embed_fn is None and self._load_embedder:
+                self._embed_fn = _default_embedder()
+                self._load_embedder = False
+        return self._embed_fn is not None
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if not self.ensure_embedder():
+            return None
+        try:
+            vector = np.asarray(self._embed_fn([text])[0], dtype=np.float32)
+        except Exception as exc:
+            logger.warning("Query embedding failed: %s", exc)
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._registry_version = registry_version()
+
+    def _check_registry(self) -> None:
+        current = registry_version()
+        if current != self._registry_version:
+            logger.info("Approved function registry changed; clearing generated code cache")
+            self.invalidate()
+
+    def _expired(self, entry: CachedGeneration) -> bool:
+        return self.ttl_seconds > 0 and self._time() - entry.created_at > self.ttl_seconds
+
+    def _remember(self, entry: CachedGeneration) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # -- lookup --------------------------------------------------------------
+
+    def lookup(self, query: str, context: Dict[str, Any], db=None) -> Optional[str]:
+        """Return cached code for ``query`` against ``context``'s shape, if any."""
+
+        self._check_registry()
+        fingerprint = context_fingerprint(context)
+        key = cache_key(query, fingerprint)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry.code
+
+        code = self._lookup_history(key, db)
+        if code is not None:
+            self.hits["history"] += 1
+            self._remember(
+                CachedGeneration(key, fingerprint, normalize_query(query), code, self._time(), self._embed(normalize_query(query)))
+            )
+            return code
+
+        code = self._lookup_similar(query, fingerprint)
+        if code is not None:
+            self.hits["similar"] += 1
+            return code
+
+        self.misses += 1
+        return None
+
+    def _lookup_history(self, key: str, db) -> Optional[str]:
+        if db is None:
+            return None
+        try:
+            from backend.runtime.models import CodeExecution
+
+            query = db.query(CodeExecution.generated_code).filter(
+                CodeExecution.cache_key == key,
+                CodeExecution.status == "success",
+            )
+            if self.ttl_seconds > 0:
+                cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+                query = query.filter(CodeExecution.created_at >= cutoff)
+            row = query.order_by(CodeExecution.id.desc()).first()
+        except Exception as exc:
+            logger.debug("Generation cache history lookup skipped: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def _lookup_similar(self, query: str, fingerprint: str) -> Optional[str]:
+        normalized = normalize_query(query)
+        numbers = query_numbers(normalized)
+        with self._lock:
+            candidates = [
+                entry
+                for entry in self._entries.values()
+                if entry.fingerprint == fingerprint
+                and entry.embedding is not None
+                and not self._expired(entry)
+                and query_numbers(entry.normalized_query) == numbers
+            ]
+        if not candidates:
+            return None
+        vector = self._embed(normalized)
+        if vector is None:
+            return None
+        matrix = np.stack([entry.embedding for entry in candidates])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if float(scores[best]) < self.similarity_threshold:
+            return None
+        return candidates[best].code
+
+    # -- store ---------------------------------------------------------------
+
+    def store(self, query: str, context: Dict[str, Any], code: str) -> str:
+        """Remember ``code`` for the query/context shape and return its cache key."""
+
+        fingerprint = context_fingerprint(context)
+        key = cache_key(query, fingerprint)
+        normalized = normalize_query(query)
+        self._remember(CachedGeneration(key, fingerprint, normalized, code, self._time(), self._embed(normalized)))
+        return key
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "hits": dict(self.hits), "misses": self.misses}
+
+
+_cache: Optional[GenerationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_generation_cache() -> GenerationCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GenerationCache()
+    return _cache
@@ -38,6 +38,9 @@ class CodeExecution(Base):
     execution_time = Column(Float, nullable=True)  # seconds
     memory_used = Column(Integer, nullable=True)  # bytes
     error_message = Column(Text, nullable=True)
+    # Generation cache key (normalised query + context shape); see generation_cache.
+    cache_key = Column(String(64), nullable=True, index=True)
+    context_fingerprint = Column(String(64), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     logs = relationship("ExecutionLog", back_populates="execution", cascade="all, delete-orphan")
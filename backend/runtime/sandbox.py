@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import io
 import logging
-import re
+import os
 import sys
 import time
 import traceback
-from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from contextlib import redirect_stdout, redirect_stderr
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set
 
 from backend.runtime.schemas import ExecutionLog, ExecutionResult
@@ -29,7 +30,9 @@ APPROVED_MODULES: Set[str] = {
     "itertools",
 }
 
-# Patterns that are forbidden in code
+# Patterns that are forbidden in code.  The AST walk in
+# backend.runtime.code_cache derives the builtins and modules it rejects from
+# this list.
 FORBIDDEN_PATTERNS: List[str] = [
     "__import__",
     "eval(",
@@ -64,6 +67,11 @@ FORBIDDEN_PATTERNS: List[str] = [
 DEFAULT_TIMEOUT = 5  # seconds
 DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024  # 256MB
 
+# "process" runs code in the warm worker pool (see sandbox_pool); "inprocess"
+# runs it in the calling process without limits, for debugging only.
+ISOLATION_PROCESS = "process"
+ISOLATION_INPROCESS = "inprocess"
+
 
 def _execute_in_sandbox(code: str, context: Dict[str, Any], timeout: int) -> Dict[str, Any]:
     """Execute code in an isolated environment.
@@ -80,12 +88,19 @@ def _execute_in_sandbox(code: str, context: Dict[str, Any], timeout: int) -> Dic
     start_time = time.time()
 
     try:
+        from backend.runtime.code_cache import get_code_cache
+
+        analysis = get_code_cache().analyze(code)
+        # Unsafe code never reaches here through SandboxExecutor; compile the
+        # raw source so direct callers still get the interpreter's error.
+        code_object = analysis.code_object or compile(code, "<sandbox>", "exec")
+
         # Build restricted globals
         safe_globals = _build_safe_globals(context)
 
         # Execute with output capture
         with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-            exec(code, safe_globals)  # noqa: S102
+            exec(code_object, safe_globals)  # noqa: S102
 
         # Extract result
         result_value = safe_globals.get("result")
@@ -169,8 +184,21 @@ def _build_safe_globals(context: Dict[str, Any]) -> Dict[str, Any]:
         "__import__": _make_restricted_import(),
     }
 
-    # Import approved modules
-    approved_modules = {}
+    # Build globals
+    safe_globals = {
+        "__builtins__": safe_builtins,
+        "context": context,
+        **_approved_module_globals(),
+        **context,  # Inject context variables directly
+    }
+
+    return safe_globals
+
+
+@lru_cache(maxsize=1)
+def _approved_module_globals() -> Dict[str, Any]:
+    """Approved modules bound under their usual names; imported once per process."""
+    approved_modules: Dict[str, Any] = {}
     for module_name in APPROVED_MODULES:
         try:
             if module_name == "pandas":
@@ -204,16 +232,7 @@ def _build_safe_globals(context: Dict[str, Any]) -> Dict[str, Any]:
                 approved_modules["itertools"] = itertools
         except ImportError:
             logger.warning("Could not import approved module: %s", module_name)
-
-    # Build globals
-    safe_globals = {
-        "__builtins__": safe_builtins,
-        "context": context,
-        **approved_modules,
-        **context,  # Inject context variables directly
-    }
-
-    return safe_globals
+    return approved_modules
 
 
 class SandboxExecutor:
@@ -223,15 +242,25 @@ class SandboxExecutor:
         self,
         timeout: int = DEFAULT_TIMEOUT,
         memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        isolation: Optional[str] = None,
     ):
         """Initialize the sandbox executor.
 
         Args:
             timeout: Maximum execution time in seconds.
             memory_limit: Maximum memory usage in bytes.
+            isolation: "process" (default, or SANDBOX_ISOLATION) or "inprocess".
         """
         self._timeout = timeout
         self._memory_limit = memory_limit
+        self._isolation = isolation or os.getenv("SANDBOX_ISOLATION", ISOLATION_PROCESS)
+
+    def _run(self, code: str, context: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+        if self._isolation == ISOLATION_INPROCESS:
+            return _execute_in_sandbox(code, context, timeout)
+        from backend.runtime.sandbox_pool import get_sandbox_pool
+
+        return get_sandbox_pool(self._memory_limit).execute(code, context, timeout)
 
     def execute(
         self,
@@ -263,10 +292,10 @@ class SandboxExecutor:
                 logs=[ExecutionLog(level="ERROR", message=f"Violations: {violations}")],
             )
 
-        # Execute in the current process with timeout simulation
-        # Note: For production, use ProcessPoolExecutor for true isolation
+        from backend.runtime.sandbox_pool import SandboxTimeout
+
         try:
-            result = _execute_in_sandbox(code, context, timeout)
+            result = self._run(code, context, timeout)
 
             return ExecutionResult(
                 generated_code=code,
@@ -280,7 +309,7 @@ class SandboxExecutor:
                 ],
             )
 
-        except FuturesTimeoutError:
+        except (FuturesTimeoutError, SandboxTimeout):
             return ExecutionResult(
                 generated_code=code,
                 output=None,
@@ -318,35 +347,9 @@ class SandboxExecutor:
         Returns:
             List of violation descriptions.
         """
-        violations = []
-
-        # Check forbidden patterns
-        for pattern in FORBIDDEN_PATTERNS:
-            if pattern in code:
-                violations.append(f"Forbidden pattern: {pattern}")
-
-        # Check imports
-        import_pattern = r"(?:^|\n)\s*(?:from|import)\s+([a-zA-Z_][a-zA-Z0-9_.]*)"
-        imports = re.findall(import_pattern, code)
-        for imp in imports:
-            module = imp.split(".")[0]
-            if module not in APPROVED_MODULES:
-                violations.append(f"Forbidden import: {module}")
-
-        # Check for dangerous string operations that might bypass checks
-        dangerous_patterns = [
-            r'getattr\s*\(',
-            r'setattr\s*\(',
-            r'delattr\s*\(',
-            r'__\w+__',  # Dunder methods
-            r'\.mro\(',
-            r'\.\_\_class\_\_',
-        ]
-        for pattern in dangerous_patterns:
-            if re.search(pattern, code):
-                violations.append(f"Dangerous pattern: {pattern}")
-
-        return violations
+        from backend.runtime.code_cache import get_code_cache
+
+        return list(get_code_cache().analyze(code).violations)
 
     def _create_globals(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Create restricted globals for code execution.
@@ -369,19 +372,6 @@ class SandboxExecutor:
         Returns:
             Validation result dictionary.
         """
-        executor = SandboxExecutor()
-        violations = executor._check_violations(code)
-
-        # Extract imports for reporting
-        import_pattern = r"(?:^|\n)\s*(?:from|import)\s+([a-zA-Z_][a-zA-Z0-9_.]*)"
-        all_imports = re.findall(import_pattern, code)
-
-        approved = [imp.split(".")[0] for imp in all_imports if imp.split(".")[0] in APPROVED_MODULES]
-        forbidden = [imp.split(".")[0] for imp in all_imports if imp.split(".")[0] not in APPROVED_MODULES]
-
-        return {
-            "is_safe": len(violations) == 0,
-            "violations": violations,
-            "approved_imports": list(set(approved)),
-            "forbidden_imports": list(set(forbidden)),
-        }
+        from backend.runtime.code_cache import get_code_cache
+
+        return get_code_cache().analyze(code).as_dict()
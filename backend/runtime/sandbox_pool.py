@@ -0,0 +1,238 @@
+"""Warm pool of sandbox worker processes.
+
+Generated code runs in long-lived child processes rather than in the API
+process.  Workers are forked from a server that has already imported numpy
+and pandas, so an execution only pays for pickling its context and result.
+Each worker caps its address space (``RLIMIT_AS``) at start-up and its CPU
+time (``RLIMIT_CPU``) before every execution; the parent additionally
+enforces the wall-clock timeout by killing the worker and forking a
+replacement, so a runaway loop never outlives its budget.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from backend.runtime.sandbox import DEFAULT_MEMORY_LIMIT, _execute_in_sandbox
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_MODULES = ["numpy", "pandas", "backend.runtime.sandbox"]
+# How long a caller waits for a free worker before giving up.
+CHECKOUT_TIMEOUT = 30.0
+
+
+class SandboxTimeout(Exception):
+    """Raised when an execution exceeds its wall-clock budget."""
+
+
+class SandboxWorkerDied(Exception):
+    """Raised when a worker exits mid-execution (e.g. killed by RLIMIT_CPU)."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _current_address_space() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[0])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _apply_memory_limit(memory_limit: int) -> None:
+    """Allow ``memory_limit`` bytes on top of what the warm worker already maps."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX
+        return
+    baseline = _current_address_space()
+    if baseline is None or memory_limit <= 0:
+        return
+    limit = baseline + memory_limit
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as exc:
+        logger.warning("Could not apply sandbox RLIMIT_AS: %s", exc)
+
+
+def _apply_cpu_limit(timeout: float) -> None:
+    """Extend the soft CPU limit by one execution's budget.
+
+    RLIMIT_CPU counts the whole life of the process, so the limit is moved
+    forward from the CPU already used; overrunning it delivers SIGXCPU.
+    """
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + math.ceil(timeout) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as exc:
+        logger.warning("Could not apply sandbox RLIMIT_CPU: %s", exc)
+
+
+def _dump_result(result: Dict[str, Any]) -> bytes:
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        result = dict(result, output=repr(result.get("output")))
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _worker_main(conn, memory_limit: int) -> None:
+    for module_name in PRELOAD_MODULES:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+    _apply_memory_limit(memory_limit)
+    while True:
+        try:
+            raw = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        code, context, timeout = pickle.loads(raw)
+        _apply_cpu_limit(timeout)
+        result = _execute_in_sandbox(code, context, timeout)
+        conn.send_bytes(_dump_result(result))
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit: int) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class SandboxPool:
+    """Fixed-size pool of warm sandbox workers."""
+
+    def __init__(self, size: Optional[int] = None, memory_limit: int = DEFAULT_MEMORY_LIMIT) -> None:
+        self.size = max(1, size or _env_int("SANDBOX_POOL_SIZE", 2))
+        self.memory_limit = memory_limit
+        self._ctx = _mp_context()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.size):
+            self._add_worker()
+
+    def _add_worker(self) -> _Worker:
+        worker = _Worker(self._ctx, self.memory_limit)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            closed = self._closed
+        if not closed:
+            self._add_worker()
+
+    def worker_pids(self) -> List[Optional[int]]:
+        with self._lock:
+            return [worker.pid for worker in self._workers]
+
+    def execute(self, code: str, context: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run ``code`` in a worker; returns the same dict as the in-process path."""
+
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+        payload = pickle.dumps((code, context, timeout), protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            worker = self._idle.get(timeout=CHECKOUT_TIMEOUT)
+        except queue.Empty:
+            raise SandboxTimeout("No sandbox worker became available") from None
+
+        try:
+            worker.conn.send_bytes(payload)
+            if not worker.conn.poll(timeout):
+                logger.warning("Sandbox execution exceeded %ss; killing worker %s", timeout, worker.pid)
+                self._replace(worker)
+                raise SandboxTimeout(f"Execution timed out after {timeout} seconds")
+            raw = worker.conn.recv_bytes()
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            exitcode = worker.process.exitcode
+            self._replace(worker)
+            raise SandboxWorkerDied(f"Sandbox worker exited unexpectedly (exit code {exitcode})") from exc
+
+        self._idle.put(worker)
+        return pickle.loads(raw)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.kill()
+
+
+_pools: Dict[int, SandboxPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sandbox_pool(memory_limit: int = DEFAULT_MEMORY_LIMIT) -> SandboxPool:
+    """Process-wide pool for ``memory_limit``, started on first use."""
+
+    with _pools_lock:
+        pool = _pools.get(memory_limit)
+        if pool is None:
+            pool = SandboxPool(memory_limit=memory_limit)
+            _pools[memory_limit] = pool
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
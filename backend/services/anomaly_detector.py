@@ -1,20 +1,58 @@
-"""Rule based anomaly detection for construction telemetry.
+"""Rule based and streaming anomaly detection for construction telemetry.
 
 The helper inspects heterogenous dictionaries coming from planning,
 operations and safety systems.  It looks for well known signals that
 should trigger follow-up by the analytics dashboard and returns a list
-of structured findings.  The implementation purposely favours clear
+of structured findings.  The threshold rules purposely favour clear
 heuristics over statistical models so the behaviour is predictable in
 tests and for debugging inside Render deployments.
+
+Telemetry is evaluated a batch at a time: each batch is turned into columns
+once and every rule is a vectorised expression over those columns, so only
+the rows that actually fire pay for building a finding.  On top of the rules,
+``StreamingAnomalyDetector`` runs rolling statistical detectors per
+(project, metric) series: an EWMA z-score against the recent level and an
+optional seasonal residual against the same phase of earlier seasons.  Each
+series keeps a count, mean and variance (per phase for the seasonal
+detector), so state does not grow with the length of the stream.
+``WorkspaceEventSource`` feeds the detector straight from the
+``events:workspace:*`` Redis streams.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import json
+import logging
+import re
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.events.envelope import EventEnvelope
+from backend.redisx.retention import WORKSPACE_STREAM_PATTERN
 
+logger = logging.getLogger(__name__)
 
 Severity = str
 
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Metric -> finding type for the statistical detectors.
+DEFAULT_METRICS: Dict[str, str] = {
+    "risk_score": "risk",
+    "schedule_delay_days": "schedule",
+    "actual_cost": "cost",
+}
+
+_SEVERE_SAFETY_NOTES = ("lost time", "hospitalisation", "hospitalization", "major")
+_NEAR_MISS_NOTES = ("near miss", "near-miss", "ppe non-compliance")
+_QUALITY_NOTES = ("rework", "non-conformance", "failed inspection")
+
+# Placeholder for keys absent from an entry, where ``entry.get(key, default)``
+# and an explicit ``None`` lead to different output.
+_MISSING = object()
+
 
 def detect_anomalies(data_stream: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Inspect a project telemetry stream and report notable deviations.
@@ -45,37 +83,11 @@ def detect_anomalies(data_stream: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             Machine readable fields that triggered the anomaly.
     """
 
-    findings: List[Dict[str, Any]] = []
-
-    for entry in data_stream or []:
-        if not isinstance(entry, dict):
-            continue
-
-        timestamp = entry.get("timestamp")
-
-        def add_finding(anomaly_type: str, severity: Severity, message: str, *, context: Optional[Dict[str, Any]] = None) -> None:
-            findings.append(
-                {
-                    "type": anomaly_type,
-                    "severity": severity,
-                    "message": message,
-                    "timestamp": timestamp,
-                    "context": context or {},
-                }
-            )
-
-        _check_risk(entry, add_finding)
-        _check_schedule(entry, add_finding)
-        _check_cost(entry, add_finding)
-        _check_safety(entry, add_finding)
-        _check_quality(entry, add_finding)
-
+    batch = TelemetryBatch.from_records(data_stream or [])
     # Sort by severity to keep the most pressing anomalies at the top of the
-    # dashboard.  The ordering is stable for tests which makes assertions
+    # dashboard.  Ties keep entry order, then rule order, so assertions stay
     # deterministic.
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    findings.sort(key=lambda finding: severity_order.get(finding["severity"], 99))
-    return findings
+    return [finding for _, finding in sorted(evaluate_rules(batch), key=lambda item: item[0])]
 
 
 def _to_float(value: Any) -> Optional[float]:
@@ -85,158 +97,727 @@ def _to_float(value: Any) -> Optional[float]:
         return None
 
 
-def _contains_any(text: str, keywords: Iterable[str]) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in keywords)
-
-
-def _check_risk(entry: Dict[str, Any], add_finding) -> None:
-    risk_score = _to_float(entry.get("risk_score"))
-    if risk_score is None:
-        return
-
-    risk_threshold = _to_float(entry.get("risk_threshold")) or 0.7
-    if risk_score <= risk_threshold:
-        return
-
-    severity: Severity
-    if risk_score >= 0.9:
-        severity = "critical"
-    elif risk_score >= (risk_threshold + 0.15):
-        severity = "high"
-    else:
-        severity = "medium"
-
-    add_finding(
-        "risk",
-        severity,
-        f"Risk score {risk_score:.2f} exceeds threshold {risk_threshold:.2f} for {entry.get('section', 'project segment')}",
-        context={
-            "risk_score": risk_score,
-            "risk_threshold": risk_threshold,
-            "drivers": entry.get("risk_drivers", []),
-        },
-    )
-
-
-def _check_schedule(entry: Dict[str, Any], add_finding) -> None:
-    progress = _to_float(entry.get("progress_percent"))
-    expected = _to_float(entry.get("expected_progress_percent"))
-    tolerance = _to_float(entry.get("variance_tolerance"))
-    tolerance = tolerance if tolerance is not None else 5.0
-
-    if progress is not None and expected is not None:
-        variance = expected - progress
-        if variance > tolerance:
-            severity: Severity = "high" if variance >= tolerance * 2 else "medium"
-            add_finding(
-                "schedule",
-                severity,
-                f"Progress trailing plan by {variance:.1f} percentage points",
-                context={
-                    "expected_progress_percent": expected,
-                    "actual_progress_percent": progress,
-                    "variance_percent": variance,
+_INT64 = np.iinfo(np.int64)
+
+
+def _to_int(value: Any) -> int:
+    """``int(value)``; 0 when that fails or the count does not fit in int64."""
+
+    try:
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+    return number if _INT64.min <= number <= _INT64.max else 0
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> str:
+    return "|".join(re.escape(keyword) for keyword in keywords)
+
+
+class TelemetryBatch:
+    """Column view over one batch of telemetry rows.
+
+    Columns are extracted lazily, so a rule set only pays for the fields it
+    reads.  Rows from dictionaries keep ``float()`` semantics per value: an
+    explicit ``NaN`` is a number while a missing key is not.  Rows from a
+    DataFrame (or an Arrow batch) treat ``NaN`` as missing, as pandas uses it
+    to fill absent keys.
+    """
+
+    def __init__(self, length: int, columns: Mapping[str, Any], records: Optional[Sequence[Dict[str, Any]]] = None, nan_is_missing: bool = False) -> None:
+        self.length = length
+        self._columns: Dict[str, np.ndarray] = {}
+        self._source = columns
+        self._records = records
+        self._nan_is_missing = nan_is_missing
+        self._numeric: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._text: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "TelemetryBatch":
+        rows = [entry for entry in records if isinstance(entry, dict)]
+        return cls(len(rows), {}, records=rows)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "TelemetryBatch":
+        return cls(len(frame), frame, nan_is_missing=True)
+
+    @classmethod
+    def coerce(cls, batch: Any) -> "TelemetryBatch":
+        if isinstance(batch, TelemetryBatch):
+            return batch
+        if isinstance(batch, pd.DataFrame):
+            return cls.from_frame(batch)
+        if hasattr(batch, "to_pandas"):  # pyarrow RecordBatch / Table
+            return cls.from_frame(batch.to_pandas())
+        if isinstance(batch, dict):
+            return cls.from_records([batch])
+        return cls.from_records(batch)
+
+    def raw(self, name: str) -> np.ndarray:
+        """Object column; absent keys hold ``_MISSING``."""
+
+        column = self._columns.get(name)
+        if column is not None:
+            return column
+        if self._records is not None:
+            column = np.fromiter((entry.get(name, _MISSING) for entry in self._records), dtype=object, count=self.length)
+        elif name in self._source:
+            column = np.asarray(self._source[name], dtype=object).copy()
+            column[pd.isna(column)] = _MISSING
+        else:
+            column = np.full(self.length, _MISSING, dtype=object)
+        self._columns[name] = column
+        return column
+
+    def value(self, name: str, row: int, default: Any = None) -> Any:
+        column = self._columns.get(name)
+        value = (column if column is not None else self.raw(name))[row]
+        return default if value is _MISSING else value
+
+    def numeric(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """``(values, valid)`` where ``valid`` marks entries ``float()`` accepts."""
+
+        cached = self._numeric.get(name)
+        if cached is not None:
+            return cached
+        values = np.full(self.length, np.nan)
+        valid = np.zeros(self.length, dtype=bool)
+        source = None
+        if self._records is None and name in self._source:
+            source = np.asarray(self._source[name])
+        if source is not None and source.dtype.kind in "biuf":
+            values = source.astype(float)
+            valid = ~np.isnan(values)
+        else:
+            raw = self.raw(name)
+            present = np.flatnonzero((raw != _MISSING) & (raw != None))  # noqa: E711 - elementwise
+            if len(present):
+                subset = raw[present]
+                try:
+                    converted = subset.astype(float)
+                    ok = np.ones(len(present), dtype=bool)
+                except (TypeError, ValueError):
+                    floats = [_to_float(value) for value in subset]
+                    ok = np.array([value is not None for value in floats], dtype=bool)
+                    converted = np.array([value if value is not None else np.nan for value in floats], dtype=float)
+                values[present] = converted
+                valid[present] = ok
+                if self._nan_is_missing:
+                    valid &= ~np.isnan(values)
+        self._numeric[name] = (values, valid)
+        return values, valid
+
+    def first_truthy_count(self, names: Sequence[str]) -> np.ndarray:
+        """``int(entry.get(a) or entry.get(b) or ...)``; failures and counts beyond int64 are 0."""
+
+        counts = np.zeros(self.length, dtype=np.int64)
+        pending = np.ones(self.length, dtype=bool)
+        for name in names:
+            if not pending.any():
+                break
+            source = None
+            if self._records is None and name in self._source:
+                source = np.asarray(self._source[name])
+            if source is not None and source.dtype.kind in "biuf":
+                numbers = source.astype(float)
+                truthy = pending & (numbers != 0) & ~np.isnan(numbers)
+                # Infinite or out-of-range values are truthy but fail like _to_int.
+                fits = truthy & (np.abs(numbers) < 2.0**63)
+                counts[fits] = np.trunc(numbers[fits]).astype(np.int64)
+            else:
+                raw = self.raw(name)
+                candidates = np.flatnonzero(pending & (raw != _MISSING))
+                values = raw[candidates]
+                selected = candidates[values.astype(bool)] if len(candidates) else candidates
+                truthy = np.zeros(self.length, dtype=bool)
+                truthy[selected] = True
+                if len(selected):
+                    counts[selected] = [_to_int(value) for value in raw[selected]]
+            pending &= ~truthy
+        return counts
+
+    def contains_any(self, name: str, keywords: Iterable[str], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Case-insensitive substring match of ``keywords`` in a text column."""
+
+        matches = np.zeros(self.length, dtype=bool)
+        texts = self._lowered(name)
+        if rows is not None:
+            texts = texts[np.isin(texts.index.to_numpy(), rows)]
+        if len(texts):
+            found = texts.str.contains(_keyword_pattern(keywords), regex=True).to_numpy(dtype=bool)
+            matches[texts.index.to_numpy()[found]] = True
+        return matches
+
+    def _lowered(self, name: str) -> pd.Series:
+        # Lower-cased non-empty strings only, indexed by row; most telemetry
+        # rows carry no notes, so keyword scans run over a small subset.
+        cached = self._text.get(name)
+        if cached is None:
+            lowered = pd.Series(self.raw(name), dtype=object).str.lower()
+            cached = lowered[lowered.notna().to_numpy() & (lowered.to_numpy() != "")]
+            self._text[name] = cached
+        return cached
+
+
+Finding = Tuple[Tuple[int, int, int], Dict[str, Any]]
+
+
+class _FindingSink:
+    """Collects findings with the sort key that reproduces per-entry order."""
+
+    def __init__(self, batch: TelemetryBatch) -> None:
+        self.batch = batch
+        self.findings: List[Finding] = []
+
+    def add(self, row: int, sequence: int, anomaly_type: str, severity: Severity, message: str, context: Dict[str, Any]) -> None:
+        self.findings.append(
+            (
+                (SEVERITY_ORDER.get(severity, 99), row, sequence),
+                {
+                    "type": anomaly_type,
+                    "severity": severity,
+                    "message": message,
+                    "timestamp": self.batch.value("timestamp", row),
+                    "context": context,
                 },
             )
+        )
 
-    delay_days = _to_float(entry.get("schedule_delay_days")) or _to_float(entry.get("days_late"))
-    if delay_days and delay_days > 0:
-        severity = "critical" if delay_days >= 14 else ("high" if delay_days >= 7 else "medium")
-        add_finding(
-            "schedule",
+
+def evaluate_rules(batch: Any) -> List[Finding]:
+    """Run the threshold rules over one batch.
+
+    Returns ``(sort_key, finding)`` pairs; sorting on the key orders findings
+    by severity, then entry, then rule, which is the order the per-entry
+    checks have always produced.
+    """
+
+    batch = TelemetryBatch.coerce(batch)
+    sink = _FindingSink(batch)
+    if batch.length:
+        _check_risk(batch, sink)
+        _check_schedule(batch, sink)
+        _check_cost(batch, sink)
+        _check_safety(batch, sink)
+        _check_quality(batch, sink)
+    return sink.findings
+
+
+def _or_default(values: np.ndarray, valid: np.ndarray, default: float) -> np.ndarray:
+    # ``_to_float(x) or default``: a missing or zero value takes the default
+    # while NaN, being truthy, is kept.
+    return np.where(valid & (values != 0), values, default)
+
+
+def _check_risk(batch: TelemetryBatch, sink: _FindingSink) -> None:
+    risk_score, has_score = batch.numeric("risk_score")
+    threshold_values, has_threshold = batch.numeric("risk_threshold")
+    risk_threshold = _or_default(threshold_values, has_threshold, 0.7)
+
+    with np.errstate(invalid="ignore"):
+        fires = has_score & ~(risk_score <= risk_threshold)
+    for row in np.flatnonzero(fires).tolist():
+        score = float(risk_score[row])
+        threshold = float(risk_threshold[row])
+        if score >= 0.9:
+            severity = "critical"
+        elif score >= (threshold + 0.15):
+            severity = "high"
+        else:
+            severity = "medium"
+        drivers = batch.value("risk_drivers", row, _MISSING)
+        sink.add(
+            row,
+            0,
+            "risk",
             severity,
-            f"Milestone late by {int(delay_days)} days",
-            context={
-                "milestone": entry.get("milestone"),
-                "delay_days": delay_days,
+            f"Risk score {score:.2f} exceeds threshold {threshold:.2f} for {batch.value('section', row, 'project segment')}",
+            {
+                "risk_score": score,
+                "risk_threshold": threshold,
+                "drivers": [] if drivers is _MISSING else drivers,
             },
         )
 
 
-def _check_cost(entry: Dict[str, Any], add_finding) -> None:
-    planned_cost = _to_float(entry.get("planned_cost"))
-    actual_cost = _to_float(entry.get("actual_cost"))
-    if planned_cost is None or actual_cost is None or planned_cost == 0:
-        return
-
-    deviation_pct = ((actual_cost - planned_cost) / planned_cost) * 100
-    tolerance_pct = _to_float(entry.get("cost_tolerance_pct")) or 5.0
-
-    if deviation_pct <= tolerance_pct:
-        return
+def _check_schedule(batch: TelemetryBatch, sink: _FindingSink) -> None:
+    progress, has_progress = batch.numeric("progress_percent")
+    expected, has_expected = batch.numeric("expected_progress_percent")
+    tolerance_values, has_tolerance = batch.numeric("variance_tolerance")
+    tolerance = np.where(has_tolerance, tolerance_values, 5.0)
+
+    variance = expected - progress
+    with np.errstate(invalid="ignore"):
+        behind = has_progress & has_expected & (variance > tolerance)
+    for row in np.flatnonzero(behind).tolist():
+        gap = float(variance[row])
+        severity: Severity = "high" if gap >= tolerance[row] * 2 else "medium"
+        sink.add(
+            row,
+            1,
+            "schedule",
+            severity,
+            f"Progress trailing plan by {gap:.1f} percentage points",
+            {
+                "expected_progress_percent": float(expected[row]),
+                "actual_progress_percent": float(progress[row]),
+                "variance_percent": gap,
+            },
+        )
 
-    severity: Severity = "high" if deviation_pct >= tolerance_pct * 2 else "medium"
+    delay_values, has_delay = batch.numeric("schedule_delay_days")
+    late_values, has_late = batch.numeric("days_late")
+    use_delay = has_delay & (delay_values != 0)
+    delay_days = np.where(use_delay, delay_values, late_values)
+    has_days = use_delay | has_late
+    with np.errstate(invalid="ignore"):
+        late = has_days & (delay_days != 0) & (delay_days > 0)
+    for row in np.flatnonzero(late).tolist():
+        days = float(delay_days[row])
+        severity = "critical" if days >= 14 else ("high" if days >= 7 else "medium")
+        sink.add(
+            row,
+            2,
+            "schedule",
+            severity,
+            f"Milestone late by {int(days)} days",
+            {
+                "milestone": batch.value("milestone", row),
+                "delay_days": days,
+            },
+        )
 
-    add_finding(
-        "cost",
-        severity,
-        f"Cost overrun of {deviation_pct:.1f}% detected",
-        context={
-            "planned_cost": planned_cost,
-            "actual_cost": actual_cost,
-            "deviation_pct": deviation_pct,
-        },
-    )
 
+def _check_cost(batch: TelemetryBatch, sink: _FindingSink) -> None:
+    planned_cost, has_planned = batch.numeric("planned_cost")
+    actual_cost, has_actual = batch.numeric("actual_cost")
+    tolerance_values, has_tolerance = batch.numeric("cost_tolerance_pct")
+    tolerance_pct = _or_default(tolerance_values, has_tolerance, 5.0)
+
+    comparable = has_planned & has_actual & (planned_cost != 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        deviation_pct = ((actual_cost - planned_cost) / np.where(comparable, planned_cost, 1.0)) * 100
+        over = comparable & ~(deviation_pct <= tolerance_pct)
+    for row in np.flatnonzero(over).tolist():
+        deviation = float(deviation_pct[row])
+        severity: Severity = "high" if deviation >= tolerance_pct[row] * 2 else "medium"
+        sink.add(
+            row,
+            3,
+            "cost",
+            severity,
+            f"Cost overrun of {deviation:.1f}% detected",
+            {
+                "planned_cost": float(planned_cost[row]),
+                "actual_cost": float(actual_cost[row]),
+                "deviation_pct": deviation,
+            },
+        )
 
-def _check_safety(entry: Dict[str, Any], add_finding) -> None:
-    incidents = entry.get("incidents") or entry.get("safety_incidents") or entry.get("incident_count")
-    if incidents:
-        try:
-            incident_count = int(incidents)
-        except (TypeError, ValueError):
-            incident_count = 0
 
-        if incident_count > 0:
+def _check_safety(batch: TelemetryBatch, sink: _FindingSink) -> None:
+    incidents = batch.first_truthy_count(("incidents", "safety_incidents", "incident_count"))
+    reported = np.flatnonzero(incidents > 0)
+    if len(reported):
+        severe = batch.contains_any("notes", _SEVERE_SAFETY_NOTES, rows=reported)
+        for row in reported.tolist():
+            incident_count = int(incidents[row])
             severity: Severity
-            if incident_count >= 3 or _contains_any(entry.get("notes", ""), ["lost time", "hospitalisation", "hospitalization", "major"]):
+            if incident_count >= 3 or severe[row]:
                 severity = "critical"
             elif incident_count == 2:
                 severity = "high"
             else:
                 severity = "medium"
-
-            add_finding(
+            sink.add(
+                row,
+                4,
                 "safety",
                 severity,
                 f"Recorded {incident_count} safety incident(s)",
-                context={
+                {
                     "incident_count": incident_count,
-                    "notes": entry.get("notes"),
+                    "notes": batch.value("notes", row),
                 },
             )
 
-    if _contains_any(entry.get("notes", ""), ["near miss", "near-miss", "ppe non-compliance"]):
-        add_finding(
+    for row in np.flatnonzero(batch.contains_any("notes", _NEAR_MISS_NOTES)).tolist():
+        sink.add(
+            row,
+            5,
             "safety",
             "low",
             "Near miss reported – schedule refresher training",
-            context={"notes": entry.get("notes")},
+            {"notes": batch.value("notes", row)},
         )
 
 
-def _check_quality(entry: Dict[str, Any], add_finding) -> None:
-    defects = entry.get("defects") or entry.get("punch_items")
-    if defects:
-        try:
-            defect_count = int(defects)
-        except (TypeError, ValueError):
-            defect_count = 0
-
-        if defect_count > 0:
-            severity: Severity = "high" if defect_count >= 5 else "medium"
-            add_finding(
-                "quality",
-                severity,
-                f"{defect_count} quality punch list item(s) logged",
-                context={"defects": defect_count, "location": entry.get("section")},
-            )
+def _check_quality(batch: TelemetryBatch, sink: _FindingSink) -> None:
+    defects = batch.first_truthy_count(("defects", "punch_items"))
+    for row in np.flatnonzero(defects > 0).tolist():
+        defect_count = int(defects[row])
+        severity: Severity = "high" if defect_count >= 5 else "medium"
+        sink.add(
+            row,
+            6,
+            "quality",
+            severity,
+            f"{defect_count} quality punch list item(s) logged",
+            {"defects": defect_count, "location": batch.value("section", row)},
+        )
 
-    if _contains_any(entry.get("notes", ""), ["rework", "non-conformance", "failed inspection"]):
-        add_finding(
+    for row in np.flatnonzero(batch.contains_any("notes", _QUALITY_NOTES)).tolist():
+        sink.add(
+            row,
+            7,
             "quality",
             "medium",
             "Quality non-conformance requires follow-up",
-            context={"notes": entry.get("notes"), "inspection": entry.get("inspection")},
+            {"notes": batch.value("notes", row), "inspection": batch.value("inspection", row)},
         )
+
+
+def _factorize(keys: Sequence[Hashable]) -> Tuple[np.ndarray, List[Hashable]]:
+    key_array = keys if isinstance(keys, np.ndarray) else np.fromiter(keys, dtype=object, count=len(keys))
+    codes, uniques = pd.factorize(key_array, sort=False)
+    uniques = uniques.tolist()
+    missing = codes < 0
+    if missing.any():
+        # ``None`` (no project id) is a series of its own, not a missing value.
+        codes[missing] = len(uniques)
+        uniques.append(None)
+    return codes, uniques
+
+
+def _affine_scan(decay: np.ndarray, increment: np.ndarray) -> np.ndarray:
+    """Inclusive scan of ``y[i] = decay[i] * y[i - 1] + increment[i]``.
+
+    Runs in ``log2(n)`` vectorised doubling steps, composing the affine maps
+    pairwise.  A zero ``decay`` restarts the recurrence, which is how several
+    series laid end to end are scanned in one pass.
+    """
+
+    decay = decay.copy()
+    result = increment.copy()
+    shift = 1
+    while shift < len(result):
+        result[shift:] += decay[shift:] * result[:-shift]
+        decay[shift:] *= decay[:-shift]
+        shift *= 2
+    return result
+
+
+class EwmaZScoreDetector:
+    """Exponentially weighted mean and variance per series.
+
+    Each observation is scored against the mean and variance *before* it is
+    folded in: ``z = (x - mean) / sqrt(var)``.  Series state is ``(count,
+    mean, var)``.  A batch is sorted by series and both recurrences are
+    evaluated for every series at once with an affine prefix scan, seeded
+    with each series' state from earlier batches.
+    """
+
+    def __init__(self, alpha: float = 0.1, threshold: float = 3.0, warmup: int = 20) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self._state: Dict[Hashable, Tuple[int, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def update(self, keys: Sequence[Hashable], values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Score and absorb ``values``; returns ``(z_scores, expected, flagged)``."""
+
+        codes, uniques = _factorize(keys)
+        return self.update_codes(codes, uniques, values)
+
+    def update_codes(self, codes: np.ndarray, keys: Sequence[Hashable], values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``update`` for pre-factorized keys: ``keys[codes[i]]`` is row ``i``'s series."""
+
+        values = np.asarray(values, dtype=float)
+        size = len(values)
+        if size == 0:
+            empty = np.zeros(0)
+            return empty, empty, np.zeros(0, dtype=bool)
+
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        lengths = np.diff(np.r_[starts, size])
+        ends = starts + lengths - 1
+        group_keys = [keys[code] for code in sorted_codes[starts].tolist()]
+        observed = values[order]
+
+        seeds = [self._state.get(key) for key in group_keys]
+        first = observed[starts].tolist()
+        count0 = np.array([seed[0] if seed else 0 for seed in seeds], dtype=np.int64)
+        mean0 = np.array([seed[1] if seed else value for seed, value in zip(seeds, first)], dtype=float)
+        var0 = np.array([seed[2] if seed else 0.0 for seed in seeds], dtype=float)
+
+        alpha = self.alpha
+        keep = 1.0 - alpha
+        decay = np.full(size, keep)
+        decay[starts] = 0.0
+
+        increment = alpha * observed
+        increment[starts] += keep * mean0
+        means = _affine_scan(decay, increment)
+        prior_mean = np.empty(size)
+        prior_mean[1:] = means[:-1]
+        prior_mean[starts] = mean0
+
+        deviation = observed - prior_mean
+        increment = alpha * keep * deviation * deviation
+        increment[starts] += keep * var0
+        variances = _affine_scan(decay, increment)
+        prior_var = np.empty(size)
+        prior_var[1:] = variances[:-1]
+        prior_var[starts] = var0
+
+        group = np.repeat(np.arange(len(starts)), lengths)
+        prior_count = count0[group] + (np.arange(size) - starts[group])
+        for key, count, mean, var in zip(group_keys, (count0 + lengths).tolist(), means[ends].tolist(), variances[ends].tolist()):
+            self._state[key] = (count, mean, var)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_sorted = np.where(deviation == 0, 0.0, deviation / np.sqrt(prior_var))
+        flagged_sorted = (prior_count >= self.warmup) & (np.abs(z_sorted) > self.threshold)
+
+        z_scores = np.empty(size)
+        expected = np.empty(size)
+        flagged = np.empty(size, dtype=bool)
+        z_scores[order] = z_sorted
+        expected[order] = prior_mean
+        flagged[order] = flagged_sorted
+        return z_scores, expected, flagged
+
+
+class SeasonalResidualDetector:
+    """Scores each observation against the same phase of earlier seasons.
+
+    Observation ``n`` of a series falls in phase ``n % season_length`` and is
+    compared with an EWMA of that phase only, so a weekly pattern in daily
+    telemetry is not itself reported as an anomaly.  State is one position
+    counter per series plus ``season_length`` EWMA states.
+    """
+
+    def __init__(self, season_length: int, alpha: float = 0.2, threshold: float = 3.0, warmup: int = 5) -> None:
+        if season_length < 2:
+            raise ValueError("season_length must be at least 2")
+        self.season_length = season_length
+        self._phases = EwmaZScoreDetector(alpha=alpha, threshold=threshold, warmup=warmup)
+        self._positions: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def update(self, keys: Sequence[Hashable], values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        codes, series_keys = _factorize(keys)
+        size = len(codes)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if size else np.zeros(0, dtype=np.int64)
+        rank = np.empty(size, dtype=np.int64)
+        rank[order] = np.arange(size) - np.repeat(starts, np.diff(np.r_[starts, size]))
+
+        base = np.array([self._positions.get(key, 0) for key in series_keys], dtype=np.int64)
+        phase = (base[codes] + rank) % self.season_length
+        phase_codes, phase_uniques = pd.factorize(codes * self.season_length + phase, sort=False)
+        phase_keys = [
+            (series_keys[combined // self.season_length], combined % self.season_length)
+            for combined in phase_uniques.tolist()
+        ]
+        for key, start, seen in zip(series_keys, base.tolist(), np.bincount(codes, minlength=len(series_keys)).tolist()):
+            self._positions[key] = start + seen
+        return self._phases.update_codes(phase_codes, phase_keys, values)
+
+
+class StreamingAnomalyDetector:
+    """Threshold rules plus rolling statistical detectors over a telemetry stream.
+
+    ``process`` accepts an iterable of dictionaries, lists of dictionaries,
+    DataFrames or Arrow record batches; single dictionaries are grouped into
+    batches of ``batch_size`` rows.  Findings have the same shape as
+    ``detect_anomalies`` output and are severity-sorted per batch.
+    Statistical findings carry ``context["detector"]`` (``ewma`` or
+    ``seasonal``).
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[Mapping[str, str]] = None,
+        series_key: str = "project_id",
+        alpha: float = 0.1,
+        z_threshold: float = 3.0,
+        warmup: int = 20,
+        season_length: Optional[int] = None,
+        seasonal_warmup: int = 5,
+        rules: bool = True,
+        batch_size: int = 50_000,
+    ) -> None:
+        self.metrics = dict(DEFAULT_METRICS if metrics is None else metrics)
+        self.series_key = series_key
+        self.z_threshold = z_threshold
+        self.rules = rules
+        self.batch_size = batch_size
+        self._detectors: List[Tuple[str, str, str, Any]] = []
+        for metric in self.metrics:
+            self._detectors.append(("ewma", metric, "moving average", EwmaZScoreDetector(alpha, z_threshold, warmup)))
+            if season_length:
+                self._detectors.append(
+                    ("seasonal", metric, "seasonal baseline", SeasonalResidualDetector(season_length, alpha, z_threshold, seasonal_warmup))
+                )
+
+    def process(self, source: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        for batch in _batches(source, self.batch_size):
+            yield from self.process_batch(batch)
+
+    def process_batch(self, batch: Any) -> List[Dict[str, Any]]:
+        batch = TelemetryBatch.coerce(batch)
+        findings = evaluate_rules(batch) if self.rules else []
+        if batch.length:
+            sink = _FindingSink(batch)
+            self._score(batch, sink)
+            findings.extend(sink.findings)
+        return [finding for _, finding in sorted(findings, key=lambda item: item[0])]
+
+    def _score(self, batch: TelemetryBatch, sink: _FindingSink) -> None:
+        series = batch.raw(self.series_key).copy()
+        series[series == _MISSING] = None
+        for sequence, (name, metric, label, detector) in enumerate(self._detectors, start=8):
+            values, valid = batch.numeric(metric)
+            rows = np.flatnonzero(valid & np.isfinite(values))
+            if not len(rows):
+                continue
+            observed = values[rows]
+            z_scores, expected, flagged = detector.update(series[rows], observed)
+            for index in np.flatnonzero(flagged).tolist():
+                row = int(rows[index])
+                z_score = float(z_scores[index])
+                value = float(observed[index])
+                baseline = float(expected[index])
+                severity: Severity = "high" if abs(z_score) >= self.z_threshold * 2 else "medium"
+                direction = "above" if z_score > 0 else "below"
+                sink.add(
+                    row,
+                    sequence,
+                    self.metrics[metric],
+                    severity,
+                    f"{metric} {value:.2f} is {abs(z_score):.1f} standard deviations {direction} its {label} {baseline:.2f}",
+                    {
+                        "detector": name,
+                        "metric": metric,
+                        "series": series[row],
+                        "value": value,
+                        "expected": baseline,
+                        "z_score": z_score,
+                    },
+                )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Number of tracked series per detector and metric."""
+
+        summary: Dict[str, Dict[str, int]] = {}
+        for name, metric, _, detector in self._detectors:
+            summary.setdefault(name, {})[metric] = len(detector)
+        return summary
+
+
+def _batches(source: Iterable[Any], batch_size: int) -> Iterator[Any]:
+    pending: List[Dict[str, Any]] = []
+    for item in source:
+        if isinstance(item, dict):
+            pending.append(item)
+            if len(pending) >= batch_size:
+                yield pending
+                pending = []
+            continue
+        if pending:
+            yield pending
+            pending = []
+        yield item
+    if pending:
+        yield pending
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class WorkspaceEventSource:
+    """Telemetry rows read from the ``events:workspace:*`` Redis streams.
+
+    Each event's JSON payload becomes a row, with ``timestamp``,
+    ``project_id`` (the workspace) and ``event_type`` filled from the
+    envelope when the payload does not set them.  ``last_ids`` holds the
+    resume position per stream.  Iterating yields one list of rows per
+    ``XREAD``; without ``block_ms`` iteration ends once the streams are
+    drained, otherwise it follows them indefinitely.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        pattern: str = WORKSPACE_STREAM_PATTERN,
+        last_ids: Optional[Dict[str, str]] = None,
+        count: int = 1000,
+        block_ms: Optional[int] = None,
+        event_types: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.pattern = pattern
+        self.last_ids: Dict[str, str] = dict(last_ids or {})
+        self.count = count
+        self.block_ms = block_ms
+        self.event_types = set(event_types) if event_types is not None else None
+        self.entries_read = 0
+
+    def discover(self) -> List[str]:
+        for key in self.redis.scan_iter(match=self.pattern, count=1000):
+            self.last_ids.setdefault(_decode(key), "0")
+        return sorted(self.last_ids)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        streams = self.discover()
+        self.entries_read = 0
+        if not streams:
+            return []
+        response = self.redis.xread({stream: self.last_ids[stream] for stream in streams}, count=self.count, block=self.block_ms)
+        rows: List[Dict[str, Any]] = []
+        for stream, entries in response or []:
+            stream = _decode(stream)
+            self.entries_read += len(entries)
+            for entry_id, fields in entries:
+                self.last_ids[stream] = _decode(entry_id)
+                row = self._row({_decode(key): _decode(value) for key, value in fields.items()})
+                if row is not None:
+                    rows.append(row)
+        return rows
+
+    def _row(self, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        event = EventEnvelope.from_fields(fields)
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return None
+        try:
+            payload = json.loads(event.payload_json)
+        except ValueError:
+            logger.debug("Skipping event %s with malformed payload", event.event_id)
+            return None
+        if not isinstance(payload, dict):
+            return None
+        payload.setdefault("timestamp", event.ts)
+        payload.setdefault("project_id", event.workspace_id)
+        payload.setdefault("event_type", event.event_type)
+        return payload
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        while True:
+            rows = self.poll()
+            if rows:
+                yield rows
+            elif not self.entries_read and self.block_ms is None:
+                return
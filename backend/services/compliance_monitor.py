@@ -1,9 +1,25 @@
-"""Compliance monitoring utilities for project documentation."""
+"""Compliance monitoring utilities for project documentation.
+
+Rules are compiled into a ``CompiledRulebook``: every required and forbidden
+phrase of every rule goes into one Aho-Corasick automaton, the document is
+scanned once, and each rule's status is read off the set of phrases found.
+Compiled rulebooks are cached per rulebook version (or content fingerprint),
+so checking many documents against the same governance library pays for the
+automaton once.  Matching is case-insensitive substring matching by default;
+``word_boundaries`` only accepts phrases not embedded in a longer word and
+``normalize_arabic`` folds diacritics, tatweel and letter variants on both
+sides before matching.
+"""
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass
@@ -18,7 +34,14 @@ class NormalisedRule:
     recommendations: Optional[str] = None
 
 
-def check_compliance(document_text: str, rules: List[Any]) -> List[Dict[str, Any]]:
+def check_compliance(
+    document_text: str,
+    rules: List[Any],
+    *,
+    version: Optional[Hashable] = None,
+    word_boundaries: bool = False,
+    normalize_arabic: bool = False,
+) -> List[Dict[str, Any]]:
     """Assess a document against governance rules.
 
     Parameters
@@ -48,48 +71,260 @@ def check_compliance(document_text: str, rules: List[Any]) -> List[Dict[str, Any
         Each element contains ``rule_id``, ``status`` (``compliant``,
         ``warning`` or ``violation``), ``severity`` and ``details`` providing
         context for dashboards.
+
+    ``version`` identifies the rulebook for the compiled-rulebook cache; when
+    omitted the rules' content is fingerprinted instead.
+    """
+
+    rulebook = compile_rules(rules, version=version, word_boundaries=word_boundaries, normalize_arabic=normalize_arabic)
+    return rulebook.check(document_text)
+
+
+def check_compliance_batch(
+    documents: Iterable[str],
+    rules: List[Any],
+    *,
+    version: Optional[Hashable] = None,
+    word_boundaries: bool = False,
+    normalize_arabic: bool = False,
+) -> List[List[Dict[str, Any]]]:
+    """Check several documents against one compiled rulebook.
+
+    Returns one findings list per document, in input order, each identical to
+    what ``check_compliance`` returns for that document.
+    """
+
+    rulebook = compile_rules(rules, version=version, word_boundaries=word_boundaries, normalize_arabic=normalize_arabic)
+    return rulebook.check_many(documents)
+
+
+# Harakat, superscript alef and tatweel are dropped; hamza-carrying and
+# alternative letter forms fold to their base letter; Arabic-Indic digits
+# become ASCII digits.
+_ARABIC_FOLDING = {
+    **{codepoint: None for codepoint in range(0x064B, 0x0653)},
+    0x0670: None,
+    0x0640: None,
+    **{ord(letter): "\u0627" for letter in "\u0623\u0625\u0622\u0671"},
+    0x0649: "\u064a",
+    0x0629: "\u0647",
+    0x0624: "\u0648",
+    0x0626: "\u064a",
+    **{0x0660 + digit: str(digit) for digit in range(10)},
+    **{0x06F0 + digit: str(digit) for digit in range(10)},
+}
+
+
+def normalize_arabic_text(text: str) -> str:
+    """Fold Arabic spelling variants so phrase matching ignores them."""
+
+    return text.translate(_ARABIC_FOLDING)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton reporting which of a set of phrases occur in a text.
+
+    The trie and failure links are built once.  Transitions are completed
+    lazily while scanning (following failure links the first time a
+    ``(state, character)`` pair is seen, then cached), so each text character
+    costs a single dictionary lookup.
     """
 
-    if not document_text:
-        document_text = ""
+    def __init__(self, phrases: Sequence[str]) -> None:
+        self.lengths = [len(phrase) for phrase in phrases]
+        self.always: Set[int] = {index for index, phrase in enumerate(phrases) if not phrase}
+        goto: List[Dict[str, int]] = [{}]
+        own: List[List[int]] = [[]]
+        for index, phrase in enumerate(phrases):
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    own.append([])
+                state = nxt
+            own[state].append(index)
+
+        fail = [0] * len(goto)
+        outputs: List[Tuple[int, ...]] = [()] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            outputs[state] = tuple(own[state])
+        for state in queue:
+            for char, nxt in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[nxt] = goto[fallback].get(char, 0)
+                outputs[nxt] = tuple(own[nxt]) + outputs[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._delta: List[Dict[str, int]] = [dict(transitions) for transitions in goto]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def _resolve(self, state: int, char: str) -> int:
+        fallback = state
+        while fallback and char not in self._goto[fallback]:
+            fallback = self._fail[fallback]
+        nxt = self._goto[fallback].get(char, 0)
+        self._delta[state][char] = nxt
+        return nxt
+
+    def find(self, text: str, word_boundaries: bool = False) -> Set[int]:
+        """Indices of the phrases occurring in ``text``."""
 
-    text_lower = document_text.lower()
-    findings: List[Dict[str, Any]] = []
+        found = set(self.always)
+        delta = self._delta
+        outputs = self._outputs
+        resolve = self._resolve
+        state = 0
+        if not word_boundaries:
+            for char in text:
+                nxt = delta[state].get(char)
+                if nxt is None:
+                    nxt = resolve(state, char)
+                state = nxt
+                if outputs[state]:
+                    found.update(outputs[state])
+            return found
 
-    for raw_rule in rules or []:
-        rule = _normalise_rule(raw_rule)
-        missing = _missing_phrases(text_lower, rule.required_phrases)
-        forbidden_hits = _present_phrases(text_lower, rule.forbidden_phrases)
+        lengths = self.lengths
+        last = len(text) - 1
+        for position, char in enumerate(text):
+            nxt = delta[state].get(char)
+            if nxt is None:
+                nxt = resolve(state, char)
+            state = nxt
+            if not outputs[state]:
+                continue
+            if position < last and _is_word_char(text[position + 1]):
+                continue
+            for index in outputs[state]:
+                start = position - lengths[index]
+                if start < 0 or not _is_word_char(text[start]):
+                    found.add(index)
+        return found
 
-        if missing and forbidden_hits:
-            status = "violation"
-            details = (
-                f"Missing {', '.join(missing)} and detected forbidden phrases {', '.join(forbidden_hits)}"
-            )
-        elif missing:
-            status = "violation"
-            details = f"Missing required phrase(s): {', '.join(missing)}"
-        elif forbidden_hits:
-            status = "warning" if rule.severity == "low" else "violation"
-            details = f"Forbidden phrase(s) present: {', '.join(forbidden_hits)}"
-        else:
-            status = "compliant"
-            details = "Requirement satisfied"
 
-        finding: Dict[str, Any] = {
-            "rule_id": rule.rule_id,
-            "description": rule.description,
-            "status": status,
-            "severity": rule.severity,
-            "details": details,
-        }
+class CompiledRulebook:
+    """Rules normalised once, with all their phrases in one automaton."""
 
-        if rule.recommendations and status != "compliant":
-            finding["recommendation"] = rule.recommendations
+    def __init__(self, rules: Optional[List[Any]], word_boundaries: bool = False, normalize_arabic: bool = False) -> None:
+        self.rules = [_normalise_rule(raw_rule) for raw_rule in rules or []]
+        self.word_boundaries = word_boundaries
+        self.normalize_arabic = normalize_arabic
+        phrase_ids: Dict[str, int] = {}
 
-        findings.append(finding)
+        def _ids(phrases: Iterable[str]) -> List[int]:
+            return [phrase_ids.setdefault(self.normalise(phrase), len(phrase_ids)) for phrase in phrases]
 
-    return findings
+        self._required = [_ids(rule.required_phrases) for rule in self.rules]
+        self._forbidden = [_ids(rule.forbidden_phrases) for rule in self.rules]
+        self.automaton = PhraseAutomaton(list(phrase_ids))
+
+    def normalise(self, text: str) -> str:
+        lowered = text.lower()
+        return normalize_arabic_text(lowered) if self.normalize_arabic else lowered
+
+    def check(self, document_text: str) -> List[Dict[str, Any]]:
+        found = self.automaton.find(self.normalise(document_text or ""), self.word_boundaries)
+        findings: List[Dict[str, Any]] = []
+        for rule, required, forbidden in zip(self.rules, self._required, self._forbidden):
+            missing = [phrase for phrase, index in zip(rule.required_phrases, required) if index not in found]
+            forbidden_hits = [phrase for phrase, index in zip(rule.forbidden_phrases, forbidden) if index in found]
+            findings.append(_finding(rule, missing, forbidden_hits))
+        return findings
+
+    def check_many(self, documents: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        return [self.check(document) for document in documents]
+
+
+def _finding(rule: NormalisedRule, missing: List[str], forbidden_hits: List[str]) -> Dict[str, Any]:
+    if missing and forbidden_hits:
+        status = "violation"
+        details = (
+            f"Missing {', '.join(missing)} and detected forbidden phrases {', '.join(forbidden_hits)}"
+        )
+    elif missing:
+        status = "violation"
+        details = f"Missing required phrase(s): {', '.join(missing)}"
+    elif forbidden_hits:
+        status = "warning" if rule.severity == "low" else "violation"
+        details = f"Forbidden phrase(s) present: {', '.join(forbidden_hits)}"
+    else:
+        status = "compliant"
+        details = "Requirement satisfied"
+
+    finding: Dict[str, Any] = {
+        "rule_id": rule.rule_id,
+        "description": rule.description,
+        "status": status,
+        "severity": rule.severity,
+        "details": details,
+    }
+
+    if rule.recommendations and status != "compliant":
+        finding["recommendation"] = rule.recommendations
+
+    return finding
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+_RULEBOOK_CACHE: "OrderedDict[Tuple[Hashable, bool, bool], CompiledRulebook]" = OrderedDict()
+_RULEBOOK_CACHE_LOCK = threading.Lock()
+
+
+def _rules_fingerprint(rules: Optional[List[Any]]) -> str:
+    payload = json.dumps(rules or [], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_rules(
+    rules: Optional[List[Any]],
+    *,
+    version: Optional[Hashable] = None,
+    word_boundaries: bool = False,
+    normalize_arabic: bool = False,
+) -> CompiledRulebook:
+    """Compiled rulebook for ``rules``, built once per version and options.
+
+    Pass ``version`` when the caller tracks rulebook revisions; otherwise the
+    rules are fingerprinted, which costs a JSON dump per call but never
+    serves a stale rulebook.
+    """
+
+    key = (version if version is not None else _rules_fingerprint(rules), word_boundaries, normalize_arabic)
+    with _RULEBOOK_CACHE_LOCK:
+        rulebook = _RULEBOOK_CACHE.get(key)
+        if rulebook is not None:
+            _RULEBOOK_CACHE.move_to_end(key)
+            return rulebook
+    rulebook = CompiledRulebook(rules, word_boundaries=word_boundaries, normalize_arabic=normalize_arabic)
+    with _RULEBOOK_CACHE_LOCK:
+        _RULEBOOK_CACHE[key] = rulebook
+        while len(_RULEBOOK_CACHE) > max(1, _env_int("COMPLIANCE_RULEBOOK_CACHE_SIZE", 16)):
+            _RULEBOOK_CACHE.popitem(last=False)
+    return rulebook
 
 
 def _normalise_rule(raw_rule: Any) -> NormalisedRule:
@@ -127,11 +362,3 @@ def _ensure_iterable(value: Any) -> Iterable[str]:
     if value:
         return [value]
     return []
-
-
-def _missing_phrases(text_lower: str, phrases: Iterable[str]) -> List[str]:
-    return [phrase for phrase in phrases if phrase.lower() not in text_lower]
-
-
-def _present_phrases(text_lower: str, phrases: Iterable[str]) -> List[str]:
-    return [phrase for phrase in phrases if phrase.lower() in text_lower]
@@ -2,7 +2,7 @@
 
 from .uncertainty_quantification import UncertaintyQuantifier, UncertaintyResult
 from .causal_analysis import ConstructionCausalAnalyzer, CausalInsight
-from .intelligent_alerts import AlertIntelligenceSystem, IntelligentAlert
+from .intelligent_alerts import AlertBatcher, AlertIntelligenceSystem, IntelligentAlert, ProjectContextCache
 
 __all__ = [
     "UncertaintyQuantifier",
@@ -10,5 +10,7 @@ __all__ = [
     "ConstructionCausalAnalyzer",
     "CausalInsight",
     "AlertIntelligenceSystem",
+    "AlertBatcher",
     "IntelligentAlert",
+    "ProjectContextCache",
 ]
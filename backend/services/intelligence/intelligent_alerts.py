@@ -1,14 +1,24 @@
-"""Intelligent alerting utilities built on uncertainty and causal analysis."""
+"""Intelligent alerting utilities built on uncertainty and causal analysis.
+
+``process_event`` calls arriving within ``ALERT_BATCH_WINDOW_MS`` of each other
+are scored together: one feature matrix and one uncertainty prediction per
+batch instead of one per event.  Synchronous ingest code (hydration, schedule
+imports) can call ``score_events`` directly with a whole burst.  Synthetic
+project context frames for causal analysis are cached per project.
+"""
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import asyncio
 import json
 import logging
 import os
+import threading
+import time
 
 import numpy as np
 import pandas as pd
@@ -18,6 +28,16 @@ from .causal_analysis import ConstructionCausalAnalyzer, CausalInsight
 
 logger = logging.getLogger(__name__)
 
+ALERT_THRESHOLD = 0.3
+CAUSAL_EVENT_TYPES = {"delay", "cost_overrun", "quality_issue"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
 
 @dataclass
 class IntelligentAlert:
@@ -43,33 +63,210 @@ class IntelligentAlert:
         return payload
 
 
+class ProjectContextCache:
+    """LRU of ``project_id -> context frame`` with a TTL."""
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.maxsize = maxsize if maxsize is not None else _env_int("ALERT_CONTEXT_CACHE_SIZE", 128)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int("ALERT_CONTEXT_CACHE_TTL_SECONDS", 900)
+        self._time = time_fn
+        self._entries: "OrderedDict[Optional[str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Optional[str]) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, frame = entry
+                if not (self.ttl_seconds > 0 and self._time() - created_at > self.ttl_seconds):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return frame
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, key: Optional[str], frame: pd.DataFrame) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._time(), frame)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+# An event's alert, ``None`` below the alert threshold, or the error it raised.
+ScoredEvent = Union[Optional["IntelligentAlert"], Exception]
+BatchProcessor = Callable[[List[Dict[str, Any]]], Awaitable[List[ScoredEvent]]]
+
+
+def _raise_first_error(outcomes: List[ScoredEvent]) -> List[ScoredEvent]:
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            raise outcome
+    return outcomes
+
+
+class AlertBatcher:
+    """Collect events submitted within ``window_ms`` and process them as one batch.
+
+    A batch is flushed when the window closes or ``max_batch`` events are
+    waiting, whichever comes first; each caller gets its own event's result,
+    or its own event's exception, so one bad event cannot fail the others.
+    """
+
+    def __init__(self, process_batch: BatchProcessor, window_ms: Optional[int] = None, max_batch: Optional[int] = None) -> None:
+        self.process_batch = process_batch
+        self.window_ms = window_ms if window_ms is not None else _env_int("ALERT_BATCH_WINDOW_MS", 5)
+        self.max_batch = max(1, max_batch if max_batch is not None else _env_int("ALERT_BATCH_MAX_SIZE", 64))
+        self.batches = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Dict[str, Any], "asyncio.Future[Optional[IntelligentAlert]]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, event: Dict[str, Any]) -> Optional["IntelligentAlert"]:
+        if self.window_ms <= 0:
+            self.batches += 1
+            outcome = (await self.process_batch([event]))[0]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending futures belong to the old loop and can never resolve.
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+        future: "asyncio.Future[Optional[IntelligentAlert]]" = loop.create_future()
+        self._pending.append((event, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch and self._loop is not None:
+            self.batches += 1
+            self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Dict[str, Any], "asyncio.Future[Optional[IntelligentAlert]]"]]) -> None:
+        try:
+            outcomes = await self.process_batch([event for event, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
 class AlertIntelligenceSystem:
     """Generate enriched alerts using both uncertainty and causal analysis."""
 
-    def __init__(self, uncertainty_quantifier: UncertaintyQuantifier, causal_analyzer: ConstructionCausalAnalyzer) -> None:
+    def __init__(
+        self,
+        uncertainty_quantifier: UncertaintyQuantifier,
+        causal_analyzer: ConstructionCausalAnalyzer,
+        batch_window_ms: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        context_cache: Optional[ProjectContextCache] = None,
+    ) -> None:
         self.uncertainty_quantifier = uncertainty_quantifier
         self.causal_analyzer = causal_analyzer
         self.alert_history: List[IntelligentAlert] = []
         self.websocket_connections: List[Any] = []
+        self.context_cache = context_cache if context_cache is not None else ProjectContextCache()
+        self.batcher = AlertBatcher(self._process_batch, window_ms=batch_window_ms, max_batch=max_batch_size)
 
     async def process_event(self, event: Dict[str, Any]) -> Optional[IntelligentAlert]:
-        probability = self._assess_alert_probability(event)
-        if probability < 0.3:
-            logger.debug("Event below alert threshold; probability=%.2f", probability)
-            return None
-
-        uncertainty = self._quantify_event_uncertainty(event)
-        causal_insight: Optional[CausalInsight] = None
-        if event.get("type") in {"delay", "cost_overrun", "quality_issue"}:
-            causal_insight = self._analyze_root_cause(event)
-
-        alert = self._create_intelligent_alert(event, uncertainty, causal_insight, probability)
-        self.alert_history.append(alert)
-
-        await self._broadcast_alert(alert)
-        if alert.auto_resolvable:
-            await self._trigger_auto_resolution(alert)
-        return alert
+        return await self.batcher.submit(event)
+
+    async def process_events(self, events: Sequence[Dict[str, Any]], return_exceptions: bool = False) -> List[ScoredEvent]:
+        """Score ``events`` as one batch, then broadcast and auto-resolve each alert.
+
+        Events that fail are skipped; afterwards the first error is raised, or
+        returned in that event's place with ``return_exceptions``.
+        """
+
+        outcomes = self.score_events(events, return_exceptions=True)
+        for outcome in outcomes:
+            if outcome is None or isinstance(outcome, Exception):
+                continue
+            await self._broadcast_alert(outcome)
+            if outcome.auto_resolvable:
+                await self._trigger_auto_resolution(outcome)
+        return outcomes if return_exceptions else _raise_first_error(outcomes)
+
+    async def _process_batch(self, events: List[Dict[str, Any]]) -> List[ScoredEvent]:
+        return await self.process_events(events, return_exceptions=True)
+
+    def score_events(self, events: Sequence[Dict[str, Any]], return_exceptions: bool = False) -> List[ScoredEvent]:
+        """Build alerts for a burst of events with one uncertainty prediction.
+
+        Returns one entry per event (``None`` below the alert threshold).  An
+        event that cannot be scored does not affect the others: the first
+        error is raised once the rest are scored, or returned in that event's
+        place with ``return_exceptions``.  This is the synchronous entry point
+        for ingest code; alerts are recorded in ``alert_history`` but not
+        broadcast.
+        """
+
+        outcomes: List[ScoredEvent] = [None] * len(events)
+        probabilities: Dict[int, float] = {}
+        features: Dict[int, np.ndarray] = {}
+        for index, event in enumerate(events):
+            try:
+                probability = self._assess_alert_probability(event)
+                if probability < ALERT_THRESHOLD:
+                    logger.debug("Event below alert threshold; probability=%.2f", probability)
+                    continue
+                features[index] = self._event_to_features(event)
+                probabilities[index] = probability
+            except Exception as exc:
+                logger.warning("Skipping alert event that could not be scored: %s", exc)
+                outcomes[index] = exc
+
+        uncertainties = self._predict_uncertainty(list(features.values()))
+        for index, uncertainty in zip(features, uncertainties):
+            event = events[index]
+            try:
+                causal_insight: Optional[CausalInsight] = None
+                if event.get("type") in CAUSAL_EVENT_TYPES:
+                    causal_insight = self._analyze_root_cause(event)
+                alert = self._create_intelligent_alert(event, uncertainty, causal_insight, probabilities[index])
+            except Exception as exc:
+                logger.warning("Skipping alert event that could not be analysed: %s", exc)
+                outcomes[index] = exc
+                continue
+            self.alert_history.append(alert)
+            outcomes[index] = alert
+        return outcomes if return_exceptions else _raise_first_error(outcomes)
 
     def _assess_alert_probability(self, event: Dict[str, Any]) -> float:
         probability = 0.0
@@ -82,13 +279,24 @@ class AlertIntelligenceSystem:
         return min(probability, 1.0)
 
     def _quantify_event_uncertainty(self, event: Dict[str, Any]) -> UncertaintyResult:
-        features = self._event_to_features(event)
+        return self._quantify_batch_uncertainty([event])[0]
+
+    def _quantify_batch_uncertainty(self, events: Sequence[Dict[str, Any]]) -> List[UncertaintyResult]:
+        return self._predict_uncertainty([self._event_to_features(event) for event in events])
+
+    def _predict_uncertainty(self, rows: Sequence[np.ndarray]) -> List[UncertaintyResult]:
+        if not rows:
+            return []
+        features = np.vstack(rows)
         try:
             results = self.uncertainty_quantifier.predict_with_uncertainty(features)
-            return results[0]
+            if len(results) == len(rows):
+                return results
+            logger.debug("Uncertainty model returned %s results for %s events", len(results), len(rows))
         except Exception as exc:  # pragma: no cover - heuristic fallback
             logger.debug("Uncertainty estimation failed: %s", exc)
-            return UncertaintyResult(
+        return [
+            UncertaintyResult(
                 prediction=0,
                 confidence=0.6,
                 uncertainty=0.4,
@@ -96,6 +304,8 @@ class AlertIntelligenceSystem:
                 explanation="Heuristic uncertainty estimate",
                 should_escalate=False,
             )
+            for _ in rows
+        ]
 
     def _analyze_root_cause(self, event: Dict[str, Any]) -> CausalInsight:
         project_data = self._get_project_context(event.get("project_id"))
@@ -206,19 +416,26 @@ class AlertIntelligenceSystem:
         ], dtype=float)
 
     def _get_project_context(self, project_id: Optional[str]) -> pd.DataFrame:
-        np.random.seed(abs(hash(project_id)) % (2**32))
+        frame = self.context_cache.get(project_id)
+        if frame is None:
+            frame = self._build_project_context(project_id)
+            self.context_cache.put(project_id, frame)
+        return frame
+
+    def _build_project_context(self, project_id: Optional[str]) -> pd.DataFrame:
+        rng = np.random.RandomState(abs(hash(project_id)) % (2**32))
         dates = pd.date_range(end=datetime.utcnow(), periods=60)
         return pd.DataFrame(
             {
                 "date": dates,
-                "daily_progress": np.random.uniform(0.4, 1.0, size=len(dates)),
-                "resource_utilization": np.random.uniform(0.5, 1.0, size=len(dates)),
-                "weather_impact": np.random.uniform(0.0, 0.3, size=len(dates)),
-                "design_change_count": np.random.randint(0, 5, size=len(dates)),
-                "planned_duration": np.random.uniform(0.8, 1.2, size=len(dates)),
-                "actual_duration": np.random.uniform(0.9, 1.3, size=len(dates)),
-                "planned_cost": np.random.uniform(0.8, 1.2, size=len(dates)),
-                "actual_cost": np.random.uniform(0.9, 1.3, size=len(dates)),
+                "daily_progress": rng.uniform(0.4, 1.0, size=len(dates)),
+                "resource_utilization": rng.uniform(0.5, 1.0, size=len(dates)),
+                "weather_impact": rng.uniform(0.0, 0.3, size=len(dates)),
+                "design_change_count": rng.randint(0, 5, size=len(dates)),
+                "planned_duration": rng.uniform(0.8, 1.2, size=len(dates)),
+                "actual_duration": rng.uniform(0.9, 1.3, size=len(dates)),
+                "planned_cost": rng.uniform(0.8, 1.2, size=len(dates)),
+                "actual_cost": rng.uniform(0.9, 1.3, size=len(dates)),
             }
         )
 
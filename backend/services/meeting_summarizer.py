@@ -1,12 +1,44 @@
-"""Generate structured meeting notes from raw transcripts."""
+"""Generate structured meeting notes from raw transcripts.
+
+``StreamingSummarizer`` consumes transcript segments as they arrive: complete
+sentences are cut off the buffered text, and each one is classified into
+decisions, action items and issues (with severity) in a single pass of one
+Aho-Corasick automaton over all category keywords.  Running summaries are kept
+incrementally, so ``snapshot()`` is cheap mid-meeting and memory stays bounded
+by the extracted items rather than the transcript.  ``summarize_transcript``
+feeds a whole transcript through the same path.
+"""
 
 from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.services.compliance_monitor import PhraseAutomaton
 
 SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+SPEAKER_PREFIX_RE = re.compile(r"^[A-Za-z ]{1,40}:\s*")
+OWNER_NAME_RE = re.compile(r"([A-Z][a-z]+(?: [A-Z][a-z]+)*)")
+DUE_DATE_RE = re.compile(
+    r"\bby ([A-Za-z]+ \d{1,2}|end of [A-Za-z]+|next week|(?:Q[1-4]|Monday|Tuesday|Wednesday|Thursday|Friday))",
+    re.IGNORECASE,
+)
+ISO_DUE_DATE_RE = re.compile(r"\bby (\d{4}-\d{2}-\d{2})")
+DESCRIPTION_PREFIX_RE = re.compile(r"\b(decision|decided|action|issue)[:\s]", re.IGNORECASE)
+
+DECISION_KEYWORDS = ("decision", "decided", "approved", "approve")
+ACTION_KEYWORDS = ("action", "follow up", "assign", "deliver", "send", "prepare")
+ISSUE_KEYWORDS = ("issue", "risk", "concern", "blocker", "delay")
+OWNER_KEYWORDS = ("assigned to", "to ")
+SEVERITY_KEYWORDS = {"critical": "high", "major": "high", "minor": "low"}
+URGENCY_KEYWORDS = ("urgent", "immediate")
+
+CATEGORIES = ("decisions", "action_items", "issues")
+SUMMARY_ITEMS = 2
+# Unpunctuated speech-to-text output never ends a sentence, so longer runs
+# are split at a word boundary to keep the buffer bounded.
+MAX_SENTENCE_CHARS = 1000
 
 
 @dataclass
@@ -27,6 +59,139 @@ class ExtractedItem:
         return payload
 
 
+class _KeywordClassifier:
+    """One automaton over every category, severity and urgency keyword."""
+
+    def __init__(self) -> None:
+        self._labels: List[Tuple[str, str]] = []
+        phrases: List[str] = []
+        groups = [
+            ("decisions", DECISION_KEYWORDS),
+            ("action_items", ACTION_KEYWORDS),
+            ("issues", ISSUE_KEYWORDS),
+            ("severity", tuple(SEVERITY_KEYWORDS)),
+            ("severity", URGENCY_KEYWORDS),
+        ]
+        for group, keywords in groups:
+            for keyword in keywords:
+                self._labels.append((group, keyword))
+                phrases.append(keyword.lower())
+        self._automaton = PhraseAutomaton(phrases)
+
+    def classify(self, lower_sentence: str) -> Tuple[List[str], Optional[str]]:
+        """Categories the sentence belongs to, and its severity if it is an issue."""
+
+        found = {self._labels[index] for index in self._automaton.find(lower_sentence)}
+        categories = [category for category in CATEGORIES if any(group == category for group, _ in found)]
+        severity = None
+        if "issues" in categories:
+            severity = next(
+                (SEVERITY_KEYWORDS[keyword] for keyword in SEVERITY_KEYWORDS if ("severity", keyword) in found),
+                None,
+            )
+            if severity is None and any(("severity", keyword) in found for keyword in URGENCY_KEYWORDS):
+                severity = "high"
+        return categories, severity
+
+
+_CLASSIFIER: Optional[_KeywordClassifier] = None
+
+
+def _classifier() -> _KeywordClassifier:
+    global _CLASSIFIER
+    if _CLASSIFIER is None:
+        _CLASSIFIER = _KeywordClassifier()
+    return _CLASSIFIER
+
+
+class StreamingSummarizer:
+    """Incremental meeting minutes over transcript segments.
+
+    ``feed`` accepts segments in arrival order and returns the items extracted
+    from the sentences they completed; ``finish`` flushes the trailing
+    sentence.  ``version`` increases whenever a new item is extracted.
+    """
+
+    def __init__(self) -> None:
+        self.decisions: List[ExtractedItem] = []
+        self.action_items: List[ExtractedItem] = []
+        self.issues: List[ExtractedItem] = []
+        self.sentence_count = 0
+        self.version = 0
+        self._opening: List[str] = []
+        self._buffer = ""
+        self._classifier = _classifier()
+
+    def feed(self, segment: str) -> List[Tuple[str, ExtractedItem]]:
+        """Add a transcript segment; returns ``(category, item)`` pairs it completed."""
+
+        if not segment:
+            return []
+        # Earlier calls left no sentence boundary in the buffer, so only the
+        # new text is scanned; the lookbehind still sees the buffer's last
+        # character.
+        start = len(self._buffer)
+        if self._buffer and not self._buffer[-1].isspace() and not segment[0].isspace():
+            self._buffer += " "
+        self._buffer += segment
+        cut = 0
+        sentences = []
+        for match in SENTENCE_SPLIT_RE.finditer(self._buffer, start):
+            sentences.append(self._buffer[cut : match.start()])
+            cut = match.end()
+        rest = self._buffer[cut:]
+        while len(rest) > MAX_SENTENCE_CHARS:
+            split = rest.rfind(" ", 1, MAX_SENTENCE_CHARS + 1)
+            if split <= 0:
+                split = MAX_SENTENCE_CHARS
+            sentences.append(rest[:split])
+            rest = rest[split:].lstrip()
+        self._buffer = rest
+        return self._add_sentences(sentences)
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush the unterminated tail of the transcript and return the summary."""
+
+        tail, self._buffer = self._buffer, ""
+        self._add_sentences([tail])
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "summary": _build_summary(self._opening, self.decisions, self.issues, self.action_items),
+            "decisions": [item.as_dict() for item in self.decisions],
+            "action_items": [item.as_dict() for item in self.action_items],
+            "issues": [item.as_dict() for item in self.issues],
+        }
+
+    def _add_sentences(self, segments: Iterable[str]) -> List[Tuple[str, ExtractedItem]]:
+        extracted: List[Tuple[str, ExtractedItem]] = []
+        for segment in segments:
+            sentence = _normalise_sentence(segment)
+            if not sentence:
+                continue
+            self.sentence_count += 1
+            if len(self._opening) < SUMMARY_ITEMS:
+                self._opening.append(sentence)
+            categories, severity = self._classifier.classify(sentence.lower())
+            if not categories:
+                continue
+            due_date = _extract_due_date(sentence)
+            description = _clean_description(sentence)
+            for category in categories:
+                item = ExtractedItem(
+                    description=description,
+                    owner=_extract_owner(sentence, OWNER_KEYWORDS) if category == "action_items" else None,
+                    due_date=due_date,
+                    severity=severity if category == "issues" else None,
+                )
+                getattr(self, category).append(item)
+                extracted.append((category, item))
+        if extracted:
+            self.version += 1
+        return extracted
+
+
 def summarize_transcript(transcript: str) -> Dict[str, Any]:
     """Convert a transcript into digestible summary artefacts."""
 
@@ -38,67 +203,22 @@ def summarize_transcript(transcript: str) -> Dict[str, Any]:
             "issues": [],
         }
 
-    sentences = _tokenise(transcript)
-    decisions = _extract_items(sentences, {"decision", "decided", "approved", "approve"})
-    action_items = _extract_items(
-        sentences,
-        {"action", "follow up", "assign", "deliver", "send", "prepare"},
-        default_owner_keywords={"assigned to", "to "},
-    )
-    issues = _extract_items(
-        sentences,
-        {"issue", "risk", "concern", "blocker", "delay"},
-        severity_keywords={"critical": "high", "major": "high", "minor": "low"},
-    )
-
-    summary = _build_summary(sentences, decisions, issues, action_items)
-
-    return {
-        "summary": summary,
-        "decisions": [item.as_dict() for item in decisions],
-        "action_items": [item.as_dict() for item in action_items],
-        "issues": [item.as_dict() for item in issues],
-    }
-
-
-def _tokenise(transcript: str) -> List[str]:
-    statements = [segment.strip() for segment in SENTENCE_SPLIT_RE.split(transcript) if segment.strip()]
-    normalised: List[str] = []
-    for statement in statements:
-        cleaned = re.sub(r"^[A-Za-z ]{1,40}:\s*", "", statement)
-        if cleaned:
-            normalised.append(cleaned)
-    return normalised
-
-
-def _extract_items(
-    sentences: Iterable[str],
-    keywords: Iterable[str],
-    *,
-    default_owner_keywords: Optional[Iterable[str]] = None,
-    severity_keywords: Optional[Dict[str, str]] = None,
-) -> List[ExtractedItem]:
-    extracted: List[ExtractedItem] = []
-    keyword_list = [keyword.lower() for keyword in keywords]
-
-    for sentence in sentences:
-        lower_sentence = sentence.lower()
-        if not any(keyword in lower_sentence for keyword in keyword_list):
-            continue
+    summarizer = StreamingSummarizer()
+    summarizer.feed(transcript)
+    return summarizer.finish()
+
+
+def summarize_segments(segments: Iterable[str]) -> Dict[str, Any]:
+    """Summarise transcript segments (e.g. from speech-to-text) without joining them."""
+
+    summarizer = StreamingSummarizer()
+    for segment in segments:
+        summarizer.feed(segment)
+    return summarizer.finish()
 
-        owner = _extract_owner(sentence, default_owner_keywords)
-        due_date = _extract_due_date(sentence)
-        severity = _extract_severity(lower_sentence, severity_keywords)
-        extracted.append(
-            ExtractedItem(
-                description=_clean_description(sentence),
-                owner=owner,
-                due_date=due_date,
-                severity=severity,
-            )
-        )
 
-    return extracted
+def _normalise_sentence(segment: str) -> str:
+    return SPEAKER_PREFIX_RE.sub("", segment.strip(), count=1)
 
 
 def _extract_owner(sentence: str, keywords: Optional[Iterable[str]]) -> Optional[str]:
@@ -112,40 +232,25 @@ def _extract_owner(sentence: str, keywords: Optional[Iterable[str]]) -> Optional
         if index == -1:
             continue
         tail = sentence[index + len(keyword_lower) :].strip()
-        match = re.match(r"([A-Z][a-z]+(?: [A-Z][a-z]+)*)", tail)
+        match = OWNER_NAME_RE.match(tail)
         if match:
             return match.group(1)
     return None
 
 
 def _extract_due_date(sentence: str) -> Optional[str]:
-    match = re.search(
-        r"\bby ([A-Za-z]+ \d{1,2}|end of [A-Za-z]+|next week|(?:Q[1-4]|Monday|Tuesday|Wednesday|Thursday|Friday))",
-        sentence,
-        re.IGNORECASE,
-    )
+    match = DUE_DATE_RE.search(sentence)
     if match:
         return match.group(1)
-    match = re.search(r"\bby (\d{4}-\d{2}-\d{2})", sentence)
+    match = ISO_DUE_DATE_RE.search(sentence)
     if match:
         return match.group(1)
     return None
 
 
-def _extract_severity(lower_sentence: str, severity_keywords: Optional[Dict[str, str]]) -> Optional[str]:
-    if not severity_keywords:
-        return None
-    for keyword, severity in severity_keywords.items():
-        if keyword in lower_sentence:
-            return severity
-    if "urgent" in lower_sentence or "immediate" in lower_sentence:
-        return "high"
-    return None
-
-
 def _clean_description(sentence: str) -> str:
     sentence = sentence.strip()
-    sentence = re.sub(r"\b(decision|decided|action|issue)[:\s]", "", sentence, flags=re.IGNORECASE)
+    sentence = DESCRIPTION_PREFIX_RE.sub("", sentence)
     return sentence
 
 
@@ -0,0 +1,392 @@
+"""Streaming reader for Microsoft Project XML exports.
+
+MS Project writes schedules as one ``Project`` document in the
+``http://schemas.microsoft.com/project`` namespace::
+
+    <Project xmlns="http://schemas.microsoft.com/project">
+      <MinutesPerDay>480</MinutesPerDay>
+      <Calendars><Calendar>...</Calendar></Calendars>
+      <Tasks>
+        <Task>
+          <UID>12</UID><Name>Piling</Name><Duration>PT40H0M0S</Duration>
+          <PredecessorLink><PredecessorUID>11</PredecessorUID><Type>1</Type>
+            <LinkLag>4800</LinkLag></PredecessorLink>
+        </Task>
+      </Tasks>
+      <Resources>...</Resources>
+      <Assignments><Assignment>...</Assignment></Assignments>
+    </Project>
+
+The document is read with ``iterparse`` in a single pass. Each record
+(``Task``, ``Calendar``, ``Assignment``) is converted when its end tag
+arrives and then detached from the tree, as is every other top-level
+section, so memory holds one record's elements plus the extracted columns,
+never the DOM. Tags are resolved against the root element's namespace, so
+files with or without the MSP namespace are read the same way. Reading stops once every
+requested section has been closed.
+
+:func:`build_network` turns the tasks and predecessor links straight into a
+:class:`~backend.services.cpm_engine.ScheduleNetwork`. MS Project stores
+durations as ISO 8601 working time and lags in tenths of a minute; both are
+converted to days with the project's ``MinutesPerDay``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+import re
+import sys
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Union
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from backend.services.cpm_engine import RELATION_TYPES, ScheduleNetwork, WorkCalendar
+
+MSP_SECTIONS = ("Calendars", "Tasks", "Assignments")
+DEFAULT_MINUTES_PER_DAY = 480.0
+MSP_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# PredecessorLink/Type: 0 FF, 1 FS, 2 SF, 3 SS.
+_LINK_TYPES = {"0": RELATION_TYPES.index("FF"), "1": RELATION_TYPES.index("FS"),
+               "2": RELATION_TYPES.index("SF"), "3": RELATION_TYPES.index("SS")}
+_RECORDS = {"Calendars": "Calendar", "Tasks": "Task", "Assignments": "Assignment"}
+_DURATION = re.compile(
+    r"^(-)?P(?:(\d+(?:\.\d+)?)D)?(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?$"
+)
+# WeekDay/DayType: 1 Sunday .. 7 Saturday; 0 marks an exception period.
+_WEEKMASK_POSITION = {"2": 0, "3": 1, "4": 2, "5": 3, "6": 4, "7": 5, "1": 6}
+
+_TASK_COLUMNS = ("uid", "id", "name", "wbs", "outline_level", "start", "finish",
+                 "duration_hours", "milestone", "summary", "calendar_uid")
+_LINK_COLUMNS = ("successor_uid", "predecessor_uid", "type", "lag_minutes")
+_ASSIGNMENT_COLUMNS = ("uid", "task_uid", "resource_uid", "units", "work_hours")
+
+
+class MspFormatError(ValueError):
+    """Raised when a document is not an MS Project XML export."""
+
+
+@lru_cache(maxsize=4096)
+def duration_hours(value: Optional[str]) -> float:
+    """Hours in an MS Project ISO 8601 duration such as ``PT40H0M0S``; 0 if unparseable."""
+
+    match = _DURATION.match(value.strip()) if value else None
+    if match is None:
+        return 0.0
+    sign, days, hours, minutes, seconds = match.groups()
+    total = float(days or 0) * 24 + float(hours or 0) + float(minutes or 0) / 60 + float(seconds or 0) / 3600
+    return -total if sign else total
+
+
+def _local(tag: str) -> str:
+    return tag[tag.rfind("}") + 1:]
+
+
+def _number(value: Optional[str], default: float = 0.0) -> float:
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+@dataclass
+class MspCalendar:
+    """A project calendar: working weekdays (Monday..Sunday) and non-working periods."""
+
+    uid: str
+    name: str
+    base_calendar_uid: Optional[str] = None
+    weekmask: str = "1111100"
+    exceptions: List[Tuple[str, str]] = field(default_factory=list)
+
+    def to_work_calendar(self) -> WorkCalendar:
+        """The calendar as a CPM :class:`WorkCalendar` with exception dates expanded."""
+
+        holidays: List[str] = []
+        for start, finish in self.exceptions:
+            first = np.datetime64(start[:10], "D")
+            last = np.datetime64(finish[:10], "D")
+            holidays.extend(str(day) for day in np.arange(first, last + 1))
+        return WorkCalendar(weekmask=self.weekmask, holidays=tuple(sorted(set(holidays))))
+
+
+@dataclass
+class MspProject:
+    """Extracted project data; ``tasks``, ``links`` and ``assignments`` are DataFrames."""
+
+    name: str
+    minutes_per_day: float
+    calendar_uid: Optional[str]
+    tasks: Any
+    links: Any
+    calendars: List[MspCalendar]
+    assignments: Any
+
+    @property
+    def calendar(self) -> Optional[MspCalendar]:
+        for calendar in self.calendars:
+            if calendar.uid == self.calendar_uid:
+                return calendar
+        return None
+
+
+def _read_calendar(element: ET.Element) -> MspCalendar:
+    values: Dict[str, Optional[str]] = {}
+    weekmask = list("1111100")
+    exceptions: List[Tuple[str, str]] = []
+    for child in element:
+        tag = _local(child.tag)
+        if tag == "WeekDays":
+            for day in child:
+                fields = {_local(item.tag): item for item in day}
+                day_type = (fields["DayType"].text or "").strip() if "DayType" in fields else ""
+                working = (fields["DayWorking"].text or "").strip() == "1" if "DayWorking" in fields else True
+                if day_type in _WEEKMASK_POSITION:
+                    weekmask[_WEEKMASK_POSITION[day_type]] = "1" if working else "0"
+                elif day_type == "0" and not working and "TimePeriod" in fields:
+                    period = {_local(item.tag): item.text or "" for item in fields["TimePeriod"]}
+                    exceptions.append((period.get("FromDate", ""), period.get("ToDate", "")))
+        elif tag == "Exceptions":
+            for exception in child:
+                fields = {_local(item.tag): item for item in exception}
+                working = "DayWorking" in fields and (fields["DayWorking"].text or "").strip() == "1"
+                if not working and "TimePeriod" in fields:
+                    period = {_local(item.tag): item.text or "" for item in fields["TimePeriod"]}
+                    exceptions.append((period.get("FromDate", ""), period.get("ToDate", "")))
+        else:
+            values[tag] = child.text
+    base = (values.get("BaseCalendarUID") or "").strip()
+    return MspCalendar(
+        uid=(values.get("UID") or "").strip(),
+        name=(values.get("Name") or "").strip(),
+        base_calendar_uid=base if base and base != "-1" else None,
+        weekmask="".join(weekmask),
+        exceptions=[period for period in exceptions if period[0] and period[1]],
+    )
+
+
+class _Collector:
+    """Column buffers filled record by record while parsing."""
+
+    def __init__(self, namespace: str = "") -> None:
+        # Record children are stripped of the document's namespace by slicing,
+        # which is much cheaper than resolving each tag.
+        self._cut = len(namespace)
+        self.project: Dict[str, Optional[str]] = {}
+        self.tasks: Dict[str, List[Any]] = {column: [] for column in _TASK_COLUMNS}
+        self.links: Dict[str, List[Any]] = {column: [] for column in _LINK_COLUMNS}
+        # Assignments are usually the bulk of an export: numbers go into typed
+        # arrays and the (highly repetitive) task/resource UIDs are interned.
+        self.assignments: Dict[str, Any] = {
+            "uid": array("q"), "task_uid": [], "resource_uid": [], "units": array("d"), "work_hours": array("d"),
+        }
+        self.calendars: List[MspCalendar] = []
+
+    def task(self, element: ET.Element) -> None:
+        cut = self._cut
+        values: Dict[str, Optional[str]] = {}
+        uid_links: List[Tuple[str, str, str]] = []
+        for child in element:
+            tag = child.tag[cut:]
+            if tag == "PredecessorLink":
+                link = {item.tag[cut:]: item.text for item in child}
+                if (link.get("CrossProject") or "0").strip() == "1":
+                    continue
+                uid_links.append(
+                    ((link.get("PredecessorUID") or "").strip(), (link.get("Type") or "1").strip(), link.get("LinkLag") or "0")
+                )
+            else:
+                values[tag] = child.text
+        uid = (values.get("UID") or "").strip()
+        if not uid or (values.get("IsNull") or "0").strip() == "1":
+            return
+        columns = self.tasks
+        columns["uid"].append(uid)
+        columns["id"].append((values.get("ID") or "").strip())
+        columns["name"].append((values.get("Name") or "").strip())
+        columns["wbs"].append((values.get("WBS") or values.get("OutlineNumber") or "").strip())
+        columns["outline_level"].append(int(_number(values.get("OutlineLevel"))))
+        # Dates repeat heavily across a schedule; interning keeps one copy of each.
+        columns["start"].append(sys.intern((values.get("Start") or "").strip()) or None)
+        columns["finish"].append(sys.intern((values.get("Finish") or "").strip()) or None)
+        columns["duration_hours"].append(duration_hours(values.get("Duration")))
+        columns["milestone"].append((values.get("Milestone") or "0").strip() == "1")
+        columns["summary"].append((values.get("Summary") or "0").strip() == "1")
+        calendar_uid = (values.get("CalendarUID") or "").strip()
+        columns["calendar_uid"].append(calendar_uid if calendar_uid and calendar_uid != "-1" else None)
+        links = self.links
+        for predecessor, link_type, lag in uid_links:
+            if not predecessor:
+                continue
+            links["successor_uid"].append(uid)
+            links["predecessor_uid"].append(predecessor)
+            links["type"].append(_LINK_TYPES.get(link_type, _LINK_TYPES["1"]))
+            links["lag_minutes"].append(_number(lag) / 10.0)
+
+    def assignment(self, element: ET.Element) -> None:
+        cut = self._cut
+        values = {child.tag[cut:]: child.text for child in element}
+        columns = self.assignments
+        columns["uid"].append(int(_number(values.get("UID"), -1)))
+        columns["task_uid"].append(sys.intern((values.get("TaskUID") or "").strip()))
+        columns["resource_uid"].append(sys.intern((values.get("ResourceUID") or "").strip()))
+        columns["units"].append(_number(values.get("Units"), 1.0))
+        columns["work_hours"].append(duration_hours(values.get("Work")))
+
+    def calendar(self, element: ET.Element) -> None:
+        self.calendars.append(_read_calendar(element))
+
+    def build(self) -> MspProject:
+        import pandas as pd
+
+        tasks = pd.DataFrame(self.tasks, columns=list(_TASK_COLUMNS))
+        for column in ("start", "finish"):
+            tasks[column] = pd.to_datetime(tasks[column], format="ISO8601", errors="coerce")
+        tasks["duration_hours"] = tasks["duration_hours"].astype(float)
+        links = pd.DataFrame(self.links, columns=list(_LINK_COLUMNS)).astype({"type": np.int8, "lag_minutes": float})
+        assignments = pd.DataFrame(
+            {
+                column: np.frombuffer(values, dtype=np.int64 if values.typecode == "q" else float)
+                if isinstance(values, array) else values
+                for column, values in self.assignments.items()
+            },
+            columns=list(_ASSIGNMENT_COLUMNS),
+        )
+        calendar_uid = (self.project.get("CalendarUID") or "").strip() or None
+        return MspProject(
+            name=(self.project.get("Name") or self.project.get("Title") or "").strip(),
+            minutes_per_day=_number(self.project.get("MinutesPerDay"), DEFAULT_MINUTES_PER_DAY) or DEFAULT_MINUTES_PER_DAY,
+            calendar_uid=calendar_uid,
+            tasks=tasks,
+            links=links,
+            calendars=self.calendars,
+            assignments=assignments,
+        )
+
+
+class MspXmlReader:
+    """Single-pass ``iterparse`` reader for MS Project XML."""
+
+    def __init__(self, source: Union[str, Path, IO[bytes]]) -> None:
+        self._source = source
+
+    def read(self, sections: Optional[Iterable[str]] = None) -> MspProject:
+        """Read ``sections`` (all of :data:`MSP_SECTIONS` if None) and the project header."""
+
+        wanted = set(sections) if sections is not None else set(MSP_SECTIONS)
+        unknown = wanted - set(MSP_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown MS Project sections: {sorted(unknown)}")
+        remaining = set(wanted)
+        source = str(self._source) if isinstance(self._source, Path) else self._source
+        events = ET.iterparse(source, events=("start", "end"))
+
+        _, root = next(events)
+        if _local(root.tag) != "Project":
+            raise MspFormatError(f"Expected a Project document, found <{_local(root.tag)}>")
+        namespace = root.tag[: root.tag.rfind("}") + 1]
+        collector = _Collector(namespace)
+        handlers = {
+            f"{namespace}{_RECORDS[section]}": getattr(collector, _RECORDS[section].lower()) for section in wanted
+        }
+
+        stack: List[ET.Element] = [root]
+        for event, element in events:
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            depth = len(stack)
+            if depth == 2:
+                # A record inside a top-level section.
+                handler = handlers.get(element.tag)
+                if handler is not None:
+                    handler(element)
+                stack[1].remove(element)
+            elif depth == 1:
+                tag = _local(element.tag)
+                if len(element) == 0:
+                    collector.project[tag] = element.text
+                root.remove(element)
+                remaining.discard(tag)
+                if not remaining:
+                    break
+        return collector.build()
+
+
+def read_msp_xml(source: Union[str, Path, IO[bytes]], sections: Optional[Iterable[str]] = None) -> MspProject:
+    """Read an MS Project XML export (every section by default)."""
+
+    return MspXmlReader(source).read(sections)
+
+
+def build_network(project: MspProject) -> ScheduleNetwork:
+    """CPM network of the project's non-summary tasks; durations and lags in working days.
+
+    Summary tasks are structure rather than work, so they and any links
+    attached to them are left out, as are links to tasks outside the file.
+    """
+    import pandas as pd
+
+    tasks = project.tasks
+    work = tasks.loc[~tasks["summary"].to_numpy(dtype=bool)]
+    ids = work["uid"].tolist()
+    hours_per_day = project.minutes_per_day / 60.0
+    durations = work["duration_hours"].to_numpy(dtype=float) / hours_per_day
+
+    links = project.links
+    index = pd.Index(ids)
+    succ = index.get_indexer(links["successor_uid"].to_numpy())
+    pred = index.get_indexer(links["predecessor_uid"].to_numpy())
+    keep = (succ >= 0) & (pred >= 0)
+    return ScheduleNetwork(
+        ids=ids,
+        durations=durations,
+        pred=pred[keep].astype(np.int64),
+        succ=succ[keep].astype(np.int64),
+        rel_type=links["type"].to_numpy(dtype=np.int8)[keep],
+        lag=links["lag_minutes"].to_numpy(dtype=float)[keep] / project.minutes_per_day,
+    )
+
+
+def _format_dates(values) -> List[str]:
+    return [value.strftime(MSP_DATE_FORMAT) if value == value else "" for value in values]
+
+
+def schedule_tasks(project: MspProject, network: Optional[ScheduleNetwork] = None) -> List[Dict[str, object]]:
+    """Task dictionaries (id, code, name, wbs, dates, duration, dependencies) for API output."""
+
+    network = network or build_network(project)
+    work = project.tasks.loc[~project.tasks["summary"].to_numpy(dtype=bool)]
+    dependencies: List[List[Dict[str, object]]] = [[] for _ in range(network.size)]
+    for source, target, relation, lag in zip(
+        network.pred.tolist(), network.succ.tolist(), network.rel_type.tolist(), network.lag.tolist()
+    ):
+        dependencies[target].append({"id": network.ids[source], "type": RELATION_TYPES[relation], "lag": lag})
+
+    return [
+        {
+            "id": uid,
+            "code": code,
+            "name": name,
+            "wbs": wbs,
+            "start": start,
+            "finish": finish,
+            "duration": duration,
+            "dependencies": links,
+        }
+        for uid, code, name, wbs, start, finish, duration, links in zip(
+            network.ids,
+            work["id"].tolist(),
+            work["name"].tolist(),
+            work["wbs"].tolist(),
+            _format_dates(work["start"].tolist()),
+            _format_dates(work["finish"].tolist()),
+            network.durations.tolist(),
+            dependencies,
+        )
+    ]
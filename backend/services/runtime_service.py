@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from backend.runtime.code_generator import CodeGenerator
 from backend.runtime.context_builder import ContextBuilder
+from backend.runtime.generation_cache import cache_key, context_fingerprint, get_generation_cache
 from backend.runtime.sandbox import SandboxExecutor
 from backend.runtime.schemas import (
     CodeRequest,
@@ -27,6 +29,7 @@ class RuntimeService:
         self._generator = CodeGenerator()
         self._executor = SandboxExecutor()
         self._context_builder = ContextBuilder()
+        self._generation_cache = get_generation_cache()
 
     async def process_query(
         self,
@@ -55,9 +58,13 @@ class RuntimeService:
         if request.context:
             context.update(request.context)
 
-        # Generate code
-        code = self._generator.generate_code(request.query, context)
-        logger.debug("Generated code:\n%s", code)
+        # Generate code, reusing earlier code for the same question and context shape.
+        # The cache may load and run an embedding model, so keep it off the event loop.
+        code = await asyncio.to_thread(self._generation_cache.lookup, request.query, context, db)
+        from_cache = code is not None
+        if code is None:
+            code = self._generator.generate_code(request.query, context)
+            logger.debug("Generated code:\n%s", code)
 
         # If dry run, just return the code without executing
         if request.dry_run:
@@ -86,11 +93,15 @@ class RuntimeService:
                 ],
             )
 
-        # Execute code
-        result = self._executor.execute(code, context)
+        # Execute code; the sandbox blocks until the run (or its pool checkout) times out
+        result = await asyncio.to_thread(self._executor.execute, code, context)
+        if from_cache:
+            result.logs.insert(0, ExecutionLog(level="INFO", message="Generated code served from cache"))
+        elif result.status == "success":
+            await asyncio.to_thread(self._generation_cache.store, request.query, context, code)
 
         # Save to database if available
-        execution_id = await self._save_execution(request, code, result, db)
+        execution_id = await self._save_execution(request, code, result, db, context)
         result.execution_id = execution_id
 
         return result
@@ -137,7 +148,7 @@ class RuntimeService:
         Returns:
             ExecutionResult.
         """
-        return self._executor.execute(code, context)
+        return await asyncio.to_thread(self._executor.execute, code, context)
 
     async def get_history(
         self,
@@ -190,6 +201,7 @@ class RuntimeService:
         code: str,
         result: ExecutionResult,
         db=None,
+        context: Optional[Dict[str, Any]] = None,
     ) -> Optional[int]:
         """Save execution record to database.
 
@@ -218,6 +230,10 @@ class RuntimeService:
                 memory_used=result.memory_used,
                 error_message=result.error_message,
             )
+            if context is not None:
+                fingerprint = context_fingerprint(context)
+                execution.context_fingerprint = fingerprint
+                execution.cache_key = cache_key(request.query, fingerprint)
 
             db.add(execution)
             db.flush()  # Get ID
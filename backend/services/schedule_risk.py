@@ -0,0 +1,470 @@
+"""Monte Carlo schedule risk analysis on the CPM network.
+
+Each activity gets a three-point duration estimate (optimistic, most likely,
+pessimistic) sampled from a triangular or PERT (scaled beta) distribution.
+Iterations are simulated in batches: durations are drawn as an
+``activities x batch`` matrix and the forward and backward passes run wave by
+wave over the topological order of :mod:`backend.services.cpm_engine`, so
+every numpy call advances a whole batch of iterations at once::
+
+    ES[s] = max over links (p -> s) of ES[p] + from_finish * D[p] + lag - to_finish * D[s]
+
+Links into one wave are merged per successor with elementwise
+``np.maximum`` (and per predecessor with ``np.minimum`` in the backward
+pass), one round of links at a time. The batch size is chosen so one duration matrix
+stays around :data:`BATCH_ELEMENTS` values.
+
+Results are the project-duration distribution (P50/P80/P90 by default, as
+working days and, with ``project_start``, as finish dates) and each
+activity's criticality index: the share of iterations in which it had zero
+total float.
+
+Task dictionaries follow the :func:`~backend.services.cpm_engine.compute_cpm`
+schema plus optional estimate fields::
+
+    {"id": "A100", "duration": 10, "optimistic": 8, "most_likely": 10,
+     "pessimistic": 16, "distribution": "pert", "dependencies": [...]}
+
+Activities without estimates get ``default_range`` multiples of their
+deterministic duration.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.services.cpm_engine import (
+    _FROM_FINISH,
+    _TO_FINISH,
+    CycleError,
+    ScheduleNetwork,
+    WorkCalendar,
+    _find_cycles,
+    _topological_waves,
+    compute_cpm,
+)
+
+DISTRIBUTIONS = ("triangular", "pert")
+DEFAULT_RANGE = (0.9, 1.3)
+DEFAULT_PERCENTILES = (50, 80, 90)
+MAX_ITERATIONS = 100_000
+# Target size of one activities x iterations matrix (~32 MB of float64).
+BATCH_ELEMENTS = 4_000_000
+# Shape parameter of the PERT distribution (weight of the most likely value).
+PERT_LAMBDA = 4.0
+_CRITICAL_TOLERANCE = 1e-6
+
+
+@dataclass
+class DurationEstimates:
+    """Per-activity three-point estimates in working days."""
+
+    optimistic: np.ndarray
+    most_likely: np.ndarray
+    pessimistic: np.ndarray
+    pert: np.ndarray  # True where the activity uses the PERT distribution
+
+    @classmethod
+    def from_durations(
+        cls,
+        durations: np.ndarray,
+        default_range: Tuple[float, float] = DEFAULT_RANGE,
+        distribution: str = "triangular",
+    ) -> "DurationEstimates":
+        durations = np.asarray(durations, dtype=float)
+        low, high = default_range
+        return cls(
+            optimistic=durations * low,
+            most_likely=durations.copy(),
+            pessimistic=durations * high,
+            pert=np.full(durations.size, distribution == "pert"),
+        )
+
+    @classmethod
+    def from_tasks(
+        cls,
+        tasks: Sequence[Dict[str, Any]],
+        network: ScheduleNetwork,
+        default_range: Tuple[float, float] = DEFAULT_RANGE,
+        distribution: str = "triangular",
+    ) -> "DurationEstimates":
+        estimates = cls.from_durations(network.durations, default_range, distribution)
+        position = {task_id: index for index, task_id in enumerate(network.ids)}
+        for task in tasks:
+            index = position.get(str(task.get("id")))
+            if index is None:
+                continue
+            most_likely = task.get("most_likely")
+            if most_likely is not None:
+                estimates.most_likely[index] = float(most_likely)
+                estimates.optimistic[index] = float(most_likely) * default_range[0]
+                estimates.pessimistic[index] = float(most_likely) * default_range[1]
+            if task.get("optimistic") is not None:
+                estimates.optimistic[index] = float(task["optimistic"])
+            if task.get("pessimistic") is not None:
+                estimates.pessimistic[index] = float(task["pessimistic"])
+            if task.get("distribution") is not None:
+                estimates.pert[index] = str(task["distribution"]).lower() == "pert"
+        return estimates
+
+    def validate(self) -> None:
+        if not (np.all(self.optimistic <= self.most_likely) and np.all(self.most_likely <= self.pessimistic)):
+            raise ValueError("Estimates must satisfy optimistic <= most_likely <= pessimistic")
+        if np.any(self.optimistic < 0):
+            raise ValueError("Duration estimates must not be negative")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Durations as an ``activities x size`` matrix."""
+
+        low = self.optimistic[:, None]
+        mode = self.most_likely[:, None]
+        high = self.pessimistic[:, None]
+        span = high - low
+        durations = np.broadcast_to(mode, (low.shape[0], size)).copy()
+        varied = span[:, 0] > 0
+
+        triangular = varied & ~self.pert
+        if triangular.any():
+            # Inverse CDF in float32: sampling dominates the batch otherwise,
+            # and single precision is far below the estimates' own accuracy.
+            a, c, b, width = (
+                values[triangular].astype(np.float32) for values in (low, mode, high, span)
+            )
+            u = rng.random((int(triangular.sum()), size), dtype=np.float32)
+            left = u < (c - a) / width
+            square = np.where(left, u * (width * (c - a)), (1.0 - u) * (width * (b - c)))
+            np.sqrt(square, out=square)
+            durations[triangular] = np.where(left, a + square, b - square)
+
+        pert = varied & self.pert
+        if pert.any():
+            a, c, b, width = low[pert], mode[pert], high[pert], span[pert]
+            alpha = 1.0 + PERT_LAMBDA * (c - a) / width
+            beta = 1.0 + PERT_LAMBDA * (b - c) / width
+            durations[pert] = a + width * rng.beta(alpha, beta, size=(int(pert.sum()), size))
+        return durations
+
+
+# A wave's links are merged in rounds (the k-th link of every activity that
+# has one); activities with more links than this are reduced with reduceat.
+_MAX_ROUNDS = 8
+
+# One step of a wave: link slice [lo, hi), positions of the updated activities
+# within the wave (None for the first round, which covers every activity once)
+# and reduceat offsets for the final high-degree step (None otherwise).
+_Step = Tuple[int, int, Optional[np.ndarray], Optional[np.ndarray]]
+
+
+@dataclass
+class _LinkOrder:
+    """Links sorted by wave, then merge round, then updated activity.
+
+    ``np.maximum.reduceat`` along the iteration axis is an order of magnitude
+    slower than elementwise ``np.maximum``, so a wave's links are not reduced
+    per activity directly. Round ``k`` holds the ``k``-th link of every
+    activity that has one; merging rounds elementwise keeps each step a
+    contiguous slice of full-width rows.
+    """
+
+    edges: np.ndarray  # positions in the original link arrays
+    pred: np.ndarray
+    succ: np.ndarray
+    # (updated activities, steps) per wave; None for waves without links.
+    waves: List[Optional[Tuple[np.ndarray, List[_Step]]]]
+
+
+def _order_links(pred: np.ndarray, succ: np.ndarray, wave: np.ndarray, by: np.ndarray) -> _LinkOrder:
+    """Order links by ``wave[by]``, merge round and the ``by`` endpoint."""
+
+    n_waves = int(wave.max()) + 1
+    key = wave[by]
+    grouped = np.lexsort((by, key))
+    endpoint = by[grouped]
+    first = np.concatenate(([True], (endpoint[1:] != endpoint[:-1]) | (key[grouped][1:] != key[grouped][:-1])))
+    group_start = np.maximum.accumulate(np.where(first, np.arange(grouped.size), 0))
+    rank = np.empty_like(grouped)
+    rank[grouped] = np.minimum(np.arange(grouped.size) - group_start, _MAX_ROUNDS)
+
+    edges = np.lexsort((by, rank, key))
+    key, rank, endpoint = key[edges], rank[edges], by[edges]
+    wave_bounds = np.searchsorted(key, np.arange(n_waves + 1)).tolist()
+    waves: List[Optional[Tuple[np.ndarray, List[_Step]]]] = []
+    for current in range(n_waves):
+        lo, hi = wave_bounds[current], wave_bounds[current + 1]
+        if lo == hi:
+            waves.append(None)
+            continue
+        ranks = rank[lo:hi]
+        round_bounds = (lo + np.searchsorted(ranks, np.arange(_MAX_ROUNDS + 2))).tolist()
+        targets = endpoint[round_bounds[0]:round_bounds[1]]
+        steps: List[_Step] = [(round_bounds[0], round_bounds[1], None, None)]
+        for k in range(1, _MAX_ROUNDS + 1):
+            start, stop = round_bounds[k], round_bounds[k + 1]
+            if start == stop:
+                break
+            members = endpoint[start:stop]
+            if k < _MAX_ROUNDS:
+                steps.append((start, stop, np.searchsorted(targets, members), None))
+            else:
+                heads = np.flatnonzero(np.concatenate(([True], members[1:] != members[:-1])))
+                steps.append((start, stop, np.searchsorted(targets, members[heads]), heads))
+        waves.append((targets, steps))
+    return _LinkOrder(edges=edges, pred=pred[edges], succ=succ[edges], waves=waves)
+
+
+@dataclass
+class _LinkOffsets:
+    """Per-link offset ``from_finish * D[p] + lag - to_finish * D[s]`` in forward order."""
+
+    pred: np.ndarray
+    succ: np.ndarray
+    from_finish: Optional[np.ndarray]  # None when every link is anchored on the predecessor's finish
+    to_finish: Optional[np.ndarray]  # None when no link constrains the successor's finish
+    lag: Optional[np.ndarray]  # None when every lag is zero
+
+    @classmethod
+    def build(cls, order: _LinkOrder, rel_type: np.ndarray, lag: np.ndarray) -> "_LinkOffsets":
+        rel_type, lag = rel_type[order.edges], lag[order.edges]
+        from_finish = _FROM_FINISH[rel_type]
+        to_finish = _TO_FINISH[rel_type]
+        # Most links are plain FS without lag; dropping the terms that are
+        # constant saves several full-matrix operations per batch.
+        return cls(
+            pred=order.pred,
+            succ=order.succ,
+            from_finish=None if from_finish.all() else from_finish[:, None],
+            to_finish=to_finish[:, None] if to_finish.any() else None,
+            lag=lag[:, None] if lag.any() else None,
+        )
+
+    def evaluate(self, durations: np.ndarray) -> np.ndarray:
+        offsets = durations[self.pred]
+        if self.from_finish is not None:
+            offsets *= self.from_finish
+        if self.lag is not None:
+            offsets += self.lag
+        if self.to_finish is not None:
+            offsets -= self.to_finish * durations[self.succ]
+        return offsets
+
+
+def _simulate_batch(
+    forward: _LinkOrder,
+    backward: _LinkOrder,
+    link_offsets: _LinkOffsets,
+    to_backward: np.ndarray,
+    durations: np.ndarray,
+    scheduled: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Project durations and a critical-activity mask for one batch."""
+
+    offsets = link_offsets.evaluate(durations)
+    early_start = np.zeros_like(durations)
+    for group in forward.waves[1:]:
+        if group is None:
+            continue
+        targets, steps = group
+        merged = None
+        for lo, hi, positions, heads in steps:
+            candidates = early_start[forward.pred[lo:hi]]
+            candidates += offsets[lo:hi]
+            if heads is not None:
+                candidates = np.maximum.reduceat(candidates, heads, axis=0)
+            if positions is None:
+                merged = candidates
+            else:
+                merged[positions] = np.maximum(merged[positions], candidates)
+        early_start[targets] = np.maximum(merged, 0.0, out=merged)
+
+    project = (early_start + durations)[scheduled].max(axis=0)
+    late_start = project[None, :] - durations
+    offsets = offsets[to_backward]
+    for group in reversed(backward.waves):
+        if group is None:
+            continue
+        targets, steps = group
+        merged = late_start[targets]
+        for lo, hi, positions, heads in steps:
+            candidates = late_start[backward.succ[lo:hi]]
+            candidates -= offsets[lo:hi]
+            if heads is not None:
+                candidates = np.minimum.reduceat(candidates, heads, axis=0)
+            if positions is None:
+                np.minimum(merged, candidates, out=merged)
+            else:
+                merged[positions] = np.minimum(merged[positions], candidates)
+        late_start[targets] = merged
+
+    tolerance = _CRITICAL_TOLERANCE * np.maximum(project, 1.0)
+    critical = (late_start - early_start) <= tolerance[None, :]
+    return project, critical
+
+
+@dataclass
+class ScheduleRiskResult:
+    """Outcome of a schedule simulation; arrays are indexed like ``ids``."""
+
+    ids: List[str]
+    iterations: int
+    deterministic_duration: float
+    durations: np.ndarray  # simulated project duration per iteration
+    criticality: np.ndarray
+    percentiles: Dict[int, float]
+    seed: Optional[int] = None
+    percentile_dates: Optional[Dict[int, str]] = None
+    deterministic_date: Optional[str] = None
+    cycles: Optional[List[List[str]]] = None
+    unscheduled: Optional[List[str]] = None
+
+    @property
+    def probability_on_time(self) -> float:
+        """Share of iterations finishing no later than the deterministic schedule."""
+
+        return float(np.mean(self.durations <= self.deterministic_duration + _CRITICAL_TOLERANCE))
+
+    def most_critical(self, limit: int = 20) -> List[Dict[str, Any]]:
+        order = np.argsort(-self.criticality, kind="stable")[:limit]
+        return [
+            {"id": self.ids[i], "criticality_index": float(self.criticality[i])}
+            for i in order.tolist()
+            if self.criticality[i] > 0
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        finish = {
+            f"P{q}": {"duration": value, **({"date": self.percentile_dates[q]} if self.percentile_dates else {})}
+            for q, value in self.percentiles.items()
+        }
+        return {
+            "iterations": self.iterations,
+            "seed": self.seed,
+            "deterministic_duration": self.deterministic_duration,
+            "deterministic_finish_date": self.deterministic_date,
+            "mean_duration": float(self.durations.mean()),
+            "std_duration": float(self.durations.std()),
+            "min_duration": float(self.durations.min()),
+            "max_duration": float(self.durations.max()),
+            "finish": finish,
+            "probability_on_time": self.probability_on_time,
+            "criticality_index": {tid: float(value) for tid, value in zip(self.ids, self.criticality.tolist())},
+            "most_critical": self.most_critical(),
+            "cycles": self.cycles or [],
+            "unscheduled": self.unscheduled or [],
+        }
+
+
+def _finish_date(calendar: WorkCalendar, origin: np.datetime64, duration: float) -> str:
+    # Finishing after N working days means finishing on working day N - 1.
+    day = max(np.ceil(duration - _CRITICAL_TOLERANCE) - 1, 0)
+    return str(calendar.offset(origin, np.asarray([day]))[0])
+
+
+def simulate_schedule(
+    tasks: Any,
+    iterations: int = 1000,
+    distribution: str = "triangular",
+    estimates: Optional[DurationEstimates] = None,
+    default_range: Tuple[float, float] = DEFAULT_RANGE,
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+    project_start: Optional[str] = None,
+    calendar: Optional[WorkCalendar] = None,
+    batch_size: Optional[int] = None,
+    on_cycle: str = "report",
+) -> ScheduleRiskResult:
+    """Simulate project duration under duration uncertainty.
+
+    Args:
+        tasks: Task dictionaries (see module docstring) or a :class:`ScheduleNetwork`.
+        iterations: Number of simulated schedules (max :data:`MAX_ITERATIONS`).
+        distribution: ``"triangular"`` or ``"pert"`` for activities that do
+            not name their own.
+        estimates: Explicit estimates, overriding those derived from ``tasks``.
+        default_range: Optimistic/pessimistic multiples of the deterministic
+            duration for activities without estimates.
+        percentiles: Percentiles of the project duration to report.
+        seed: Seed for ``np.random.Generator``; identical seeds give identical results.
+        project_start: Date of working day zero; adds finish dates.
+        calendar: Working calendar for finish dates and date-derived durations.
+        batch_size: Iterations per batch (derived from the network size if omitted).
+        on_cycle: ``"report"`` to simulate the acyclic part, ``"raise"`` to
+            raise :class:`~backend.services.cpm_engine.CycleError`.
+
+    Returns:
+        A :class:`ScheduleRiskResult`.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+    if on_cycle not in {"report", "raise"}:
+        raise ValueError("on_cycle must be 'report' or 'raise'")
+    network = tasks if isinstance(tasks, ScheduleNetwork) else ScheduleNetwork.from_tasks(tasks, calendar)
+    if estimates is None:
+        if isinstance(tasks, ScheduleNetwork):
+            estimates = DurationEstimates.from_durations(network.durations, default_range, distribution)
+        else:
+            estimates = DurationEstimates.from_tasks(tasks, network, default_range, distribution)
+    estimates.validate()
+    iterations = int(max(1, min(iterations, MAX_ITERATIONS)))
+
+    _, wave = _topological_waves(network)
+    scheduled = wave >= 0
+    cycles: List[List[str]] = []
+    unscheduled: List[str] = []
+    if not scheduled.all():
+        cycles = _find_cycles(network, ~scheduled)
+        if on_cycle == "raise":
+            raise CycleError(cycles)
+        unscheduled = [network.ids[i] for i in np.flatnonzero(~scheduled)]
+    deterministic = compute_cpm(network).project_duration
+
+    ids = [network.ids[i] for i in np.flatnonzero(scheduled)]
+    if not ids:
+        raise ValueError("Schedule has no activities to simulate")
+    keep = scheduled[network.succ]
+    pred, succ = network.pred[keep], network.succ[keep]
+    rel_type, lag = network.rel_type[keep], network.lag[keep].astype(float)
+    forward = _order_links(pred, succ, wave, succ)
+    backward = _order_links(pred, succ, wave, pred)
+    link_offsets = _LinkOffsets.build(forward, rel_type, lag)
+    # Offsets are evaluated once per batch in forward order and permuted for the backward pass.
+    position = np.empty_like(forward.edges)
+    position[forward.edges] = np.arange(forward.edges.size)
+    to_backward = position[backward.edges]
+
+    n = network.size
+    batch_size = batch_size or max(64, BATCH_ELEMENTS // max(n, 1))
+    rng = np.random.default_rng(seed)
+    project = np.empty(iterations)
+    critical_counts = np.zeros(n)
+    done = 0
+    while done < iterations:
+        size = min(batch_size, iterations - done)
+        durations = estimates.sample(rng, size)
+        durations[~scheduled] = 0.0
+        batch_project, critical = _simulate_batch(forward, backward, link_offsets, to_backward, durations, scheduled)
+        project[done:done + size] = batch_project
+        critical_counts += critical.sum(axis=1)
+        done += size
+
+    qs = [int(q) for q in percentiles]
+    values = np.percentile(project, qs) if qs else []
+    result = ScheduleRiskResult(
+        ids=ids,
+        iterations=iterations,
+        deterministic_duration=float(deterministic),
+        durations=project,
+        criticality=(critical_counts / iterations)[scheduled],
+        percentiles={q: float(value) for q, value in zip(qs, values)},
+        seed=seed,
+        cycles=cycles,
+        unscheduled=unscheduled,
+    )
+    if project_start is not None:
+        calendar = calendar or WorkCalendar()
+        origin = np.datetime64(project_start, "D")
+        result.percentile_dates = {q: _finish_date(calendar, origin, value) for q, value in result.percentiles.items()}
+        result.deterministic_date = _finish_date(calendar, origin, result.deterministic_duration)
+    return result
@@ -0,0 +1,221 @@
+"""Text-only PDF writer that streams pages straight to disk.
+
+Page content is compressed and written as soon as a page is finished; the
+writer only remembers byte offsets and page object numbers for the trailing
+cross-reference table, so memory stays flat however many pages a table runs
+to.  Text uses the built-in Helvetica fonts with WinAnsi encoding, so no font
+files are embedded and characters outside cp1252 are replaced; callers check
+``encodable`` first when the text may be Arabic or other non-Latin script.
+"""
+
+from __future__ import annotations
+
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+import zlib
+
+A4 = (595.28, 841.89)
+
+# Average Helvetica glyph width as a fraction of the font size, good enough
+# to truncate cells to their column.
+_AVERAGE_GLYPH_WIDTH = 0.5
+
+_CATALOG, _PAGES, _REGULAR, _BOLD = 1, 2, 3, 4
+
+
+def encodable(text: str) -> bool:
+    """True if ``text`` survives the writer's WinAnsi (cp1252) encoding."""
+
+    try:
+        text.encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class StreamingPdfWriter:
+    """Write pages of positioned text to ``handle`` one page at a time."""
+
+    def __init__(self, handle: BinaryIO, page_size: Tuple[float, float] = A4, compress: bool = True) -> None:
+        self.handle = handle
+        self.width, self.height = page_size
+        self.compress = compress
+        self._offsets: List[int] = [0, 0, 0, 0, 0]  # object 0 and the four reserved objects
+        self._page_ids: List[int] = []
+        self._content: Optional[List[bytes]] = None
+        self._position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def _write(self, data: bytes) -> None:
+        self.handle.write(data)
+        self._position += len(data)
+
+    def _object(self, number: int, body: bytes) -> None:
+        while len(self._offsets) <= number:
+            self._offsets.append(0)
+        self._offsets[number] = self._position
+        self._write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _next_number(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def begin_page(self) -> None:
+        if self._content is not None:
+            self.end_page()
+        self._content = []
+
+    def text(self, x: float, y: float, value: str, size: float = 9.0, bold: bool = False) -> None:
+        if self._content is None:
+            self.begin_page()
+        font = b"/F2" if bold else b"/F1"
+        self._content.append(
+            b"BT %s %s Tf %s %s Td %s Tj ET\n"
+            % (font, _fmt(size).encode(), _fmt(x).encode(), _fmt(y).encode(), _pdf_string(value))
+        )
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5) -> None:
+        if self._content is None:
+            self.begin_page()
+        self._content.append(
+            b"%s w %s %s m %s %s l S\n"
+            % (_fmt(width).encode(), _fmt(x1).encode(), _fmt(y1).encode(), _fmt(x2).encode(), _fmt(y2).encode())
+        )
+
+    def end_page(self) -> None:
+        if self._content is None:
+            return
+        stream = b"".join(self._content)
+        self._content = None
+        if self.compress:
+            stream = zlib.compress(stream)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(stream)
+        else:
+            header = b"<< /Length %d >>" % len(stream)
+        content_id = self._next_number()
+        self._object(content_id, header + b"\nstream\n" + stream + b"\nendstream")
+        page_id = self._next_number()
+        self._object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> >>"
+            % (_PAGES, _fmt(self.width).encode(), _fmt(self.height).encode(), content_id, _REGULAR, _BOLD),
+        )
+        self._page_ids.append(page_id)
+
+    def close(self) -> None:
+        """Finish the last page and write fonts, page tree and xref table."""
+
+        self.end_page()
+        if not self._page_ids:
+            self.begin_page()
+            self.end_page()
+        for number, font in ((_REGULAR, b"Helvetica"), (_BOLD, b"Helvetica-Bold")):
+            self._object(
+                number,
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % font,
+            )
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._object(_PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)))
+        self._object(_CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES)
+        xref_offset = self._position
+        entries = [b"0000000000 65535 f \n"] + [b"%010d 00000 n \n" % offset for offset in self._offsets[1:]]
+        self._write(b"xref\n0 %d\n" % len(self._offsets) + b"".join(entries))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self._offsets), _CATALOG, xref_offset)
+        )
+
+
+class PdfTextLayout:
+    """Top-to-bottom text cursor over a ``StreamingPdfWriter`` with page breaks."""
+
+    def __init__(self, writer: StreamingPdfWriter, margin: float = 40.0, font_size: float = 9.0) -> None:
+        self.writer = writer
+        self.margin = margin
+        self.font_size = font_size
+        self.leading = font_size * 1.5
+        self.y = 0.0
+        self._repeat_header: Optional[Tuple[Sequence[str], List[float]]] = None
+        self.new_page()
+
+    @property
+    def usable_width(self) -> float:
+        return self.writer.width - 2 * self.margin
+
+    def new_page(self) -> None:
+        self.writer.begin_page()
+        self.y = self.writer.height - self.margin
+        if self._repeat_header is not None:
+            self._header(*self._repeat_header)
+
+    def _advance(self, height: float) -> None:
+        if self.y - height < self.margin:
+            self.new_page()
+        self.y -= height
+
+    def heading(self, value: str, size: float = 14.0) -> None:
+        self._advance(size * 1.6)
+        self.writer.text(self.margin, self.y, value, size=size, bold=True)
+
+    def paragraph(self, value: str, bold: bool = False) -> None:
+        max_chars = max(1, int(self.usable_width / (self.font_size * _AVERAGE_GLYPH_WIDTH)))
+        words = value.split()
+        line = ""
+        for word in words:
+            candidate = f"{line} {word}".strip()
+            if len(candidate) > max_chars and line:
+                self._advance(self.leading)
+                self.writer.text(self.margin, self.y, line, size=self.font_size, bold=bold)
+                line = word
+            else:
+                line = candidate
+        self._advance(self.leading)
+        self.writer.text(self.margin, self.y, line, size=self.font_size, bold=bold)
+
+    def _cells(self, values: Sequence[str], widths: List[float], bold: bool = False) -> None:
+        self._advance(self.leading)
+        x = self.margin
+        for value, width in zip(values, widths):
+            max_chars = max(1, int(width / (self.font_size * _AVERAGE_GLYPH_WIDTH)) - 1)
+            text = str(value)
+            if len(text) > max_chars:
+                text = text[: max(1, max_chars - 1)] + "…"
+            self.writer.text(x, self.y, text, size=self.font_size, bold=bold)
+            x += width
+
+    def _header(self, headers: Sequence[str], widths: List[float]) -> None:
+        self._cells(headers, widths, bold=True)
+        rule_y = self.y - self.leading * 0.3
+        self.writer.line(self.margin, rule_y, self.margin + self.usable_width, rule_y)
+
+    def begin_table(self, headers: Sequence[str]) -> List[float]:
+        """Draw ``headers`` and repeat them at the top of every following page."""
+
+        widths = [self.usable_width / max(1, len(headers))] * len(headers)
+        self._advance(self.leading * 0.5)
+        self._header(headers, widths)
+        self._repeat_header = (headers, widths)
+        return widths
+
+    def row(self, values: Sequence[str], widths: List[float]) -> None:
+        self._cells(values, widths)
+
+    def end_table(self) -> None:
+        self._repeat_header = None
+        self._advance(self.leading * 0.5)
+
+    def close(self) -> None:
+        self.writer.close()
@@ -0,0 +1,336 @@
+"""Streaming reader for Primavera P6 XER exports.
+
+An XER file is a sequence of tab-separated tables::
+
+    %T  TASK
+    %F  task_id  proj_id  wbs_id  clndr_id  task_code  task_name  ...
+    %R  1001     17       230     5         A1000      Excavation ...
+    %T  TASKPRED
+    ...
+    %E
+
+The file is read line by line. Rows of tables that were not requested are
+skipped without being split, so a task-only read never materialises the
+(often much larger) resource assignment tables. Rows of requested tables are
+buffered in chunks of ``chunk_rows`` raw lines and converted with pandas' C
+parser into typed columns, so peak memory is bounded by the requested tables'
+typed size plus one chunk of text, not by the file size.
+
+Column types follow P6 naming conventions: ``*_date`` columns become
+``datetime64``, ``*_id`` / ``*_cnt`` / ``*_qty`` / ``*_cost`` / ``*_pct``
+columns numeric, everything else stays text.
+
+:func:`build_network` turns the TASK, TASKPRED and CALENDAR tables straight
+into a :class:`~backend.services.cpm_engine.ScheduleNetwork`, converting hour
+counts to working days with each activity's calendar.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+import io
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from backend.services.cpm_engine import RELATION_TYPES, ScheduleNetwork
+
+SCHEDULE_TABLES = ("TASK", "TASKPRED", "CALENDAR", "PROJWBS", "PROJECT")
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_DAY_HOURS = 8.0
+XER_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+_NUMERIC_SUFFIXES = ("_id", "_cnt", "_qty", "_cost", "_pct", "_num", "_seq_num")
+_RELATION_CODES = {f"PR_{code}": position for position, code in enumerate(RELATION_TYPES)}
+_MILESTONE_TYPES = ("TT_Mile", "TT_FinMile")
+
+
+class XerFormatError(ValueError):
+    """Raised when a file does not follow the XER table layout."""
+
+
+@dataclass
+class XerTable:
+    """One XER table as typed columns (a pandas DataFrame)."""
+
+    name: str
+    fields: List[str]
+    frame: "object"
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.frame[name].to_numpy()
+
+
+def _typed_chunk(lines: List[str], fields: List[str]):
+    import pandas as pd
+
+    frame = pd.read_csv(
+        io.StringIO("".join(lines)),
+        sep="\t",
+        header=None,
+        names=["%R", *fields],
+        usecols=range(1, len(fields) + 1),
+        # P6 often ends rows with a tab; without this the extra empty column
+        # would become the index and break usecols.
+        index_col=False,
+        dtype=str,
+        keep_default_na=False,
+        quoting=csv.QUOTE_NONE,
+        engine="c",
+    )
+    for field in fields:
+        if field.endswith("_date"):
+            frame[field] = pd.to_datetime(frame[field], format=XER_DATE_FORMAT, errors="coerce")
+        elif field.endswith(_NUMERIC_SUFFIXES):
+            values = frame[field]
+            numeric = pd.to_numeric(values, errors="coerce")
+            # Text identifiers that happen to end in _id keep their strings.
+            if numeric.isna().sum() == (values == "").sum():
+                frame[field] = numeric
+    return frame
+
+
+def _build_table(name: str, fields: List[str], chunks: List[object]) -> XerTable:
+    import pandas as pd
+
+    if not chunks:
+        frame = pd.DataFrame({field: pd.Series(dtype=object) for field in fields})
+    elif len(chunks) == 1:
+        frame = chunks[0]
+    else:
+        frame = pd.concat(chunks, ignore_index=True)
+    return XerTable(name=name, fields=fields, frame=frame)
+
+
+class XerReader:
+    """Lazily yields the tables of an XER file."""
+
+    def __init__(
+        self,
+        source: Union[str, Path, IO[str]],
+        encoding: str = "utf-8",
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        self._source = source
+        self._encoding = encoding
+        self._chunk_rows = max(1, chunk_rows)
+
+    def _lines(self) -> Iterator[str]:
+        if hasattr(self._source, "read"):
+            yield from self._source  # type: ignore[misc]
+            return
+        with open(self._source, "r", encoding=self._encoding, errors="replace", newline="") as handle:
+            yield from handle
+
+    def iter_tables(self, tables: Optional[Iterable[str]] = None) -> Iterator[XerTable]:
+        """Yield requested tables (all if ``tables`` is None) in file order.
+
+        Reading stops as soon as every requested table has been seen.
+        """
+
+        remaining = {name.upper() for name in tables} if tables is not None else None
+        name: Optional[str] = None
+        fields: Optional[List[str]] = None
+        selected = False
+        buffer: List[str] = []
+        chunks: List[object] = []
+
+        for line in self._lines():
+            if line.startswith("%R"):
+                if selected:
+                    if fields is None:
+                        raise XerFormatError(f"Row before field list in table {name}")
+                    buffer.append(line)
+                    if len(buffer) >= self._chunk_rows:
+                        chunks.append(_typed_chunk(buffer, fields))
+                        buffer = []
+                continue
+            if line.startswith(("%T", "%E")) and selected:
+                if buffer:
+                    chunks.append(_typed_chunk(buffer, fields or []))
+                yield _build_table(name or "", fields or [], chunks)
+                if remaining is not None:
+                    remaining.discard(name)
+                    if not remaining:
+                        return
+            if line.startswith("%T"):
+                parts = line.rstrip("\r\n").split("\t")
+                if len(parts) < 2:
+                    raise XerFormatError("Table marker (%T) without a table name")
+                name = parts[1].strip().upper()
+                fields, buffer, chunks = None, [], []
+                selected = remaining is None or name in remaining
+            elif line.startswith("%F"):
+                if name is None:
+                    raise XerFormatError("Field list (%F) before any table (%T)")
+                fields = [field.strip() for field in line.rstrip("\r\n").split("\t")[1:]]
+            elif line.startswith("%E"):
+                return
+
+        if selected:
+            if buffer:
+                chunks.append(_typed_chunk(buffer, fields or []))
+            yield _build_table(name or "", fields or [], chunks)
+
+    def read(self, tables: Optional[Iterable[str]] = None) -> Dict[str, XerTable]:
+        """Requested tables keyed by name."""
+
+        return {table.name: table for table in self.iter_tables(tables)}
+
+
+def read_xer(
+    source: Union[str, Path, IO[str]],
+    tables: Optional[Sequence[str]] = SCHEDULE_TABLES,
+    encoding: str = "utf-8",
+) -> Dict[str, XerTable]:
+    """Read ``tables`` (the schedule tables by default) from an XER file."""
+
+    return XerReader(source, encoding=encoding).read(tables)
+
+
+def _task_day_hours(tables: Dict[str, XerTable]) -> np.ndarray:
+    import pandas as pd
+
+    task = tables["TASK"].frame
+    day_hours = pd.Series(DEFAULT_DAY_HOURS, index=task.index, dtype=float)
+    calendar = tables.get("CALENDAR")
+    if calendar is not None and len(calendar) and "clndr_id" in task:
+        hours = pd.to_numeric(calendar.frame["day_hr_cnt"], errors="coerce")
+        by_calendar = pd.Series(hours.to_numpy(), index=calendar.frame["clndr_id"].to_numpy())
+        by_calendar = by_calendar[~by_calendar.index.duplicated()]
+        day_hours = task["clndr_id"].map(by_calendar).astype(float)
+    values = day_hours.to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isfinite(values) & (values > 0), values, DEFAULT_DAY_HOURS)
+
+
+def _task_duration_hours(task) -> np.ndarray:
+    hours = np.full(len(task), np.nan)
+    for field in ("target_drtn_hr_cnt", "remain_drtn_hr_cnt"):
+        if field in task:
+            values = task[field].to_numpy(dtype=float, na_value=np.nan)
+            hours = np.where(np.isnan(hours), values, hours)
+    return np.nan_to_num(hours, nan=0.0)
+
+
+def build_network(tables: Dict[str, XerTable]) -> ScheduleNetwork:
+    """CPM network from TASK, TASKPRED and CALENDAR tables; durations and lags in working days.
+
+    Activities are identified by ``task_id``. Links to activities outside
+    the export (other projects) are dropped.
+    """
+    import pandas as pd
+
+    if "TASK" not in tables:
+        raise XerFormatError("XER file has no TASK table")
+    task = tables["TASK"].frame
+    ids = [str(value) for value in task["task_id"].tolist()]
+    day_hours = _task_day_hours(tables)
+    durations = _task_duration_hours(task) / day_hours
+    if "task_type" in task:
+        durations = np.where(task["task_type"].isin(_MILESTONE_TYPES).to_numpy(), 0.0, durations)
+
+    empty = np.zeros(0, dtype=np.int64)
+    pred = succ = empty
+    rel_type = np.zeros(0, dtype=np.int8)
+    lag = np.zeros(0)
+    links = tables.get("TASKPRED")
+    if links is not None and len(links):
+        frame = links.frame
+        index = pd.Index(task["task_id"].to_numpy())
+        succ = index.get_indexer(frame["task_id"].to_numpy())
+        pred = index.get_indexer(frame["pred_task_id"].to_numpy())
+        keep = (succ >= 0) & (pred >= 0)
+        succ, pred = succ[keep].astype(np.int64), pred[keep].astype(np.int64)
+        codes = frame["pred_type"].map(_RELATION_CODES).fillna(0).to_numpy()[keep]
+        rel_type = codes.astype(np.int8)
+        lag_hours = np.nan_to_num(frame["lag_hr_cnt"].to_numpy(dtype=float, na_value=np.nan)[keep]) if "lag_hr_cnt" in frame else np.zeros(succ.size)
+        # P6 measures lag on the predecessor's calendar by default.
+        lag = lag_hours / day_hours[pred]
+
+    return ScheduleNetwork(ids=ids, durations=durations, pred=pred, succ=succ, rel_type=rel_type, lag=lag)
+
+
+def _wbs_paths(tables: Dict[str, XerTable]) -> Dict[object, str]:
+    wbs = tables.get("PROJWBS")
+    if wbs is None or not len(wbs):
+        return {}
+    frame = wbs.frame
+    names = dict(zip(frame["wbs_id"].tolist(), frame["wbs_short_name"].astype(str).tolist()))
+    parents = dict(zip(frame["wbs_id"].tolist(), frame["parent_wbs_id"].tolist())) if "parent_wbs_id" in frame else {}
+    project_nodes = set()
+    if "proj_node_flag" in frame:
+        project_nodes = set(frame.loc[frame["proj_node_flag"] == "Y", "wbs_id"].tolist())
+    paths: Dict[object, str] = {}
+
+    def path(node) -> str:
+        chain = []
+        seen = set()
+        while node in names and node not in project_nodes and node not in seen:
+            if node in paths:
+                chain.append(paths[node])
+                break
+            seen.add(node)
+            chain.append(names[node])
+            node = parents.get(node)
+        return ".".join(reversed(chain))
+
+    for node in names:
+        paths[node] = path(node)
+    return paths
+
+
+def _format_dates(values) -> List[str]:
+    return [value.strftime(XER_DATE_FORMAT) if value == value else "" for value in values]
+
+
+def schedule_tasks(tables: Dict[str, XerTable], network: Optional[ScheduleNetwork] = None) -> List[Dict[str, object]]:
+    """Task dictionaries (id, code, name, wbs, dates, duration, dependencies) for API output."""
+
+    task = tables["TASK"].frame
+    network = network or build_network(tables)
+    count = len(task)
+
+    def text(field: str) -> List[str]:
+        return task[field].astype(str).tolist() if field in task else [""] * count
+
+    def dates(*fields: str) -> List[str]:
+        for field in fields:
+            if field in task:
+                return _format_dates(task[field].tolist())
+        return [""] * count
+
+    wbs_paths = _wbs_paths(tables)
+    wbs = [wbs_paths.get(value, "") for value in task["wbs_id"].tolist()] if "wbs_id" in task else [""] * count
+    dependencies: List[List[Dict[str, object]]] = [[] for _ in range(count)]
+    for source, target, relation, lag in zip(
+        network.pred.tolist(), network.succ.tolist(), network.rel_type.tolist(), network.lag.tolist()
+    ):
+        dependencies[target].append({"id": network.ids[source], "type": RELATION_TYPES[relation], "lag": lag})
+
+    return [
+        {
+            "id": tid,
+            "code": code,
+            "name": name,
+            "wbs": wbs_path,
+            "start": start,
+            "finish": finish,
+            "duration": duration,
+            "dependencies": links,
+        }
+        for tid, code, name, wbs_path, start, finish, duration, links in zip(
+            network.ids,
+            text("task_code"),
+            text("task_name"),
+            wbs,
+            dates("target_start_date", "early_start_date"),
+            dates("target_end_date", "early_end_date"),
+            network.durations.tolist(),
+            dependencies,
+        )
+    ]
@@ -0,0 +1,223 @@
+"""Tests for the daily analytics rollups and the endpoints that read them."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.analytics import rollups
+from backend.analytics.models import AnalyticsDailyRollup
+from backend.api import analytics_reports_system as reports
+from backend.backend.db import Base
+from backend.events.envelope import EventEnvelope
+from backend.events.projector import EventProjector
+
+RAW = MetaData()
+TASKS = Table(
+    "tasks",
+    RAW,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String),
+    Column("project_id", String),
+    Column("title", String),
+    Column("priority", String),
+    Column("status", String),
+    Column("completed", Boolean),
+    Column("due_date", DateTime),
+    Column("created_at", DateTime),
+)
+ALERTS = Table(
+    "alerts",
+    RAW,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String),
+    Column("project_id", String),
+    Column("title", String),
+    Column("severity", String),
+    Column("created_at", DateTime),
+)
+
+NOW = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    RAW.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            TASKS.insert(),
+            [
+                {
+                    "user_id": "user-001",
+                    "project_id": "PRJ-001" if index % 2 else "PRJ-002",
+                    "title": f"Task {index}",
+                    "priority": ("high", "medium", "urgent")[index % 3],
+                    "status": ("pending", "in_progress", "completed")[index % 3],
+                    "completed": index % 3 == 2,
+                    "created_at": NOW - timedelta(days=index),
+                }
+                for index in range(12)
+            ],
+        )
+        conn.execute(
+            ALERTS.insert(),
+            [
+                {"user_id": "user-001", "project_id": "PRJ-001", "title": "A", "severity": severity, "created_at": NOW}
+                for severity in ("critical", "high", "info")
+            ],
+        )
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _event(event_type, payload, event_id=None):
+    event = EventEnvelope.build(event_type, payload, source="test")
+    if event_id is not None:
+        event = EventEnvelope(**{**event.__dict__, "event_id": event_id})
+    return event
+
+
+def test_events_update_rollups_once(db):
+    task = {
+        "user_id": "u1",
+        "project_id": "p1",
+        "created_at": NOW.isoformat(),
+        "status": "pending",
+        "priority": "high",
+        "completed": False,
+    }
+    created = _event("task.created", task, event_id="e-1")
+    assert EventProjector.apply(created, db)
+    assert not EventProjector.apply(created, db)  # replayed event is not counted twice
+    EventProjector.apply(
+        _event(
+            "task.updated",
+            {**task, "status": "completed", "completed": True, "previous": {"status": "pending", "completed": False}},
+        ),
+        db,
+    )
+    alert = {"user_id": "u1", "project_id": "p1", "created_at": NOW.isoformat(), "severity": "high"}
+    EventProjector.apply(_event("alert.created", alert), db)
+    EventProjector.apply(_event("project.progress", {"user_id": "u1", "project_id": "p1", "progress": 40}), db)
+    EventProjector.apply(_event("project.progress", {"user_id": "u1", "project_id": "p1", "progress": 45}), db)
+
+    totals = rollups.sum_rollups(db, "u1", NOW.date(), NOW.date())
+    assert (totals["tasks_total"], totals["tasks_completed"]) == (1, 1)
+    assert (totals["status_pending"], totals["status_completed"], totals["priority_high"]) == (0, 1, 1)
+    assert (totals["alerts_total"], totals["alerts_high"]) == (1, 1)
+    assert rollups.progress_history(db, "u1", "p1") == [(datetime.utcnow().date(), 45.0)]
+
+    EventProjector.apply(_event("task.deleted", {**task, "status": "completed", "completed": True}), db)
+    assert rollups.sum_rollups(db, "u1")["tasks_total"] == 0
+
+
+def test_backfill_matches_raw_rows_and_check_finds_drift(db):
+    assert not rollups.rollups_ready(db)
+    assert rollups.backfill(db) == 13  # 12 task days plus today's PRJ-001 alerts
+    assert rollups.rollups_ready(db)
+    assert rollups.check_consistency(db) == []
+    assert rollups.backfill(db) == 0
+
+    totals = rollups.sum_rollups(db, "user-001", (NOW - timedelta(days=5)).date(), NOW.date())
+    assert totals["tasks_total"] == 6
+    assert (totals["priority_high"], totals["priority_medium"], totals["priority_low"]) == (2, 2, 2)
+    assert (totals["alerts_total"], totals["alerts_critical"], totals["alerts_low"]) == (3, 1, 1)
+    assert len(rollups.daily_rollups(db, "user-001", project_id="PRJ-001")) == 7  # 6 task days + alerts today
+
+    row = db.get(AnalyticsDailyRollup, (NOW.date(), "user-001", "PRJ-002"))
+    row.tasks_total += 5
+    row.progress = 60.0
+    db.commit()
+    mismatches = rollups.check_consistency(db)
+    assert [(m.column, m.stored, m.expected) for m in mismatches] == [("tasks_total", 6, 1)]
+
+    assert rollups.backfill(db, since=NOW.date(), until=NOW.date()) == 1
+    assert rollups.check_consistency(db) == []
+    assert db.get(AnalyticsDailyRollup, (NOW.date(), "user-001", "PRJ-002")).progress == 60.0
+
+
+def test_writes_after_backfill_keep_rollups_consistent(db):
+    rollups.backfill(db)
+    task = {
+        "user_id": "user-001",
+        "project_id": "PRJ-001",
+        "title": "Late pour",
+        "priority": "high",
+        "status": "pending",
+        "completed": False,
+        "created_at": NOW,
+    }
+    task_id = db.execute(TASKS.insert().values(**task)).inserted_primary_key[0]
+    EventProjector.stage(_event("task.created", rollups.task_event_payload(task)), db)
+    db.commit()
+
+    totals = rollups.sum_rollups(db, "user-001", NOW.date(), NOW.date())
+    assert (totals["tasks_total"], totals["priority_high"]) == (2, 2)
+    assert rollups.check_consistency(db) == []
+
+    db.execute(TASKS.update().where(TASKS.c.id == task_id).values(status="completed", completed=True))
+    completed = {**task, "status": "completed", "completed": True}
+    previous = {"status": "pending", "completed": False}
+    EventProjector.stage(_event("task.updated", rollups.task_event_payload(completed, previous)), db)
+    db.commit()
+    assert rollups.sum_rollups(db, "user-001", NOW.date(), NOW.date())["tasks_completed"] == 1
+    assert rollups.check_consistency(db) == []
+
+    alert = {"user_id": "user-001", "project_id": "PRJ-009", "severity": "high", "created_at": NOW}
+    db.execute(ALERTS.insert().values(title="Crane wind", **alert))
+    EventProjector.stage(_event("alert.created", rollups.alert_event_payload(alert)), db)
+    db.commit()
+    assert rollups.sum_rollups(db, "user-001", project_id="PRJ-009")["alerts_high"] == 1
+    assert rollups.check_consistency(db) == []
+
+
+def test_sample_buckets_sum_like_the_database():
+    buckets = rollups.compute_rollups(reports._SAMPLE_TASKS, reports._SAMPLE_ALERTS)
+    totals = rollups.sum_buckets(buckets, "user-001")
+    assert totals["tasks_total"] == sum(1 for task in reports._SAMPLE_TASKS if task.user_id == "user-001")
+    assert rollups.sum_buckets(buckets, None, project_id="PRJ-003")["alerts_medium"] == 1
+
+
+def test_endpoints_and_reports_sum_rollups(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = FastAPI()
+    app.include_router(reports.router, prefix="/api")
+    app.dependency_overrides[reports._optional_db] = lambda: db
+    client = TestClient(app)
+
+    sample = client.get("/api/analytics/dashboard").json()
+    assert sample["overview"]["total_tasks"] == 4  # sample rollups until backfilled
+
+    rollups.backfill(db)
+    body = client.get("/api/analytics/dashboard", params={"days": 7}).json()
+    assert body["overview"]["total_tasks"] == 8
+    assert body["overview"]["completed_tasks"] == 2
+    assert body["breakdowns"]["alerts"] == {"critical": 1, "high": 1, "medium": 0, "low": 1}
+    assert [point["total"] for point in body["trends"]["completion_trend"]] == [1] * 7
+
+    project = client.get("/api/analytics/project/PRJ-001").json()
+    assert project["metrics"]["total_tasks"] == 6
+    assert project["breakdowns"]["task_status"] == {"pending": 2, "in_progress": 2, "completed": 2}
+    assert project["trends"]["progress"] == []
+
+    generator = reports.AutomatedReportGenerator(db=db, chart_cache=reports.ChartCache(tmp_path / "charts"))
+    row = db.get(AnalyticsDailyRollup, (NOW.date(), "user-001", "PRJ-002"))
+    row.alerts_medium = 7  # only visible if the report reads rollups
+    db.commit()
+    path = asyncio.run(
+        generator.generate_report(reports.ReportType.MONTHLY_OVERVIEW, reports.ReportFormat.JSON, "user-001")
+    )
+    report = json.loads(open(path).read())
+    assert report["metrics"]["total_tasks"] == 12
+    assert report["metrics"]["medium_alerts"] == 7
+    assert len(report["tables"]["tasks"]) == 12
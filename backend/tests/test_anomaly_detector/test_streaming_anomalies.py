@@ -0,0 +1,149 @@
+"""Tests for the columnar rules and streaming anomaly detectors."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.events.envelope import EventEnvelope
+from backend.services.anomaly_detector import (
+    EwmaZScoreDetector,
+    SeasonalResidualDetector,
+    StreamingAnomalyDetector,
+    WorkspaceEventSource,
+    detect_anomalies,
+)
+
+ENTRIES = [
+    {"timestamp": "t0", "risk_score": 0.8, "section": "Zone A", "notes": "near miss at gate"},
+    "not a dict",
+    {"timestamp": "t1", "progress_percent": 40, "expected_progress_percent": 55, "schedule_delay_days": "0", "days_late": 8},
+    {"timestamp": "t2", "planned_cost": 100, "actual_cost": 112, "incidents": 0, "safety_incidents": "2", "notes": "Major injury"},
+    {"timestamp": "t3", "risk_score": "0.95", "risk_threshold": 0, "punch_items": 6.9, "notes": "Rework needed", "inspection": "I-7"},
+    {"timestamp": "t4", "risk_score": None, "incident_count": "x", "defects": 0, "planned_cost": 0, "actual_cost": 10},
+]
+
+
+def test_threshold_rules_keep_their_records_and_order():
+    findings = detect_anomalies(ENTRIES)
+
+    assert [(f["timestamp"], f["type"], f["severity"]) for f in findings] == [
+        ("t2", "safety", "critical"),
+        ("t3", "risk", "critical"),
+        ("t1", "schedule", "high"),
+        ("t1", "schedule", "high"),
+        ("t2", "cost", "high"),
+        ("t3", "quality", "high"),
+        ("t0", "risk", "medium"),
+        ("t3", "quality", "medium"),
+        ("t0", "safety", "low"),
+    ]
+    assert findings[0]["context"] == {"incident_count": 2, "notes": "Major injury"}
+    assert findings[1]["message"] == "Risk score 0.95 exceeds threshold 0.70 for project segment"
+    assert findings[1]["context"] == {"risk_score": 0.95, "risk_threshold": 0.7, "drivers": []}
+    assert findings[3]["message"] == "Milestone late by 8 days"
+    assert findings[4]["context"] == {"planned_cost": 100.0, "actual_cost": 112.0, "deviation_pct": 12.0}
+    assert findings[5]["context"] == {"defects": 6, "location": None}
+    assert findings[6]["message"] == "Risk score 0.80 exceeds threshold 0.70 for Zone A"
+    assert findings[8]["message"] == "Near miss reported – schedule refresher training"
+    assert detect_anomalies([]) == []
+
+
+def test_counts_beyond_int64_are_treated_as_malformed():
+    huge = [{"incidents": 2**63, "defects": 10**30, "timestamp": "t0"}, {"punch_items": float("inf")}]
+    assert detect_anomalies(huge) == []
+
+    frame = pd.DataFrame({"incidents": np.array([2**63, 2], dtype=np.uint64), "punch_items": [float("inf"), 0.0]})
+    findings = StreamingAnomalyDetector(metrics={}).process_batch(frame)
+    assert [(f["type"], f["context"].get("incident_count")) for f in findings] == [("safety", 2)]
+
+
+def test_dataframe_batches_match_dictionaries():
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame(
+        {
+            "timestamp": [f"2026-01-{day:02d}" for day in range(1, 29)],
+            "risk_score": rng.uniform(0.5, 1.0, 28),
+            "planned_cost": rng.choice([0.0, 100.0, np.nan], 28),
+            "actual_cost": rng.uniform(90, 130, 28),
+            "incident_count": rng.choice([0, 0, 1, 3], 28),
+            "notes": rng.choice(["", "near miss", "failed inspection", None], 28),
+        }
+    )
+    records = [
+        {key: value for key, value in row.items() if not pd.isna(value)}
+        for row in frame.to_dict("records")
+    ]
+
+    assert StreamingAnomalyDetector(metrics={}).process_batch(frame) == detect_anomalies(records)
+
+
+def test_ewma_state_carries_across_batches():
+    rng = np.random.default_rng(0)
+    keys = rng.choice(["P1", "P2", None], 600)
+    values = rng.normal(size=600)
+    detector = EwmaZScoreDetector(alpha=0.2, threshold=3.0, warmup=5)
+    expected = np.concatenate([detector.update(keys[:250], values[:250])[1], detector.update(keys[250:], values[250:])[1]])
+
+    state = {}
+    reference = []
+    for key, value in zip(keys, values):
+        count, mean, var = state.get(key, (0, value, 0.0))
+        reference.append(mean)
+        deviation = value - mean
+        state[key] = (count + 1, mean + 0.2 * deviation, 0.8 * (var + 0.2 * deviation * deviation))
+
+    assert np.allclose(expected, reference)
+    assert len(detector) == 3
+
+
+def test_streaming_detector_flags_spikes_per_project():
+    rng = np.random.default_rng(1)
+    rows = [
+        {"timestamp": day, "project_id": project, "actual_cost": 1000 + rng.normal(0, 10)}
+        for day in range(60)
+        for project in ("P1", "P2")
+    ]
+    rows[100]["actual_cost"] = 1200  # P1, day 50
+
+    detector = StreamingAnomalyDetector(metrics={"actual_cost": "cost"}, z_threshold=5.0, warmup=20, batch_size=32)
+    findings = list(detector.process(iter(rows)))
+
+    assert [(f["timestamp"], f["context"]["series"]) for f in findings] == [(50, "P1")]
+    assert findings[0]["type"] == "cost" and findings[0]["severity"] == "high"
+    assert findings[0]["context"]["detector"] == "ewma"
+    assert detector.stats() == {"ewma": {"actual_cost": 2}}
+
+
+def test_seasonal_residual_follows_the_weekly_pattern():
+    weekly = np.tile([10.0, 10.0, 10.0, 10.0, 10.0, 2.0, 2.0], 8) + np.random.default_rng(2).normal(0, 0.2, 56)
+    seasonal = SeasonalResidualDetector(season_length=7, alpha=0.3, threshold=4.0, warmup=5)
+    ewma = EwmaZScoreDetector(alpha=0.3, threshold=4.0, warmup=5)
+
+    assert not seasonal.update(["P1"] * 56, weekly)[2].any()
+    assert ewma.update(["P1"] * 56, weekly)[2].any()
+    assert seasonal.update(["P1"], [10.0])[2].tolist() == [False]  # phase 0 again
+    assert seasonal.update(["P1"], [10.0])[2].tolist() == [False]
+    assert seasonal.update(["P1"], [2.0])[2].tolist() == [True]  # a weekday value dropped to weekend level
+
+
+def test_consumes_workspace_event_streams():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    for workspace_id, payload in [(1, {"risk_score": 0.92}), (2, {"progress_percent": 10, "expected_progress_percent": 30}), (1, [1, 2])]:
+        event = EventEnvelope.build("telemetry.reported", payload, workspace_id=workspace_id)
+        redis_client.xadd(f"events:workspace:{workspace_id}", event.to_fields())
+    redis_client.xadd("events:global", EventEnvelope.build("telemetry.reported", {"risk_score": 1.0}).to_fields())
+
+    source = WorkspaceEventSource(redis_client, count=1)
+    findings = list(StreamingAnomalyDetector(metrics={}).process(source))
+
+    assert sorted((f["type"], f["severity"]) for f in findings) == [("risk", "critical"), ("schedule", "high")]
+    assert all(isinstance(f["timestamp"], str) for f in findings)
+    assert set(source.last_ids) == {"events:workspace:1", "events:workspace:2"}
+    assert list(source) == []  # drained; resumes from last_ids
+
+    redis_client.xadd("events:workspace:2", EventEnvelope.build("telemetry.reported", {"defects": 7}, workspace_id=2).to_fields())
+    assert [row["project_id"] for rows in source for row in rows] == [2]
+    assert json.loads(json.dumps(findings))
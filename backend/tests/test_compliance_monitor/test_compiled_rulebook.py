@@ -0,0 +1,78 @@
+"""Tests for the compiled compliance rulebook."""
+
+from backend.services.compliance_monitor import (
+    CompiledRulebook,
+    PhraseAutomaton,
+    check_compliance,
+    check_compliance_batch,
+    compile_rules,
+)
+
+RULES = [
+    "method statement",
+    {
+        "id": "HSE-1",
+        "description": "Work at height controls",
+        "severity": "high",
+        "required_phrases": ["Permit to Work", "harness"],
+        "forbidden_phrases": ["no supervision"],
+        "recommendation": "Attach the permit",
+    },
+    {"id": "HSE-2", "severity": "low", "required_phrases": "crane", "forbidden_phrases": ["crane"]},
+    {"id": "COM-1", "required_phrases": ["cat"], "forbidden_phrases": ["penalty"]},
+    7,
+]
+
+
+def test_findings_keep_their_shape_and_statuses():
+    findings = check_compliance("The Method Statement covers the CRANE lift and the caterpillar; no supervision.", RULES)
+
+    assert [(f["rule_id"], f["status"]) for f in findings] == [
+        ("method statement", "compliant"),
+        ("HSE-1", "violation"),
+        ("HSE-2", "warning"),
+        ("COM-1", "compliant"),
+        ("unknown", "compliant"),
+    ]
+    assert findings[1]["details"] == "Missing Permit to Work, harness and detected forbidden phrases no supervision"
+    assert findings[1]["recommendation"] == "Attach the permit"
+    assert findings[2]["details"] == "Forbidden phrase(s) present: crane"
+    assert findings[0]["details"] == "Requirement satisfied" and "recommendation" not in findings[0]
+    assert [f["status"] for f in check_compliance(None, ["x", {"id": "empty", "forbidden_phrases": [""]}])] == [
+        "violation",
+        "violation",
+    ]
+
+
+def test_automaton_reports_overlapping_and_nested_phrases():
+    automaton = PhraseAutomaton(["he", "she", "his", "hers", "ushe", "x"])
+
+    assert automaton.find("ushers") == {0, 1, 3, 4}
+    assert automaton.find("ahishers", word_boundaries=True) == set()
+    assert automaton.find("his hers", word_boundaries=True) == {2, 3}
+
+
+def test_word_boundaries_and_arabic_normalisation():
+    rules = [{"id": "AR-1", "required_phrases": ["خطة السلامة"]}, {"id": "EN-1", "required_phrases": ["cat"]}]
+    text = "تمت الموافقة على خُطَّة السـلامة. The caterpillar arrived."
+
+    plain = check_compliance(text, rules)
+    assert [f["status"] for f in plain] == ["violation", "compliant"]
+
+    strict = check_compliance(text, rules, word_boundaries=True, normalize_arabic=True)
+    assert [f["status"] for f in strict] == ["compliant", "violation"]
+
+    hamza = check_compliance("إدارة المخاطر", [{"id": "AR-2", "required_phrases": ["ادارة المخاطر"]}], normalize_arabic=True)
+    assert hamza[0]["status"] == "compliant"
+
+
+def test_batch_reuses_one_compiled_rulebook():
+    documents = ["method statement, permit to work, harness", "", "crane"]
+
+    batch = check_compliance_batch(documents, RULES, version="v1")
+
+    assert batch == [check_compliance(document, RULES) for document in documents]
+    assert compile_rules(RULES, version="v1") is compile_rules(RULES, version="v1")
+    assert compile_rules(RULES) is compile_rules([*RULES])
+    assert compile_rules(RULES) is not compile_rules(RULES[:2])
+    assert isinstance(compile_rules(RULES, word_boundaries=True), CompiledRulebook)
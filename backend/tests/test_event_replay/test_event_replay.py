@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from backend.backend.db import Base
+from backend.events.envelope import EventEnvelope
+from backend.events.models import EventLog, EventOffset, WorkspaceStateProjection
+from backend.events.projector import EventProjector
+from backend.events.replay import ArchiveSource, EventLogSource, ProjectionReplayer
+from backend.redisx.retention import StreamArchive
+
+_EVENT_TYPES = ("hydration.completed", "learning.dataset.exported", "regression.promoted", "chat.message")
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'replay.db'}")
+    import backend.events.models  # noqa: F401
+
+    Base.metadata.create_all(engine, tables=[EventLog.__table__, EventOffset.__table__, WorkspaceStateProjection.__table__])
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def _events(count: int) -> list[EventEnvelope]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        event = EventEnvelope.build(
+            event_type=_EVENT_TYPES[i % len(_EVENT_TYPES)],
+            workspace_id=i % 7,
+            source="test",
+            payload={"job_id": f"job-{i}"},
+        )
+        events.append(
+            EventEnvelope(**{**event.__dict__, "ts": (start + timedelta(seconds=i)).isoformat()})
+        )
+    return events
+
+
+def _project_live(engine, events):
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    try:
+        for event in events:
+            EventProjector.apply(event, session)
+    finally:
+        session.close()
+
+
+def _snapshot(engine, table_name="workspace_state_projection"):
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"SELECT workspace_id, last_hydration_at, last_hydration_job_id, "
+            f"last_learning_export_at, last_promotion_at FROM {table_name} ORDER BY workspace_id"
+        ).all()
+    return [tuple(row) for row in rows]
+
+
+def test_shadow_rebuild_matches_live_projection_and_swaps(engine):
+    events = _events(120)
+    _project_live(engine, events)
+    expected = _snapshot(engine)
+    with engine.begin() as connection:
+        connection.execute(WorkspaceStateProjection.__table__.update().values(last_hydration_job_id="corrupt"))
+
+    replayer = ProjectionReplayer(source=EventLogSource(engine, batch_size=16), bind=engine, checkpoint_every=32)
+    result = replayer.run()
+
+    assert result.events == 120
+    assert _snapshot(engine, "workspace_state_projection_shadow") == expected
+    assert _snapshot(engine) != expected
+
+    assert replayer.swap() == 7
+    assert _snapshot(engine) == expected
+    assert "workspace_state_projection_shadow" not in inspect(engine).get_table_names()
+
+
+def test_replay_resumes_from_checkpoint(engine):
+    events = _events(100)
+    _project_live(engine, events)
+    expected = _snapshot(engine)
+
+    class FailingSource(EventLogSource):
+        def iter_batches(self, after):
+            for index, batch in enumerate(super().iter_batches(after)):
+                if index == 4:
+                    raise RuntimeError("connection lost")
+                yield batch
+
+    failing = ProjectionReplayer(source=FailingSource(engine, batch_size=10), bind=engine, checkpoint_every=20)
+    with pytest.raises(RuntimeError):
+        failing.run()
+
+    replayer = ProjectionReplayer(source=EventLogSource(engine, batch_size=10), bind=engine, checkpoint_every=20)
+    result = replayer.run()
+
+    assert result.resumed_from is not None
+    assert result.events == 60
+    assert _snapshot(engine, "workspace_state_projection_shadow") == expected
+
+
+def test_replay_from_archive_in_place(engine, tmp_path):
+    events = _events(40)
+    archive = StreamArchive(tmp_path / "archive")
+    archive.write("events:global", [(f"{i + 1}-0", event.to_fields()) for i, event in enumerate(events[:25])])
+    archive.write("events:global", [(f"{i + 26}-0", event.to_fields()) for i, event in enumerate(events[25:])])
+    _project_live(engine, events)
+    expected = _snapshot(engine)
+
+    replayer = ProjectionReplayer(
+        source=ArchiveSource(archive, batch_size=8),
+        bind=engine,
+        shadow=False,
+    )
+    result = replayer.run(resume=False)
+
+    assert result.events == 40
+    assert result.cursor == "40-0"
+    assert _snapshot(engine) == expected
@@ -0,0 +1,124 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from backend.api.events import router as events_router
+from backend.events.tail import EventTailHub, SubscriberDropped, get_tail_hub
+
+fakeredis = pytest.importorskip("fakeredis")
+
+STREAM = "events:workspace:9"
+
+
+def _hub(server, **kwargs) -> EventTailHub:
+    return EventTailHub(
+        redis_factory=lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        block_ms=50,
+        **kwargs,
+    )
+
+
+async def _take(subscription, count: int, timeout: float = 2.0) -> list:
+    received = []
+
+    async def _consume():
+        async for entry in subscription.entries():
+            received.append(entry)
+            if len(received) == count:
+                return
+
+    await asyncio.wait_for(_consume(), timeout)
+    return received
+
+
+def test_single_reader_fans_out_to_all_subscribers():
+    server = fakeredis.FakeServer()
+    writer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    hub = _hub(server)
+
+    async def scenario():
+        subscriptions = [await hub.subscribe(9) for _ in range(25)]
+        assert hub.reader_count() == 1
+        ids = [writer.xadd(STREAM, {"event_type": "hydration.started", "n": str(i)}) for i in range(3)]
+        results = await asyncio.gather(*[_take(subscription, 3) for subscription in subscriptions])
+        for subscription in subscriptions:
+            await subscription.close()
+        await asyncio.sleep(0)
+        return ids, results
+
+    ids, results = asyncio.run(scenario())
+
+    assert all([entry_id for entry_id, _ in received] == ids for received in results)
+    assert hub.reader_count() == 0
+
+
+def test_resume_from_last_id_has_no_gaps_or_duplicates():
+    server = fakeredis.FakeServer()
+    writer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    ids = [writer.xadd(STREAM, {"n": str(i)}) for i in range(5)]
+    hub = _hub(server)
+
+    async def scenario():
+        live = await hub.subscribe(9)
+        resumed = await hub.subscribe(9, last_id=ids[1])
+        ids.extend(writer.xadd(STREAM, {"n": str(i)}) for i in range(5, 8))
+        received = await _take(resumed, 6)
+        await live.close()
+        await resumed.close()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [entry_id for entry_id, _ in received] == ids[2:]
+    assert received[0][1] == {"n": "2"}
+
+
+def test_slow_subscriber_is_dropped():
+    server = fakeredis.FakeServer()
+    writer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    hub = _hub(server, queue_size=2)
+
+    async def scenario():
+        slow = await hub.subscribe(9)
+        for i in range(5):
+            writer.xadd(STREAM, {"n": str(i)})
+        await asyncio.sleep(0.3)
+        received = []
+        with pytest.raises(SubscriberDropped):
+            async for entry in slow.entries():
+                received.append(entry)
+        await slow.close()
+        return received
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_websocket_tail_resumes_and_streams_live():
+    server = fakeredis.FakeServer()
+    writer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    first = writer.xadd(STREAM, {"event_type": "hydration.started", "n": "0"})
+    second = writer.xadd(STREAM, {"event_type": "hydration.completed", "n": "1"})
+    hub = _hub(server)
+
+    app = FastAPI()
+    app.include_router(events_router, prefix="/api")
+    app.dependency_overrides[get_tail_hub] = lambda: hub
+    client = TestClient(app)
+
+    with client.websocket_connect(f"/api/events/workspace/9/ws?last_id={first}") as websocket:
+        message = websocket.receive_json()
+        assert message["id"] == second
+        assert message["event_type"] == "hydration.completed"
+        third = writer.xadd(STREAM, {"event_type": "hydration.completed", "n": "2"})
+        assert websocket.receive_json()["id"] == third
+
+
+def test_stream_endpoint_requires_redis():
+    app = FastAPI()
+    app.include_router(events_router, prefix="/api")
+    app.dependency_overrides[get_tail_hub] = lambda: EventTailHub(redis_factory=lambda: None)
+    client = TestClient(app)
+
+    assert client.get("/api/events/workspace/9/stream").status_code == 503
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta, timezone
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.api.events import router as events_router
+from backend.api.ops_jobs import router as ops_jobs_router
+from backend.api.pagination import NEXT_CURSOR_HEADER
+from backend.backend.db import Base, _ensure_indexes, get_db
+from backend.events.models import EventLog
+from backend.ops.models import BackgroundJob
+
+_START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    import backend.events.models  # noqa: F401
+    import backend.ops.models  # noqa: F401
+
+    Base.metadata.create_all(engine)
+    try:
+        yield SessionLocal
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(events_router, prefix="/api")
+    app.include_router(ops_jobs_router, prefix="/api")
+
+    def _override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _override_db
+    return TestClient(app)
+
+
+def _seed_events(session_factory, count: int) -> None:
+    session = session_factory()
+    for i in range(count):
+        session.add(
+            EventLog(
+                event_id=f"evt-{i:04d}",
+                event_type="hydration.completed" if i % 3 == 0 else "chat.message",
+                # Pairs of events share a timestamp to exercise the id tiebreak.
+                ts=(_START + timedelta(seconds=i // 2)).isoformat(),
+                workspace_id=1 if i % 2 else 2,
+                actor_id=7 if i % 5 == 0 else None,
+                correlation_id="corr-a" if i < 10 else None,
+                source="test",
+                payload_json="{}",
+            )
+        )
+    session.commit()
+    session.close()
+
+
+def _collect(client, url: str, params: dict) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, params=query)
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return items
+
+
+def test_global_events_page_through_history_without_gaps(session_factory, client):
+    _seed_events(session_factory, 45)
+
+    items = _collect(client, "/api/events/global", {"limit": 7})
+
+    ids = [item["event_id"] for item in items]
+    assert len(ids) == 45
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_workspace_events_filters(session_factory, client):
+    _seed_events(session_factory, 30)
+
+    hydrations = _collect(client, "/api/events/workspace/2", {"limit": 4, "event_type": "hydration.completed"})
+    assert {item["event_id"] for item in hydrations} == {f"evt-{i:04d}" for i in range(0, 30, 6)}
+
+    by_actor = client.get("/api/events/global", params={"actor_id": 7}).json()
+    assert {item["event_id"] for item in by_actor} == {f"evt-{i:04d}" for i in range(0, 30, 5)}
+
+    correlated = client.get("/api/events/global", params={"correlation_id": "corr-a"}).json()
+    assert len(correlated) == 10
+
+    window = client.get(
+        "/api/events/global",
+        params={
+            "since": (_START + timedelta(seconds=5)).isoformat(),
+            "until": (_START + timedelta(seconds=7)).isoformat(),
+        },
+    ).json()
+    assert sorted(item["event_id"] for item in window) == [f"evt-{i:04d}" for i in range(10, 14)]
+
+
+def test_invalid_cursor_rejected(client):
+    assert client.get("/api/events/global", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_events_ndjson_export(session_factory, client):
+    _seed_events(session_factory, 2500)
+
+    response = client.get("/api/events/export", params={"workspace_id": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1250
+    assert [line["event_id"] for line in lines] == sorted(line["event_id"] for line in lines)
+
+
+def test_jobs_keyset_pagination_and_export(session_factory, client):
+    session = session_factory()
+    for i in range(23):
+        session.add(
+            BackgroundJob(
+                job_id=f"job-{i}",
+                job_type="hydration",
+                workspace_id=i % 2,
+                status="success" if i % 4 else "failed",
+            )
+        )
+    session.commit()
+    session.close()
+
+    items = _collect(client, "/api/ops/jobs", {"limit": 5, "workspace_id": 0})
+    assert [item["job_id"] for item in items] == [f"job-{i}" for i in range(22, -1, -2)]
+
+    failed = _collect(client, "/api/ops/jobs", {"limit": 2, "status": "failed"})
+    assert len(failed) == 6
+
+    export = client.get("/api/ops/jobs/export", params={"status": "success"})
+    assert len(export.text.splitlines()) == 17
+
+
+def test_ensure_indexes_backfills_existing_tables():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE event_log (event_id VARCHAR PRIMARY KEY, event_type VARCHAR, ts VARCHAR, "
+            "workspace_id INTEGER, actor_id INTEGER, correlation_id VARCHAR, source VARCHAR, "
+            "payload_json TEXT, created_at DATETIME)"
+        )
+    Base.metadata.create_all(engine, tables=[EventLog.__table__])
+
+    _ensure_indexes(engine)
+
+    names = {index["name"] for index in inspect(engine).get_indexes("event_log")}
+    assert {"ix_event_log_ts_event_id", "ix_event_log_workspace_ts", "ix_event_log_type_ts"} <= names
@@ -0,0 +1,102 @@
+"""Tests for micro-batched alert scoring and the project context cache."""
+
+import asyncio
+
+import pytest
+
+from backend.services.intelligence import (
+    AlertIntelligenceSystem,
+    ConstructionCausalAnalyzer,
+    ProjectContextCache,
+    UncertaintyQuantifier,
+)
+
+
+class CountingQuantifier(UncertaintyQuantifier):
+    def __init__(self):
+        super().__init__(model_type="classification")
+        self.batch_sizes = []
+
+    def predict_with_uncertainty(self, X, return_all_metrics=False):
+        self.batch_sizes.append(len(X))
+        return super().predict_with_uncertainty(X, return_all_metrics)
+
+
+def _system(**kwargs):
+    quantifier = CountingQuantifier()
+    return quantifier, AlertIntelligenceSystem(quantifier, ConstructionCausalAnalyzer(seed=1), **kwargs)
+
+
+def _event(index, **extra):
+    return {"type": "safety", "safety_risk": True, "delay_days": index, "project_id": "PRJ-1", **extra}
+
+
+def test_concurrent_events_share_one_prediction():
+    quantifier, system = _system(batch_window_ms=20)
+    events = [_event(index) for index in range(10)] + [{"type": "note", "project_id": "PRJ-1"}]
+
+    async def scenario():
+        return await asyncio.gather(*(system.process_event(event) for event in events))
+
+    alerts = asyncio.run(scenario())
+
+    assert quantifier.batch_sizes == [10]  # the below-threshold note is never scored
+    assert system.batcher.batches == 1
+    assert alerts[-1] is None
+    assert [alert.context["delay_days"] for alert in alerts[:-1]] == list(range(10))
+
+    _, unbatched = _system(batch_window_ms=0)
+    single = asyncio.run(unbatched.process_event(events[7]))
+    assert (single.severity, single.confidence) == (alerts[7].severity, alerts[7].confidence)
+
+
+def test_malformed_event_fails_only_its_own_caller():
+    quantifier, system = _system(batch_window_ms=20)
+    events = [_event(1), {"type": "delay", "delay_days": None, "project_id": "PRJ-1"}, _event(2)]
+
+    async def scenario():
+        return await asyncio.gather(*(system.process_event(event) for event in events), return_exceptions=True)
+
+    first, bad, last = asyncio.run(scenario())
+
+    assert isinstance(bad, TypeError)
+    assert (first.context["delay_days"], last.context["delay_days"]) == (1, 2)
+    assert quantifier.batch_sizes == [2]
+    assert system.batcher.batches == 1
+
+    outcomes = system.score_events(events, return_exceptions=True)
+    assert isinstance(outcomes[1], TypeError) and outcomes[0] is not None and outcomes[2] is not None
+    with pytest.raises(TypeError):
+        system.score_events(events)
+
+
+def test_batches_flush_at_max_size():
+    quantifier, system = _system(batch_window_ms=10_000, max_batch_size=4)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(*(system.process_event(_event(i)) for i in range(8))), 5)
+
+    assert len(asyncio.run(scenario())) == 8
+    assert quantifier.batch_sizes == [4, 4]
+
+
+def test_sync_batch_api_caches_project_context():
+    cache = ProjectContextCache(maxsize=8, ttl_seconds=0)
+    quantifier, system = _system(context_cache=cache)
+    events = [
+        {"type": "delay", "delay_days": 12, "project_id": "PRJ-1"},
+        {"type": "cost_overrun", "cost_overrun_percentage": 20, "project_id": "PRJ-1"},
+        {"type": "delay", "delay_days": 3, "project_id": "PRJ-2"},
+        {"type": "delay", "delay_days": 40, "project_id": "PRJ-2"},
+    ]
+
+    alerts = system.score_events(events)
+
+    assert alerts[2] is None
+    assert [alert.alert_type for alert in alerts if alert] == ["delay", "cost_overrun", "delay"]
+    assert alerts[3].severity == "critical"
+    assert quantifier.batch_sizes == [3]
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 1
+    assert len(system.alert_history) == 3
+    cached = system._get_project_context("PRJ-1").drop(columns="date")
+    assert cached.equals(system._build_project_context("PRJ-1").drop(columns="date"))
@@ -1,4 +1,11 @@
-from backend.services.meeting_summarizer import summarize_transcript
+import time
+
+from backend.services.meeting_summarizer import (
+    MAX_SENTENCE_CHARS,
+    StreamingSummarizer,
+    summarize_segments,
+    summarize_transcript,
+)
 
 
 def test_summarize_transcript_produces_structured_minutes() -> None:
@@ -27,3 +34,75 @@ def test_summarize_transcript_handles_empty_input() -> None:
         "action_items": [],
         "issues": [],
     }
+
+
+def test_streaming_segments_match_whole_transcript() -> None:
+    transcript = (
+        "PM: Site walk done. Decision: approve the crane relocation. "
+        "Action assigned to Omar to send the revised lift plan by Monday. "
+        "Issue: minor delay on the MEP submittals\n"
+        "PM: wrap up"
+    )
+    segments = ["PM: Site walk", " done. Decision: approve the crane", " relocation. Action assigned to Omar",
+                " to send the revised lift plan by Monday. Issue: minor delay on the MEP submittals\n", "PM: wrap up"]
+
+    summarizer = StreamingSummarizer()
+    assert summarizer.feed(segments[0]) == []
+    summarizer.feed(segments[1])
+    assert summarizer.snapshot()["decisions"] == []  # sentence still open
+    added = summarizer.feed(segments[2])
+    assert [category for category, _ in added] == ["decisions"]
+    assert summarizer.version == 1
+    for segment in segments[3:]:
+        summarizer.feed(segment)
+    assert summarizer.snapshot()["issues"] == [{"description": "minor delay on the MEP submittals", "severity": "low"}]
+
+    assert summarizer.finish() == summarize_transcript(transcript) == summarize_segments(segments)
+    assert summarizer.sentence_count == 5
+
+
+def test_unpunctuated_speech_keeps_the_buffer_bounded() -> None:
+    summarizer = StreamingSummarizer()
+    start = time.perf_counter()
+    for index in range(20_000):
+        summarizer.feed(f"and pour {index} continues on level three")
+
+    assert time.perf_counter() - start < 5
+    assert len(summarizer._buffer) <= MAX_SENTENCE_CHARS
+    assert summarizer.sentence_count > 500
+
+    # Boundaries that straddle two segments are still found.
+    summarizer = StreamingSummarizer()
+    summarizer.feed("Site walk done.")
+    assert [category for category, _ in summarizer.feed("Decision: approve the relocation.\n")] == ["decisions"]
+    assert summarizer.sentence_count == 2
+
+
+def test_meeting_segments_publish_partials_on_alert_socket(monkeypatch) -> None:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.api import alerts_ws, meeting_summarizer
+    from backend.redisx.fanout import FanoutHub
+
+    monkeypatch.setattr(alerts_ws, "hub", FanoutHub(namespace="alerts", redis_url=""))
+    app = FastAPI()
+    app.include_router(alerts_ws.router, prefix="/api")
+    app.include_router(meeting_summarizer.router, prefix="/api")
+    # One portal (event loop) for HTTP and WebSocket, as in a single server process.
+    with TestClient(app) as client, client.websocket_connect("/api/ws/alerts?workspace_id=PRJ-9") as websocket:
+        deadline = time.monotonic() + 2
+        while alerts_ws.hub.connection_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        segment = {"text": "Opening remarks. The team decided to", "project_id": "PRJ-9"}
+        assert client.post("/api/meetings/m-1/segments", json=segment).json()["decisions"] == []
+        client.post("/api/meetings/m-1/segments", json={"text": "pour on Sunday. More"})
+        partial = websocket.receive_json()
+        assert (partial["type"], partial["final"], partial["version"]) == ("meeting.summary", False, 1)
+        assert partial["decisions"] == [{"description": "The team to pour on Sunday."}]  # keyword stripped as before
+
+        assert client.get("/api/meetings/m-1/summary").json()["sentences"] == 2
+        final = client.post("/api/meetings/m-1/finish").json()
+        assert websocket.receive_json() == final
+        assert final["final"] and final["sentences"] == 3
+        assert client.get("/api/meetings/m-1/summary").status_code == 404
@@ -0,0 +1,184 @@
+"""Tests for the aggregated, cached analytics endpoints of the mobile backend."""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytest.importorskip("openai")
+pytest.importorskip("aiofiles")
+pytest.importorskip("email_validator")
+
+
+@pytest.fixture(scope="module")
+def mobile():
+    previous = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = "sqlite://"
+    try:
+        from backend import mobile_backend_api
+    finally:
+        if previous is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = previous
+    return mobile_backend_api
+
+
+@pytest.fixture()
+def env(mobile):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    mobile.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    session = Session()
+    now = datetime.utcnow()
+    users = [mobile.User(id=user_id, email=f"{user_id}@example.com", name=user_id) for user_id in ("u1", "u2")]
+    session.add_all(users)
+    session.add_all(
+        [
+            mobile.Project(id="p1", name="Gate", user_id="u1", status="active"),
+            mobile.Project(id="p2", name="Wall", user_id="u1", status="on_hold"),
+            mobile.Project(id="p3", name="Other", user_id="u2", status="active"),
+        ]
+    )
+    for index in range(12):
+        session.add(
+            mobile.Task(
+                user_id="u1",
+                project_id="p1" if index % 3 else "p2",
+                title=f"T{index}",
+                priority=("high", "medium", "low")[index % 3],
+                status="completed" if index % 4 == 0 else ("pending", "in_progress")[index % 2],
+                completed=index % 4 == 0,
+                created_at=now - timedelta(days=index * 4),
+            )
+        )
+    session.add(mobile.Task(user_id="u2", project_id="p3", title="foreign"))
+    for index, severity in enumerate(["critical", "low", "critical"]):
+        session.add(mobile.Alert(user_id="u1", project_id="p1", title="A", severity=severity, read=index == 1))
+    for index, (file_type, size) in enumerate([("photo", 2 * 1024 * 1024), ("document", 512), ("photo", 1024)]):
+        session.add(
+            mobile.UploadedFile(
+                user_id="u1",
+                project_id="p1" if index else None,
+                filename=f"f{index}",
+                file_type=file_type,
+                file_size=size,
+                created_at=now - timedelta(days=index),
+            )
+        )
+    session.add_all(
+        [
+            mobile.ChatMessage(user_id="u1", role="user", content="hi"),
+            mobile.ChatMessage(user_id="u1", role="assistant", content="hello"),
+        ]
+    )
+    session.commit()
+    user = session.get(mobile.User, "u1")
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def current_user():
+        return user
+
+    mobile.app.dependency_overrides[mobile.get_db] = get_db
+    mobile.app.dependency_overrides[mobile.get_current_user] = current_user
+    mobile.analytics_cache.clear()
+    yield TestClient(mobile.app), engine
+    mobile.app.dependency_overrides.clear()
+    mobile.analytics_cache.clear()
+    session.close()
+
+
+def test_dashboard_counts_come_from_one_aggregate_query(env):
+    client, engine = env
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    body = client.get("/api/analytics/dashboard").json()
+
+    assert body["summary"] == {
+        "total_projects": 2,
+        "active_projects": 1,
+        "total_tasks": 12,
+        "completed_tasks": 3,
+        "completion_rate": 25.0,
+        "total_alerts": 3,
+        "unread_alerts": 2,
+        "total_files": 3,
+    }
+    assert [task["title"] for task in body["recent_tasks"]] == ["T0", "T1", "T2", "T3", "T4"]
+    assert len(statements) == 3  # counters + recent projects + recent tasks
+    assert client.get("/api/analytics/dashboard").json() == body
+    assert len(statements) == 3
+
+
+def test_project_file_and_activity_breakdowns(env):
+    client, _ = env
+
+    project = client.get("/api/analytics/projects/p1").json()
+    assert project["tasks"] == {
+        "total": 8,
+        "completed": 2,
+        "completion_rate": 25.0,
+        "by_priority": {"high": 0, "medium": 4, "low": 4},
+        "by_status": {"pending": 2, "in_progress": 4, "completed": 2},
+    }
+    assert project["alerts"] == {"total": 3, "critical": 2}
+    assert project["files"] == {"total": 2, "total_size_mb": 0.0}
+    assert client.get("/api/analytics/projects/p3").status_code == 404
+
+    files = client.get("/api/analytics/files").json()
+    assert files["total_files"] == 3 and files["total_size_mb"] == 2.0
+    assert files["by_type"] == {"document": 1, "photo": 2}
+    assert files["by_project"] == {"p1": 2}
+    assert [upload["filename"] for upload in files["recent_uploads"]] == ["f0", "f1", "f2"]
+
+    activity = client.get("/api/analytics/activity", params={"days": 10}).json()
+    assert activity["totals"] == {"tasks": 3, "files": 3, "messages": 1}
+    assert len(activity["activity"]) == 10
+    today = datetime.utcnow().date().isoformat()
+    assert activity["activity"][today] == {"tasks": 1, "files": 1, "messages": 1}
+
+
+def test_writes_invalidate_cached_analytics(env, mobile):
+    client, _ = env
+    misses = mobile.analytics_cache.misses
+    assert client.get("/api/analytics/dashboard").json()["summary"]["total_tasks"] == 12
+    assert client.get("/api/analytics/projects/p1").json()["tasks"]["total"] == 8
+
+    created = client.post("/api/tasks", json={"project_id": "p1", "title": "New", "description": "d"}).json()
+    assert client.get("/api/analytics/dashboard").json()["summary"]["total_tasks"] == 13
+    assert client.get("/api/analytics/projects/p1").json()["tasks"]["total"] == 9
+
+    client.patch(f"/api/tasks/{created['id']}/complete")
+    assert client.get("/api/analytics/dashboard").json()["summary"]["completed_tasks"] == 4
+    assert mobile.analytics_cache.misses == misses + 5
+
+
+def test_cache_expires_and_evicts(mobile):
+    clock = [0.0]
+    cache = mobile.AnalyticsCache(maxsize=2, ttl_seconds=30, time_fn=lambda: clock[0])
+    cache.put(("u1", "dashboard"), {"summary": {"total_tasks": 1}})
+    cache.put(("u2", "project", "p1"), {"tasks": {}})
+
+    cached = cache.get(("u1", "dashboard"))
+    cached["summary"]["total_tasks"] = 99
+    assert cache.get(("u1", "dashboard")) == {"summary": {"total_tasks": 1}}
+
+    cache.invalidate(project_id="p1")
+    assert cache.get(("u2", "project", "p1")) is None
+    cache.put(("u3", "files"), {})
+    cache.put(("u4", "files"), {})
+    assert cache.get(("u1", "dashboard")) is None  # evicted as least recently used
+    clock[0] = 31.0
+    assert cache.get(("u4", "files")) is None
+    assert cache.stats()["hits"] == 2
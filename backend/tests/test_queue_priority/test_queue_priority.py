@@ -0,0 +1,193 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.backend.db import Base
+from backend.jobs.queue_worker import _handle_entry, process_once
+from backend.ops.handlers.hydration_handler import hydration_dedupe_key, hydration_priority
+from backend.ops.models import BackgroundJob
+from backend.redisx.queue import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_SCHEDULED,
+    RedisQueue,
+    WeightedLaneSelector,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture()
+def db_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(engine)
+    yield TestingSessionLocal
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture()
+def queue(db_factory):
+    return RedisQueue(redis_client=fakeredis.FakeRedis(decode_responses=True), db_factory=db_factory)
+
+
+def _enqueue(queue, workspace_id, priority, **kwargs):
+    return queue.enqueue(
+        "hydration",
+        {"workspace_id": workspace_id},
+        {"workspace_id": workspace_id},
+        priority=priority,
+        **kwargs,
+    )
+
+
+def _recording_handler(order):
+    def handler(job, payload, headers, db):
+        order.append(job.workspace_id)
+        return {"ok": True}
+
+    return handler
+
+
+def test_selector_interleaves_lanes_by_weight():
+    selector = WeightedLaneSelector({PRIORITY_INTERACTIVE: 3, PRIORITY_BULK: 1})
+
+    leaders = [selector.order()[0] for _ in range(8)]
+
+    assert leaders.count(PRIORITY_INTERACTIVE) == 6
+    assert leaders.count(PRIORITY_BULK) == 2
+    assert leaders[:4] != [PRIORITY_BULK] * 4
+
+
+def test_interactive_jobs_are_not_starved_by_bulk_backlog(queue, db_factory):
+    for _ in range(30):
+        _enqueue(queue, 1, PRIORITY_BULK)
+    for _ in range(3):
+        _enqueue(queue, 2, PRIORITY_INTERACTIVE)
+
+    order = []
+    process_once(
+        queue,
+        db_factory=db_factory,
+        hydration_handler=_recording_handler(order),
+        sleep_fn=lambda _: None,
+        count=5,
+    )
+
+    assert order.count(2) == 3
+    assert order.index(2) == 0
+
+
+def test_idle_lanes_do_not_waste_capacity(queue, db_factory):
+    for _ in range(4):
+        _enqueue(queue, 1, PRIORITY_BULK)
+
+    order = []
+    processed = process_once(
+        queue,
+        db_factory=db_factory,
+        hydration_handler=_recording_handler(order),
+        sleep_fn=lambda _: None,
+    )
+
+    assert processed == 4
+
+
+def test_duplicate_requests_collapse_until_started(queue, db_factory):
+    first = _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+    second = _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+    assert first == second
+    assert queue.redis.xlen("jobs:main") == 1
+
+    process_once(queue, db_factory=db_factory, hydration_handler=_recording_handler([]), sleep_fn=lambda _: None)
+
+    third = _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+    assert third != first
+
+
+def test_failed_enqueue_releases_dedupe_key(queue, monkeypatch):
+    def broken_xadd(stream, fields):
+        raise ConnectionError("redis went away")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(queue.redis, "xadd", broken_xadd)
+        with pytest.raises(ConnectionError):
+            _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+    assert queue.redis.get("jobs:dedupe:hydration:3") is None
+
+    def broken_mirror(*args, **kwargs):
+        raise RuntimeError("mirror failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(queue, "_try_mirror_to_db", broken_mirror)
+        with pytest.raises(RuntimeError):
+            _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+
+    job_id = _enqueue(queue, 3, PRIORITY_SCHEDULED, dedupe_key="hydration:3")
+    assert queue.redis.xlen("jobs:main") == 1
+    assert queue.redis.xrange("jobs:main")[0][1]["job_id"] == job_id
+
+
+def test_workspace_inflight_cap_defers_to_lane_tail(queue, db_factory):
+    _enqueue(queue, 4, PRIORITY_INTERACTIVE)
+    _enqueue(queue, 5, PRIORITY_INTERACTIVE)
+    assert queue.acquire_workspace_slot(4, limit=1)
+
+    entries = queue.read("jobs:interactive", count=2, block_ms=None)
+    db = db_factory()
+    try:
+        handled = [
+            _handle_entry(entry, queue, db, _recording_handler([]), lambda _: None, max_inflight=1)
+            for entry in entries
+        ]
+    finally:
+        db.close()
+
+    assert handled == [False, True]
+    tail = queue.redis.xrevrange("jobs:interactive", count=1)[0][1]
+    assert tail["workspace_id"] == "4"
+    assert queue.redis.get("jobs:inflight:5") == "0"
+
+    queue.release_workspace_slot(4, limit=1)
+    db = db_factory()
+    try:
+        assert db.query(BackgroundJob).filter(BackgroundJob.status == "success").count() == 1
+    finally:
+        db.close()
+
+
+def test_hydration_priority_and_dedupe_key():
+    full = {"workspace_id": 1, "source_ids": [3, 2], "force_full_scan": True}
+    targeted = {"workspace_id": 1, "source_ids": [2, 3], "force_full_scan": False}
+
+    assert hydration_priority(full) == PRIORITY_BULK
+    assert hydration_priority(targeted) == PRIORITY_INTERACTIVE
+    assert hydration_dedupe_key(full) != hydration_dedupe_key(targeted)
+    assert hydration_dedupe_key(targeted) == hydration_dedupe_key({**targeted, "source_ids": [3, 2]})
+    assert hydration_dedupe_key({**targeted, "max_files": 10}) != hydration_dedupe_key({**targeted, "max_files": 50})
+
+
+def test_retry_backoff_does_not_hold_the_workspace_slot(queue, db_factory):
+    _enqueue(queue, 6, PRIORITY_INTERACTIVE)
+    entry = queue.read("jobs:interactive", count=1, block_ms=None)[0]
+    slots_while_sleeping = []
+
+    def failing_handler(job, payload, headers, db):
+        raise RuntimeError("source unavailable")
+
+    def sleep(_seconds):
+        slots_while_sleeping.append(queue.redis.get("jobs:inflight:6"))
+
+    db = db_factory()
+    try:
+        assert _handle_entry(entry, queue, db, failing_handler, sleep, max_inflight=1)
+    finally:
+        db.close()
+
+    assert slots_while_sleeping == ["0"]
+    assert queue.redis.xrevrange("jobs:interactive", count=1)[0][1]["attempt"] == "1"
@@ -0,0 +1,125 @@
+"""Tests for the compact ULE link store."""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from backend.reasoning.link_store import LinkStore
+from backend.reasoning.packs.construction_pack import ConstructionPack
+from backend.reasoning.schemas import DocumentInput, Entity, EntityType, Evidence, EvidenceType, Link, LinkType
+from backend.reasoning.ule_engine import ULEEngine
+
+
+def _entity(entity_id, document_id, entity_type=EntityType.BOQ_ITEM, **extra):
+    return Entity(id=entity_id, type=entity_type, text=f"Text of {entity_id}", document_id=document_id, **extra)
+
+
+def _link(source, target, confidence=0.8, **extra):
+    return Link(
+        source=source,
+        target=target,
+        link_type=LinkType.SPECIFIES,
+        confidence=confidence,
+        pack_name="ConstructionPack",
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 250),
+        **extra,
+    )
+
+
+def test_links_round_trip_through_the_columns():
+    store = LinkStore()
+    boq = _entity("B-1", "DOC-A", section="03300", metadata={"unit": "m3"}, page_number=4)
+    spec = _entity("S-1", "DOC-B", entity_type=EntityType.SPEC_SECTION)
+    for entity in (boq, spec):
+        store.put_entity(entity)
+    link = _link(
+        boq,
+        spec,
+        evidence=[
+            Evidence(type=EvidenceType.KEYWORD_MATCH, value="C40", weight=0.4, metadata={"matched_keywords": ["c40"]}),
+            Evidence(type=EvidenceType.SEMANTIC_SIMILARITY, value=0.91, weight=0.6, source_text="a", target_text="b"),
+        ],
+        metadata={"reviewed_by": "qs"},
+        validated=True,
+    )
+    store.add_link(link)
+
+    assert store.link(link.id).model_dump() == link.model_dump()
+    assert store.link(uuid4()) is None
+    assert store.link_type_counts() == {"specifies": 1}
+    assert store.entity_type_counts() == {"BOQItem": 1, "SpecSection": 1}
+
+    replaced = link.model_copy(update={"confidence": 0.95, "target": boq, "evidence": []})
+    store.add_link(replaced)
+    assert store.link_count == 1
+    assert store.link(link.id).evidence == []
+    assert store.rows_for_document("DOC-B") == []
+
+
+@pytest.mark.asyncio
+async def test_engine_indexes_links_by_document_and_project():
+    engine = ULEEngine()
+    entities = {
+        "DOC-A": [_entity(f"A-{i}", "DOC-A") for i in range(3)],
+        "DOC-B": [_entity(f"B-{i}", "DOC-B", entity_type=EntityType.SPEC_SECTION) for i in range(2)],
+        "DOC-C": [_entity("C-0", "DOC-C")],
+    }
+    for document_id, project_id in (("DOC-A", "7"), ("DOC-B", "7"), ("DOC-C", "8")):
+        for entity in entities[document_id]:
+            engine._store.put_entity(entity)
+        engine._store.set_document(document_id, [e.id for e in entities[document_id]], project_id=project_id)
+    links = [
+        _link(entities["DOC-A"][0], entities["DOC-B"][0]),
+        _link(entities["DOC-A"][1], entities["DOC-B"][1]),
+        _link(entities["DOC-A"][2], entities["DOC-A"][0]),
+        _link(entities["DOC-C"][0], entities["DOC-C"][0]),
+    ]
+    for link in links:
+        engine._store.add_link(link)
+
+    for document_id in entities:
+        ids = {e.id for e in entities[document_id]}
+        expected = [link.id for link in links if link.source.id in ids or link.target.id in ids]
+        assert [link.id for link in engine.get_links_for_document(document_id)] == expected
+
+    graph = engine.get_graph(project_id="7")
+    assert [edge["id"] for edge in graph["edges"]] == [str(link.id) for link in links[:3]]
+    assert [node["id"] for node in graph["nodes"]] == ["A-0", "B-0", "A-1", "B-1", "A-2"]
+    assert len(engine.get_graph()["edges"]) == 4
+    assert len(engine._links) == 4 and len(engine._entities) == 6
+    assert engine.get_statistics()["total_documents"] == 3
+
+    # Reprocessing a document through the engine updates its entity index.
+    engine.register_pack(ConstructionPack())
+    await engine.process_document(
+        DocumentInput(document_id="DOC-C", document_name="C", content="", document_type="general", project_id="9")
+    )
+    assert engine.get_links_for_document("DOC-C") == []
+    assert engine.get_graph(project_id="8") == {"nodes": [], "edges": []}
+
+
+def test_imported_link_stubs_do_not_count_as_entities():
+    engine = ULEEngine()
+    engine._store.put_entity(_entity("entity-1", "DOC-A"))
+    engine.import_link(
+        {
+            "id": "550e8400-e29b-41d4-a716-446655440000",
+            "source_entity_id": "entity-1",
+            "source_entity_type": "BOQItem",
+            "target_entity_id": "entity-2",
+            "target_entity_type": "SpecSection",
+            "link_type": "specifies",
+            "confidence": 0.85,
+            "evidence": [{"type": "keyword_match", "value": "C40", "weight": 0.4}],
+            "pack_name": "ConstructionPack",
+            "created_at": "2024-01-01T00:00:00",
+        }
+    )
+
+    assert engine.get_statistics()["total_entities"] == 1
+    assert engine.get_entity("entity-2") is None
+    exported = engine.export_links()[0]
+    assert exported["evidence"][0]["type"] == EvidenceType.KEYWORD_MATCH
+    assert exported["created_at"] == "2024-01-01T00:00:00"
+    assert engine.get_evidence(engine.get_link(next(iter(engine._links))).id).source.text == "Text of entity-1"
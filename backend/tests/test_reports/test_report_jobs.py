@@ -0,0 +1,174 @@
+"""Tests for queued report rendering and the chart image cache."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.api import analytics_reports_system as reports
+from backend.backend.db import Base
+from backend.jobs.queue_worker import process_once
+from backend.ops.handlers.report_handler import REPORT_JOB_TYPE, report_dedupe_key, shutdown_render_pool
+from backend.ops.models import BackgroundJob, BackgroundJobEvent, ReportArtifact
+from backend.redisx.queue import PRIORITY_INTERACTIVE, RedisQueue
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture()
+def db_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(engine)
+    yield TestingSessionLocal
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture()
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("REPORT_CHART_CACHE_DIR", raising=False)
+    yield tmp_path
+    shutdown_render_pool()
+
+
+def _payload(**overrides):
+    payload = {
+        "user_id": "user-001",
+        "report_type": "monthly_overview",
+        "report_format": "json",
+        "project_id": None,
+        "date_from": None,
+        "date_to": None,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_report_jobs_render_on_the_queue_worker(workdir, db_factory, monkeypatch):
+    monkeypatch.setenv("REPORT_RENDER_WORKERS", "0")
+    queue = RedisQueue(redis_client=fakeredis.FakeRedis(decode_responses=True), db_factory=db_factory)
+    payload = _payload()
+    enqueue = lambda: queue.enqueue(  # noqa: E731
+        REPORT_JOB_TYPE,
+        payload,
+        {"correlation_id": "c-1"},
+        priority=PRIORITY_INTERACTIVE,
+        dedupe_key=report_dedupe_key(payload),
+    )
+    job_id = enqueue()
+    assert enqueue() == job_id
+
+    assert process_once(queue, db_factory=db_factory, sleep_fn=lambda _: None) == 1
+
+    db = db_factory()
+    job = db.query(BackgroundJob).filter(BackgroundJob.job_id == job_id).one()
+    assert job.status == "success"
+    assert job.result_json["correlation_id"] == "c-1"
+    assert job.result_json["download_url"] == f"/api/reports/artifacts/{job.result_json['report_id']}"
+    artifact = db.query(ReportArtifact).filter(ReportArtifact.report_id == job.result_json["report_id"]).one()
+    assert (artifact.user_id, artifact.filename) == ("user-001", job.result_json["filename"])
+    report = json.loads(artifact.content)
+    assert report["title"] == "Monthly Overview Report"
+    assert report["metrics"]["total_projects"] == 2
+    assert not (workdir / "reports" / artifact.filename).exists()  # the database copy is served
+    db.close()
+
+
+def test_dedupe_key_includes_custom_params():
+    base = report_dedupe_key(_payload())
+    first = report_dedupe_key(_payload(custom_params={"zones": ["A", "B"], "currency": "SAR"}))
+    reordered = report_dedupe_key(_payload(custom_params={"currency": "SAR", "zones": ["A", "B"]}))
+    other = report_dedupe_key(_payload(custom_params={"currency": "USD", "zones": ["A", "B"]}))
+
+    assert first == reordered
+    assert len({base, first, other}) == 3
+    assert report_dedupe_key(_payload(custom_params={})) == base
+
+
+def test_unknown_job_types_still_fail(workdir, db_factory):
+    queue = RedisQueue(redis_client=fakeredis.FakeRedis(decode_responses=True), db_factory=db_factory)
+    job_id = queue.enqueue("mystery", {}, {})
+
+    process_once(queue, db_factory=db_factory, sleep_fn=lambda _: None)
+
+    db = db_factory()
+    job = db.query(BackgroundJob).filter(BackgroundJob.job_id == job_id).one()
+    assert job.last_error == "Unsupported job type mystery"
+    db.close()
+
+
+def test_chart_cache_reuses_images_by_data_hash(tmp_path):
+    cache = reports.ChartCache(tmp_path / "charts", max_files=1)
+    calls = []
+
+    def render(label):
+        def draw():
+            calls.append(label)
+            return reports.base64.b64encode(label.encode()).decode()
+
+        return draw
+
+    first = cache.get_or_render("overview", [1, 2, 3], render("a"))
+    assert cache.get_or_render("overview", [1, 2, 3], render("b")) == first
+    assert cache.get_or_render("overview", [1, 2, 4], render("c")) != first
+    assert calls == ["a", "c"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.prune()
+    assert len(list((tmp_path / "charts").glob("*.png"))) == 1
+
+
+def test_generate_endpoint_renders_off_loop_without_a_queue(workdir, db_factory, monkeypatch):
+    monkeypatch.setenv("REPORT_RENDER_WORKERS", "1")
+    app = FastAPI()
+    app.include_router(reports.router, prefix="/api")
+
+    def override_db():
+        db = db_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[reports._optional_db] = override_db
+    client = TestClient(app)
+
+    body = client.post("/api/reports/generate", params={"report_type": "weekly_progress", "report_format": "json"}).json()
+    assert body["status"] == "success" and body["job_id"] is None
+    assert client.get(body["download_url"]).json()["title"] == "Weekly Progress Report"
+
+    db = db_factory()
+    db.add(BackgroundJob(job_id="r-1", job_type=REPORT_JOB_TYPE, status="running"))
+    db.add(BackgroundJobEvent(job_id="r-1", event_type="queued", data_json={"payload": _payload()}))
+    db.add(BackgroundJob(job_id="r-2", job_type=REPORT_JOB_TYPE, status="success", result_json=body))
+    db.add(BackgroundJobEvent(job_id="r-2", event_type="queued", data_json={"payload": _payload(user_id="user-002")}))
+    db.add(
+        ReportArtifact(
+            report_id="other", user_id="user-002", filename="x.json", report_format="json", size=2, content=b"{}"
+        )
+    )
+    db.commit()
+    assert client.get("/api/reports/jobs/r-1").json()["download_url"] is None
+    assert client.get("/api/reports/jobs/r-1/download").status_code == 409
+
+    job = db.query(BackgroundJob).filter(BackgroundJob.job_id == "r-1").one()
+    job.status = "success"
+    job.result_json = {"report_id": body["report_id"]}
+    db.commit()
+    db.close()
+    status = client.get("/api/reports/jobs/r-1").json()
+    assert status["download_url"] == "/api/reports/jobs/r-1/download"
+    assert client.get(status["download_url"]).status_code == 200
+    assert client.get("/api/reports/jobs/missing").status_code == 404
+
+    # Jobs and artifacts of other users are invisible.
+    assert client.get("/api/reports/jobs/r-2").status_code == 404
+    assert client.get("/api/reports/jobs/r-2/download").status_code == 404
+    assert client.get("/api/reports/artifacts/other").status_code == 404
+    assert client.delete(f"/api/reports/{body['filename']}").status_code in (404, 405)
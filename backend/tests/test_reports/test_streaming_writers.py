@@ -0,0 +1,194 @@
+"""Tests for the streaming report writers and database-backed task tables."""
+
+import asyncio
+import json
+import re
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import analytics_reports_system as reports
+from backend.services.streaming_pdf import PdfTextLayout, StreamingPdfWriter
+
+TASK_COUNT = 450
+
+
+@pytest.fixture()
+def generator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    metadata = MetaData()
+    tasks = Table(
+        "tasks",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", String),
+        Column("project_id", String),
+        Column("title", String),
+        Column("priority", String),
+        Column("status", String),
+        Column("completed", Boolean),
+        Column("due_date", DateTime),
+        Column("created_at", DateTime),
+    )
+    alerts = Table(
+        "alerts",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", String),
+        Column("project_id", String),
+        Column("title", String),
+        Column("severity", String),
+        Column("created_at", DateTime),
+    )
+    engine = create_engine(f"sqlite:///{tmp_path / 'reports.db'}")
+    metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            tasks.insert(),
+            [
+                {
+                    "user_id": "user-001",
+                    "project_id": "proj-001",
+                    "title": f"Task {index:04d}",
+                    "priority": "high",
+                    "status": "completed" if index % 3 == 0 else "in_progress",
+                    "completed": index % 3 == 0,
+                    "due_date": None,
+                    "created_at": now - timedelta(minutes=TASK_COUNT - index),
+                }
+                for index in range(TASK_COUNT)
+            ],
+        )
+        conn.execute(tasks.insert(), [{"user_id": "user-002", "title": "Other", "created_at": now}])
+        conn.execute(
+            alerts.insert(),
+            [
+                {
+                    "user_id": "user-001",
+                    "project_id": "proj-001",
+                    "title": f"Alert {index:02d}",
+                    "severity": ("critical", "high", "low")[index % 3],
+                    "created_at": now - timedelta(hours=index),
+                }
+                for index in range(12)
+            ],
+        )
+    db = sessionmaker(bind=engine)()
+    yield reports.AutomatedReportGenerator(db=db, chart_cache=reports.ChartCache(tmp_path / "charts"))
+    db.close()
+    engine.dispose()
+
+
+def _generate(generator, report_format):
+    return asyncio.run(
+        generator.generate_report(reports.ReportType.MONTHLY_OVERVIEW, report_format, "user-001")
+    )
+
+
+def test_tables_stream_from_the_database(generator):
+    data = asyncio.run(
+        generator._collect_report_data(
+            reports.ReportType.MONTHLY_OVERVIEW,
+            "user-001",
+            None,
+            datetime.utcnow() - timedelta(days=30),
+            datetime.utcnow() + timedelta(minutes=1),
+            None,
+        )
+    )
+    assert data.metrics["total_tasks"] == TASK_COUNT
+    assert data.metrics["completed_tasks"] == TASK_COUNT // 3
+    assert (data.metrics["total_alerts"], data.metrics["critical_alerts"], data.metrics["high_alerts"]) == (12, 4, 4)
+    assert isinstance(data.tables["tasks"].rows, reports.RowStream)
+    first = [row["Title"] for row in data.tables["tasks"].rows]
+    assert first[:2] == ["Task 0000", "Task 0001"] and len(first) == TASK_COUNT
+    assert [row["Title"] for row in data.tables["tasks"].rows] == first  # re-iterable
+    assert [row["Title"] for row in data.tables["alerts"].rows][:2] == ["Alert 00", "Alert 01"]
+    assert len(data.tables["alerts"].rows) == 10
+
+
+def test_json_and_html_writers_stream_every_row(generator):
+    report = json.loads(open(_generate(generator, reports.ReportFormat.JSON)).read())
+    assert report["metrics"]["total_tasks"] == TASK_COUNT
+    assert len(report["tables"]["tasks"]) == TASK_COUNT
+    assert report["tables"]["tasks"][-1]["Title"] == f"Task {TASK_COUNT - 1:04d}"
+
+    html = open(_generate(generator, reports.ReportFormat.HTML)).read()
+    assert html.count("<tr><td>Task ") == TASK_COUNT
+    assert html.rstrip().endswith("</html>")
+
+
+def test_excel_writer_uses_write_only_sheets(generator):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.load_workbook(_generate(generator, reports.ReportFormat.EXCEL), read_only=True)
+    assert workbook.sheetnames[:2] == ["Summary", "Projects"]
+    rows = list(workbook["Tasks"].iter_rows(values_only=True))
+    assert rows[0] == ("Title", "Priority", "Status", "Due Date")
+    assert len(rows) == TASK_COUNT + 1
+    workbook.close()
+
+
+def _pdf_objects(data):
+    """Check the xref table against the file and return the page contents."""
+
+    xref_at = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    assert data[xref_at:].startswith(b"xref\n")
+    offsets = [int(entry) for entry in re.findall(rb"(\d{10}) 00000 n", data[xref_at:])]
+    for number, offset in enumerate(offsets, start=1):
+        assert data[offset:].startswith(b"%d 0 obj" % number)
+    return [zlib.decompress(stream) for stream in re.findall(rb"stream\n(.*?)\nendstream", data, re.S)]
+
+
+def test_pdf_writer_streams_pages_without_weasyprint(generator, monkeypatch):
+    monkeypatch.setattr(reports, "HTML", None)
+    path = _generate(generator, reports.ReportFormat.PDF)
+    assert path.endswith(".pdf")
+    data = open(path, "rb").read()
+    assert data.startswith(b"%PDF-1.4") and data.rstrip().endswith(b"%%EOF")
+    pages = _pdf_objects(data)
+    assert len(pages) > 5
+    text = b"".join(pages)
+    assert text.count(b"(Task ") == TASK_COUNT
+    assert b"(Monthly Overview Report) Tj" in pages[0]
+    assert all(b"(Title) Tj" in page for page in pages[-3:])  # header repeats on each page
+
+
+def test_large_pdf_with_arabic_text_uses_the_html_path(generator, monkeypatch):
+    rendered = []
+
+    class FakeHTML:
+        def __init__(self, path):
+            self.path = path
+
+        def write_pdf(self, target):
+            rendered.append(self.path)
+            open(target, "wb").write(b"%PDF-1.7 html")
+
+    monkeypatch.setattr(reports, "HTML", FakeHTML)
+    monkeypatch.setattr(reports, "PDF_HTML_MAX_ROWS", 10)
+
+    latin = open(_generate(generator, reports.ReportFormat.PDF), "rb").read()
+    assert latin.startswith(b"%PDF-1.4") and rendered == []
+
+    generator.db.execute(text("UPDATE tasks SET title = 'صب الخرسانة' WHERE id = 400"))
+    generator.db.commit()
+    arabic = open(_generate(generator, reports.ReportFormat.PDF), "rb").read()
+    assert arabic == b"%PDF-1.7 html" and len(rendered) == 1
+    assert "صب الخرسانة" in open(rendered[0], encoding="utf-8").read()
+
+
+def test_pdf_layout_wraps_and_escapes(tmp_path):
+    path = tmp_path / "plain.pdf"
+    with path.open("wb") as handle:
+        writer = StreamingPdfWriter(handle, compress=False)
+        layout = PdfTextLayout(writer)
+        layout.paragraph("word (x) " * 100)
+        layout.close()
+    data = path.read_bytes()
+    assert writer.page_count == 1
+    assert b"\\(x\\)" in data
+    assert data.count(b" Tj ET") > 1
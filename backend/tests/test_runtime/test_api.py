@@ -221,3 +221,49 @@ class TestFunctionExecutionEndpoint:
         )
 
         assert response.status_code == 400
+
+    def test_execute_function_batch(self, client):
+        """Test executing a function for several projects at once."""
+        response = client.post(
+            "/api/runtime/function/sensitivity_analysis/batch",
+            json={"projects": [
+                {"base_value": 1000, "variables": {"labor": 0.5}},
+                {"base_value": 2000, "variables": {"labor": 0.5}},
+            ]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        assert data["results"][1]["results"]["labor"]["impacts"][0]["new_value"] == 1800.0
+
+    def test_schedule_simulation(self, client):
+        """Test the schedule risk simulation endpoint."""
+        response = client.post(
+            "/api/runtime/schedule/simulate",
+            json={
+                "tasks": [
+                    {"id": "A", "duration": 5, "pessimistic": 8},
+                    {"id": "B", "duration": 3, "dependencies": ["A"]},
+                ],
+                "iterations": 200,
+                "seed": 1,
+                "project_start": "2026-01-04",
+                "weekmask": "1111001",
+            },
+        )
+
+        assert response.status_code == 200
+        result = response.json()["result"]
+        assert result["iterations"] == 200
+        assert result["criticality_index"] == {"A": 1.0, "B": 1.0}
+        assert result["finish"]["P90"]["duration"] >= result["finish"]["P50"]["duration"] > 7
+
+    def test_schedule_simulation_rejects_bad_estimates(self, client):
+        """Test that inconsistent estimates are a client error."""
+        response = client.post(
+            "/api/runtime/schedule/simulate",
+            json={"tasks": [{"id": "A", "duration": 5, "optimistic": 6}]},
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,101 @@
+"""Tests for AST validation and the compiled-code cache."""
+
+from backend.runtime.code_cache import CodeCache, analyze_code, get_code_cache
+from backend.runtime.code_generator import CodeGenerator
+from backend.runtime.sandbox import SandboxExecutor
+
+
+class TestAnalyzeCode:
+    """Test the single-pass AST validator."""
+
+    def test_safe_code_is_compiled(self):
+        analysis = analyze_code("import numpy as np\nresult = int(np.sum([1, 2]))")
+        assert analysis.is_safe
+        assert analysis.approved_imports == ("numpy",)
+        assert analysis.code_object is not None
+
+    def test_unsafe_code_is_not_compiled(self):
+        analysis = analyze_code("import os\nresult = os.getcwd()")
+        assert not analysis.is_safe
+        assert analysis.forbidden_imports == ("os",)
+        assert analysis.code_object is None
+
+    def test_blocks_escape_routes(self):
+        cases = {
+            "result = ().__class__.__bases__": "__class__",
+            "f = getattr\nresult = f(1, 'real')": "getattr",
+            "from os import path": "os",
+            "result = g.gi_frame.f_globals": "gi_frame",
+            "result = eval": "eval",
+        }
+        for code, expected in cases.items():
+            violations = analyze_code(code).violations
+            assert any(expected in violation for violation in violations), code
+
+    def test_blocks_modules_and_builtins_reached_through_attributes(self):
+        cases = {
+            "import pandas as pd\nresult = pd.io.common.os.getcwd()": "Forbidden module: os",
+            "import numpy as np\nresult = np.lib.npyio.os.listdir('.')": "Forbidden module: os",
+            "import collections\nresult = collections.sys.modules": "Forbidden module: sys",
+            "import pandas as pd\nresult = pd.core.computation.eval.eval": "Forbidden pattern: eval",
+            "import json\nresult = json.decoder.builtins.open": "Forbidden pattern: open",
+        }
+        for code, expected in cases.items():
+            analysis = analyze_code(code)
+            assert not analysis.is_safe, code
+            assert expected in analysis.violations, code
+            assert analysis.code_object is None
+
+    def test_blocks_dunders_inside_string_literals(self):
+        for code in (
+            "result = '{0.__class__.__mro__}'.format(x)",
+            "result = df.agg('__class__')",
+            "result = f'{x.real}__globals__'",
+        ):
+            analysis = analyze_code(code)
+            assert not analysis.is_safe, code
+            assert "Dangerous pattern: '__' in string literal" in analysis.violations
+
+    def test_strings_and_lookalike_names_are_allowed(self):
+        analysis = analyze_code("profile = 'see os.path and eval('\nopened = len(profile)\nresult = type(opened).__name__")
+        assert analysis.is_safe, analysis.violations
+
+    def test_syntax_error_reported(self):
+        analysis = analyze_code("result = [1, 2")
+        assert not analysis.is_safe
+        assert analysis.violations[0].startswith("Syntax error")
+
+
+class TestCodeCache:
+    """Test LRU caching of analyses."""
+
+    def test_hit_returns_same_code_object(self):
+        cache = CodeCache(maxsize=4)
+        first = cache.analyze("result = 1")
+        second = cache.analyze("result = 1")
+        assert second.code_object is first.code_object
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = CodeCache(maxsize=2)
+        cache.analyze("result = 1")
+        cache.analyze("result = 2")
+        cache.analyze("result = 1")
+        cache.analyze("result = 3")
+        assert len(cache) == 2
+        cache.analyze("result = 1")
+        assert cache.stats()["hits"] == 2
+
+    def test_template_code_validates_once(self):
+        generator = CodeGenerator(api_key=None)
+        code = generator._template_boq_sum({})
+        executor = SandboxExecutor(isolation="inprocess")
+        context = {"boq_items": [{"quantity": 2, "unit_cost": 5.0}]}
+        get_code_cache().clear()
+
+        results = [executor.execute(code, context) for _ in range(3)]
+
+        assert all(result.output["total_cost"] == 10.0 for result in results)
+        assert generator.validate_code(code)["is_safe"]
+        assert get_code_cache().stats()["misses"] == 1
@@ -0,0 +1,189 @@
+"""Tests for concurrent, cached, columnar context building."""
+
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.events.envelope import EventEnvelope
+from backend.runtime import context_cache
+from backend.runtime.code_generator import CodeGenerator
+from backend.runtime.context_builder import ContextBuilder
+from backend.runtime.context_cache import ProjectContextCache, invalidate_for_event
+from backend.runtime.sandbox import SandboxExecutor
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE boq_items (id INTEGER PRIMARY KEY, project_id INTEGER, description TEXT, "
+            "quantity NUMERIC, unit TEXT, unit_cost NUMERIC)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO boq_items (project_id, description, quantity, unit, unit_cost) VALUES "
+            "(1, 'Concrete', 10, 'm3', 150), (1, 'Steel', NULL, 'ton', 2500), (1, 'Formwork', 4, 'sqm', NULL), "
+            "(2, 'Other', 1, 'ea', 1)"
+        )
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture()
+def cache(monkeypatch):
+    shared = ProjectContextCache(redis_client=None)
+    monkeypatch.setattr(context_cache, "_cache", shared)
+    return shared
+
+
+def test_boq_is_columnar_with_nulls_as_zero(session, cache):
+    context = ContextBuilder().build_context(1, "total boq quantity", db=session)
+
+    frame = context["boq_items"]
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame["quantity"]) == [10.0, 0.0, 4.0]
+    assert list(frame["unit_cost"]) == [150.0, 2500.0, 0.0]
+    assert frame["quantity"].dtype == float
+
+
+def test_row_mode_keeps_list_of_dicts(session, cache):
+    context = ContextBuilder(columnar=False).build_context(1, "total boq quantity", db=session)
+
+    assert context["boq_items"][0] == {
+        "id": 1, "description": "Concrete", "quantity": 10.0, "unit": "m3", "unit_cost": 150.0,
+    }
+
+
+def test_cache_until_project_updated_event(session, cache):
+    builder = ContextBuilder()
+    first = builder.build_context(1, "boq items", db=session)
+    first["boq_items"].loc[0, "quantity"] = -1  # callers get copies
+    session.execute(text("DELETE FROM boq_items WHERE project_id = 1 AND description = 'Steel'"))
+    session.commit()
+
+    assert len(builder.build_context(1, "boq items", db=session)["boq_items"]) == 3
+    assert builder.build_context(1, "boq items", db=session)["boq_items"].loc[0, "quantity"] == 10.0
+    assert cache.stats()["hits"] == 2
+
+    assert invalidate_for_event(EventEnvelope.build("project.updated", {"project_id": 1}))
+    assert not invalidate_for_event(EventEnvelope.build("project.viewed", {"project_id": 1}))
+    assert len(builder.build_context(1, "boq items", db=session)["boq_items"]) == 2
+    assert len(builder.build_context(2, "boq items", db=session)["boq_items"]) == 1
+
+
+def test_failed_fetch_falls_back_to_samples_and_is_not_cached(session, cache):
+    context = ContextBuilder().build_context(1, "schedule delay", db=session)
+
+    assert context["tasks"][0]["name"] == "Foundation"
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidation_is_shared_through_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    api_cache = ProjectContextCache(redis_client=client)
+    worker_cache = ProjectContextCache(redis_client=client)
+
+    api_cache.put(7, "boq", api_cache.version(7), [1, 2])
+    assert api_cache.get(7, "boq", api_cache.version(7)) == [1, 2]
+    worker_cache.invalidate(7)
+    assert api_cache.get(7, "boq", api_cache.version(7)) is None
+
+
+def test_hydration_invalidates_named_projects_or_all(cache):
+    for project_id in (1, 2, 7):
+        cache.put(project_id, "boq", cache.version(project_id), [project_id])
+
+    assert invalidate_for_event(EventEnvelope.build("hydration.completed", {"project_ids": ["2"]}, workspace_id=7))
+    assert cache.get(2, "boq", cache.version(2)) is None
+    assert cache.get(7, "boq", cache.version(7)) == [7]  # a workspace id is not a project id
+
+    context_cache.invalidate_hydrated_context({"workspace_id": 7})
+    assert [cache.get(project_id, "boq", cache.version(project_id)) for project_id in (1, 7)] == [None, None]
+
+
+def test_invalidating_every_project_is_shared_through_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    api_cache = ProjectContextCache(redis_client=client)
+    worker_cache = ProjectContextCache(redis_client=client)
+
+    api_cache.put(3, "boq", api_cache.version(3), [3])
+    worker_cache.invalidate(None)
+    assert api_cache.get(3, "boq", api_cache.version(3)) is None
+
+
+class _Result:
+    def __init__(self, columns):
+        self._columns = columns
+
+    def keys(self):
+        return self._columns
+
+    def fetchall(self):
+        return [tuple(range(len(self._columns)))]
+
+    def fetchone(self):
+        return (100, 80, 120)
+
+
+class _ConcurrentBind:
+    """Engine stand-in whose queries only succeed if all three run at once."""
+
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self):
+        self.barrier = threading.Barrier(3, timeout=5)
+        self.threads = set()
+
+    def connect(self):
+        bind = self
+
+        class _Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement, params):
+                bind.threads.add(threading.get_ident())
+                bind.barrier.wait()
+                sql = str(statement)
+                if "project_costs" in sql:
+                    return _Result(["budget", "actual_cost", "forecast"])
+                if "boq_items" in sql:
+                    return _Result(["id", "description", "quantity", "unit", "unit_cost"])
+                return _Result(["id", "certificate_no", "amount", "date", "status"])
+
+        return _Connection()
+
+
+def test_fetches_run_concurrently_on_separate_connections(cache):
+    bind = _ConcurrentBind()
+    db = type("Session", (), {"get_bind": lambda self: bind})()
+
+    context = ContextBuilder().build_context(1, "boq cost payment", db=db)
+
+    assert len(bind.threads) == 3
+    assert context["cost_data"] == {"budget": 100.0, "actual": 80.0, "forecast": 120.0}
+    assert list(context["payments"].columns) == ["id", "certificate_no", "amount", "date", "status"]
+
+
+def test_templates_accept_frames():
+    frame = pd.DataFrame({"quantity": [2.0, 3.0], "unit_cost": [5.0, 1.0]})
+    generator = CodeGenerator(api_key=None)
+    executor = SandboxExecutor(isolation="inprocess")
+
+    result = executor.execute(generator._template_boq_sum({}), {"boq_items": frame})
+
+    assert result.output == {"total_items": 2, "total_quantity": 5.0, "total_cost": 13.0}
+    assert "pandas DataFrame with 2 rows" in generator._build_context_description({"boq_items": frame})
@@ -0,0 +1,121 @@
+"""Tests for columnar inputs, batching and correlated Monte Carlo in the function registry."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.runtime.function_registry import (
+    APPROVED_FUNCTIONS,
+    boq_quantity_check,
+    correlated_monte_carlo,
+    evaluate_batch,
+    monte_carlo_sim,
+    pnl_attribution,
+    sensitivity_analysis,
+    sensitivity_analysis_batch,
+)
+
+ROWS = [
+    {"id": "A", "quantity": 10, "unit_cost": 2.5},
+    {"id": "B", "quantity": 4, "unit_cost": 10.0},
+    {"description": "C", "quantity": 7, "unit_cost": 1.0},
+]
+SPECS = {"A": {"quantity": 8}, "B": {"quantity": 4}, "C": {"quantity": 9}}
+
+
+class _ArrowLikeTable:
+    """Minimal pyarrow.Table surface: column_names, num_rows, column().to_numpy()."""
+
+    def __init__(self, columns):
+        self._columns = {name: np.asarray(values) for name, values in columns.items()}
+        self.column_names = list(columns)
+        self.num_rows = len(next(iter(self._columns.values())))
+
+    def column(self, name):
+        values = self._columns[name]
+        return type("Column", (), {"to_numpy": lambda self: values})()
+
+
+class TestColumnarInputs:
+    """Row dicts, column mappings, DataFrames and Arrow tables agree."""
+
+    def test_boq_inputs_agree(self):
+        expected = boq_quantity_check(ROWS, SPECS)
+        columns = {"id": ["A", "B", "C"], "quantity": [10, 4, 7], "unit_cost": [2.5, 10.0, 1.0]}
+
+        for data in (columns, pd.DataFrame(columns), _ArrowLikeTable(columns)):
+            assert boq_quantity_check(data, SPECS) == expected
+
+        assert expected["items_over_spec"] == 1
+        assert expected["items_under_spec"] == 1
+        assert expected["variance_details"][2] == {
+            "item_id": "C", "quantity": 7, "spec_quantity": 9, "variance": -2, "variance_pct": -2 / 9 * 100,
+        }
+        assert isinstance(expected["total_quantity"], int)
+
+    def test_pnl_accepts_columns(self):
+        mapping = {"Materials": -5000, "Labor": 12000, "Equipment": 5000}
+        frame = pd.DataFrame({"category": list(mapping), "value": list(mapping.values())})
+
+        assert pnl_attribution(frame) == pnl_attribution(mapping)
+        # Ties on absolute value keep input order.
+        assert [c["category"] for c in pnl_attribution(mapping)["category_impacts"]] == ["Labor", "Materials", "Equipment"]
+
+
+class TestBatch:
+    """Test the batched multi-project API."""
+
+    def test_sensitivity_batch_matches_single(self):
+        variables = {"labor": 0.4, "materials": 0.6}
+        params = [{"base_value": base, "variables": variables} for base in (1000.0, 2500.0, 12345.67)]
+
+        assert evaluate_batch("sensitivity_analysis", params) == [sensitivity_analysis(**p) for p in params]
+        dense = sensitivity_analysis_batch([1000.0, 2000.0], variables, [-10, 10])
+        assert np.array(dense["new_values"]).shape == (2, 2, 2)
+
+    def test_boq_batch_matches_single(self):
+        params = [{"boq_items": ROWS}, {"boq_items": []}, {"boq_items": ROWS[:1]}]
+
+        assert evaluate_batch("boq_quantity_check", params) == [boq_quantity_check(**p) for p in params]
+
+    def test_boq_batch_accepts_dataframes(self):
+        frame = pd.DataFrame(ROWS)
+        params = [{"boq_items": frame}, {"boq_items": frame.iloc[:0]}, {"boq_items": None}, {"boq_items": ROWS[:1]}]
+
+        assert evaluate_batch("boq_quantity_check", params) == [boq_quantity_check(**p) for p in params]
+
+    def test_unknown_function(self):
+        with pytest.raises(KeyError):
+            evaluate_batch("nope", [{}])
+
+
+class TestCorrelatedMonteCarlo:
+    """Test seeded, correlated Monte Carlo."""
+
+    CORRELATION = [[1.0, 0.8], [0.8, 1.0]]
+
+    def test_seed_is_reproducible(self):
+        first = correlated_monte_carlo([100, 50], [10, 5], self.CORRELATION, iterations=5000, seed=3)
+        second = correlated_monte_carlo([100, 50], [10, 5], self.CORRELATION, iterations=5000, seed=3)
+        assert first == second
+        assert monte_carlo_sim([1, 2, 3], iterations=50, seed=1) == monte_carlo_sim([1, 2, 3], iterations=50, seed=1)
+
+    def test_streaming_percentiles_match_theory(self):
+        result = correlated_monte_carlo([100, 50], [10, 5], self.CORRELATION, iterations=300_000, seed=11)
+
+        expected_std = np.sqrt(10**2 + 5**2 + 2 * 0.8 * 10 * 5)
+        assert result["iterations"] == 300_000
+        assert result["expected_std"] == pytest.approx(expected_std)
+        assert result["mean"] == pytest.approx(150, abs=0.1)
+        assert result["std"] == pytest.approx(expected_std, rel=0.01)
+        assert result["percentile_90"] == pytest.approx(150 + 1.2816 * expected_std, rel=0.005)
+        assert result["min"] <= result["percentile_10"] <= result["percentile_50"] <= result["max"]
+
+    def test_caps_iterations_and_handles_singular_correlation(self):
+        result = correlated_monte_carlo([1, 1], [1, 1], [[1, 1], [1, 1]], iterations=10**9, seed=0)
+        assert result["iterations"] == 1_000_000
+        assert result["std"] == pytest.approx(2.0, rel=0.01)
+
+    def test_registered(self):
+        assert APPROVED_FUNCTIONS["correlated_monte_carlo"]["function"] is correlated_monte_carlo
+        assert "error" in correlated_monte_carlo([], [])
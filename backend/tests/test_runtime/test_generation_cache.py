@@ -0,0 +1,234 @@
+"""Tests for the generated-code cache."""
+
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.backend.db import Base, _ensure_columns
+from backend.runtime import function_registry
+from backend.runtime.generation_cache import (
+    GenerationCache,
+    cache_key,
+    context_fingerprint,
+    normalize_query,
+)
+from backend.runtime.models import CodeExecution
+from backend.runtime.schemas import CodeRequest
+from backend.services.runtime_service import RuntimeService
+
+CONTEXT = {"boq_items": [{"description": "steel", "quantity": 3, "unit_cost": 2.5}]}
+CODE = "result = sum(i['quantity'] * i['unit_cost'] for i in boq_items)"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(**kwargs):
+    kwargs.setdefault("load_embedder", False)
+    return GenerationCache(**kwargs)
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+class TestKeys:
+    """Test query normalisation and context fingerprints."""
+
+    def test_normalize_query(self):
+        assert normalize_query("  What's the TOTAL cost? ") == normalize_query("what s the total cost")
+        assert normalize_query("increase 15.5%") == "increase 15.5%"
+
+    def test_fingerprint_ignores_values_but_not_shape(self):
+        other_values = {"boq_items": [{"description": "concrete", "quantity": 9, "unit_cost": 1.0}]}
+        new_key = {"boq_items": CONTEXT["boq_items"], "values": [1, 2]}
+        changed_type = {"boq_items": [{"description": "steel", "quantity": "3", "unit_cost": 2.5}]}
+
+        assert context_fingerprint(CONTEXT) == context_fingerprint(other_values)
+        assert context_fingerprint(CONTEXT) != context_fingerprint(new_key)
+        assert context_fingerprint(CONTEXT) != context_fingerprint(changed_type)
+
+
+class TestGenerationCache:
+    """Test lookup tiers, TTL and invalidation."""
+
+    def test_memory_hit_and_ttl(self):
+        clock = _Clock()
+        cache = _cache(ttl_seconds=60, time_fn=clock)
+        cache.store("Total BOQ cost", CONTEXT, CODE)
+
+        assert cache.lookup("total boq cost?", CONTEXT) == CODE
+        clock.now += 61
+        assert cache.lookup("total boq cost?", CONTEXT) is None
+
+    def test_registry_change_invalidates(self, monkeypatch):
+        cache = _cache()
+        cache.store("Total BOQ cost", CONTEXT, CODE)
+
+        patched = dict(function_registry.APPROVED_FUNCTIONS)
+        patched["new_fn"] = {"signature": "new_fn() -> Dict"}
+        monkeypatch.setattr(function_registry, "APPROVED_FUNCTIONS", patched)
+
+        assert cache.lookup("Total BOQ cost", CONTEXT) is None
+        assert cache.stats()["size"] == 0
+
+    def test_history_table_backs_memory(self, session_factory):
+        session = session_factory()
+        fingerprint = context_fingerprint(CONTEXT)
+        session.add(
+            CodeExecution(
+                query="Total BOQ cost",
+                generated_code=CODE,
+                status="success",
+                cache_key=cache_key("Total BOQ cost", fingerprint),
+                context_fingerprint=fingerprint,
+            )
+        )
+        session.commit()
+        cache = _cache()
+
+        assert cache.lookup("total BOQ cost", CONTEXT, db=session) == CODE
+        assert cache.lookup("total BOQ cost", CONTEXT) == CODE
+        assert cache.stats()["hits"] == {"memory": 1, "history": 1, "similar": 0}
+        session.close()
+
+    def test_near_duplicate_query_reuses_code(self):
+        synonyms = {"sum": "total"}
+
+        def embed(texts):
+            vocabulary = ["total", "boq", "schedule"]
+            rows = []
+            for text in texts:
+                words = [synonyms.get(word, word) for word in text.split()]
+                rows.append([float(words.count(term)) for term in vocabulary])
+            return np.array(rows)
+
+        cache = _cache(embed_fn=embed, similarity_threshold=0.95)
+        cache.store("total BOQ cost", CONTEXT, CODE)
+
+        assert cache.lookup("sum of BOQ", CONTEXT) == CODE
+        assert cache.lookup("schedule slip", CONTEXT) is None
+        assert cache.lookup("sum of BOQ", {"values": [1.0]}) is None
+
+        cache.store("increase total BOQ by 10%", CONTEXT, "result = 1.10")
+        assert cache.lookup("increase sum of BOQ by 10%", CONTEXT) == "result = 1.10"
+        assert cache.lookup("increase sum of BOQ by 20%", CONTEXT) is None
+        assert cache.lookup("increase sum of BOQ by 10.5%", CONTEXT) is None
+
+
+def test_runtime_service_skips_generation_on_repeat(session_factory, monkeypatch):
+    import backend.services.runtime_service as runtime_service
+
+    monkeypatch.setattr(runtime_service, "get_generation_cache", lambda: _cache())
+    service = RuntimeService()
+    calls = []
+    original = service._generator.generate_code
+
+    def counting_generate(query, context):
+        calls.append(query)
+        return original(query, context)
+
+    monkeypatch.setattr(service._generator, "generate_code", counting_generate)
+    request = CodeRequest(query="Calculate sum of values", context={"values": [1, 2, 3]})
+
+    session = session_factory()
+    first = asyncio.run(service.process_query(request, db=session))
+    second = asyncio.run(service.process_query(request, db=session))
+    session.close()
+
+    assert len(calls) == 1
+    assert first.output == second.output
+    assert second.logs[0].message == "Generated code served from cache"
+
+
+def test_embedder_loads_once_off_the_event_loop(session_factory, monkeypatch):
+    import threading
+
+    import backend.runtime.generation_cache as generation_cache
+    import backend.services.runtime_service as runtime_service
+
+    loads = []
+
+    def slow_loader():
+        loads.append(threading.get_ident())
+        return lambda texts: np.ones((len(texts), 3))
+
+    monkeypatch.setattr(generation_cache, "_default_embedder", slow_loader)
+    cache = GenerationCache()
+    monkeypatch.setattr(runtime_service, "get_generation_cache", lambda: cache)
+    service = RuntimeService()
+    request = CodeRequest(query="Calculate sum of values", context={"values": [1, 2, 3]})
+
+    async def scenario():
+        session = session_factory()
+        try:
+            await service.process_query(request, db=session)
+        finally:
+            session.close()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert len(loads) == 1 and loads[0] != loop_thread
+    assert cache.ensure_embedder()
+
+
+def test_sandbox_runs_off_the_event_loop(session_factory, monkeypatch):
+    import threading
+
+    import backend.services.runtime_service as runtime_service
+
+    monkeypatch.setattr(runtime_service, "get_generation_cache", lambda: _cache())
+    service = RuntimeService()
+    threads = []
+    execute = service._executor.execute
+
+    def recording_execute(code, context):
+        threads.append(threading.get_ident())
+        return execute(code, context)
+
+    monkeypatch.setattr(service._executor, "execute", recording_execute)
+    request = CodeRequest(query="Calculate sum of values", context={"values": [1, 2, 3]})
+
+    async def scenario():
+        session = session_factory()
+        try:
+            await service.process_query(request, db=session)
+        finally:
+            session.close()
+        await service.execute_code("result = 1", {})
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+def test_ensure_columns_adds_cache_columns_to_old_table():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE code_executions (id INTEGER PRIMARY KEY, project_id INTEGER, user_id INTEGER, "
+            "query TEXT NOT NULL, generated_code TEXT NOT NULL, result_json JSON, status VARCHAR(20) NOT NULL, "
+            "execution_time FLOAT, memory_used INTEGER, error_message TEXT, created_at DATETIME)"
+        )
+
+    _ensure_columns(engine, CodeExecution.metadata)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("code_executions")}
+    assert {"cache_key", "context_fingerprint"} <= columns
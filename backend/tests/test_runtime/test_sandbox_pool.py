@@ -0,0 +1,65 @@
+"""Tests for the pre-forked sandbox worker pool."""
+
+import os
+
+import pytest
+
+from backend.runtime.sandbox import SandboxExecutor
+from backend.runtime.sandbox_pool import SandboxPool, SandboxTimeout
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="sandbox limits require POSIX rlimits")
+
+
+@pytest.fixture()
+def pool():
+    pool = SandboxPool(size=1, memory_limit=64 * 1024 * 1024)
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+class TestSandboxPool:
+    """Test execution in warm worker processes."""
+
+    def test_runs_outside_api_process(self, pool):
+        result = pool.execute("import numpy as np\nresult = int(np.arange(5).sum())", {}, 5)
+        assert result["status"] == "success"
+        assert result["output"] == 10
+        assert os.getpid() not in pool.worker_pids()
+
+    def test_worker_is_reused_without_leaking_state(self, pool):
+        pid = pool.worker_pids()[0]
+        pool.execute("leaked = 1\nresult = 1", {}, 5)
+        result = pool.execute("result = leaked", {}, 5)
+        assert "NameError" in result["error_message"]
+        assert pool.worker_pids() == [pid]
+
+    def test_timeout_kills_and_replaces_worker(self, pool):
+        pid = pool.worker_pids()[0]
+        with pytest.raises(SandboxTimeout):
+            pool.execute("while True:\n    pass", {}, 0.5)
+
+        assert pool.worker_pids() != [pid]
+        assert pool.execute("result = 2 + 2", {}, 5)["output"] == 4
+
+    def test_memory_limit_is_enforced(self, pool):
+        result = pool.execute("import numpy as np\nresult = float(np.ones(64 * 1024 * 1024).sum())", {}, 5)
+        assert result["status"] == "error"
+        assert "MemoryError" in result["error_message"]
+
+    def test_context_and_dataframe_round_trip(self, pool):
+        result = pool.execute(
+            "import pandas as pd\nresult = pd.DataFrame({'cost': costs}).describe()",
+            {"costs": [1.0, 2.0, 3.0]},
+            5,
+        )
+        assert result["status"] == "success"
+        assert result["output"].loc["mean", "cost"] == 2.0
+
+
+def test_executor_reports_timeout():
+    executor = SandboxExecutor(timeout=1)
+    result = executor.execute("while True:\n    pass")
+    assert result.status == "error"
+    assert "timed out" in result.error_message
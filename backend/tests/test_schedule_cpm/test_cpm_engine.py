@@ -0,0 +1,121 @@
+"""Tests for the array-based CPM engine."""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend.services import cpm_engine
+from backend.services.cpm_engine import CycleError, ScheduleNetwork, WorkCalendar, compute_cpm
+
+FS_TASKS = [
+    {"id": "1", "start": "2026-01-01", "finish": "2026-01-06", "dependencies": []},
+    {"id": "2", "start": "2026-01-06", "finish": "2026-01-09", "dependencies": ["1"]},
+    {"id": "3", "start": "2026-01-06", "finish": "2026-01-16T12:00:00", "dependencies": ["1"]},
+    {"id": "4", "start": "bad", "finish": "2026-01-20", "dependencies": ["2", "3", "99"]},
+    {"id": "5", "start": "2026-01-01", "finish": "2026-01-01", "dependencies": []},
+]
+
+# Output of the original dictionary-based compute_critical_path for FS_TASKS.
+FS_EXPECTED = {
+    "1": (5, 0.0, 5.0, 0.0, 5.0, 0.0),
+    "5": (1, 0.0, 1.0, 15.0, 16.0, 15.0),
+    "2": (3, 5.0, 8.0, 12.0, 15.0, 7.0),
+    "3": (10, 5.0, 15.0, 5.0, 15.0, 0.0),
+    "4": (1, 15.0, 16.0, 15.0, 16.0, 0.0),
+}
+KEYS = ("duration", "earliest_start", "earliest_finish", "latest_start", "latest_finish", "slack")
+
+
+def _random_network(size, seed, relations):
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(size):
+        dependencies = []
+        for _ in range(rng.randint(0, 3) if index else 0):
+            pred = str(rng.randrange(index))
+            if relations:
+                dependencies.append({"id": pred, "type": rng.choice(cpm_engine.RELATION_TYPES), "lag": rng.randint(-3, 4)})
+            else:
+                dependencies.append(pred)
+        tasks.append({"id": str(index), "duration": rng.randint(1, 9), "dependencies": dependencies})
+    return tasks
+
+
+def test_matches_original_fs_results():
+    result = compute_cpm(FS_TASKS).to_dict()
+
+    assert list(result["tasks"]) == list(FS_EXPECTED)
+    for tid, expected in FS_EXPECTED.items():
+        assert tuple(result["tasks"][tid][key] for key in KEYS) == expected
+    assert result["critical_path"] == ["1", "3", "4"]
+    assert result["project_duration"] == 16.0
+
+
+def test_relationship_types_and_lags():
+    tasks = [
+        {"id": "A", "duration": 4},
+        {"id": "B", "duration": 3, "dependencies": [{"id": "A", "type": "SS", "lag": 2}]},
+        {"id": "C", "duration": 2, "dependencies": [{"id": "B", "type": "FF", "lag": 1}]},
+        {"id": "D", "duration": 5, "dependencies": [{"id": "A", "type": "SF", "lag": 1}]},
+        {"id": "E", "duration": 1, "dependencies": [{"id": "C", "type": "FS", "lag": -1}]},
+    ]
+
+    result = compute_cpm(tasks)
+    by_id = dict(zip(result.ids, zip(result.early_start, result.late_start, result.total_float)))
+
+    assert by_id == {"A": (0, 0, 0), "B": (2, 2, 0), "C": (4, 4, 0), "D": (0, 1, 1), "E": (5, 5, 0)}
+    assert result.project_duration == 6.0
+    assert result.critical_path == ["A", "B", "C", "E"]
+
+    with pytest.raises(ValueError):
+        compute_cpm([{"id": "A", "duration": 1}, {"id": "B", "duration": 1, "dependencies": [{"id": "A", "type": "XX"}]}])
+
+
+@pytest.mark.parametrize("relations", [False, True])
+def test_wave_and_edge_passes_agree(monkeypatch, relations):
+    network = ScheduleNetwork.from_tasks(_random_network(2000, seed=5, relations=relations))
+
+    monkeypatch.setattr(cpm_engine, "_MIN_MEAN_WAVE_WIDTH", 0)
+    by_wave = compute_cpm(network)
+    monkeypatch.setattr(cpm_engine, "_MIN_MEAN_WAVE_WIDTH", 10**9)
+    by_edge = compute_cpm(network)
+
+    assert by_wave.ids == by_edge.ids
+    for name in ("early_start", "late_start", "total_float"):
+        np.testing.assert_array_equal(getattr(by_wave, name), getattr(by_edge, name))
+    assert (by_wave.total_float >= -1e-9).all()
+
+
+def test_cycles_are_reported_or_raised():
+    tasks = [
+        {"id": "X", "duration": 1, "dependencies": ["Y"]},
+        {"id": "Y", "duration": 1, "dependencies": ["X"]},
+        {"id": "Z", "duration": 1, "dependencies": ["X"]},
+        {"id": "S", "duration": 1, "dependencies": ["S"]},
+        {"id": "W", "duration": 2},
+    ]
+
+    result = compute_cpm(tasks)
+    assert result.ids == ["W"]
+    assert sorted(result.cycles) == [["S"], ["X", "Y"]]
+    assert result.unscheduled == ["X", "Y", "Z", "S"]
+
+    with pytest.raises(CycleError) as excinfo:
+        compute_cpm(tasks, on_cycle="raise")
+    assert len(excinfo.value.cycles) == 2
+
+
+def test_calendar_durations_and_dates():
+    calendar = WorkCalendar(weekmask="1111001", holidays=("2026-01-05",))  # Sunday-Thursday week
+    tasks = [
+        {"id": "A", "start": "2026-01-01", "finish": "2026-01-08"},
+        {"id": "B", "duration": 2, "dependencies": ["A"]},
+    ]
+
+    result = compute_cpm(tasks, calendar=calendar, project_start="2026-01-01").to_dict()
+
+    assert result["tasks"]["A"]["duration"] == 4.0
+    assert result["tasks"]["A"]["early_finish_date"] == "2026-01-07"
+    assert result["tasks"]["B"]["early_start_date"] == "2026-01-08"
+    assert result["tasks"]["B"]["early_finish_date"] == "2026-01-11"
@@ -0,0 +1,137 @@
+"""Tests for the streaming MS Project XML reader."""
+
+import io
+
+import pytest
+
+from backend.services.cpm_engine import compute_cpm
+from backend.services.msp_xml_reader import (
+    MspFormatError,
+    MspXmlReader,
+    build_network,
+    duration_hours,
+    read_msp_xml,
+    schedule_tasks,
+)
+
+MSP_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Project xmlns="http://schemas.microsoft.com/project">
+  <Name>Diriyah Gate.xml</Name>
+  <MinutesPerDay>600</MinutesPerDay>
+  <CalendarUID>1</CalendarUID>
+  <Calendars>
+    <Calendar>
+      <UID>1</UID><Name>Site</Name><IsBaseCalendar>1</IsBaseCalendar><BaseCalendarUID>-1</BaseCalendarUID>
+      <WeekDays>
+        <WeekDay><DayType>6</DayType><DayWorking>0</DayWorking></WeekDay>
+        <WeekDay><DayType>7</DayType><DayWorking>0</DayWorking></WeekDay>
+        <WeekDay><DayType>1</DayType><DayWorking>1</DayWorking></WeekDay>
+      </WeekDays>
+      <Exceptions>
+        <Exception>
+          <TimePeriod><FromDate>2026-03-30T00:00:00</FromDate><ToDate>2026-04-01T23:59:00</ToDate></TimePeriod>
+          <DayWorking>0</DayWorking>
+        </Exception>
+      </Exceptions>
+    </Calendar>
+  </Calendars>
+  <Tasks>
+    <Task><UID>0</UID><ID>0</ID><Name>Diriyah Gate</Name><Summary>1</Summary><Duration>PT60H0M0S</Duration></Task>
+    <Task>
+      <UID>1</UID><ID>1</ID><Name>Excavation</Name><WBS>1.1</WBS><OutlineLevel>2</OutlineLevel>
+      <Start>2026-01-04T08:00:00</Start><Finish>2026-01-08T18:00:00</Finish>
+      <Duration>PT50H0M0S</Duration><Milestone>0</Milestone><Summary>0</Summary>
+    </Task>
+    <Task>
+      <UID>2</UID><ID>2</ID><Name>Piling</Name><WBS>1.2</WBS>
+      <Duration>PT30H0M0S</Duration><Summary>0</Summary>
+      <PredecessorLink><PredecessorUID>1</PredecessorUID><Type>1</Type><LinkLag>0</LinkLag></PredecessorLink>
+    </Task>
+    <Task>
+      <UID>3</UID><ID>3</ID><Name>Blinding</Name><WBS>1.3</WBS>
+      <Duration>PT20H0M0S</Duration><Summary>0</Summary>
+      <PredecessorLink><PredecessorUID>1</PredecessorUID><Type>3</Type><LinkLag>6000</LinkLag></PredecessorLink>
+    </Task>
+    <Task>
+      <UID>4</UID><ID>4</ID><Name>Foundations complete</Name><WBS>1.4</WBS>
+      <Duration>PT0H0M0S</Duration><Milestone>1</Milestone><Summary>0</Summary>
+      <PredecessorLink><PredecessorUID>2</PredecessorUID><Type>0</Type></PredecessorLink>
+      <PredecessorLink><PredecessorUID>3</PredecessorUID><Type>1</Type></PredecessorLink>
+      <PredecessorLink><PredecessorUID>77</PredecessorUID><Type>1</Type><CrossProject>1</CrossProject></PredecessorLink>
+      <PredecessorLink><PredecessorUID>0</PredecessorUID><Type>1</Type></PredecessorLink>
+    </Task>
+    <Task><UID>5</UID><IsNull>1</IsNull></Task>
+  </Tasks>
+  <Resources><Resource><UID>1</UID><Name>Crew A</Name></Resource></Resources>
+  <Assignments>
+    <Assignment><UID>1</UID><TaskUID>1</TaskUID><ResourceUID>1</ResourceUID><Units>2</Units><Work>PT100H0M0S</Work></Assignment>
+  </Assignments>
+</Project>
+"""
+
+
+def _source(text: str = MSP_XML):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_duration_hours():
+    assert duration_hours("PT40H0M0S") == 40
+    assert duration_hours("PT7H30M0S") == 7.5
+    assert duration_hours("P1DT2H") == 26
+    assert duration_hours("garbage") == 0
+    assert duration_hours(None) == 0
+
+
+def test_reads_namespaced_sections_in_one_pass():
+    project = read_msp_xml(_source())
+
+    assert project.name == "Diriyah Gate.xml"
+    assert project.minutes_per_day == 600
+    assert project.tasks["uid"].tolist() == ["0", "1", "2", "3", "4"]
+    assert project.tasks["duration_hours"].tolist() == [60, 50, 30, 20, 0]
+    assert str(project.tasks["start"].dtype).startswith("datetime64")
+    assert len(project.links) == 5  # the cross-project link is dropped
+    assert project.assignments.to_dict("records") == [
+        {"uid": 1, "task_uid": "1", "resource_uid": "1", "units": 2.0, "work_hours": 100.0}
+    ]
+    calendar = project.calendar
+    assert calendar.weekmask == "1111001"
+    assert calendar.to_work_calendar().holidays == ("2026-03-30", "2026-03-31", "2026-04-01")
+
+
+def test_unrequested_sections_are_skipped():
+    project = MspXmlReader(_source()).read(["Tasks"])
+
+    assert len(project.tasks) == 5
+    assert project.calendars == []
+    assert project.assignments.empty
+
+
+def test_non_namespaced_document_reads_the_same():
+    plain = MSP_XML.replace(' xmlns="http://schemas.microsoft.com/project"', "")
+
+    assert read_msp_xml(_source(plain)).tasks.equals(read_msp_xml(_source()).tasks)
+
+
+def test_network_and_cpm():
+    project = read_msp_xml(_source())
+    network = build_network(project)
+
+    assert network.ids == ["1", "2", "3", "4"]
+    assert network.durations.tolist() == [5.0, 3.0, 2.0, 0.0]
+    # 6000 tenths of a minute = 600 minutes = one 10-hour day; the summary-task link is dropped.
+    links = sorted(zip(network.pred.tolist(), network.succ.tolist(), network.rel_type.tolist(), network.lag.tolist()))
+    assert links == [(0, 1, 0, 0.0), (0, 2, 1, 1.0), (1, 3, 2, 0.0), (2, 3, 0, 0.0)]
+
+    result = compute_cpm(network).to_dict()
+    assert result["project_duration"] == 8
+    assert result["critical_path"] == ["1", "2", "4"]
+
+    tasks = schedule_tasks(project, network)
+    assert tasks[0]["start"] == "2026-01-04T08:00:00"
+    assert tasks[2]["dependencies"] == [{"id": "1", "type": "SS", "lag": 1.0}]
+
+
+def test_rejects_other_documents():
+    with pytest.raises(MspFormatError):
+        read_msp_xml(_source("<Workbook><Sheet/></Workbook>"))
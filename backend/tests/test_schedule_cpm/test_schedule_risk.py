@@ -0,0 +1,87 @@
+"""Tests for Monte Carlo schedule risk analysis."""
+
+import numpy as np
+import pytest
+
+from backend.runtime.function_registry import APPROVED_FUNCTIONS, schedule_risk_simulation
+from backend.services.cpm_engine import CycleError, ScheduleNetwork, compute_cpm
+from backend.services.schedule_risk import DurationEstimates, simulate_schedule
+
+TASKS = [
+    {"id": "A", "duration": 5, "dependencies": []},
+    {"id": "B", "duration": 3, "dependencies": ["A"]},
+    {"id": "C", "duration": 2, "dependencies": [{"id": "A", "type": "SS", "lag": 1}]},
+    {"id": "D", "duration": 4, "dependencies": ["B", {"id": "C", "type": "FF", "lag": 0}]},
+]
+
+
+def test_fixed_durations_match_cpm():
+    result = simulate_schedule(TASKS, iterations=50, default_range=(1.0, 1.0), seed=3)
+    cpm = compute_cpm(TASKS)
+
+    assert np.all(result.durations == cpm.project_duration)
+    assert result.percentiles == {50: 12.0, 80: 12.0, 90: 12.0}
+    criticality = dict(zip(result.ids, result.criticality.tolist()))
+    assert criticality == {tid: float(flag) for tid, flag in zip(cpm.ids, cpm.critical.tolist())}
+    assert result.probability_on_time == 1.0
+
+
+def test_batches_vectorise_the_same_passes():
+    # A wide random network: batched passes must agree with per-iteration CPM.
+    rng = np.random.default_rng(0)
+    tasks = [{"id": str(i), "duration": int(rng.integers(1, 10)), "dependencies": []} for i in range(300)]
+    for i in range(20, 300):
+        for pred in rng.choice(i, size=2, replace=False):
+            tasks[i]["dependencies"].append(
+                {"id": str(pred), "type": str(rng.choice(["FS", "SS", "FF", "SF"])), "lag": int(rng.integers(-1, 3))}
+            )
+    network = ScheduleNetwork.from_tasks(tasks)
+    estimates = DurationEstimates.from_durations(network.durations, (0.5, 2.0), "pert")
+
+    result = simulate_schedule(network, iterations=5, estimates=estimates, seed=7, batch_size=2)
+
+    # Replay the same draws (batches of 2 + 2 + 1) through the scalar engine.
+    draws = np.random.default_rng(7)
+    expected = []
+    for size in (2, 2, 1):
+        batch = estimates.sample(draws, size)
+        for column in range(size):
+            fixed = ScheduleNetwork(network.ids, batch[:, column], network.pred, network.succ, network.rel_type, network.lag)
+            expected.append(compute_cpm(fixed).project_duration)
+    assert np.allclose(result.durations, expected)
+
+
+def test_distribution_percentiles_and_dates():
+    tasks = [dict(task, optimistic=task["duration"] * 0.8, pessimistic=task["duration"] * 1.6) for task in TASKS]
+    result = simulate_schedule(tasks, iterations=4000, distribution="pert", seed=11, project_start="2026-01-04")
+
+    p50, p80, p90 = (result.percentiles[q] for q in (50, 80, 90))
+    assert 12.0 < p50 < p80 < p90 < 12.0 * 1.6
+    assert result.durations.min() >= 12.0 * 0.8
+    assert result.percentile_dates[90] >= result.percentile_dates[50] >= "2026-01-15"
+    assert result.deterministic_date == "2026-01-15"
+    assert result.criticality[result.ids.index("A")] == 1.0
+    assert simulate_schedule(tasks, iterations=200, seed=5).durations.tolist() == simulate_schedule(
+        tasks, iterations=200, seed=5
+    ).durations.tolist()
+
+
+def test_invalid_estimates_and_cycles():
+    with pytest.raises(ValueError):
+        simulate_schedule([{"id": "A", "duration": 4, "optimistic": 5}], iterations=10)
+    cyclic = TASKS + [{"id": "E", "duration": 1, "dependencies": ["F"]}, {"id": "F", "duration": 1, "dependencies": ["E"]}]
+    with pytest.raises(CycleError):
+        simulate_schedule(cyclic, iterations=10, on_cycle="raise")
+    result = simulate_schedule(cyclic, iterations=10, seed=1)
+    assert result.unscheduled == ["E", "F"] and "E" not in result.ids
+
+
+def test_registered_runtime_function():
+    assert "schedule_risk_simulation" in APPROVED_FUNCTIONS
+    output = schedule_risk_simulation(TASKS, iterations=500, seed=2, project_start="2026-01-04")
+
+    assert set(output["finish"]) == {"P50", "P80", "P90"}
+    assert "date" in output["finish"]["P80"]
+    assert output["criticality_index"]["A"] == 1.0
+    assert output["most_critical"][0]["criticality_index"] == 1.0
+    assert schedule_risk_simulation([]) == {"error": "No tasks provided"}
@@ -0,0 +1,108 @@
+"""Tests for the streaming XER reader."""
+
+import io
+
+import numpy as np
+import pytest
+
+from backend.services.cpm_engine import compute_cpm
+from backend.services.xer_reader import XerFormatError, XerReader, build_network, read_xer, schedule_tasks
+
+XER = "\n".join([
+    "ERMHDR\t19.12\t2026-01-01\tProject\tadmin\tadmin\tdbxDatabaseNoName\tProject Management\tUSD",
+    "%T\tCALENDAR",
+    "%F\tclndr_id\tclndr_name\tday_hr_cnt",
+    "%R\t1\tStandard 8h\t8",
+    "%R\t2\tSite 10h\t10",
+    "%T\tPROJWBS",
+    "%F\twbs_id\tproj_id\tparent_wbs_id\twbs_short_name\tproj_node_flag",
+    "%R\t100\t7\t\tDIR\tY",
+    "%R\t101\t7\t100\tCIV\tN",
+    "%R\t102\t7\t101\tFND\tN",
+    "%T\tTASK",
+    "%F\ttask_id\tproj_id\twbs_id\tclndr_id\ttask_code\ttask_name\ttask_type\ttarget_drtn_hr_cnt\ttarget_start_date\ttarget_end_date",
+    "%R\t1\t7\t102\t1\tA100\tExcavation\tTT_Task\t40\t2026-01-04 08:00\t2026-01-08 17:00",
+    "%R\t2\t7\t102\t2\tA110\tPiling\tTT_Task\t30\t2026-01-11 08:00\t2026-01-13 17:00",
+    "%R\t3\t7\t101\t1\tA120\tBlinding\tTT_Task\t16\t2026-01-06 08:00\t2026-01-07 17:00",
+    "%R\t4\t7\t101\t1\tM900\tFoundations complete\tTT_FinMile\t0\t\t2026-01-14 17:00",
+    "%T\tTASKRSRC",
+    "%F\ttaskrsrc_id\ttask_id\trsrc_id\ttarget_qty",
+    "%R\t1\t1\t55\t40",
+    "%T\tTASKPRED",
+    "%F\ttask_pred_id\ttask_id\tpred_task_id\tpred_type\tlag_hr_cnt",
+    "%R\t10\t2\t1\tPR_FS\t0",
+    "%R\t11\t3\t1\tPR_SS\t8",
+    "%R\t12\t4\t2\tPR_FF\t0",
+    "%R\t13\t4\t3\tPR_FS\t0",
+    "%R\t14\t4\t999\tPR_FS\t0",
+    "%E",
+    "",
+])
+
+
+def test_tables_are_typed_and_selectable():
+    tables = XerReader(io.StringIO(XER)).read(["TASK", "TASKPRED"])
+
+    assert set(tables) == {"TASK", "TASKPRED"}
+    task = tables["TASK"]
+    assert len(task) == 4
+    assert task.column("task_id").dtype == np.int64
+    assert task.column("target_drtn_hr_cnt").tolist() == [40, 30, 16, 0]
+    assert str(task.frame["target_start_date"].dtype).startswith("datetime64")
+    assert task.frame["target_start_date"].isna().tolist() == [False, False, False, True]
+    assert task.column("task_code").tolist() == ["A100", "A110", "A120", "M900"]
+
+
+def test_trailing_tabs_are_ignored():
+    lines = [line + "\t" if line.startswith("%R") else line for line in XER.split("\n")]
+    tables = XerReader(io.StringIO("\n".join(lines))).read(["TASK"])
+
+    assert tables["TASK"].column("task_code").tolist() == ["A100", "A110", "A120", "M900"]
+    assert tables["TASK"].column("target_drtn_hr_cnt").tolist() == [40, 30, 16, 0]
+
+
+def test_reading_stops_after_requested_tables():
+    class CountingLines(io.StringIO):
+        consumed = 0
+
+        def __next__(self):
+            CountingLines.consumed += 1
+            return super().__next__()
+
+    source = CountingLines(XER)
+    tables = XerReader(source).read(["CALENDAR"])
+
+    assert list(tables) == ["CALENDAR"]
+    assert CountingLines.consumed < 7
+
+
+def test_small_chunks_give_same_frame():
+    whole = XerReader(io.StringIO(XER)).read(["TASKPRED"])["TASKPRED"].frame
+    chunked = XerReader(io.StringIO(XER), chunk_rows=2).read(["TASKPRED"])["TASKPRED"].frame
+
+    assert whole.equals(chunked)
+
+
+def test_network_uses_calendars_relations_and_lags():
+    tables = read_xer(io.StringIO(XER))
+    network = build_network(tables)
+
+    assert network.ids == ["1", "2", "3", "4"]
+    np.testing.assert_allclose(network.durations, [5.0, 3.0, 2.0, 0.0])
+    assert network.pred.tolist() == [0, 0, 1, 2]  # the link to task 999 is external
+    assert network.rel_type.tolist() == [0, 1, 2, 0]
+    np.testing.assert_allclose(network.lag, [0.0, 1.0, 0.0, 0.0])
+
+    result = compute_cpm(network)
+    assert result.project_duration == 8.0
+    assert result.critical_path == ["1", "2", "4"]
+
+    tasks = schedule_tasks(tables, network)
+    assert tasks[1]["wbs"] == "CIV.FND"
+    assert tasks[1]["start"] == "2026-01-11 08:00"
+    assert tasks[3]["dependencies"] == [{"id": "2", "type": "FF", "lag": 0.0}, {"id": "3", "type": "FS", "lag": 0.0}]
+
+
+def test_malformed_file():
+    with pytest.raises(XerFormatError):
+        XerReader(io.StringIO("%F\ta\tb\n%R\t1\t2\n")).read()
@@ -0,0 +1,129 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from backend.api.ops_streams import get_stream_retention, router as ops_streams_router
+from backend.redisx.retention import (
+    StreamArchive,
+    StreamRetention,
+    StreamRetentionPolicy,
+    parse_stream_id,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture()
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _fill(redis_client, stream: str, count: int) -> list[str]:
+    return [redis_client.xadd(stream, {"n": str(i)}) for i in range(count)]
+
+
+def _retention(redis_client, tmp_path, **policy_kwargs) -> StreamRetention:
+    policies = [
+        StreamRetentionPolicy(pattern="events:global", approximate=False, **policy_kwargs),
+        StreamRetentionPolicy(pattern="events:workspace:*", approximate=False, **policy_kwargs),
+    ]
+    return StreamRetention(
+        redis_client=redis_client,
+        policies=policies,
+        archive=StreamArchive(tmp_path),
+        batch_size=7,
+    )
+
+
+def test_trim_by_maxlen_archives_trimmed_range(redis_client, tmp_path):
+    ids = _fill(redis_client, "events:global", 50)
+    retention = _retention(redis_client, tmp_path, maxlen=20)
+
+    result = retention.trim_stream("events:global")
+
+    assert result.archived == 30
+    assert redis_client.xlen("events:global") == 20
+    assert redis_client.xrange("events:global", count=1)[0][0] == ids[30]
+    archived = list(retention.archive.iter_entries("events:global"))
+    assert [entry_id for entry_id, _ in archived] == ids[:30]
+    assert archived[0][1] == {"n": "0"}
+
+
+def test_trim_never_drops_unacknowledged_entries(redis_client, tmp_path):
+    ids = _fill(redis_client, "events:global", 30)
+    redis_client.xgroup_create("events:global", "events", id="0")
+    delivered = redis_client.xreadgroup("events", "c1", {"events:global": ">"}, count=10)
+    delivered_ids = [entry_id for entry_id, _ in delivered[0][1]]
+    redis_client.xack("events:global", "events", *delivered_ids[:4])
+    retention = _retention(redis_client, tmp_path, maxlen=5)
+
+    assert retention.ack_floor("events:global") == ids[4]
+    result = retention.trim_stream("events:global")
+
+    assert result.archived == 4
+    remaining = [entry_id for entry_id, _ in redis_client.xrange("events:global")]
+    assert remaining[0] == ids[4]
+    assert redis_client.xpending("events:global", "events")["pending"] == 6
+
+
+def test_ack_floor_covers_undelivered_entries(redis_client, tmp_path):
+    ids = _fill(redis_client, "jobs:main", 10)
+    redis_client.xgroup_create("jobs:main", "workers", id="0")
+    delivered = redis_client.xreadgroup("workers", "c1", {"jobs:main": ">"}, count=3)
+    redis_client.xack("jobs:main", "workers", *[entry_id for entry_id, _ in delivered[0][1]])
+    retention = StreamRetention(
+        redis_client=redis_client,
+        policies=[StreamRetentionPolicy(pattern="jobs:main", maxlen=1, approximate=False)],
+        archive=StreamArchive(tmp_path),
+    )
+
+    result = retention.trim_stream("jobs:main")
+
+    assert parse_stream_id(ids[2]) < parse_stream_id(result.ack_floor) <= parse_stream_id(ids[3])
+    assert redis_client.xrange("jobs:main", count=1)[0][0] == ids[3]
+
+
+def test_repeat_sweep_does_not_rearchive(redis_client, tmp_path):
+    _fill(redis_client, "events:workspace:1", 12)
+    _fill(redis_client, "events:workspace:2", 3)
+    retention = _retention(redis_client, tmp_path, maxlen=5)
+
+    first = {result.stream: result.archived for result in retention.sweep()}
+    second = {result.stream: result.archived for result in retention.sweep()}
+
+    assert first == {"events:workspace:1": 7, "events:workspace:2": 0}
+    assert second == {"events:workspace:1": 0, "events:workspace:2": 0}
+    assert len(list(retention.archive.iter_entries("events:workspace:1"))) == 7
+
+
+def test_trim_by_age(redis_client, tmp_path):
+    for ms in (1000, 2000, 3000, 9000):
+        redis_client.xadd("events:global", {"n": str(ms)}, id=f"{ms}-0")
+    retention = _retention(redis_client, tmp_path, max_age_seconds=5)
+    retention._time_fn = lambda: 10.0
+
+    retention.trim_stream("events:global")
+
+    assert [parse_stream_id(entry_id)[0] for entry_id, _ in redis_client.xrange("events:global")] == [9000]
+
+
+def test_metrics_endpoint_reports_pel_and_lag(redis_client, tmp_path):
+    _fill(redis_client, "events:global", 8)
+    redis_client.xgroup_create("events:global", "events", id="0")
+    redis_client.xreadgroup("events", "c1", {"events:global": ">"}, count=3)
+    retention = _retention(redis_client, tmp_path, maxlen=100)
+
+    app = FastAPI()
+    app.include_router(ops_streams_router, prefix="/api")
+    app.dependency_overrides[get_stream_retention] = lambda: retention
+    client = TestClient(app)
+
+    response = client.get("/api/ops/streams")
+    assert response.status_code == 200
+    (metrics,) = response.json()
+    assert metrics["stream"] == "events:global"
+    assert metrics["length"] == 8
+    assert metrics["pending_total"] == 3
+    assert metrics["groups"][0]["lag"] == 5
+
+    assert client.get("/api/ops/streams/events:workspace:404").status_code == 404
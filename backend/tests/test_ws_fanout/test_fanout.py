@@ -0,0 +1,165 @@
+"""Tests for the sharded WebSocket fan-out hub and the alerts socket."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api import alerts_ws
+from backend.redisx.fanout import (
+    ALL_TOPICS,
+    BROADCAST_TOPIC,
+    CLOSE_TRY_AGAIN_LATER,
+    FanoutHub,
+    shard_for,
+    topics_for,
+    user_topic,
+    workspace_topic,
+)
+
+
+class FakeSocket:
+    def __init__(self, delay=0.0, block=False):
+        self.delay = delay
+        self.block = block
+        self.received = []
+        self.closed_with = None
+
+    async def send_json(self, message):
+        if self.block:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(message)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+async def _settle(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def test_slow_socket_is_dropped_without_stalling_others():
+    async def scenario():
+        hub = FanoutHub(namespace="t", redis_url="", queue_size=3, send_timeout=5)
+        fast = [FakeSocket() for _ in range(20)]
+        slow = FakeSocket(block=True)
+        for socket in fast + [slow]:
+            await hub.connect(socket, topics_for(workspace_id=1))
+        other = FakeSocket()
+        await hub.connect(other, topics_for(workspace_id=2))
+
+        for index in range(10):
+            await hub.publish(workspace_topic(1), {"n": index})
+            await asyncio.sleep(0.001)  # fast senders keep up; the blocked one fills its queue
+        await hub.publish(BROADCAST_TOPIC, {"n": "all"})
+        await _settle(lambda: all(len(socket.received) == 11 for socket in fast))
+
+        assert fast[0].received[-1] == {"n": "all"}
+        assert other.received == [{"n": "all"}]
+        assert slow.closed_with == CLOSE_TRY_AGAIN_LATER
+        assert hub.stats.dropped == 1 and hub.connection_count == 21
+        await hub.close()
+
+    asyncio.run(scenario())
+
+
+def test_messages_cross_replicas_through_sharded_channels():
+    fakeredis = pytest.importorskip("fakeredis")
+    aioredis = pytest.importorskip("fakeredis.aioredis")
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        replica_a, replica_b = (
+            FanoutHub(namespace="t", redis_client=aioredis.FakeRedis(server=server, decode_responses=True), shards=8)
+            for _ in range(2)
+        )
+        alice, bob, watcher = FakeSocket(), FakeSocket(), FakeSocket()
+        alice_conn = await replica_b.connect(alice, topics_for(user_id="alice"))
+        await replica_b.connect(bob, topics_for(user_id="bob"))
+        await replica_a.connect(watcher, [ALL_TOPICS])
+        assert replica_b._subscribed == {
+            shard_for(user_topic("alice"), 8),
+            shard_for(user_topic("bob"), 8),
+            shard_for(BROADCAST_TOPIC, 8),
+        }
+        assert replica_a._subscribed == set(range(8))
+
+        await replica_a.publish(user_topic("alice"), {"alert": 1})
+        await replica_a.publish(BROADCAST_TOPIC, {"alert": 2})
+        await _settle(lambda: len(alice.received) == 2 and len(watcher.received) == 2)
+        assert bob.received == [{"alert": 2}]
+
+        replica_b.disconnect(alice_conn)
+        still_needed = {shard_for(user_topic("bob"), 8), shard_for(BROADCAST_TOPIC, 8)}
+        await _settle(lambda: replica_b._subscribed == still_needed)
+        await replica_a.publish(user_topic("alice"), {"alert": 3})
+        await _settle(lambda: len(watcher.received) == 3)
+        assert len(alice.received) == 2
+        await replica_a.close()
+        await replica_b.close()
+
+    asyncio.run(scenario())
+
+
+def test_multi_topic_message_reaches_each_socket_once():
+    fakeredis = pytest.importorskip("fakeredis")
+    aioredis = pytest.importorskip("fakeredis.aioredis")
+    user, workspace = user_topic("alice"), workspace_topic(7)
+    shards = next(count for count in range(2, 64) if shard_for(user, count) != shard_for(workspace, count))
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        replica_a, replica_b = (
+            FanoutHub(namespace="t", redis_client=aioredis.FakeRedis(server=server, decode_responses=True), shards=shards)
+            for _ in range(2)
+        )
+        both, alice, site, watcher = FakeSocket(), FakeSocket(), FakeSocket(), FakeSocket()
+        await replica_b.connect(both, topics_for(user_id="alice", workspace_id=7))
+        await replica_b.connect(alice, topics_for(user_id="alice"))
+        await replica_a.connect(site, topics_for(workspace_id=7))
+        await replica_a.connect(watcher, [ALL_TOPICS])
+
+        await replica_a.publish([user, workspace], {"alert": 1})
+        await replica_a.publish(BROADCAST_TOPIC, {"alert": 2})
+        sockets = (both, alice, site, watcher)
+        await _settle(lambda: all(len(socket.received) >= 2 for socket in sockets))
+        await asyncio.sleep(0.1)
+        assert [socket.received for socket in sockets] == [[{"alert": 1}, {"alert": 2}]] * 4
+        await replica_a.close()
+        await replica_b.close()
+
+        local = FanoutHub(namespace="t", redis_url="")
+        single = FakeSocket()
+        await local.connect(single, topics_for(user_id="alice", workspace_id=7))
+        assert local.deliver([user, workspace], {"alert": 3}) == 1
+        await local.close()
+
+    asyncio.run(scenario())
+
+
+def test_alert_socket_filters_by_workspace(monkeypatch):
+    monkeypatch.setattr(alerts_ws, "hub", FanoutHub(namespace="alerts", redis_url=""))
+    app = FastAPI()
+    app.include_router(alerts_ws.router, prefix="/api")
+    client = TestClient(app)
+
+    assert alerts_ws.alert_topics({"project_id": 7}) == [workspace_topic(7)]
+    assert alerts_ws.alert_topics({"project_id": 0}) == [BROADCAST_TOPIC]
+    assert alerts_ws.alert_topics({"user_id": "u1", "workspace_id": 7}) == [user_topic("u1"), workspace_topic(7)]
+    with client.websocket_connect("/api/ws/alerts?workspace_id=7") as websocket:
+        deadline = time.monotonic() + 2
+        while alerts_ws.hub.connection_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        alerts_ws.enqueue_alert({"project_id": 8, "message": "other site"})
+        alerts_ws.enqueue_alert({"project_id": 7, "message": "crane wind"})
+        alerts_ws.enqueue_alert({"project_id": 0, "message": "deploy approved"})
+        assert websocket.receive_json()["message"] == "crane wind"
+        assert websocket.receive_json()["message"] == "deploy approved"
@@ -0,0 +1,99 @@
+"""Benchmark compliance checking against a large governance rulebook.
+
+Generates a rulebook of rules with required and forbidden phrases and a long
+contract-like document, then times a per-phrase substring scan (the previous
+implementation), compiling the rulebook, a single check with the compiled
+automaton and a batch of documents against the cached rulebook.
+
+Usage:
+    python scripts/bench_compliance_monitor.py --rules 2000 --pages 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.compliance_monitor import CompiledRulebook, check_compliance_batch  # noqa: E402
+
+VOCABULARY = (
+    "contractor employer engineer shall submit approve method statement risk assessment permit work height "
+    "lifting plan crane scaffold excavation shoring concrete pour cube test inspection handover defects "
+    "liability period retention bond insurance indemnity variation instruction claim notice days calendar "
+    "programme baseline critical path delay damages extension time force majeure suspension termination "
+    "payment certificate valuation interim final account dispute adjudication arbitration"
+).split()
+
+
+def rulebook(rules: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+
+    def phrase() -> str:
+        return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 4)))
+
+    return [
+        {
+            "id": f"GOV-{index:05d}",
+            "severity": rng.choice(["low", "medium", "high"]),
+            "required_phrases": [phrase() for _ in range(rng.randint(1, 3))],
+            "forbidden_phrases": [phrase() for _ in range(rng.randint(0, 2))],
+        }
+        for index in range(rules)
+    ]
+
+
+def document(pages: int, seed: int) -> str:
+    rng = random.Random(seed)
+    words_per_page = 500
+    return " ".join(rng.choice(VOCABULARY) for _ in range(pages * words_per_page))
+
+
+def naive_check(text: str, rules: List[Dict[str, Any]]) -> int:
+    lowered = text.lower()
+    hits = 0
+    for rule in rules:
+        for phrase in rule["required_phrases"] + rule["forbidden_phrases"]:
+            hits += phrase.lower() in lowered
+    return hits
+
+
+def timed(label: str, func) -> Any:
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<36} {time.perf_counter() - start:7.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=2_000)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--documents", type=int, default=10, help="documents in the batch run")
+    args = parser.parse_args()
+
+    rules = rulebook(args.rules, seed=1)
+    text = document(args.pages, seed=2)
+    phrases = sum(len(rule["required_phrases"]) + len(rule["forbidden_phrases"]) for rule in rules)
+    print(f"{len(rules):,} rules, {phrases:,} phrases, document {len(text) / 1e6:.1f}M characters")
+
+    timed("per-phrase substring scan", lambda: naive_check(text, rules))
+    compiled = timed("compile rulebook", lambda: CompiledRulebook(rules))
+    print(f"{'':<36} {compiled.automaton.states:,} automaton states")
+    findings = timed("compiled check (cold transitions)", lambda: compiled.check(text))
+    timed("compiled check (warm)", lambda: compiled.check(text))
+    violations = sum(finding["status"] != "compliant" for finding in findings)
+    print(f"{'':<36} {violations:,} rules not compliant")
+
+    documents = [document(args.pages // args.documents or 1, seed=10 + index) for index in range(args.documents)]
+    timed(f"batch of {args.documents} documents", lambda: check_compliance_batch(documents, rules, version="bench"))
+    timed("word boundaries + arabic", lambda: CompiledRulebook(rules, word_boundaries=True, normalize_arabic=True).check(text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark the array CPM engine against the original dictionary implementation.
+
+Builds a layered finish-to-start network, checks that the engine reproduces
+the original ``compute_critical_path`` results on it, then times both and
+the engine on a mixed-relationship network.
+
+Usage:
+    python scripts/bench_cpm.py --activities 100000 --layers 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from datetime import date, datetime, timedelta
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.cpm_engine import ScheduleNetwork, compute_cpm  # noqa: E402
+
+
+def legacy_compute_critical_path(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The pre-engine ``schedule_metrics.compute_critical_path``, kept for comparison."""
+
+    def parse(value: str) -> datetime:
+        for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"):
+            try:
+                return datetime.strptime(value, fmt)
+            except Exception:
+                continue
+        raise ValueError(value)
+
+    task_map = {t["id"]: t for t in tasks}
+    durations: Dict[str, float] = {}
+    for t in tasks:
+        try:
+            dur = (parse(t.get("finish", "")) - parse(t.get("start", ""))).days
+            durations[t["id"]] = dur if dur > 0 else 1
+        except Exception:
+            durations[t["id"]] = 1
+    successors: Dict[str, List[str]] = {tid: [] for tid in task_map}
+    predecessors: Dict[str, List[str]] = {tid: [] for tid in task_map}
+    for t in tasks:
+        for pred in t.get("dependencies", []):
+            if pred in task_map:
+                predecessors[t["id"]].append(pred)
+                successors[pred].append(t["id"])
+    queue = deque(tid for tid, preds in predecessors.items() if not preds)
+    order: List[str] = []
+    while queue:
+        tid = queue.popleft()
+        order.append(tid)
+        for succ in successors[tid]:
+            predecessors[succ].remove(tid)
+            if not predecessors[succ]:
+                queue.append(succ)
+    es: Dict[str, float] = {}
+    ef: Dict[str, float] = {}
+    for tid in order:
+        preds = task_map[tid].get("dependencies", [])
+        es[tid] = max(ef[p] for p in preds if p in ef) if preds else 0.0
+        ef[tid] = es[tid] + durations[tid]
+    project_duration = max(ef.values()) if ef else 0.0
+    lf: Dict[str, float] = {}
+    ls: Dict[str, float] = {}
+    for tid, succs in successors.items():
+        if not succs:
+            lf[tid] = project_duration
+            ls[tid] = project_duration - durations[tid]
+    for tid in reversed(order):
+        if tid not in lf:
+            lf[tid] = min(ls[s] for s in successors[tid])
+            ls[tid] = lf[tid] - durations[tid]
+    per_task = {
+        tid: {
+            "duration": durations[tid],
+            "earliest_start": es[tid],
+            "earliest_finish": ef[tid],
+            "latest_start": ls[tid],
+            "latest_finish": lf[tid],
+            "slack": ls[tid] - es[tid],
+        }
+        for tid in order
+    }
+    critical = [tid for tid in order if abs(per_task[tid]["slack"]) < 1e-6]
+    return {"tasks": per_task, "critical_path": critical, "project_duration": project_duration}
+
+
+def layered_network(activities: int, layers: int, seed: int, relations: bool = False) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    width = max(1, activities // layers)
+    origin = date(2026, 1, 1)
+    tasks: List[Dict[str, Any]] = []
+    for index in range(activities):
+        layer = index // width
+        start = origin + timedelta(days=rng.randint(0, 30))
+        dependencies: List[Any] = []
+        if layer:
+            for _ in range(rng.randint(1, 3)):
+                pred = f"A{(layer - 1) * width + rng.randrange(width)}"
+                if relations:
+                    dependencies.append({"id": pred, "type": rng.choice(("FS", "SS", "FF", "SF")), "lag": rng.randint(-2, 5)})
+                else:
+                    dependencies.append(pred)
+        tasks.append({
+            "id": f"A{index}",
+            "start": start.isoformat(),
+            "finish": (start + timedelta(days=rng.randint(1, 20))).isoformat(),
+            "dependencies": dependencies,
+        })
+    return tasks
+
+
+def _same(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    if list(old["tasks"]) != list(new["tasks"]) or old["critical_path"] != new["critical_path"]:
+        return False
+    if not math.isclose(old["project_duration"], new["project_duration"]):
+        return False
+    return all(
+        math.isclose(value, new["tasks"][tid][key], abs_tol=1e-9)
+        for tid, metrics in old["tasks"].items()
+        for key, value in metrics.items()
+    )
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<44} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--activities", type=int, default=100_000)
+    parser.add_argument("--layers", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    tasks = layered_network(args.activities, args.layers, args.seed)
+    network = _timed("build network (parse dates, index edges)", lambda: ScheduleNetwork.from_tasks(tasks))
+    new = _timed("engine passes (FS)", lambda: compute_cpm(network))
+    print(f"  {network.size:,} activities, {network.pred.size:,} relationships, "
+          f"duration {new.project_duration:.0f} days, {int(new.critical.sum()):,} critical")
+    if not args.skip_legacy:
+        old = _timed("original compute_critical_path", lambda: legacy_compute_critical_path(tasks))
+        print("results match original:", _same(old, new.to_dict()))
+
+    mixed = ScheduleNetwork.from_tasks(layered_network(args.activities, args.layers, args.seed, relations=True))
+    _timed("engine passes (FS/SS/FF/SF with lags)", lambda: compute_cpm(mixed))
+    chain = ScheduleNetwork.from_tasks(layered_network(args.activities, args.activities, args.seed))
+    _timed("engine passes (single chain)", lambda: compute_cpm(chain))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark projection replay throughput.
+
+Usage:
+    python scripts/bench_event_replay.py --events 200000
+    DATABASE_URL=postgresql://... python scripts/bench_event_replay.py --url "$DATABASE_URL"
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import sys
+import tempfile
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+from backend.backend.db import Base  # noqa: E402
+from backend.events.models import EventLog, EventOffset, WorkspaceStateProjection  # noqa: E402
+from backend.events.replay import EventLogSource, ProjectionReplayer  # noqa: E402
+
+_EVENT_TYPES = ("hydration.completed", "learning.dataset.exported", "regression.promoted", "hydration.started")
+
+
+def _seed(engine, count: int, workspaces: int) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    with engine.begin() as connection:
+        connection.execute(EventLog.__table__.delete())
+        for i in range(count):
+            rows.append(
+                {
+                    "event_id": str(uuid.uuid4()),
+                    "event_type": _EVENT_TYPES[i % len(_EVENT_TYPES)],
+                    "ts": (start + timedelta(milliseconds=i)).isoformat(),
+                    "workspace_id": i % workspaces,
+                    "actor_id": None,
+                    "correlation_id": None,
+                    "source": "bench",
+                    "payload_json": json.dumps({"job_id": f"job-{i}"}),
+                }
+            )
+            if len(rows) == 10_000:
+                connection.execute(insert(EventLog.__table__), rows)
+                rows = []
+        if rows:
+            connection.execute(insert(EventLog.__table__), rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--workspaces", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--url", default=None, help="Database URL (defaults to a temporary SQLite file).")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_replay.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(
+        engine,
+        tables=[EventLog.__table__, EventOffset.__table__, WorkspaceStateProjection.__table__],
+    )
+    _seed(engine, args.events, args.workspaces)
+
+    replayer = ProjectionReplayer(
+        source=EventLogSource(engine, batch_size=args.batch_size),
+        bind=engine,
+    )
+    result = replayer.run(resume=False)
+    print(json.dumps(result.to_dict(), indent=2))
+    replayer.swap()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Benchmark the vectorised function registry against the row-by-row originals.
+
+Checks that every vectorised function returns the same result as the
+original list-of-dicts implementation (kept here for reference), then times
+both, plus the batched and correlated Monte Carlo paths.
+
+Usage:
+    python scripts/bench_function_registry.py --items 100000 --projects 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.runtime import function_registry as registry  # noqa: E402
+
+
+def legacy_boq_quantity_check(boq_items: List[Dict[str, Any]], specs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    specs = specs or {}
+    total_items = len(boq_items)
+    total_quantity = sum(item.get("quantity", 0) for item in boq_items)
+    total_cost = sum(item.get("quantity", 0) * item.get("unit_cost", 0) for item in boq_items)
+    items_over = items_under = 0
+    variance_details = []
+    for item in boq_items:
+        item_id = item.get("id", item.get("description", "unknown"))
+        spec_qty = specs.get(str(item_id), {}).get("quantity")
+        if spec_qty is not None:
+            qty = item.get("quantity", 0)
+            variance = qty - spec_qty
+            if variance > 0:
+                items_over += 1
+            elif variance < 0:
+                items_under += 1
+            if len(variance_details) < 10:
+                variance_details.append({
+                    "item_id": item_id,
+                    "quantity": qty,
+                    "spec_quantity": spec_qty,
+                    "variance": variance,
+                    "variance_pct": (variance / spec_qty * 100) if spec_qty > 0 else 0,
+                })
+    return {
+        "total_items": total_items,
+        "total_quantity": total_quantity,
+        "total_cost": total_cost,
+        "items_over_spec": items_over,
+        "items_under_spec": items_under,
+        "items_on_spec": total_items - items_over - items_under,
+        "variance_details": variance_details,
+    }
+
+
+def legacy_pnl_attribution(cost_data: Dict[str, float], categories: Optional[List[str]] = None) -> Dict[str, Any]:
+    if categories:
+        cost_data = {k: v for k, v in cost_data.items() if k in categories}
+    total = sum(cost_data.values())
+    impacts = [
+        {
+            "category": category,
+            "value": value,
+            "percentage": round(value / total * 100, 2) if total != 0 else 0,
+            "impact": "positive" if value > 0 else "negative",
+        }
+        for category, value in sorted(cost_data.items(), key=lambda x: abs(x[1]), reverse=True)
+    ]
+    return {
+        "total_variance": total,
+        "category_count": len(impacts),
+        "category_impacts": impacts,
+        "top_positive_contributors": [c for c in impacts if c["value"] > 0][:3],
+        "top_negative_contributors": [c for c in impacts if c["value"] < 0][:3],
+    }
+
+
+def legacy_sensitivity_analysis(base_value: float, variables: Dict[str, float], impact_percentages=None) -> Dict[str, Any]:
+    impact_percentages = impact_percentages or [-20, -10, 0, 10, 20]
+    results = {}
+    for name, weight in variables.items():
+        impacts = []
+        for pct in impact_percentages:
+            change = base_value * (pct / 100) * weight
+            impacts.append({
+                "percentage_change": pct,
+                "new_value": round(base_value + change, 2),
+                "absolute_change": round(change, 2),
+            })
+        results[name] = {"weight": weight, "impacts": impacts}
+    return {
+        "base_value": base_value,
+        "variables_analyzed": len(variables),
+        "impact_percentages": impact_percentages,
+        "results": results,
+    }
+
+
+def _close(a: Any, b: Any) -> bool:
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_close(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+
+def _time(label: str, fn, repeat: int = 3) -> Any:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.2f} ms")
+    return result
+
+
+def _check(name: str, old: Any, new: Any) -> None:
+    status = "ok" if _close(old, new) else "MISMATCH"
+    print(f"{name:<40} {status}")
+    if status != "ok":
+        raise SystemExit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(7)
+
+    items = [
+        {"id": f"I{i}", "quantity": int(q), "unit_cost": float(c)}
+        for i, (q, c) in enumerate(zip(rng.integers(1, 500, args.items), rng.uniform(5, 900, args.items)))
+    ]
+    specs = {f"I{i}": {"quantity": int(q)} for i, q in enumerate(rng.integers(1, 500, args.items // 10))}
+    columns = {
+        "id": np.array([item["id"] for item in items], dtype=object),
+        "quantity": np.array([item["quantity"] for item in items]),
+        "unit_cost": np.array([item["unit_cost"] for item in items]),
+    }
+    costs = {f"cat{i}": float(v) for i, v in enumerate(rng.normal(0, 1e5, 5_000))}
+    variables = {f"v{i}": float(w) for i, w in enumerate(rng.uniform(0.1, 1.0, 50))}
+
+    print("== equivalence ==")
+    _check("boq_quantity_check", legacy_boq_quantity_check(items, specs), registry.boq_quantity_check(items, specs))
+    _check("pnl_attribution", legacy_pnl_attribution(costs), registry.pnl_attribution(costs))
+    _check("sensitivity_analysis", legacy_sensitivity_analysis(1e6, variables), registry.sensitivity_analysis(1e6, variables))
+    bases = rng.uniform(1e5, 1e7, args.projects).tolist()
+    batch = registry.evaluate_batch(
+        "sensitivity_analysis", [{"base_value": b, "variables": variables} for b in bases]
+    )
+    _check("sensitivity_analysis batch", [legacy_sensitivity_analysis(b, variables) for b in bases], batch)
+
+    print("== timings (best of 3) ==")
+    _time("boq legacy (rows)", lambda: legacy_boq_quantity_check(items, specs))
+    _time("boq vectorised (rows)", lambda: registry.boq_quantity_check(items, specs))
+    _time("boq vectorised (columns)", lambda: registry.boq_quantity_check(columns, specs))
+    _time("pnl legacy", lambda: legacy_pnl_attribution(costs))
+    _time("pnl vectorised", lambda: registry.pnl_attribution(costs))
+    _time(
+        f"sensitivity legacy x{args.projects}",
+        lambda: [legacy_sensitivity_analysis(b, variables) for b in bases],
+    )
+    _time(f"sensitivity_analysis_batch x{args.projects}", lambda: registry.sensitivity_analysis_batch(bases, variables))
+
+    correlation = [[1.0, 0.6, 0.3], [0.6, 1.0, 0.5], [0.3, 0.5, 1.0]]
+    result = _time(
+        f"correlated_monte_carlo {args.iterations:,}",
+        lambda: registry.correlated_monte_carlo(
+            [1e6, 4e5, 2e5], [1e5, 6e4, 5e4], correlation, iterations=args.iterations, seed=42
+        ),
+        repeat=1,
+    )
+    print(
+        f"  mean {result['mean']:.0f} (expected {result['expected_mean']:.0f})  "
+        f"std {result['std']:.0f} (expected {result['expected_std']:.0f})  "
+        f"P10 {result['percentile_10']:.0f}  P90 {result['percentile_90']:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
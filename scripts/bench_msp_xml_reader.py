@@ -0,0 +1,132 @@
+"""Benchmark the streaming MS Project XML reader on a synthetic export.
+
+Writes a namespaced MSP XML file of roughly ``--size-mb`` megabytes (tasks
+with predecessor links, then assignments), and reads it in a fresh process
+per scenario, reporting wall time and peak RSS. ``--dom`` adds the old
+``ET.parse`` approach for comparison; expect it to need several times the
+file size in memory.
+
+Usage:
+    python scripts/bench_msp_xml_reader.py --size-mb 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+NAMESPACE = "http://schemas.microsoft.com/project"
+
+
+def write_msp_xml(path: str, size_mb: int, seed: int = 5) -> int:
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    # Roughly two thirds of the file is tasks, the rest assignments.
+    activities = max(10, int(target * 0.66) // 900)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<Project xmlns="{NAMESPACE}">\n')
+        handle.write("<Name>Synthetic</Name><MinutesPerDay>480</MinutesPerDay><CalendarUID>1</CalendarUID>\n")
+        handle.write(
+            "<Calendars><Calendar><UID>1</UID><Name>Standard</Name><WeekDays>"
+            "<WeekDay><DayType>1</DayType><DayWorking>0</DayWorking></WeekDay>"
+            "<WeekDay><DayType>7</DayType><DayWorking>0</DayWorking></WeekDay>"
+            "</WeekDays></Calendar></Calendars>\n<Tasks>\n"
+        )
+        for task in range(1, activities + 1):
+            links = []
+            if task > 1:
+                for _ in range(rng.randint(1, 2)):
+                    pred = rng.randrange(max(1, task - 2000), task)
+                    links.append(
+                        f"<PredecessorLink><PredecessorUID>{pred}</PredecessorUID><Type>{rng.choice((1, 1, 1, 3, 0))}</Type>"
+                        f"<CrossProject>0</CrossProject><LinkLag>{rng.choice((0, 0, 4800))}</LinkLag><LagFormat>7</LagFormat></PredecessorLink>"
+                    )
+            handle.write(
+                f"<Task><UID>{task}</UID><ID>{task}</ID><Name>Activity {task}</Name><Type>0</Type><IsNull>0</IsNull>"
+                f"<WBS>1.{task // 500}.{task % 500}</WBS><OutlineLevel>3</OutlineLevel>"
+                f"<Start>2026-01-04T08:00:00</Start><Finish>2026-02-04T17:00:00</Finish>"
+                f"<Duration>PT{rng.randint(1, 20) * 8}H0M0S</Duration><DurationFormat>7</DurationFormat>"
+                f"<Milestone>0</Milestone><Summary>0</Summary><CalendarUID>-1</CalendarUID>{''.join(links)}</Task>\n"
+            )
+        handle.write("</Tasks>\n<Assignments>\n")
+        uid = 0
+        while handle.tell() < target:
+            uid += 1
+            handle.write(
+                f"<Assignment><UID>{uid}</UID><TaskUID>{uid % activities + 1}</TaskUID><ResourceUID>{uid % 300}</ResourceUID>"
+                f"<Units>1</Units><Work>PT{uid % 40 + 8}H0M0S</Work></Assignment>\n"
+            )
+        handle.write("</Assignments>\n</Project>\n")
+    return activities
+
+
+def _scenario(path: str, mode: str, results) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "dom":
+        import xml.etree.ElementTree as ET
+
+        root = ET.parse(path).getroot()
+        counts = {"tasks": sum(1 for _ in root.iter(f"{{{NAMESPACE}}}Task"))}
+        cpm_seconds = 0.0
+        read_seconds = time.perf_counter() - start
+    else:
+        from backend.services.cpm_engine import compute_cpm
+        from backend.services.msp_xml_reader import build_network, read_msp_xml
+
+        project = read_msp_xml(path, sections=("Tasks",) if mode == "tasks" else None)
+        read_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        compute_cpm(build_network(project))
+        cpm_seconds = time.perf_counter() - start
+        counts = {"tasks": len(project.tasks), "links": len(project.links), "assignments": len(project.assignments)}
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((read_seconds, cpm_seconds, baseline / 1024, peak / 1024, counts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--path", help="existing MSP XML file to read instead of generating one")
+    parser.add_argument("--dom", action="store_true", help="also time a full ET.parse of the file")
+    args = parser.parse_args()
+
+    path = args.path
+    cleanup = None
+    if path is None:
+        handle = tempfile.NamedTemporaryFile(suffix=".xml", delete=False)
+        handle.close()
+        path = cleanup = handle.name
+        start = time.perf_counter()
+        activities = write_msp_xml(path, args.size_mb)
+        print(f"wrote {os.path.getsize(path) / 2**20:.0f} MB with {activities:,} activities "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    context = multiprocessing.get_context("spawn")
+    scenarios = [("tasks only + CPM", "tasks"), ("all sections + CPM", "all")]
+    if args.dom:
+        scenarios.append(("ET.parse (DOM)", "dom"))
+    try:
+        for label, mode in scenarios:
+            results = context.Queue()
+            process = context.Process(target=_scenario, args=(path, mode, results))
+            process.start()
+            read_seconds, cpm_seconds, baseline, peak, counts = results.get()
+            process.join()
+            print(f"{label:<20} read {read_seconds:6.2f}s  cpm {cpm_seconds:5.2f}s  "
+                  f"peak RSS {peak:7.0f} MB (interpreter {baseline:.0f} MB)  {counts}")
+    finally:
+        if cleanup:
+            os.unlink(cleanup)
+
+
+if __name__ == "__main__":
+    main()
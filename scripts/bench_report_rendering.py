@@ -0,0 +1,88 @@
+"""Measure event loop responsiveness while monthly reports render.
+
+Renders a batch of monthly reports the old way (awaited inline in the request
+coroutine) and through the report process pool, while a heartbeat coroutine
+ticks every 10 ms. The worst heartbeat delay is what a concurrent API request
+would have waited. A second pooled run shows the chart cache at work.
+
+Usage:
+    REPORT_RENDER_WORKERS=4 python scripts/bench_report_rendering.py --reports 20 --format pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.api.analytics_reports_system import AutomatedReportGenerator, ReportFormat, ReportType  # noqa: E402
+from backend.ops.handlers.report_handler import get_render_pool, render_report, shutdown_render_pool  # noqa: E402
+
+TICK_SECONDS = 0.01
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def measure(label: str, work: Callable[[], Awaitable[Any]]) -> None:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0)  # let the heartbeat start before the work blocks
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    worst = lags[-1] if lags else 0.0
+    print(f"{label:<28} {elapsed:7.2f}s  loop lag p99 {p99 * 1000:7.1f} ms  max {worst * 1000:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--format", default="pdf", choices=[choice.value for choice in ReportFormat])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="report-bench-"))
+    payloads = [
+        {"user_id": "user-001", "report_type": ReportType.MONTHLY_OVERVIEW.value, "report_format": args.format}
+        for _ in range(args.reports)
+    ]
+
+    async def inline() -> None:
+        for payload in payloads:
+            generator = AutomatedReportGenerator()
+            await generator.generate_report(ReportType.MONTHLY_OVERVIEW, ReportFormat(payload["report_format"]), payload["user_id"])
+
+    async def pooled() -> None:
+        loop = asyncio.get_running_loop()
+        pool = get_render_pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, render_report, payload) for payload in payloads))
+
+    async def run() -> None:
+        print(f"{args.reports} monthly reports as {args.format}, {os.getenv('REPORT_RENDER_WORKERS', 'default')} workers")
+        await measure("inline in the event loop", inline)
+        await measure("process pool (cold charts)", pooled)
+        await measure("process pool (cached charts)", pooled)
+
+    try:
+        asyncio.run(run())
+    finally:
+        shutdown_render_pool()
+
+
+if __name__ == "__main__":
+    main()
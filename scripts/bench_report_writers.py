@@ -0,0 +1,156 @@
+"""Measure peak Python memory of the report writers as the task table grows.
+
+Fills a SQLite file with N tasks for one user, then renders a monthly report
+in each format while tracemalloc tracks the peak allocation. The rows are read
+through a server-side cursor and written as they arrive, so the peak should
+stay flat from a thousand rows to a million. The "rows as list" column is what
+merely materialising the same rows costs, for comparison.
+
+Usage:
+    python scripts/bench_report_writers.py --sizes 1000,10000,100000,1000000 --formats json,html,pdf,excel
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend.api.analytics_reports_system import AutomatedReportGenerator, ReportFormat, ReportType  # noqa: E402
+
+INSERT_BATCH = 10_000
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    print(f"  {label}: {time.perf_counter() - start:.2f}s")
+
+
+def build_database(path: str, rows: int) -> None:
+    metadata = MetaData()
+    tasks = Table(
+        "tasks",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", String),
+        Column("project_id", String),
+        Column("title", String),
+        Column("priority", String),
+        Column("status", String),
+        Column("completed", Boolean),
+        Column("due_date", DateTime),
+        Column("created_at", DateTime),
+    )
+    Table(
+        "alerts",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", String),
+        Column("project_id", String),
+        Column("title", String),
+        Column("severity", String),
+        Column("created_at", DateTime),
+    )
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_BATCH):
+            conn.execute(
+                tasks.insert(),
+                [
+                    {
+                        "user_id": "user-001",
+                        "project_id": "proj-001",
+                        "title": f"Inspect level {index % 40} zone {index}",
+                        "priority": ("high", "medium", "low")[index % 3],
+                        "status": "completed" if index % 4 == 0 else "in_progress",
+                        "completed": index % 4 == 0,
+                        "due_date": now + timedelta(days=index % 30),
+                        "created_at": now - timedelta(seconds=index % 86_400),
+                    }
+                    for index in range(start, min(rows, start + INSERT_BATCH))
+                ],
+            )
+    engine.dispose()
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated task counts")
+    parser.add_argument("--formats", default="json,html,pdf,excel")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    formats = [ReportFormat(name) for name in args.formats.split(",")]
+
+    workdir = tempfile.mkdtemp(prefix="report-writers-")
+    os.chdir(workdir)
+    results = []
+    for rows in sizes:
+        path = os.path.join(workdir, f"tasks_{rows}.db")
+        print(f"{rows} tasks")
+        with timed("build database"):
+            build_database(path, rows)
+        engine = create_engine(f"sqlite:///{path}")
+        db = sessionmaker(bind=engine)()
+        generator = AutomatedReportGenerator(db=db)
+
+        def collect():
+            return asyncio.run(
+                generator._collect_report_data(
+                    ReportType.MONTHLY_OVERVIEW,
+                    "user-001",
+                    None,
+                    datetime.utcnow() - timedelta(days=30),
+                    datetime.utcnow() + timedelta(days=1),
+                    None,
+                )
+            )
+
+        row = {"rows": rows, "list": peak_mb(lambda: list(collect().tables["tasks"].rows))}
+        for report_format in formats:
+            report_path = []
+            with timed(report_format.value):
+                row[report_format.value] = peak_mb(
+                    lambda: report_path.append(
+                        asyncio.run(generator.generate_report(ReportType.MONTHLY_OVERVIEW, report_format, "user-001"))
+                    )
+                )
+            os.remove(report_path[0])
+        results.append(row)
+        db.close()
+        engine.dispose()
+        os.remove(path)
+
+    print()
+    header = f"{'rows':>10} {'rows as list':>13}" + "".join(f" {fmt.value:>9}" for fmt in formats)
+    print(header + "   (peak MiB)")
+    for row in results:
+        print(f"{row['rows']:>10} {row['list']:>13.1f}" + "".join(f" {row[fmt.value]:>9.1f}" for fmt in formats))
+
+
+if __name__ == "__main__":
+    main()
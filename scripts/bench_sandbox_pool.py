@@ -0,0 +1,67 @@
+"""Benchmark sandbox executions: in-process vs. the warm worker pool.
+
+Usage:
+    python scripts/bench_sandbox_pool.py --executions 1000 --pool-size 4
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.runtime.sandbox import _execute_in_sandbox  # noqa: E402
+from backend.runtime.sandbox_pool import SandboxPool  # noqa: E402
+
+CODE = """
+import numpy as np
+result = float(np.percentile(np.array(values), 90))
+"""
+
+
+def _report(label: str, latencies: list, wall: float) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<12} {len(latencies) / wall:10.0f} exec/s   "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms"
+    )
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--executions", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+    context = {"values": list(range(200))}
+
+    start = time.perf_counter()
+    latencies = [_timed(lambda: _execute_in_sandbox(CODE, context, 5)) for _ in range(args.executions)]
+    _report("in-process", latencies, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pool = SandboxPool(size=args.pool_size)
+    print(f"pool warm-up {time.perf_counter() - start:.2f}s for {pool.size} workers")
+    try:
+        pool.execute(CODE, context, 5)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=pool.size) as threads:
+            latencies = list(threads.map(lambda _: _timed(lambda: pool.execute(CODE, context, 5)), range(args.executions)))
+        _report("pool", latencies, time.perf_counter() - start)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
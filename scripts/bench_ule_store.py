@@ -0,0 +1,146 @@
+"""Compare memory per link and graph query latency of the ULE link storage.
+
+Builds N links (two pieces of evidence each) between entities spread over
+documents and projects, then stores them twice: as the ``Dict[UUID, Link]`` of
+Pydantic models the engine used to keep, and in ``LinkStore``.  tracemalloc
+reports the bytes each representation retains per link; the timings cover the
+project graph endpoint and ``get_links_for_document``, which used to scan
+every link.
+
+Usage:
+    python scripts/bench_ule_store.py --links 100000,500000 --entities-per-document 100 --projects 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from uuid import UUID
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.reasoning.link_store import LinkStore  # noqa: E402
+from backend.reasoning.schemas import Entity, EntityType, Evidence, EvidenceType, Link, LinkType  # noqa: E402
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    print(f"  {label}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def make_entities(count: int, per_document: int) -> List[Entity]:
+    return [
+        Entity(
+            id=f"E-{index}",
+            type=EntityType.BOQ_ITEM if index % 2 else EntityType.SPEC_SECTION,
+            text=f"Concrete grade C{30 + index % 20} for zone {index % 97}",
+            document_id=f"DOC-{index // per_document}",
+            section=f"03{index % 1000:03d}",
+        )
+        for index in range(count)
+    ]
+
+
+def make_links(entities: List[Entity], count: int) -> Iterator[Link]:
+    total = len(entities)
+    for index in range(count):
+        source = entities[index % total]
+        target = entities[(index * 7919 + 1) % total]
+        yield Link(
+            id=UUID(int=index + 1),
+            source=source,
+            target=target,
+            link_type=LinkType.SPECIFIES,
+            confidence=0.75 + (index % 25) / 100,
+            evidence=[
+                Evidence(type=EvidenceType.KEYWORD_MATCH, value="C40", weight=0.4, metadata={"matched_keywords": ["c40"]}),
+                Evidence(type=EvidenceType.SEMANTIC_SIMILARITY, value=0.88, weight=0.6),
+            ],
+            pack_name="ConstructionPack",
+        )
+
+
+def retained(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def old_graph(links: Dict[UUID, Link]) -> int:
+    # The endpoint's previous loop over every stored Link.
+    nodes, edges, seen = [], [], set()
+    for link in links.values():
+        for entity in (link.source, link.target):
+            if entity.id not in seen:
+                nodes.append({"id": entity.id, "label": entity.text[:50], "type": entity.type.value, "document_id": entity.document_id})
+                seen.add(entity.id)
+        edges.append({"id": str(link.id), "source": link.source.id, "target": link.target.id,
+                      "link_type": link.link_type.value, "confidence": link.confidence})
+    return len(edges)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", default="100000,500000")
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--entities-per-document", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    args = parser.parse_args()
+
+    entities = make_entities(args.entities, args.entities_per_document)
+    documents = sorted({entity.document_id for entity in entities})
+    by_document: Dict[str, List[str]] = {}
+    for entity in entities:
+        by_document.setdefault(entity.document_id, []).append(entity.id)
+
+    for count in (int(value) for value in args.links.split(",")):
+        print(f"{count} links, {len(entities)} entities, {len(documents)} documents, {args.projects} projects")
+
+        old, old_bytes = retained(lambda: {link.id: link for link in make_links(entities, count)})
+
+        def build_store() -> LinkStore:
+            store = LinkStore()
+            for entity in entities:
+                store.put_entity(entity)
+            for index, document_id in enumerate(documents):
+                store.set_document(document_id, by_document[document_id], project_id=str(index % args.projects))
+            for link in make_links(entities, count):
+                store.add_link(link)
+            return store
+
+        store, store_bytes = retained(build_store)
+        print(f"  Dict[UUID, Link]: {old_bytes / count:8.0f} B/link   LinkStore: {store_bytes / count:6.0f} B/link"
+              f" (incl. entities)   {old_bytes / max(store_bytes, 1):.1f}x smaller")
+
+        document_id = documents[len(documents) // 2]
+        wanted = set(by_document[document_id])
+        with timed("get_links_for_document, scan of Link dict"):
+            scanned = [link for link in old.values() if link.source.id in wanted or link.target.id in wanted]
+        with timed("get_links_for_document, adjacency index"):
+            indexed = store.links_for_document(document_id)
+        assert [link.id for link in scanned] == [link.id for link in indexed]
+
+        with timed("graph, loop over every Link (old endpoint)"):
+            old_graph(old)
+        with timed("graph, all links from columns"):
+            store.graph()
+        with timed("graph, one project from columns"):
+            store.graph(store.rows_for_project("0"))
+        del old, store
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Load test WebSocket fan-out with thousands of simulated sockets.
+
+Connects N fake sockets, a small share of which are slow (each send takes
+``--slow-ms``), and publishes alerts to all of them.  The old delivery loop
+awaited ``send_json`` socket by socket, so every slow client added its delay
+to everyone's latency; the fan-out hub queues per socket and drops clients
+that fall ``WS_SEND_QUEUE_SIZE`` messages behind.  Latency is measured from
+publish until the last fast socket has the message.
+
+With ``--redis-url`` the sockets are split across two hubs (two "replicas")
+sharing that Redis; otherwise fakeredis is used when installed.
+
+Usage:
+    python scripts/bench_ws_fanout.py --sockets 10000 --messages 50 --slow-share 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.redisx.fanout import BROADCAST_TOPIC, FanoutHub, topics_for  # noqa: E402
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    print(f"  {label}: {time.perf_counter() - start:.2f}s")
+
+
+class SimulatedSocket:
+    def __init__(self, delay: float, arrivals: Dict[int, List[float]]) -> None:
+        self.delay = delay
+        self.arrivals = arrivals
+        self.closed = False
+
+    async def send_json(self, message: dict) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+            return
+        self.arrivals.setdefault(message["seq"], []).append(time.perf_counter())
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed = True
+
+
+def make_sockets(count: int, slow_share: float, slow_delay: float, arrivals: Dict[int, List[float]]) -> List[SimulatedSocket]:
+    slow_every = int(1 / slow_share) if slow_share > 0 else 0
+    return [
+        SimulatedSocket(slow_delay if slow_every and index % slow_every == 0 else 0.0, arrivals)
+        for index in range(count)
+    ]
+
+
+def report(label: str, sent_at: Dict[int, float], arrivals: Dict[int, List[float]], fast: int) -> None:
+    latencies = sorted(
+        (max(times) - sent_at[seq]) * 1000 for seq, times in arrivals.items() if len(times) == fast
+    )
+    incomplete = len(sent_at) - len(latencies)
+    if not latencies:
+        print(f"{label:<30} no message reached every fast socket")
+        return
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<30} last-fast-socket latency p50 {p50:8.1f} ms  p99 {p99:8.1f} ms  incomplete {incomplete}")
+
+
+async def run_sequential(args: argparse.Namespace) -> None:
+    arrivals: Dict[int, List[float]] = {}
+    sockets = make_sockets(args.sockets, args.slow_share, args.slow_ms / 1000, arrivals)
+    fast = sum(1 for socket in sockets if not socket.delay)
+    sent_at: Dict[int, float] = {}
+    with timed(f"sequential send loop, {args.baseline_messages} messages"):
+        for seq in range(args.baseline_messages):
+            sent_at[seq] = time.perf_counter()
+            for socket in sockets:
+                await socket.send_json({"seq": seq})
+    report("sequential (old)", sent_at, arrivals, fast)
+
+
+async def run_hub(args: argparse.Namespace) -> None:
+    redis_clients = []
+    if args.redis_url:
+        import redis.asyncio as redis_asyncio  # type: ignore
+
+        redis_clients = [redis_asyncio.Redis.from_url(args.redis_url, decode_responses=True) for _ in range(2)]
+    else:
+        try:
+            import fakeredis
+            from fakeredis import aioredis
+
+            server = fakeredis.FakeServer()
+            redis_clients = [aioredis.FakeRedis(server=server, decode_responses=True) for _ in range(2)]
+        except ImportError:
+            print("fakeredis not installed; using one in-process hub")
+    hubs = [
+        FanoutHub(namespace="bench", redis_client=client, redis_url="", queue_size=args.queue_size, send_timeout=5)
+        for client in redis_clients
+    ] or [FanoutHub(namespace="bench", redis_url="", queue_size=args.queue_size, send_timeout=5)]
+
+    arrivals: Dict[int, List[float]] = {}
+    sockets = make_sockets(args.sockets, args.slow_share, args.slow_ms / 1000, arrivals)
+    fast = sum(1 for socket in sockets if not socket.delay)
+    with timed(f"connect {len(sockets)} sockets to {len(hubs)} hub(s)"):
+        for index, socket in enumerate(sockets):
+            await hubs[index % len(hubs)].connect(socket, topics_for(user_id=f"user-{index}"))
+
+    sent_at: Dict[int, float] = {}
+    with timed(f"publish {args.messages} messages"):
+        for seq in range(args.messages):
+            sent_at[seq] = time.perf_counter()
+            await hubs[seq % len(hubs)].publish(BROADCAST_TOPIC, {"seq": seq})
+            await asyncio.sleep(args.interval_ms / 1000)
+        deadline = time.perf_counter() + 10
+        while time.perf_counter() < deadline and any(len(arrivals.get(seq, ())) < fast for seq in sent_at):
+            await asyncio.sleep(0.01)
+    report("fan-out hub", sent_at, arrivals, fast)
+    dropped = sum(hub.stats.dropped for hub in hubs)
+    slow = len(sockets) - fast
+    print(f"{'':<30} dropped {dropped} of {slow} slow sockets, {sum(s.closed for s in sockets)} closed")
+    for hub in hubs:
+        await hub.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--baseline-messages", type=int, default=3, help="messages for the slow sequential loop")
+    parser.add_argument("--slow-share", type=float, default=0.01)
+    parser.add_argument("--slow-ms", type=float, default=50.0)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    print(f"{args.sockets} sockets, {args.slow_share:.0%} slow ({args.slow_ms:.0f} ms per send)")
+    asyncio.run(run_sequential(args))
+    asyncio.run(run_hub(args))
+
+
+if __name__ == "__main__":
+    main()
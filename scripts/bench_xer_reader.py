@@ -0,0 +1,119 @@
+"""Benchmark the streaming XER reader on a synthetic P6 export.
+
+Writes an XER file of roughly ``--size-mb`` megabytes (TASK, TASKPRED and a
+large TASKRSRC table, as in real exports), then reads it in a fresh process
+per scenario and reports wall time and peak RSS.
+
+Usage:
+    python scripts/bench_xer_reader.py --size-mb 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+TASK_FIELDS = [
+    "task_id", "proj_id", "wbs_id", "clndr_id", "task_code", "task_name", "task_type",
+    "target_drtn_hr_cnt", "remain_drtn_hr_cnt", "target_start_date", "target_end_date",
+]
+PRED_FIELDS = ["task_pred_id", "task_id", "pred_task_id", "pred_type", "lag_hr_cnt"]
+RSRC_FIELDS = ["taskrsrc_id", "task_id", "rsrc_id", "target_qty", "target_cost", "act_reg_qty", "remain_qty"]
+
+
+def write_xer(path: str, size_mb: int, seed: int = 3) -> int:
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    # Roughly 10% tasks, 10% relationships, the rest resource assignments.
+    activities = max(10, target // 1200)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("ERMHDR\t19.12\t2026-01-01\tProject\tadmin\n")
+        handle.write("%T\tCALENDAR\n%F\tclndr_id\tclndr_name\tday_hr_cnt\n%R\t1\tStandard\t8\n%R\t2\tSite\t10\n")
+        handle.write("%T\tTASK\n%F\t" + "\t".join(TASK_FIELDS) + "\n")
+        for task in range(activities):
+            hours = rng.randint(8, 160)
+            handle.write(
+                f"%R\t{task}\t1\t{task // 500}\t{1 + task % 2}\tA{task:07d}\tActivity {task}\tTT_Task\t"
+                f"{hours}\t{hours}\t2026-01-01 08:00\t2026-02-01 17:00\n"
+            )
+        handle.write("%T\tTASKPRED\n%F\t" + "\t".join(PRED_FIELDS) + "\n")
+        link = 0
+        for task in range(1, activities):
+            for _ in range(rng.randint(1, 2)):
+                pred = rng.randrange(max(0, task - 2000), task)
+                handle.write(f"%R\t{link}\t{task}\t{pred}\t{rng.choice(('PR_FS', 'PR_FS', 'PR_SS', 'PR_FF'))}\t{rng.choice((0, 0, 8, 16))}\n")
+                link += 1
+        handle.write("%T\tTASKRSRC\n%F\t" + "\t".join(RSRC_FIELDS) + "\n")
+        row = 0
+        while handle.tell() < target:
+            for _ in range(10_000):
+                handle.write(f"%R\t{row}\t{row % activities}\t{row % 300}\t{row % 97}.5\t{row % 1013}.25\t0\t{row % 89}\n")
+                row += 1
+        handle.write("%E\n")
+    return activities
+
+
+def _scenario(path: str, tables, schedule: bool, results) -> None:
+    from backend.services.cpm_engine import compute_cpm
+    from backend.services.xer_reader import XerReader, build_network
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    read = XerReader(path).read(tables)
+    read_seconds = time.perf_counter() - start
+    cpm_seconds = 0.0
+    if schedule:
+        start = time.perf_counter()
+        compute_cpm(build_network(read))
+        cpm_seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rows = {name: len(table) for name, table in read.items()}
+    results.put((read_seconds, cpm_seconds, baseline / 1024, peak / 1024, rows))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--path", help="existing XER file to read instead of generating one")
+    args = parser.parse_args()
+
+    path = args.path
+    cleanup = None
+    if path is None:
+        handle = tempfile.NamedTemporaryFile(suffix=".xer", delete=False)
+        handle.close()
+        path = cleanup = handle.name
+        start = time.perf_counter()
+        activities = write_xer(path, args.size_mb)
+        print(f"wrote {os.path.getsize(path) / 2**20:.0f} MB with {activities:,} activities "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    context = multiprocessing.get_context("spawn")
+    scenarios = [
+        ("schedule tables + CPM", ["TASK", "TASKPRED", "CALENDAR"], True),
+        ("all tables", None, False),
+    ]
+    try:
+        for label, tables, schedule in scenarios:
+            results = context.Queue()
+            process = context.Process(target=_scenario, args=(path, tables, schedule, results))
+            process.start()
+            read_seconds, cpm_seconds, baseline, peak, rows = results.get()
+            process.join()
+            print(f"{label:<24} read {read_seconds:6.2f}s  cpm {cpm_seconds:5.2f}s  "
+                  f"peak RSS {peak:7.0f} MB (interpreter {baseline:.0f} MB)  rows {rows}")
+    finally:
+        if cleanup:
+            os.unlink(cleanup)
+
+
+if __name__ == "__main__":
+    main()